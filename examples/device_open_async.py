@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+"""
+ This example demonstrates opening and closing a device from asyncio code,
+ without blocking the event loop during device discovery and boot
+"""
+
+import asyncio
+import depthai as dai
+
+# Create pipeline
+pipeline = dai.Pipeline()
+
+# Define source and output
+camRgb = pipeline.createColorCamera()
+xoutRgb = pipeline.createXLinkOut()
+
+xoutRgb.setStreamName("rgb")
+
+# Properties
+camRgb.setPreviewSize(300, 300)
+
+# Linking
+camRgb.preview.link(xoutRgb.input)
+
+
+async def heartbeat():
+    # Keeps running while the device is being opened
+    while True:
+        print("Event loop is responsive")
+        await asyncio.sleep(0.5)
+
+
+async def main():
+    beat = asyncio.ensure_future(heartbeat())
+
+    # Connect to device and start pipeline, with a timeout (cancellation aborts the device search)
+    device = await asyncio.wait_for(dai.Device.openAsync(pipeline), timeout=10)
+    beat.cancel()
+    print("Opened device", device.getMxId())
+
+    qRgb = device.getOutputQueue(name="rgb", maxSize=4, blocking=False)
+    for _ in range(100):
+        inRgb = qRgb.tryGet()
+        if inRgb is not None:
+            print("Received frame", inRgb.getSequenceNum())
+        await asyncio.sleep(0.01)
+
+    await device.closeAsync()
+    print("Closed device")
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(main())
@@ -1,9 +1,7 @@
 #!/usr/bin/env python3
 
-from pathlib import Path
 import cv2
 import depthai as dai
-import time
 
 # Create pipeline
 pipeline = dai.Pipeline()
@@ -27,17 +25,17 @@ with dai.Device(pipeline) as device:
     # Output queue will be used to get the grayscale frames from the output defined above
     qRight = device.getOutputQueue(name="right", maxSize=4, blocking=False)
 
-    dirName = "mono_data"
-    Path(dirName).mkdir(parents=True, exist_ok=True)
+    # Frames are compressed into PNG images by a pool of threads and stored inside a target directory,
+    # named by sequence number and listed in 'index.csv'
+    with dai.FrameArchiver("mono_data", dai.FrameArchiver.Format.PNG) as archiver:
+        while True:
+            inRight = qRight.get()  # Blocking call, will wait until a new data has arrived
+            archiver.add(inRight)
 
-    while True:
-        inRight = qRight.get()  # Blocking call, will wait until a new data has arrived
-        # Data is originally represented as a flat 1D array, it needs to be converted into HxW form
-        # Frame is transformed and ready to be shown
-        cv2.imshow("right", inRight.getCvFrame())
+            # Frame is transformed and ready to be shown
+            cv2.imshow("right", inRight.getCvFrame())
 
-        # After showing the frame, it's being stored inside a target directory as a PNG image
-        cv2.imwrite(f"{dirName}/{int(time.time() * 1000)}.png", inRight.getFrame())
+            if cv2.waitKey(1) == ord('q'):
+                break
 
-        if cv2.waitKey(1) == ord('q'):
-            break
+        print("Archived", archiver.getStats().numArchived, "frames")
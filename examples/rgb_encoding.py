@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import time
 import depthai as dai
 
 # Create pipeline
@@ -27,16 +28,17 @@ with dai.Device(pipeline) as device:
     # Output queue will be used to get the encoded data from the output defined above
     q = device.getOutputQueue(name="h265", maxSize=30, blocking=True)
 
-    # The .h265 file is a raw stream file (not playable yet)
-    with open('video.h265', 'wb') as videoFile:
+    # Encoded frames are muxed into a playable .mp4 file on a writer thread, timed by device timestamps
+    muxer = dai.VideoMuxer('video.mp4', dai.VideoEncoderProperties.Profile.H265_MAIN)
+    muxer.addQueue(q)
+    with muxer:
         print("Press Ctrl+C to stop encoding...")
         try:
             while True:
-                h265Packet = q.get()  # Blocking call, will wait until a new data has arrived
-                h265Packet.getData().tofile(videoFile)  # Appends the packet data to the opened file
+                time.sleep(1)
         except KeyboardInterrupt:
             # Keyboard interrupt (Ctrl + C) detected
             pass
 
-    print("To view the encoded data, convert the stream file (.h265) into a video file (.mp4) using a command below:")
-    print("ffmpeg -framerate 30 -i video.h265 -c copy video.mp4")
+    stats = muxer.getStats()
+    print(f"Wrote {stats.numFrames} frames ({stats.duration:.1f} s) to video.mp4, dropped {stats.numDropped}")
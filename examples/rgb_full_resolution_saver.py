@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 
-import time
-from pathlib import Path
 import cv2
 import depthai as dai
 
@@ -34,19 +32,19 @@ with dai.Device(pipeline) as device:
     qRgb = device.getOutputQueue(name="rgb", maxSize=30, blocking=False)
     qJpeg = device.getOutputQueue(name="jpeg", maxSize=30, blocking=True)
 
-    # Make sure the destination path is present before starting to store the examples
-    dirName = "rgb_data"
-    Path(dirName).mkdir(parents=True, exist_ok=True)
+    # JPEG frames are written to 'rgb_data' (created if missing) from writer threads, without blocking the display loop
+    saver = dai.FrameSaver("rgb_data/{hostTime}_{sequenceNum}.jpeg")
+    saver.addQueue(qJpeg)
 
-    while True:
-        inRgb = qRgb.tryGet()  # Non-blocking call, will return a new data that has arrived or None otherwise
+    with saver:
+        while True:
+            inRgb = qRgb.tryGet()  # Non-blocking call, will return a new data that has arrived or None otherwise
 
-        if inRgb is not None:
-            cv2.imshow("rgb", inRgb.getCvFrame())
+            if inRgb is not None:
+                cv2.imshow("rgb", inRgb.getCvFrame())
 
-        for encFrame in qJpeg.tryGetAll():
-            with open(f"{dirName}/{int(time.time() * 1000)}.jpeg", "wb") as f:
-                f.write(bytearray(encFrame.getData()))
+            if cv2.waitKey(1) == ord('q'):
+                break
 
-        if cv2.waitKey(1) == ord('q'):
-            break
+    stats = saver.getStats()
+    print(f"Saved {stats.numSaved} images, dropped {stats.numDropped}, average write latency {stats.averageLatency.total_seconds() * 1000:.1f} ms")
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import time
 import depthai as dai
 
 # Create pipeline
@@ -46,26 +47,24 @@ with dai.Device(pipeline) as dev:
     outQ2 = dev.getOutputQueue(name='ve2Out', maxSize=30, blocking=True)
     outQ3 = dev.getOutputQueue(name='ve3Out', maxSize=30, blocking=True)
 
-    # The .h264 / .h265 files are raw stream files (not playable yet)
-    with open('mono1.h264', 'wb') as fileMono1H264, open('color.h265', 'wb') as fileColorH265, open('mono2.h264', 'wb') as fileMono2H264:
-        print("Press Ctrl+C to stop encoding...")
-        while True:
-            try:
-                # Empty each queue
-                while outQ1.has():
-                    outQ1.get().getData().tofile(fileMono1H264)
-
-                while outQ2.has():
-                    outQ2.get().getData().tofile(fileColorH265)
+    # Each stream is muxed into a playable .mp4 file on its own writer thread
+    muxers = [
+        dai.VideoMuxer('mono1.mp4', dai.VideoEncoderProperties.Profile.H264_MAIN),
+        dai.VideoMuxer('color.mp4', dai.VideoEncoderProperties.Profile.H265_MAIN),
+        dai.VideoMuxer('mono2.mp4', dai.VideoEncoderProperties.Profile.H264_MAIN),
+    ]
+    for muxer, queue in zip(muxers, [outQ1, outQ2, outQ3]):
+        muxer.addQueue(queue)
+        muxer.start()
 
-                while outQ3.has():
-                    outQ3.get().getData().tofile(fileMono2H264)
-            except KeyboardInterrupt:
-                # Keyboard interrupt (Ctrl + C) detected
-                break
+    print("Press Ctrl+C to stop encoding...")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        # Keyboard interrupt (Ctrl + C) detected
+        pass
 
-    print("To view the encoded data, convert the stream file (.h264/.h265) into a video file (.mp4), using commands below:")
-    cmd = "ffmpeg -framerate 30 -i {} -c copy {}"
-    print(cmd.format("mono1.h264", "mono1.mp4"))
-    print(cmd.format("mono2.h264", "mono2.mp4"))
-    print(cmd.format("color.h265", "color.mp4"))
+    for muxer in muxers:
+        muxer.close()
+        print(f"Wrote {muxer.getStats().numFrames} frames to {muxer.getPath()}")
@@ -3,8 +3,6 @@
 import cv2
 import numpy as np
 import depthai as dai
-from time import sleep
-import datetime
 import argparse
 from pathlib import Path
 
@@ -209,12 +207,15 @@ print("Connecting and starting the pipeline")
 with dai.Device(pipeline) as device:
 
     stereoDepthConfigInQueue = device.getInputQueue("stereoDepthConfig")
-    inStreams = ['in_right', 'in_left']
-    inStreamsCameraID = [dai.CameraBoardSocket.RIGHT, dai.CameraBoardSocket.LEFT]
-    in_q_list = []
-    for s in inStreams:
-        q = device.getInputQueue(s)
-        in_q_list.append(q)
+
+    # Frames are decoded ahead of sending on a thread pool, so disk and decoding don't stall the device.
+    # Left and right frames of each pair are sent with the same sequence number and timestamp, for the sync stage in Stereo node
+    streamer = dai.DatasetStreamer(args.dataset)
+    streamer.setDecoder(lambda path: cv2.imread(path, cv2.IMREAD_GRAYSCALE))
+    streamer.addStream('*/in_right.png', device.getInputQueue('in_right'), dai.ImgFrame.Type.RAW8, dai.CameraBoardSocket.RIGHT)
+    streamer.addStream('*/in_left.png', device.getInputQueue('in_left'), dai.ImgFrame.Type.RAW8, dai.CameraBoardSocket.LEFT)
+    streamer.setFps(2)
+    streamer.setLoop(True)
 
     # Create a receive queue for each stream
     q_list = []
@@ -222,33 +223,8 @@ with dai.Device(pipeline) as device:
         q = device.getOutputQueue(s, 8, blocking=False)
         q_list.append(q)
 
-    # Need to set a timestamp for input frames, for the sync stage in Stereo node
-    timestamp_ms = 0
-    index = 0
+    streamer.start()
     while True:
-        # Handle input streams, if any
-        if in_q_list:
-            dataset_size = 1  # Number of image pairs
-            frame_interval_ms = 500
-            for i, q in enumerate(in_q_list):
-                path = args.dataset + '/' + str(index) + '/' + q.getName() + '.png'
-                data = cv2.imread(path, cv2.IMREAD_GRAYSCALE).reshape(720*1280)
-                tstamp = datetime.timedelta(seconds = timestamp_ms // 1000,
-                                            milliseconds = timestamp_ms % 1000)
-                img = dai.ImgFrame()
-                img.setData(data)
-                img.setTimestamp(tstamp)
-                img.setInstanceNum(inStreamsCameraID[i])
-                img.setType(dai.ImgFrame.Type.RAW8)
-                img.setWidth(1280)
-                img.setHeight(720)
-                q.send(img)
-                if timestamp_ms == 0:  # Send twice for first iteration
-                    q.send(img)
-                print("Sent frame: {:25s}".format(path), 'timestamp_ms:', timestamp_ms)
-            timestamp_ms += frame_interval_ms
-            index = (index + 1) % dataset_size
-            sleep(frame_interval_ms / 1000)
         # Handle output streams
         for q in q_list:
             if q.getName() in ['left', 'right']: continue
@@ -262,3 +238,5 @@ with dai.Device(pipeline) as device:
         if key == ord('q'):
             break
         depth_handler.handleKeypress(key, stereoDepthConfigInQueue)
+
+    streamer.stop()
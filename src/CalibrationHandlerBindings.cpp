@@ -1,14 +1,59 @@
 #include "CalibrationHandlerBindings.hpp"
 #include "depthai/device/CalibrationHandler.hpp"
 #include "depthai-shared/common/Point2f.hpp"
+#include <functional>
 #include <vector>
 
+#include "calibration/CalibrationBinary.hpp"
+#include "device/CalibrationCache.hpp"
+
+namespace {
+
+// Derived matrices are memoized per python object and dropped by any setter
+CalibrationCache& getCache(py::object& self) {
+    if(!py::hasattr(self, "_cache")) {
+        self.attr("_cache") = py::capsule(new CalibrationCache(), [](void* cache) { delete static_cast<CalibrationCache*>(cache); });
+    }
+    return *static_cast<CalibrationCache*>(self.attr("_cache").cast<py::capsule>());
+}
+
+void clearCache(py::object& self) {
+    if(py::hasattr(self, "_cache")) getCache(self).clear();
+}
+
+// Setter which drops memoized results once the calibration is modified
+template <typename... Args>
+std::function<void(py::object, Args...)> invalidating(void (dai::CalibrationHandler::*setter)(Args...)) {
+    return [setter](py::object self, Args... args) {
+        (self.cast<dai::CalibrationHandler&>().*setter)(std::move(args)...);
+        clearCache(self);
+    };
+}
+
+py::array_t<float> toArray(const std::vector<std::vector<float>>& matrix) {
+    std::size_t rows = matrix.size();
+    std::size_t cols = rows > 0 ? matrix[0].size() : 0;
+    py::array_t<float> array({rows, cols});
+    auto view = array.mutable_unchecked<2>();
+    for(std::size_t i = 0; i < rows; i++) {
+        if(matrix[i].size() != cols) throw std::runtime_error("Matrix rows differ in length");
+        for(std::size_t j = 0; j < cols; j++) view(i, j) = matrix[i][j];
+    }
+    return array;
+}
+
+py::array_t<float> toArray(const std::vector<float>& vector) {
+    return py::array_t<float>(vector.size(), vector.data());
+}
+
+}
+
 void CalibrationHandlerBindings::bind(pybind11::module& m){
 
     using namespace dai;
 
     // bind pipeline
-    py::class_<CalibrationHandler>(m, "CalibrationHandler", DOC(dai, CalibrationHandler))
+    py::class_<CalibrationHandler>(m, "CalibrationHandler", py::dynamic_attr(), DOC(dai, CalibrationHandler))
         .def(py::init<>(), DOC(dai, CalibrationHandler, CalibrationHandler))
         .def(py::init<std::string>(), DOC(dai, CalibrationHandler, CalibrationHandler, 2))
         .def(py::init<std::string, std::string>(), DOC(dai, CalibrationHandler, CalibrationHandler, 3))
@@ -16,45 +61,122 @@ void CalibrationHandlerBindings::bind(pybind11::module& m){
 
         .def("getEepromData", &CalibrationHandler::getEepromData, DOC(dai, CalibrationHandler, getEepromData))
 
-        .def("getCameraIntrinsics", py::overload_cast<CameraBoardSocket, int, int, Point2f, Point2f>(&CalibrationHandler::getCameraIntrinsics), py::arg("cameraId"), py::arg("resizeWidth") = -1, py::arg("resizeHeight") = -1, py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics))
-        .def("getCameraIntrinsics", py::overload_cast<CameraBoardSocket, Size2f, Point2f, Point2f>(&CalibrationHandler::getCameraIntrinsics), py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics, 2))
-        .def("getCameraIntrinsics", py::overload_cast<CameraBoardSocket, std::tuple<int, int>, Point2f, Point2f>(&CalibrationHandler::getCameraIntrinsics), py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics, 3))
+        .def("getCameraIntrinsics", [](py::object self, CameraBoardSocket cameraId, int resizeWidth, int resizeHeight, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, resizeWidth, resizeHeight, topLeftPixelId, bottomRightPixelId);
+        }, py::arg("cameraId"), py::arg("resizeWidth") = -1, py::arg("resizeHeight") = -1, py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics))
+        .def("getCameraIntrinsics", [](py::object self, CameraBoardSocket cameraId, Size2f destShape, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, destShape.width, destShape.height, topLeftPixelId, bottomRightPixelId);
+        }, py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics, 2))
+        .def("getCameraIntrinsics", [](py::object self, CameraBoardSocket cameraId, std::tuple<int, int> destShape, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, std::get<0>(destShape), std::get<1>(destShape), topLeftPixelId, bottomRightPixelId);
+        }, py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), DOC(dai, CalibrationHandler, getCameraIntrinsics, 3))
 
         .def("getDefaultIntrinsics", &CalibrationHandler::getDefaultIntrinsics, py::arg("cameraId"), DOC(dai, CalibrationHandler, getDefaultIntrinsics))
-        .def("getDistortionCoefficients", &CalibrationHandler::getDistortionCoefficients, py::arg("cameraId"), DOC(dai, CalibrationHandler, getDistortionCoefficients))
+        .def("getDistortionCoefficients", [](py::object self, CameraBoardSocket cameraId) {
+            return getCache(self).getDistortionCoefficients(self.cast<CalibrationHandler&>(), cameraId);
+        }, py::arg("cameraId"), DOC(dai, CalibrationHandler, getDistortionCoefficients))
 
         .def("getFov", &CalibrationHandler::getFov, py::arg("cameraId"), DOC(dai, CalibrationHandler, getFov))
         .def("getLensPosition", &CalibrationHandler::getLensPosition, py::arg("cameraId"), DOC(dai, CalibrationHandler, getLensPosition))
 
-        .def("getCameraExtrinsics", &CalibrationHandler::getCameraExtrinsics, py::arg("srcCamera"), py::arg("dstCamera"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getCameraExtrinsics))
-
-        .def("getCameraToImuExtrinsics", &CalibrationHandler::getCameraToImuExtrinsics, py::arg("cameraId"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getCameraToImuExtrinsics))
-        .def("getImuToCameraExtrinsics", &CalibrationHandler::getImuToCameraExtrinsics, py::arg("cameraId"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getImuToCameraExtrinsics))
-
-        .def("getStereoRightRectificationRotation", &CalibrationHandler::getStereoRightRectificationRotation, DOC(dai, CalibrationHandler, getStereoRightRectificationRotation))
-        .def("getStereoLeftRectificationRotation", &CalibrationHandler::getStereoLeftRectificationRotation, DOC(dai, CalibrationHandler, getStereoLeftRectificationRotation))
+        .def("getCameraExtrinsics", [](py::object self, CameraBoardSocket srcCamera, CameraBoardSocket dstCamera, bool useSpecTranslation) {
+            return getCache(self).getCameraExtrinsics(self.cast<CalibrationHandler&>(), srcCamera, dstCamera, useSpecTranslation);
+        }, py::arg("srcCamera"), py::arg("dstCamera"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getCameraExtrinsics))
+
+        .def("getCameraToImuExtrinsics", [](py::object self, CameraBoardSocket cameraId, bool useSpecTranslation) {
+            return getCache(self).getCameraToImuExtrinsics(self.cast<CalibrationHandler&>(), cameraId, useSpecTranslation);
+        }, py::arg("cameraId"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getCameraToImuExtrinsics))
+        .def("getImuToCameraExtrinsics", [](py::object self, CameraBoardSocket cameraId, bool useSpecTranslation) {
+            return getCache(self).getImuToCameraExtrinsics(self.cast<CalibrationHandler&>(), cameraId, useSpecTranslation);
+        }, py::arg("cameraId"), py::arg("useSpecTranslation") = false, DOC(dai, CalibrationHandler, getImuToCameraExtrinsics))
+
+        .def("getStereoRightRectificationRotation", [](py::object self) {
+            return getCache(self).getStereoRightRectificationRotation(self.cast<CalibrationHandler&>());
+        }, DOC(dai, CalibrationHandler, getStereoRightRectificationRotation))
+        .def("getStereoLeftRectificationRotation", [](py::object self) {
+            return getCache(self).getStereoLeftRectificationRotation(self.cast<CalibrationHandler&>());
+        }, DOC(dai, CalibrationHandler, getStereoLeftRectificationRotation))
         .def("getStereoLeftCameraId", &CalibrationHandler::getStereoLeftCameraId, DOC(dai, CalibrationHandler, getStereoLeftCameraId))
         .def("getStereoRightCameraId", &CalibrationHandler::getStereoRightCameraId, DOC(dai, CalibrationHandler, getStereoRightCameraId))
 
-        .def("eepromToJsonFile", &CalibrationHandler::eepromToJsonFile, py::arg("destPath"), DOC(dai, CalibrationHandler, eepromToJsonFile))
-
-        .def("setBoardInfo", &CalibrationHandler::setBoardInfo, py::arg("boardName"), py::arg("boardRev"), DOC(dai, CalibrationHandler, setBoardInfo))
+        .def("getCameraIntrinsicsArray", [](py::object self, CameraBoardSocket cameraId, int resizeWidth, int resizeHeight, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return toArray(getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, resizeWidth, resizeHeight, topLeftPixelId, bottomRightPixelId));
+        }, py::arg("cameraId"), py::arg("resizeWidth") = -1, py::arg("resizeHeight") = -1, py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), "Same as getCameraIntrinsics, as a 3x3 numpy array")
+        .def("getCameraIntrinsicsArray", [](py::object self, CameraBoardSocket cameraId, Size2f destShape, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return toArray(getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, destShape.width, destShape.height, topLeftPixelId, bottomRightPixelId));
+        }, py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), "Same as getCameraIntrinsics, as a 3x3 numpy array")
+        .def("getCameraIntrinsicsArray", [](py::object self, CameraBoardSocket cameraId, std::tuple<int, int> destShape, Point2f topLeftPixelId, Point2f bottomRightPixelId) {
+            return toArray(getCache(self).getCameraIntrinsics(self.cast<CalibrationHandler&>(), cameraId, std::get<0>(destShape), std::get<1>(destShape), topLeftPixelId, bottomRightPixelId));
+        }, py::arg("cameraId"), py::arg("destShape"), py::arg("topLeftPixelId") = Point2f(), py::arg("bottomRightPixelId") = Point2f(), "Same as getCameraIntrinsics, as a 3x3 numpy array")
+        .def("getDistortionCoefficientsArray", [](py::object self, CameraBoardSocket cameraId) {
+            return toArray(getCache(self).getDistortionCoefficients(self.cast<CalibrationHandler&>(), cameraId));
+        }, py::arg("cameraId"), "Same as getDistortionCoefficients, as a numpy array")
+        .def("getCameraExtrinsicsArray", [](py::object self, CameraBoardSocket srcCamera, CameraBoardSocket dstCamera, bool useSpecTranslation) {
+            return toArray(getCache(self).getCameraExtrinsics(self.cast<CalibrationHandler&>(), srcCamera, dstCamera, useSpecTranslation));
+        }, py::arg("srcCamera"), py::arg("dstCamera"), py::arg("useSpecTranslation") = false, "Same as getCameraExtrinsics, as a 4x4 numpy array")
+        .def("getCameraToImuExtrinsicsArray", [](py::object self, CameraBoardSocket cameraId, bool useSpecTranslation) {
+            return toArray(getCache(self).getCameraToImuExtrinsics(self.cast<CalibrationHandler&>(), cameraId, useSpecTranslation));
+        }, py::arg("cameraId"), py::arg("useSpecTranslation") = false, "Same as getCameraToImuExtrinsics, as a 4x4 numpy array")
+        .def("getImuToCameraExtrinsicsArray", [](py::object self, CameraBoardSocket cameraId, bool useSpecTranslation) {
+            return toArray(getCache(self).getImuToCameraExtrinsics(self.cast<CalibrationHandler&>(), cameraId, useSpecTranslation));
+        }, py::arg("cameraId"), py::arg("useSpecTranslation") = false, "Same as getImuToCameraExtrinsics, as a 4x4 numpy array")
+        .def("getStereoRightRectificationRotationArray", [](py::object self) {
+            return toArray(getCache(self).getStereoRightRectificationRotation(self.cast<CalibrationHandler&>()));
+        }, "Same as getStereoRightRectificationRotation, as a 3x3 numpy array")
+        .def("getStereoLeftRectificationRotationArray", [](py::object self) {
+            return toArray(getCache(self).getStereoLeftRectificationRotation(self.cast<CalibrationHandler&>()));
+        }, "Same as getStereoLeftRectificationRotation, as a 3x3 numpy array")
+
+        .def("getRectificationMaps", [](py::object self, CameraBoardSocket cameraId, std::tuple<unsigned int, unsigned int> size, float alpha, bool useCache, const std::string& cacheDirectory) {
+            auto& cache = getCache(self);
+            // Setters may modify the calibration once the GIL is released, maps are computed from a copy
+            auto snapshot = cache.snapshot(self.cast<CalibrationHandler&>());
+            py::gil_scoped_release release;
+            return cache.getRectificationMaps(snapshot, cameraId, std::get<0>(size), std::get<1>(size), alpha, useCache, cacheDirectory);
+        }, py::arg("cameraId"), py::arg("size"), py::arg("alpha") = -1.0f, py::arg("useCache") = true, py::arg("cacheDirectory") = "",
+        "Remap tables rectifying a camera at a given (width, height). Stereo cameras are rotated into the common rectified plane, other cameras are undistorted. "
+        "Negative alpha keeps the stereo right camera's intrinsics as on device, 0 - 1 scales from only valid pixels to all pixels. "
+        "Tables are cached on disk (DEPTHAI_CACHE_DIR, or 'cacheDirectory'), keyed by calibration content and arguments")
+        .def("getRectificationMaps", [](py::object self, CameraBoardSocket cameraId, Size2f size, float alpha, bool useCache, const std::string& cacheDirectory) {
+            auto& cache = getCache(self);
+            auto snapshot = cache.snapshot(self.cast<CalibrationHandler&>());
+            py::gil_scoped_release release;
+            return cache.getRectificationMaps(snapshot, cameraId, static_cast<unsigned int>(size.width), static_cast<unsigned int>(size.height), alpha, useCache, cacheDirectory);
+        }, py::arg("cameraId"), py::arg("size"), py::arg("alpha") = -1.0f, py::arg("useCache") = true, py::arg("cacheDirectory") = "",
+        "Same as getRectificationMaps with a (width, height) tuple")
 
-        .def("setCameraIntrinsics", py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, Size2f>(&CalibrationHandler::setCameraIntrinsics), py::arg("cameraId"), py::arg("intrinsics"), py::arg("frameSize"), DOC(dai, CalibrationHandler, setCameraIntrinsics))
-        .def("setCameraIntrinsics", py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, int, int>(&CalibrationHandler::setCameraIntrinsics), py::arg("cameraId"), py::arg("intrinsics"), py::arg("width"), py::arg("height"), DOC(dai, CalibrationHandler, setCameraIntrinsics, 2))
-        .def("setCameraIntrinsics", py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, std::tuple<int, int>>(&CalibrationHandler::setCameraIntrinsics), py::arg("cameraId"), py::arg("intrinsics"), py::arg("frameSize"), DOC(dai, CalibrationHandler, setCameraIntrinsics, 3))
-
-        .def("setDistortionCoefficients", &CalibrationHandler::setDistortionCoefficients, py::arg("cameraId"), py::arg("distortionCoefficients"), DOC(dai, CalibrationHandler, setDistortionCoefficients))
-        .def("setFov", &CalibrationHandler::setFov, py::arg("cameraId"), py::arg("hfov"), DOC(dai, CalibrationHandler, setFov))
-
-        .def("setLensPosition", &CalibrationHandler::setLensPosition, py::arg("cameraId"), py::arg("lensPosition"), DOC(dai, CalibrationHandler, setLensPosition))
-        .def("setCameraType", &CalibrationHandler::setCameraType, py::arg("cameraId"), py::arg("cameraModel"), DOC(dai, CalibrationHandler, setCameraType))
-
-        .def("setCameraExtrinsics", &CalibrationHandler::setCameraExtrinsics, py::arg("srcCameraId"), py::arg("destCameraId"), py::arg("rotationMatrix"), py::arg("translation"), py::arg("specTranslation") = std::vector<float>(3,0), DOC(dai, CalibrationHandler, setCameraExtrinsics))
-        .def("setImuExtrinsics", &CalibrationHandler::setImuExtrinsics, py::arg("destCameraId"), py::arg("rotationMatrix"), py::arg("translation"), py::arg("specTranslation") = std::vector<float>(3,0), DOC(dai, CalibrationHandler, setImuExtrinsics))
-
-        .def("setStereoLeft", &CalibrationHandler::setStereoLeft, py::arg("cameraId"), py::arg("rectifiedRotation"), DOC(dai, CalibrationHandler, setStereoLeft))
-        .def("setStereoRight", &CalibrationHandler::setStereoRight, py::arg("cameraId"), py::arg("rectifiedRotation"), DOC(dai, CalibrationHandler, setStereoRight));
+        .def("eepromToJsonFile", &CalibrationHandler::eepromToJsonFile, py::arg("destPath"), DOC(dai, CalibrationHandler, eepromToJsonFile))
+        .def("toBinary", [](const CalibrationHandler& calibration) {
+            auto data = calibrationToBinary(calibration.getEepromData());
+            return py::bytes(reinterpret_cast<const char*>(data.data()), data.size());
+        }, "Serializes calibration into a compact versioned binary format, faster to load than JSON")
+        .def_static("fromBinary", [](py::object data) {
+            // Any bytes-like object
+            auto bytes = py::reinterpret_steal<py::bytes>(PyBytes_FromObject(data.ptr()));
+            if(!bytes) throw py::error_already_set();
+            char* buffer = nullptr;
+            py::ssize_t size = 0;
+            if(PyBytes_AsStringAndSize(bytes.ptr(), &buffer, &size) != 0) throw py::error_already_set();
+            return CalibrationHandler(calibrationFromBinary(reinterpret_cast<const std::uint8_t*>(buffer), static_cast<std::size_t>(size)));
+        }, py::arg("data"), "Deserializes calibration serialized by toBinary, raises if data is of another format version, truncated or corrupted")
+
+        .def("setBoardInfo", invalidating(&CalibrationHandler::setBoardInfo), py::arg("boardName"), py::arg("boardRev"), DOC(dai, CalibrationHandler, setBoardInfo))
+
+        .def("setCameraIntrinsics", invalidating(py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, Size2f>(&CalibrationHandler::setCameraIntrinsics)), py::arg("cameraId"), py::arg("intrinsics"), py::arg("frameSize"), DOC(dai, CalibrationHandler, setCameraIntrinsics))
+        .def("setCameraIntrinsics", invalidating(py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, int, int>(&CalibrationHandler::setCameraIntrinsics)), py::arg("cameraId"), py::arg("intrinsics"), py::arg("width"), py::arg("height"), DOC(dai, CalibrationHandler, setCameraIntrinsics, 2))
+        .def("setCameraIntrinsics", invalidating(py::overload_cast<CameraBoardSocket, std::vector<std::vector<float>>, std::tuple<int, int>>(&CalibrationHandler::setCameraIntrinsics)), py::arg("cameraId"), py::arg("intrinsics"), py::arg("frameSize"), DOC(dai, CalibrationHandler, setCameraIntrinsics, 3))
+
+        .def("setDistortionCoefficients", invalidating(&CalibrationHandler::setDistortionCoefficients), py::arg("cameraId"), py::arg("distortionCoefficients"), DOC(dai, CalibrationHandler, setDistortionCoefficients))
+        .def("setFov", invalidating(&CalibrationHandler::setFov), py::arg("cameraId"), py::arg("hfov"), DOC(dai, CalibrationHandler, setFov))
+
+        .def("setLensPosition", invalidating(&CalibrationHandler::setLensPosition), py::arg("cameraId"), py::arg("lensPosition"), DOC(dai, CalibrationHandler, setLensPosition))
+        .def("setCameraType", invalidating(&CalibrationHandler::setCameraType), py::arg("cameraId"), py::arg("cameraModel"), DOC(dai, CalibrationHandler, setCameraType))
+
+        .def("setCameraExtrinsics", invalidating(&CalibrationHandler::setCameraExtrinsics), py::arg("srcCameraId"), py::arg("destCameraId"), py::arg("rotationMatrix"), py::arg("translation"), py::arg("specTranslation") = std::vector<float>(3,0), DOC(dai, CalibrationHandler, setCameraExtrinsics))
+        .def("setImuExtrinsics", invalidating(&CalibrationHandler::setImuExtrinsics), py::arg("destCameraId"), py::arg("rotationMatrix"), py::arg("translation"), py::arg("specTranslation") = std::vector<float>(3,0), DOC(dai, CalibrationHandler, setImuExtrinsics))
+
+        .def("setStereoLeft", invalidating(&CalibrationHandler::setStereoLeft), py::arg("cameraId"), py::arg("rectifiedRotation"), DOC(dai, CalibrationHandler, setStereoLeft))
+        .def("setStereoRight", invalidating(&CalibrationHandler::setStereoRight), py::arg("cameraId"), py::arg("rectifiedRotation"), DOC(dai, CalibrationHandler, setStereoRight));
 
 
 }
\ No newline at end of file
@@ -6,6 +6,9 @@
 // depthai
 #include "depthai/device/DataQueue.hpp"
 
+// project
+#include "device/MessageQueue.hpp"
+
 void DataQueueBindings::bind(pybind11::module& m){
 
     using namespace dai;
@@ -137,4 +140,98 @@ void DataQueueBindings::bind(pybind11::module& m){
         }, py::arg("rawMsg"), DOC(dai, DataInputQueue, send))
         ;
 
+    // Bind MessageQueue (host side queue, used by ReconnectingDevice)
+    auto addMessageQueueCallbackLambda = [](MessageQueue& q, py::function cb) -> int {
+        pybind11::module inspect_module = pybind11::module::import("inspect");
+        pybind11::object result = inspect_module.attr("signature")(cb).attr("parameters");
+        auto numParams = pybind11::len(result);
+        if(numParams == 2){
+            return q.addCallback(cb.cast<std::function<void(std::string, std::shared_ptr<ADatatype>)>>());
+        } else if (numParams == 1){
+            return q.addCallback(cb.cast<std::function<void(std::shared_ptr<ADatatype>)>>());
+        } else if (numParams == 0){
+            return q.addCallback(cb.cast<std::function<void()>>());
+        } else {
+            throw py::value_error("Callback must take either zero, one or two arguments");
+        }
+    };
+    py::class_<MessageQueue, std::shared_ptr<MessageQueue>>(m, "MessageQueue", "Host side message queue, mirroring DataOutputQueue API, which stays valid across device reconnects")
+        .def(py::init<std::string, unsigned int, bool>(), py::arg("name"), py::arg("maxSize") = 16, py::arg("blocking") = true)
+        .def("getName", &MessageQueue::getName, "Get name of the queue")
+
+        .def("addCallback", addMessageQueueCallbackLambda, py::arg("callback"), "Adds a callback on message received, callback takes zero, one (message) or two (queue name, message) arguments. Returns callback id")
+        .def("removeCallback", &MessageQueue::removeCallback, py::arg("callbackId"), "Removes a callback, returns true if callback was removed")
+
+        .def("setBlocking", &MessageQueue::setBlocking, py::arg("blocking"), "Sets queue behavior when full (maxSize). True - blocking, false - overwriting oldest messages")
+        .def("getBlocking", &MessageQueue::getBlocking, "Gets current queue behavior when full (maxSize)")
+        .def("setMaxSize", &MessageQueue::setMaxSize, py::arg("maxSize"), "Sets maximum queue size")
+        .def("getMaxSize", &MessageQueue::getMaxSize, "Gets maximum queue size")
+        .def("getSize", &MessageQueue::getSize, "Gets number of messages currently waiting in the queue")
+        .def("getNumPushed", &MessageQueue::getNumPushed, "Gets number of messages pushed into the queue since creation")
+        .def("getNumDropped", &MessageQueue::getNumDropped, "Gets number of messages discarded by a non-blocking queue since creation")
+        .def("getAll", [](MessageQueue& obj){
+
+            std::vector<std::shared_ptr<ADatatype>> messages;
+            bool timedout = true;
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+
+                    // block for 100ms
+                    messages = obj.getAll(milliseconds(100), timedout);
+                }
+
+                // check if interrupt triggered in between
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+
+            } while(timedout);
+
+            return messages;
+        }, "Blocks until at least one message is available and retrieves all messages")
+        .def("get", [](MessageQueue& obj){
+
+            std::shared_ptr<ADatatype> d = nullptr;
+            bool timedout = true;
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+
+                    // block for 100ms
+                    d = obj.get(milliseconds(100), timedout);
+                }
+
+                // check if interrupt triggered in between
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+
+            } while(timedout);
+
+            return d;
+        }, "Blocks until a message is available and retrieves it")
+        .def("has", &MessageQueue::has, "Check whether front of the queue has a message")
+        .def("tryGet", &MessageQueue::tryGet, "Try to retrieve message from queue. Returns None if no message is available")
+        .def("tryGetAll", &MessageQueue::tryGetAll, "Try to retrieve all messages in the queue")
+        .def("send", [](MessageQueue& obj, std::shared_ptr<ADatatype> d){
+
+            bool sent = false;
+            do {
+                {
+                    // Release GIL, then block
+                    py::gil_scoped_release release;
+                    sent = obj.send(d, milliseconds(100));
+                }
+
+                // check if interrupt triggered in between
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+
+                if (!sent && obj.isClosed()) throw std::runtime_error("Queue closed");
+
+            } while(!sent);
+
+        }, py::arg("msg"), "Pushes a message into the queue, blocking if queue is blocking and full")
+        .def("close", &MessageQueue::close, py::arg("reason") = "Queue closed", py::call_guard<py::gil_scoped_release>(), "Closes the queue, waking up blocked producers and consumers")
+        .def("isClosed", &MessageQueue::isClosed, "Check whether queue was closed")
+        ;
+
 }
\ No newline at end of file
@@ -22,6 +22,7 @@
 #include "depthai/pipeline/datatype/EdgeDetectorConfig.hpp"
 
 // depthai-shared
+#include "depthai-shared/datatype/DatatypeEnum.hpp"
 #include "depthai-shared/datatype/RawBuffer.hpp"
 #include "depthai-shared/datatype/RawImgFrame.hpp"
 #include "depthai-shared/datatype/RawNNData.hpp"
@@ -49,6 +50,23 @@ void DatatypeBindings::bind(pybind11::module& m){
 
     using namespace dai;
 
+    py::enum_<DatatypeEnum>(m, "DatatypeEnum", "Type of a message")
+        .value("Buffer", DatatypeEnum::Buffer)
+        .value("ImgFrame", DatatypeEnum::ImgFrame)
+        .value("NNData", DatatypeEnum::NNData)
+        .value("ImageManipConfig", DatatypeEnum::ImageManipConfig)
+        .value("CameraControl", DatatypeEnum::CameraControl)
+        .value("ImgDetections", DatatypeEnum::ImgDetections)
+        .value("SpatialImgDetections", DatatypeEnum::SpatialImgDetections)
+        .value("SystemInformation", DatatypeEnum::SystemInformation)
+        .value("SpatialLocationCalculatorConfig", DatatypeEnum::SpatialLocationCalculatorConfig)
+        .value("SpatialLocationCalculatorData", DatatypeEnum::SpatialLocationCalculatorData)
+        .value("EdgeDetectorConfig", DatatypeEnum::EdgeDetectorConfig)
+        .value("Tracklets", DatatypeEnum::Tracklets)
+        .value("IMUData", DatatypeEnum::IMUData)
+        .value("StereoDepthConfig", DatatypeEnum::StereoDepthConfig)
+        ;
+
     // Bind Raw datatypes
     py::class_<RawBuffer, std::shared_ptr<RawBuffer>>(m, "RawBuffer", DOC(dai, RawBuffer))
         .def(py::init<>())
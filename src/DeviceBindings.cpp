@@ -3,6 +3,14 @@
 // depthai
 #include "depthai/device/Device.hpp"
 
+// project
+#include "device/DeviceOpener.hpp"
+#include "device/DeviceTransport.hpp"
+#include "device/MetricsExporter.hpp"
+#include "device/ReconnectingDevice.hpp"
+#include "device/SystemInformationBuffer.hpp"
+#include "pipeline/PipelineBlobs.hpp"
+
 // std::chrono bindings
 #include <pybind11/chrono.h>
 // py::detail
@@ -13,6 +21,9 @@
 // Searches for available devices (as Device constructor)
 // but pooling, to check for python interrupts, and releases GIL in between
 static std::unique_ptr<dai::Device> deviceConstructorHelper(const dai::Pipeline& pipeline, const std::string& pathToCmd = "", bool usb2Mode = false){
+    // Fail before searching and booting if blobs can't run with pipeline OpenVINO version
+    validatePipelineOpenVINOVersion(pipeline);
+
     auto startTime = std::chrono::steady_clock::now();
     bool found;
     dai::DeviceInfo deviceInfo = {};
@@ -89,6 +100,105 @@ static std::unique_ptr<dai::Device> deviceConstructorHelper(dai::OpenVINO::Versi
 }
 
 
+// Python side of an asyncio call executed on the device worker.
+// Holds python objects, so it must only be created and destroyed with GIL held
+struct AsyncCallContext {
+    py::object loop;
+    py::object future;
+    py::object self;
+};
+
+// Creates a context with a future bound to the current event loop. Cancelling the future sets 'cancelled'
+static AsyncCallContext* asyncCallCreate(std::shared_ptr<std::atomic<bool>> cancelled){
+    auto ctx = new AsyncCallContext();
+    ctx->loop = py::module::import("asyncio").attr("get_event_loop")();
+    ctx->future = ctx->loop.attr("create_future")();
+    ctx->future.attr("add_done_callback")(py::cpp_function([cancelled](py::object future){
+        if(future.attr("cancelled")().cast<bool>()) *cancelled = true;
+    }));
+    return ctx;
+}
+
+// Resolves the future on its event loop thread and destroys the context (GIL must be held).
+// If 'error' is not empty, future is completed with a RuntimeError instead
+static void asyncCallFinish(AsyncCallContext* ctx, py::object result, const std::string& error){
+    // Future might have been cancelled in the meantime
+    auto complete = py::cpp_function([](py::object future, py::object result, py::object exception){
+        if(future.attr("done")().cast<bool>()) return;
+        if(exception.is_none()){
+            future.attr("set_result")(result);
+        } else {
+            future.attr("set_exception")(exception);
+        }
+    });
+    py::object exception = py::none();
+    if(!error.empty()) exception = py::module::import("builtins").attr("RuntimeError")(error);
+    try {
+        ctx->loop.attr("call_soon_threadsafe")(complete, ctx->future, result, exception);
+    } catch(py::error_already_set&) {
+        // Event loop already closed, nobody is waiting for the result
+    }
+    delete ctx;
+}
+
+// Opens a device on the device worker, returns an asyncio future resolving to the Device
+static py::object deviceOpenAsyncHelper(const dai::Pipeline& pipeline, tl::optional<dai::DeviceInfo> deviceInfo, bool usb2Mode){
+    auto cancelled = std::make_shared<std::atomic<bool>>(false);
+    auto ctx = asyncCallCreate(cancelled);
+    py::object future = ctx->future;
+
+    getDeviceWorker().submit([ctx, cancelled, pipeline, deviceInfo, usb2Mode](){
+        std::unique_ptr<dai::Device> device;
+        std::string error;
+        try {
+            device = openDevice(pipeline, deviceInfo ? &(*deviceInfo) : nullptr, usb2Mode, *cancelled);
+        } catch(const DeviceOpenCancelled&) {
+            // Awaiting side already received CancelledError
+        } catch(const std::exception& ex) {
+            error = ex.what();
+            if(error.empty()) error = "Couldn't open device";
+        }
+
+        // Close without holding GIL, if cancelled while booting
+        if(device && *cancelled){
+            device->close();
+            device = nullptr;
+        }
+
+        py::gil_scoped_acquire acquire;
+        py::object result = py::none();
+        if(device) result = py::cast(std::move(device));
+        asyncCallFinish(ctx, result, error);
+    });
+
+    return future;
+}
+
+// Closes a device on the device worker, returns an asyncio future resolving to None
+static py::object deviceCloseAsyncHelper(py::object self){
+    auto cancelled = std::make_shared<std::atomic<bool>>(false);
+    auto ctx = asyncCallCreate(cancelled);
+    // Keeps the device object alive until close finishes
+    ctx->self = self;
+    auto device = self.cast<dai::Device*>();
+    py::object future = ctx->future;
+
+    getDeviceWorker().submit([ctx, device](){
+        std::string error;
+        try {
+            device->close();
+        } catch(const std::exception& ex) {
+            error = ex.what();
+            if(error.empty()) error = "Couldn't close device";
+        }
+
+        py::gil_scoped_acquire acquire;
+        asyncCallFinish(ctx, py::none(), error);
+    });
+
+    return future;
+}
+
 std::vector<std::string> deviceGetQueueEventsHelper(dai::Device& d, const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout){
     using namespace std::chrono;
 
@@ -112,11 +222,36 @@ std::vector<std::string> deviceGetQueueEventsHelper(dai::Device& d, const std::v
 }
 
 
+// Trampoline class, so DeviceTransport can be implemented in python (eg. simulated transports)
+class PyDeviceTransport : public DeviceTransport {
+   public:
+    using DeviceTransport::DeviceTransport;
+
+    std::string connect(const dai::Pipeline& pipeline, const std::string& mxId, MessageCallback callback) override {
+        PYBIND11_OVERRIDE_PURE(std::string, DeviceTransport, connect, pipeline, mxId, callback);
+    }
+    void disconnect() override {
+        PYBIND11_OVERRIDE_PURE(void, DeviceTransport, disconnect, );
+    }
+    bool isConnected() override {
+        PYBIND11_OVERRIDE_PURE(bool, DeviceTransport, isConnected, );
+    }
+    bool send(const std::string& streamName, std::shared_ptr<dai::ADatatype> msg, std::chrono::milliseconds timeout) override {
+        PYBIND11_OVERRIDE_PURE(bool, DeviceTransport, send, streamName, msg, timeout);
+    }
+};
+
 void DeviceBindings::bind(pybind11::module& m){
 
     using namespace dai;
 
 
+    // Asynchronous opens and closes acquire the GIL when finishing, so their workers are joined before interpreter shutdown
+    py::module::import("atexit").attr("register")(py::cpp_function([](){
+        py::gil_scoped_release release;
+        shutdownDeviceWorker();
+    }));
+
     // Bind Device, using DeviceWrapper to be able to destruct the object by calling close()
     py::class_<Device>(m, "Device", DOC(dai, Device))
         // Python only methods
@@ -124,6 +259,10 @@ void DeviceBindings::bind(pybind11::module& m){
         .def("__exit__", [](Device& d, py::object type, py::object value, py::object traceback) { d.close(); })
         .def("close", &Device::close, "Closes the connection to device. Better alternative is the usage of context manager: `with depthai.Device(pipeline) as device:`")
         .def("isClosed", &Device::isClosed, "Check if the device is still connected`")
+        .def_static("openAsync", &deviceOpenAsyncHelper, py::arg("pipeline"), py::arg("deviceInfo") = py::none(), py::arg("usb2Mode") = false,
+            "Searches for a device (or uses the one specified by deviceInfo) and starts the pipeline on an internal worker thread. "
+            "Returns an awaitable resolving to the opened Device. Cancelling it aborts the search, a device which is already booting gets closed")
+        .def("closeAsync", &deviceCloseAsyncHelper, "Closes the connection to device on an internal worker thread. Returns an awaitable which resolves when device is closed")
 
         //dai::Device methods
         //static
@@ -148,10 +287,12 @@ void DeviceBindings::bind(pybind11::module& m){
         }), py::arg("pipeline"), py::arg("pathToCmd"), DOC(dai, Device, Device, 3))
         .def(py::init([](const Pipeline& pipeline, const DeviceInfo& deviceInfo, bool usb2Mode){
             // Non blocking constructor
+            validatePipelineOpenVINOVersion(pipeline);
             return std::unique_ptr<Device>(new Device(pipeline, deviceInfo, usb2Mode));
         }), py::arg("pipeline"), py::arg("deviceDesc"), py::arg("usb2Mode") = false, DOC(dai, Device, Device, 4))
         .def(py::init([](const Pipeline& pipeline, const DeviceInfo& deviceInfo, std::string pathToCmd){
             // Non blocking constructor
+            validatePipelineOpenVINOVersion(pipeline);
             return std::unique_ptr<Device>(new Device(pipeline, deviceInfo, pathToCmd));
         }), py::arg("pipeline"), py::arg("deviceDesc"), py::arg("pathToCmd"), DOC(dai, Device, Device, 5))
 
@@ -241,10 +382,169 @@ void DeviceBindings::bind(pybind11::module& m){
         .def("getLeonCssCpuUsage", &Device::getLeonCssCpuUsage, DOC(dai, Device, getLeonCssCpuUsage))
         .def("getLeonMssCpuUsage", &Device::getLeonMssCpuUsage, DOC(dai, Device, getLeonMssCpuUsage))
         .def("getUsbSpeed", &Device::getUsbSpeed, DOC(dai, Device, getUsbSpeed))
+        .def("getSystemSnapshot", [](Device& d) {
+            py::gil_scoped_release release;
+            return getSystemSnapshot(d);
+        }, "Retrieves memory usage, cpu usage and chip temperatures in one call, without holding GIL in between. Returns SystemInformation")
+        .def("getSystemSnapshot", [](Device& d, const SystemInformationBuffer& buffer) {
+            py::gil_scoped_release release;
+            auto latest = buffer.getLatest();
+            if(latest) return latest;
+            return getSystemSnapshot(d);
+        }, py::arg("buffer"), "Returns latest SystemInformation recorded by the buffer (eg. from SystemLogger), or retrieves it from device if buffer is empty")
         .def("setLogOutputLevel", &Device::setLogOutputLevel, py::arg("level"), DOC(dai, Device, setLogOutputLevel))
         .def("getLogOutputLevel", &Device::getLogOutputLevel, DOC(dai, Device, getLogOutputLevel))
         .def("addLogCallback", &Device::addLogCallback, py::arg("callback"), DOC(dai, Device, addLogCallback))
         .def("removeLogCallback", &Device::removeLogCallback, py::arg("callbackId"), DOC(dai, Device, removeLogCallback))
         ;
 
+    // Bind SystemInformationBuffer
+    py::class_<SystemInformationBuffer, std::shared_ptr<SystemInformationBuffer>>(m, "SystemInformationBuffer", "Ring buffer of SystemInformation samples, stored natively and exported as numpy time series")
+        .def(py::init<std::size_t>(), py::arg("capacity") = SystemInformationBuffer::DEFAULT_CAPACITY)
+        .def_static("getFieldNames", [](){
+            const auto& names = SystemInformationBuffer::getFieldNames();
+            return std::vector<std::string>(names.begin(), names.end());
+        }, "Names of stored values. 'timestamp' is host steady clock time in seconds at which sample was added")
+        .def("attach", py::overload_cast<DataOutputQueue&>(&SystemInformationBuffer::attach), py::arg("queue"), "Records all SystemInformation messages arriving to the queue (eg. SystemLogger output). Returns callback id")
+        .def("attach", py::overload_cast<MessageQueue&>(&SystemInformationBuffer::attach), py::arg("queue"), "Records all SystemInformation messages arriving to the queue (eg. SystemLogger output). Returns callback id")
+        .def("add", static_cast<void(SystemInformationBuffer::*)(const SystemInformation&)>(&SystemInformationBuffer::add), py::arg("info"), "Adds a sample, overwriting the oldest one if buffer is full")
+        .def("getLatest", &SystemInformationBuffer::getLatest, "Returns latest sample or None")
+        .def("getSeries", [](const SystemInformationBuffer& b, const std::string& field){
+            std::vector<double> series;
+            {
+                py::gil_scoped_release release;
+                series = b.getSeries(field);
+            }
+            return py::array_t<double>(series.size(), series.data());
+        }, py::arg("field"), "Returns values of a single field, in chronological order, as numpy array")
+        .def("getTimestamps", [](const SystemInformationBuffer& b){
+            std::vector<double> series;
+            {
+                py::gil_scoped_release release;
+                series = b.getSeries("timestamp");
+            }
+            return py::array_t<double>(series.size(), series.data());
+        }, "Returns sample timestamps in seconds, in chronological order, as numpy array")
+        .def("toNumpy", [](const SystemInformationBuffer& b){
+            std::vector<std::vector<double>> columns;
+            {
+                py::gil_scoped_release release;
+                columns = b.getColumns();
+            }
+            py::dict series;
+            const auto& names = SystemInformationBuffer::getFieldNames();
+            for(std::size_t i = 0; i < columns.size(); i++){
+                series[py::str(names[i])] = py::array_t<double>(columns[i].size(), columns[i].data());
+            }
+            return series;
+        }, "Returns all fields as dict of numpy arrays, in chronological order")
+        .def("getSize", &SystemInformationBuffer::getSize, "Returns number of samples stored")
+        .def("__len__", &SystemInformationBuffer::getSize)
+        .def("getCapacity", &SystemInformationBuffer::getCapacity, "Returns maximum number of samples stored")
+        .def("getNumAdded", &SystemInformationBuffer::getNumAdded, "Returns number of samples added since creation")
+        .def("clear", &SystemInformationBuffer::clear, "Removes all samples")
+        ;
+
+    // Bind MetricsExporter
+    py::class_<MetricsExporter> metricsExporter(m, "MetricsExporter", "Exports device system information and queue statistics in OpenMetrics / Prometheus text format, over HTTP or to a textfile");
+    py::enum_<MetricsExporter::Format>(metricsExporter, "Format")
+        .value("OPENMETRICS", MetricsExporter::Format::OPENMETRICS)
+        .value("PROMETHEUS", MetricsExporter::Format::PROMETHEUS)
+        ;
+    metricsExporter
+        .def(py::init<>())
+        .def("__enter__", [](py::object obj){ return obj; })
+        .def("__exit__", [](MetricsExporter& e, py::object type, py::object value, py::object traceback) {
+            py::gil_scoped_release release;
+            e.stop();
+        })
+        .def("addDevice", py::overload_cast<Device&>(&MetricsExporter::addDevice), py::arg("device"), py::keep_alive<1, 2>(), py::call_guard<py::gil_scoped_release>(),
+            "Adds a device, its system information is retrieved at every collection interval")
+        .def("addDevice", py::overload_cast<Device&, std::shared_ptr<SystemInformationBuffer>>(&MetricsExporter::addDevice), py::arg("device"), py::arg("buffer"), py::keep_alive<1, 2>(), py::call_guard<py::gil_scoped_release>(),
+            "Adds a device, using latest system information recorded by the buffer (eg. from SystemLogger) instead of retrieving it from device")
+        .def("removeDevice", &MetricsExporter::removeDevice, py::arg("device"), py::call_guard<py::gil_scoped_release>(), "Removes a device")
+        .def("addQueue", py::overload_cast<DataOutputQueue&, const std::string&>(&MetricsExporter::addQueue), py::arg("queue"), py::arg("mxId") = "",
+            "Adds a queue, tracking received messages and latency (for messages carrying a timestamp)")
+        .def("addQueue", py::overload_cast<std::shared_ptr<MessageQueue>, const std::string&>(&MetricsExporter::addQueue), py::arg("queue"), py::arg("mxId") = "",
+            "Adds a host side queue, additionally tracking queue depth and dropped messages")
+        .def("setCollectionInterval", &MetricsExporter::setCollectionInterval, py::arg("interval"), "Sets interval of device metrics collection and textfile updates")
+        .def("startHttpServer", &MetricsExporter::startHttpServer, py::arg("port") = 9000, py::arg("host") = "127.0.0.1",
+            "Starts serving metrics on '/metrics' (0 picks a free port). Returns port the server is listening on")
+        .def("getHttpPort", &MetricsExporter::getHttpPort, "Returns port HTTP server is listening on, or -1 if not running")
+        .def("startTextfile", &MetricsExporter::startTextfile, py::arg("path"), "Periodically writes metrics in Prometheus text format to the file, replacing it atomically")
+        .def("collect", &MetricsExporter::collect, py::call_guard<py::gil_scoped_release>(), "Collects device metrics immediately")
+        .def("render", &MetricsExporter::render, py::arg("format") = MetricsExporter::Format::OPENMETRICS, py::call_guard<py::gil_scoped_release>(), "Renders current metrics")
+        .def("stop", &MetricsExporter::stop, py::call_guard<py::gil_scoped_release>(), "Stops HTTP server, textfile updates and background collection")
+        ;
+
+    // Bind DeviceTransport
+    py::class_<DeviceTransport, PyDeviceTransport, std::shared_ptr<DeviceTransport>>(m, "DeviceTransport", "Connection to a single device, as seen by ReconnectingDevice. Can be subclassed to simulate a device")
+        .def(py::init<>())
+        .def("connect", &DeviceTransport::connect, py::arg("pipeline"), py::arg("mxId"), py::arg("callback"), "Discovers the device, boots it and starts the pipeline. Callback is called with (streamName, message) for all output streams. Returns MxId of connected device")
+        .def("disconnect", &DeviceTransport::disconnect, "Closes the connection (if any)")
+        .def("isConnected", &DeviceTransport::isConnected, "Check if connection to the device is alive")
+        .def("send", &DeviceTransport::send, py::arg("streamName"), py::arg("msg"), py::arg("timeout"), "Sends a message to an input stream. Returns True if sent, False on timeout")
+        ;
+
+    py::class_<XLinkDeviceTransport, DeviceTransport, std::shared_ptr<XLinkDeviceTransport>>(m, "XLinkDeviceTransport", "DeviceTransport over XLink, backed by Device")
+        .def(py::init<bool, std::chrono::milliseconds>(), py::arg("usb2Mode") = false, py::arg("searchTime") = std::chrono::milliseconds(XLinkDeviceTransport::DEFAULT_SEARCH_TIME))
+        ;
+
+    // Bind ReconnectEvent
+    py::class_<ReconnectEvent> reconnectEvent(m, "ReconnectEvent", "Describes a change of connection state of a ReconnectingDevice");
+    py::enum_<ReconnectEvent::Type>(reconnectEvent, "Type")
+        .value("DISCONNECTED", ReconnectEvent::Type::DISCONNECTED)
+        .value("RECONNECTED", ReconnectEvent::Type::RECONNECTED)
+        ;
+    reconnectEvent
+        .def(py::init<>())
+        .def_readwrite("type", &ReconnectEvent::type)
+        .def_readwrite("mxId", &ReconnectEvent::mxId)
+        .def_readwrite("outageDuration", &ReconnectEvent::outageDuration)
+        .def_readwrite("attempts", &ReconnectEvent::attempts)
+        .def_readwrite("lastError", &ReconnectEvent::lastError)
+        ;
+
+    // Bind ReconnectingDevice
+    py::class_<ReconnectingDevice, std::shared_ptr<ReconnectingDevice>>(m, "ReconnectingDevice", "Device which survives disconnects. Rediscovers the same device by MxId, uploads the pipeline again and keeps queue handles valid across reconnects")
+        // Python only methods
+        .def("__enter__", [](py::object obj){ return obj; })
+        .def("__exit__", [](ReconnectingDevice& d, py::object type, py::object value, py::object traceback) {
+            py::gil_scoped_release release;
+            d.close();
+        })
+
+        .def(py::init([](const Pipeline& pipeline, const std::string& mxId, std::shared_ptr<DeviceTransport> transport){
+            ReconnectingDevice* device;
+            {
+                py::gil_scoped_release release;
+                device = new ReconnectingDevice(pipeline, mxId, transport);
+            }
+            // Destruction joins the supervisor and input threads, which may be blocked in a callback needing the GIL
+            return std::shared_ptr<ReconnectingDevice>(device, [](ReconnectingDevice* d) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete d;
+                } else {
+                    delete d;
+                }
+            });
+        }), py::arg("pipeline"), py::arg("mxId") = "", py::arg("transport") = nullptr,
+            py::keep_alive<1, 4>(), "Connects to a device (first available if mxId is empty) and starts the pipeline")
+        .def("getOutputQueue", &ReconnectingDevice::getOutputQueue, py::arg("name"), py::arg("maxSize") = 16, py::arg("blocking") = true, "Gets a stable output queue, which stays valid across reconnects")
+        .def("getInputQueue", &ReconnectingDevice::getInputQueue, py::arg("name"), py::arg("maxSize") = 16, py::arg("blocking") = true, "Gets a stable input queue. Messages sent while disconnected are buffered and delivered after reconnect")
+        .def("addReconnectCallback", &ReconnectingDevice::addReconnectCallback, py::arg("callback"), "Adds a callback which gets called with ReconnectEvent on every disconnect and reconnect. Returns callback id")
+        .def("removeReconnectCallback", &ReconnectingDevice::removeReconnectCallback, py::arg("callbackId"), "Removes a reconnect callback")
+        .def("getMxId", &ReconnectingDevice::getMxId, "Get MxId of the device")
+        .def("isConnected", &ReconnectingDevice::isConnected, "Check if device is currently connected")
+        .def("getReconnectCount", &ReconnectingDevice::getReconnectCount, "Get number of successful reconnects")
+        .def("getLastOutageDuration", &ReconnectingDevice::getLastOutageDuration, "Get duration of the last outage")
+        .def("getTransport", &ReconnectingDevice::getTransport, "Get transport used by this device")
+        .def("getLastCallbackError", &ReconnectingDevice::getLastCallbackError, "Get message of the last exception raised by a reconnect callback, empty if there wasn't any")
+        .def("setPollInterval", &ReconnectingDevice::setPollInterval, py::arg("interval"), "Sets how often connection is checked")
+        .def("setRetryInterval", &ReconnectingDevice::setRetryInterval, py::arg("interval"), "Sets delay between reconnect attempts")
+        .def("close", &ReconnectingDevice::close, py::call_guard<py::gil_scoped_release>(), "Stops reconnecting, closes the device and all queues")
+        .def("isClosed", &ReconnectingDevice::isClosed, "Check if device was closed")
+        ;
+
 }
\ No newline at end of file
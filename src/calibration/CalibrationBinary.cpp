@@ -0,0 +1,240 @@
+#include "CalibrationBinary.hpp"
+
+// std
+#include <algorithm>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+
+// project
+#include "utility/Hash.hpp"
+
+namespace {
+
+constexpr char MAGIC[4] = {'D', 'A', 'I', 'B'};
+// Incremented whenever the layout changes, other versions are rejected
+constexpr std::uint32_t FORMAT_VERSION = 1;
+
+struct BinaryHeader {
+    char magic[sizeof(MAGIC)];
+    std::uint32_t version;
+    std::uint64_t size;
+    std::uint64_t hash;
+};
+
+class Writer {
+   public:
+    std::vector<std::uint8_t> data;
+
+    template <typename T>
+    void write(T value) {
+        auto position = data.size();
+        data.resize(position + sizeof(T));
+        std::memcpy(data.data() + position, &value, sizeof(T));
+    }
+
+    void write(const std::string& text) {
+        write(static_cast<std::uint32_t>(text.size()));
+        data.insert(data.end(), text.begin(), text.end());
+    }
+
+    void write(const std::vector<std::uint8_t>& bytes) {
+        write(static_cast<std::uint32_t>(bytes.size()));
+        data.insert(data.end(), bytes.begin(), bytes.end());
+    }
+
+    void write(const std::vector<float>& vector) {
+        write(static_cast<std::uint32_t>(vector.size()));
+        for(float value : vector) write(value);
+    }
+
+    // Rows and columns, followed by values in row major order
+    void write(const std::vector<std::vector<float>>& matrix) {
+        auto columns = matrix.empty() ? 0 : matrix[0].size();
+        write(static_cast<std::uint32_t>(matrix.size()));
+        write(static_cast<std::uint32_t>(columns));
+        for(const auto& row : matrix) {
+            if(row.size() != columns) throw std::invalid_argument("Calibration matrix rows differ in length");
+            for(float value : row) write(value);
+        }
+    }
+
+    void write(const dai::Point3f& point) {
+        write(point.x);
+        write(point.y);
+        write(point.z);
+    }
+
+    void write(const dai::Extrinsics& extrinsics) {
+        write(extrinsics.rotationMatrix);
+        write(extrinsics.translation);
+        write(extrinsics.specTranslation);
+        write(extrinsics.toCameraSocket);
+    }
+};
+
+class Reader {
+   public:
+    Reader(const std::uint8_t* data, std::size_t size) : position(data), end(data + size) {}
+
+    template <typename T>
+    T read() {
+        T value;
+        std::memcpy(&value, take(sizeof(T)), sizeof(T));
+        return value;
+    }
+
+    std::string readString() {
+        auto size = read<std::uint32_t>();
+        const auto* data = take(size);
+        return std::string(reinterpret_cast<const char*>(data), size);
+    }
+
+    std::vector<std::uint8_t> readBytes() {
+        auto size = read<std::uint32_t>();
+        const auto* data = take(size);
+        return std::vector<std::uint8_t>(data, data + size);
+    }
+
+    std::vector<float> readVector() {
+        auto size = read<std::uint32_t>();
+        const auto* values = take(static_cast<std::size_t>(size) * sizeof(float));
+        std::vector<float> vector(size);
+        if(size > 0) std::memcpy(vector.data(), values, vector.size() * sizeof(float));
+        return vector;
+    }
+
+    std::vector<std::vector<float>> readMatrix() {
+        auto rows = read<std::uint32_t>();
+        auto columns = read<std::uint32_t>();
+        // Checked before allocating, so damaged sizes can't request huge allocations
+        if(rows > static_cast<std::size_t>(end - position)) throw std::runtime_error("Calibration binary is truncated");
+        const auto* values = take(static_cast<std::size_t>(rows) * columns * sizeof(float));
+        std::vector<std::vector<float>> matrix(rows, std::vector<float>(columns));
+        for(auto& row : matrix) {
+            if(columns == 0) continue;
+            std::memcpy(row.data(), values, columns * sizeof(float));
+            values += columns * sizeof(float);
+        }
+        return matrix;
+    }
+
+    dai::Point3f readPoint() {
+        dai::Point3f point;
+        point.x = read<float>();
+        point.y = read<float>();
+        point.z = read<float>();
+        return point;
+    }
+
+    dai::Extrinsics readExtrinsics() {
+        dai::Extrinsics extrinsics;
+        extrinsics.rotationMatrix = readMatrix();
+        extrinsics.translation = readPoint();
+        extrinsics.specTranslation = readPoint();
+        extrinsics.toCameraSocket = read<dai::CameraBoardSocket>();
+        return extrinsics;
+    }
+
+    bool atEnd() const {
+        return position == end;
+    }
+
+   private:
+    const std::uint8_t* position;
+    const std::uint8_t* end;
+
+    const std::uint8_t* take(std::size_t size) {
+        if(size > static_cast<std::size_t>(end - position)) throw std::runtime_error("Calibration binary is truncated");
+        const auto* data = position;
+        position += size;
+        return data;
+    }
+};
+
+}  // namespace
+
+std::vector<std::uint8_t> calibrationToBinary(const dai::EepromData& eepromData) {
+    Writer writer;
+    writer.data.resize(sizeof(BinaryHeader));
+    writer.write(eepromData.version);
+    writer.write(eepromData.boardName);
+    writer.write(eepromData.boardRev);
+
+    std::vector<dai::CameraBoardSocket> sockets;
+    for(const auto& camera : eepromData.cameraData) sockets.push_back(camera.first);
+    std::sort(sockets.begin(), sockets.end());
+    writer.write(static_cast<std::uint32_t>(sockets.size()));
+    for(auto socket : sockets) {
+        const auto& camera = eepromData.cameraData.at(socket);
+        writer.write(socket);
+        writer.write(camera.cameraType);
+        writer.write(camera.width);
+        writer.write(camera.height);
+        writer.write(camera.lensPosition);
+        writer.write(camera.specHfovDeg);
+        writer.write(camera.intrinsicMatrix);
+        writer.write(camera.distortionCoeff);
+        writer.write(camera.extrinsics);
+    }
+
+    const auto& stereo = eepromData.stereoRectificationData;
+    writer.write(stereo.rectifiedRotationLeft);
+    writer.write(stereo.rectifiedRotationRight);
+    writer.write(stereo.leftCameraSocket);
+    writer.write(stereo.rightCameraSocket);
+    writer.write(eepromData.imuExtrinsics);
+    writer.write(eepromData.miscellaneousData);
+
+    BinaryHeader header{};
+    std::memcpy(header.magic, MAGIC, sizeof(MAGIC));
+    header.version = FORMAT_VERSION;
+    header.size = writer.data.size() - sizeof(header);
+    header.hash = hash64(writer.data.data() + sizeof(header), static_cast<std::size_t>(header.size));
+    std::memcpy(writer.data.data(), &header, sizeof(header));
+    return std::move(writer.data);
+}
+
+dai::EepromData calibrationFromBinary(const std::uint8_t* data, std::size_t size) {
+    BinaryHeader header{};
+    if(size < sizeof(header)) throw std::runtime_error("Calibration binary is truncated");
+    std::memcpy(&header, data, sizeof(header));
+    if(std::memcmp(header.magic, MAGIC, sizeof(MAGIC)) != 0) throw std::runtime_error("Data isn't a calibration binary");
+    if(header.version != FORMAT_VERSION) {
+        throw std::runtime_error("Calibration binary format version " + std::to_string(header.version) + " isn't supported, expected "
+                                 + std::to_string(FORMAT_VERSION));
+    }
+    if(header.size != size - sizeof(header)) throw std::runtime_error("Calibration binary is truncated");
+    if(header.hash != hash64(data + sizeof(header), size - sizeof(header))) throw std::runtime_error("Calibration binary is corrupted");
+
+    Reader reader(data + sizeof(header), size - sizeof(header));
+    dai::EepromData eepromData;
+    eepromData.version = reader.read<std::uint32_t>();
+    eepromData.boardName = reader.readString();
+    eepromData.boardRev = reader.readString();
+
+    auto numCameras = reader.read<std::uint32_t>();
+    for(std::uint32_t i = 0; i < numCameras; i++) {
+        auto socket = reader.read<dai::CameraBoardSocket>();
+        dai::CameraInfo camera;
+        camera.cameraType = reader.read<dai::CameraModel>();
+        camera.width = reader.read<std::uint16_t>();
+        camera.height = reader.read<std::uint16_t>();
+        camera.lensPosition = reader.read<std::uint8_t>();
+        camera.specHfovDeg = reader.read<float>();
+        camera.intrinsicMatrix = reader.readMatrix();
+        camera.distortionCoeff = reader.readVector();
+        camera.extrinsics = reader.readExtrinsics();
+        eepromData.cameraData[socket] = std::move(camera);
+    }
+
+    auto& stereo = eepromData.stereoRectificationData;
+    stereo.rectifiedRotationLeft = reader.readMatrix();
+    stereo.rectifiedRotationRight = reader.readMatrix();
+    stereo.leftCameraSocket = reader.read<dai::CameraBoardSocket>();
+    stereo.rightCameraSocket = reader.read<dai::CameraBoardSocket>();
+    eepromData.imuExtrinsics = reader.readExtrinsics();
+    eepromData.miscellaneousData = reader.readBytes();
+    if(!reader.atEnd()) throw std::runtime_error("Calibration binary is corrupted");
+    return eepromData;
+}
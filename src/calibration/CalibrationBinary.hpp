@@ -0,0 +1,23 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+/**
+ * Serializes calibration data into a compact binary format, a faster alternative to JSON.
+ *
+ * The format starts with a header (magic 'DAIB', format version, size and hash of the contents) followed by the EEPROM
+ * data fields in declaration order, in native byte order. Cameras are sorted by socket, so equal calibrations serialize equally
+ */
+std::vector<std::uint8_t> calibrationToBinary(const dai::EepromData& eepromData);
+
+/**
+ * Deserializes calibration data serialized by calibrationToBinary.
+ * Throws if the data isn't in the binary format, is of another format version, is truncated or corrupted
+ */
+dai::EepromData calibrationFromBinary(const std::uint8_t* data, std::size_t size);
@@ -0,0 +1,267 @@
+#include "CalibrationBindings.hpp"
+
+// std
+#include <algorithm>
+#include <initializer_list>
+#include <stdexcept>
+#include <vector>
+
+// project
+#include "CalibrationStore.hpp"
+#include "DepthAligner.hpp"
+#include "PointCloudProjector.hpp"
+#include "Rectification.hpp"
+#include "StereoMesh.hpp"
+
+namespace {
+
+// Read only view of a table, keeps its owner alive
+template <typename T>
+py::array_t<T> tableView(py::object& obj, const std::vector<T>& table, std::initializer_list<std::size_t> shape) {
+    py::array_t<T> array(std::vector<py::ssize_t>(shape.begin(), shape.end()), table.data(), obj);
+    array.attr("setflags")(py::arg("write") = false);
+    return array;
+}
+
+// Read only view of a mesh as (y, x) points, keeps the mesh alive
+py::array_t<float> meshView(py::object& obj, const std::vector<std::uint8_t>& data) {
+    const auto& mesh = obj.cast<const StereoMesh&>();
+    std::vector<py::ssize_t> shape = {static_cast<py::ssize_t>(mesh.numRows), static_cast<py::ssize_t>(mesh.numColumns), 2};
+    py::array_t<float> array(shape, reinterpret_cast<const float*>(data.data()), obj);
+    array.attr("setflags")(py::arg("write") = false);
+    return array;
+}
+
+template <typename T>
+bool isPacked(const py::array& frame) {
+    // Rows may be strided (eg. crops), pixels must be packed
+    return frame.strides(1) == static_cast<py::ssize_t>(sizeof(T) * (frame.ndim() == 3 ? frame.shape(2) : 1))
+           && (frame.ndim() == 2 || frame.strides(2) == static_cast<py::ssize_t>(sizeof(T)));
+}
+
+template <typename T>
+py::array remapFrame(py::array frame, const RectificationMaps& maps, py::object out) {
+    if(!isPacked<T>(frame)) frame = py::array_t<T, py::array::c_style>::ensure(frame);
+    unsigned int channels = frame.ndim() == 3 ? static_cast<unsigned int>(frame.shape(2)) : 1;
+    std::vector<py::ssize_t> shape = {static_cast<py::ssize_t>(maps.height), static_cast<py::ssize_t>(maps.width)};
+    if(frame.ndim() == 3) shape.push_back(channels);
+
+    py::array_t<T, py::array::c_style> result;
+    if(out.is_none()) {
+        result = py::array_t<T, py::array::c_style>(shape);
+    } else {
+        if(!py::isinstance<py::array_t<T, py::array::c_style>>(out)) throw std::invalid_argument("Output must be a C contiguous array of the frame's type");
+        result = out.cast<py::array_t<T, py::array::c_style>>();
+        if(result.ndim() != static_cast<py::ssize_t>(shape.size()) || !std::equal(shape.begin(), shape.end(), result.shape())) {
+            throw std::invalid_argument("Output must have maps' size and frame's channels");
+        }
+        if(!result.writeable()) throw std::invalid_argument("Output must be writeable");
+    }
+
+    const auto* src = static_cast<const std::uint8_t*>(frame.data());
+    auto* dst = reinterpret_cast<std::uint8_t*>(result.mutable_data());
+    auto width = static_cast<unsigned int>(frame.shape(1));
+    auto height = static_cast<unsigned int>(frame.shape(0));
+    auto srcStride = static_cast<std::size_t>(frame.strides(0));
+    auto dstStride = static_cast<std::size_t>(result.strides(0));
+    {
+        py::gil_scoped_release release;
+        remap(src, width, height, srcStride, channels, sizeof(T), maps, dst, dstStride);
+    }
+    return std::move(result);
+}
+
+// Depth frame of given size with packed pixels, rows may be strided
+py::array_t<std::uint16_t> toDepth(py::array frame, unsigned int width, unsigned int height) {
+    if(!py::isinstance<py::array_t<std::uint16_t>>(frame)) throw std::invalid_argument("Depth must be a uint16 array");
+    auto depth = frame.cast<py::array_t<std::uint16_t>>();
+    if(depth.ndim() != 2 || depth.shape(0) != height || depth.shape(1) != width) throw std::invalid_argument("Depth must have shape (height, width) of the configured size");
+    if(depth.strides(1) != sizeof(std::uint16_t)) depth = py::array_t<std::uint16_t, py::array::c_style>::ensure(depth);
+    return depth;
+}
+
+py::array projectDepth(const PointCloudProjector& projector, py::array frame, bool organized, unsigned int decimation, py::object out) {
+    auto depth = toDepth(frame, projector.getWidth(), projector.getHeight());
+    py::ssize_t numPixels = static_cast<py::ssize_t>(projector.getOutputWidth(decimation)) * projector.getOutputHeight(decimation);
+    std::vector<py::ssize_t> shape = {numPixels, 3};
+    if(organized) shape = {static_cast<py::ssize_t>(projector.getOutputHeight(decimation)), static_cast<py::ssize_t>(projector.getOutputWidth(decimation)), 3};
+
+    py::array_t<float, py::array::c_style> result;
+    if(out.is_none()) {
+        result = py::array_t<float, py::array::c_style>(shape);
+    } else {
+        if(!py::isinstance<py::array_t<float, py::array::c_style>>(out)) throw std::invalid_argument("Output must be a C contiguous float32 array");
+        result = out.cast<py::array_t<float, py::array::c_style>>();
+        bool matches = organized ? result.ndim() == 3 && std::equal(shape.begin(), shape.end(), result.shape())
+                                 : result.ndim() == 2 && result.shape(0) >= numPixels && result.shape(1) == 3;
+        if(!matches) throw std::invalid_argument(organized ? "Output must have shape (height, width, 3) of decimated depth" : "Output must have shape (N, 3), N at least number of decimated pixels");
+        if(!result.writeable()) throw std::invalid_argument("Output must be writeable");
+    }
+
+    std::size_t numPoints = 0;
+    {
+        py::gil_scoped_release release;
+        numPoints = projector.project(depth.data(), static_cast<std::size_t>(depth.strides(0)), result.mutable_data(), organized, decimation);
+    }
+    if(organized) return std::move(result);
+    return result[py::slice(0, static_cast<py::ssize_t>(numPoints), 1)];
+}
+
+py::array alignDepth(const DepthAligner& aligner, py::array frame, py::object out) {
+    auto depth = toDepth(frame, aligner.getDepthWidth(), aligner.getDepthHeight());
+    std::vector<py::ssize_t> shape = {static_cast<py::ssize_t>(aligner.getTargetHeight()), static_cast<py::ssize_t>(aligner.getTargetWidth())};
+    py::array_t<std::uint16_t> result;
+    if(out.is_none()) {
+        result = py::array_t<std::uint16_t>(shape);
+    } else {
+        if(!py::isinstance<py::array_t<std::uint16_t>>(out)) throw std::invalid_argument("Output must be a uint16 array");
+        result = out.cast<py::array_t<std::uint16_t>>();
+        if(result.ndim() != 2 || !std::equal(shape.begin(), shape.end(), result.shape()) || result.strides(1) != sizeof(std::uint16_t)) {
+            throw std::invalid_argument("Output must have shape (height, width) of target size, with packed rows");
+        }
+        if(!result.writeable()) throw std::invalid_argument("Output must be writeable");
+    }
+    {
+        py::gil_scoped_release release;
+        aligner.align(depth.data(), static_cast<std::size_t>(depth.strides(0)), result.mutable_data(), static_cast<std::size_t>(result.strides(0)));
+    }
+    return std::move(result);
+}
+
+}  // namespace
+
+void CalibrationBindings::bind(pybind11::module& m) {
+    py::class_<RectificationMaps, std::shared_ptr<RectificationMaps>>(
+        m, "RectificationMaps", "Fixed point remap tables of a rectified camera, same as OpenCV's CV_16SC2 and CV_16UC1 maps (usable with cv2.remap)")
+        .def_readonly("width", &RectificationMaps::width, "Width of rectified image")
+        .def_readonly("height", &RectificationMaps::height, "Height of rectified image")
+        .def_property_readonly(
+            "cameraMatrix",
+            [](const RectificationMaps& maps) {
+                py::array_t<float> array({3, 3});
+                std::copy(maps.cameraMatrix.begin(), maps.cameraMatrix.end(), array.mutable_data());
+                return array;
+            },
+            "Intrinsics of rectified image, as a 3x3 numpy array")
+        .def_property_readonly(
+            "coordinates",
+            [](py::object obj) {
+                const auto& maps = obj.cast<const RectificationMaps&>();
+                return tableView(obj, maps.coordinates, {maps.height, maps.width, 2});
+            },
+            "Integer part of source coordinates (x, y), as a read only int16 array of shape (height, width, 2)")
+        .def_property_readonly(
+            "fractions",
+            [](py::object obj) {
+                const auto& maps = obj.cast<const RectificationMaps&>();
+                return tableView(obj, maps.fractions, {maps.height, maps.width});
+            },
+            "Fractional part of source coordinates in 1/32 pixels (y * 32 + x), as a read only uint16 array of shape (height, width)");
+
+    m.def(
+        "remap",
+        [](py::array frame, const RectificationMaps& maps, py::object out) {
+            if(frame.ndim() != 2 && frame.ndim() != 3) throw std::invalid_argument("Frame must have shape (height, width) or (height, width, channels)");
+            if(frame.ndim() == 3 && frame.shape(2) == 0) throw std::invalid_argument("Frame must have at least one channel");
+            if(py::isinstance<py::array_t<std::uint8_t>>(frame)) return remapFrame<std::uint8_t>(frame, maps, out);
+            if(py::isinstance<py::array_t<std::uint16_t>>(frame)) return remapFrame<std::uint16_t>(frame, maps, out);
+            throw std::invalid_argument("Only uint8 and uint16 frames can be remapped");
+        },
+        py::arg("frame"),
+        py::arg("maps"),
+        py::arg("out") = py::none(),
+        "Remaps a uint8 or uint16 frame with bilinear interpolation, pixels outside of the frame are black. "
+        "Writes to 'out' if given, otherwise returns a new array. Releases the GIL while remapping");
+
+    py::class_<StereoMesh, std::shared_ptr<StereoMesh>>(
+        m, "StereoMesh", "Warp meshes rectifying the stereo pair, in the format of StereoDepth.loadMeshData")
+        .def_readonly("width", &StereoMesh::width, "Width of input frames")
+        .def_readonly("height", &StereoMesh::height, "Height of input frames")
+        .def_readonly("stepWidth", &StereoMesh::stepWidth, "Horizontal distance between mesh points")
+        .def_readonly("stepHeight", &StereoMesh::stepHeight, "Vertical distance between mesh points")
+        .def_property_readonly("left", [](py::object obj) { return meshView(obj, obj.cast<const StereoMesh&>().left); },
+            "Mesh of the stereo left camera, as a read only float32 array of (y, x) source coordinates with shape (rows, columns, 2)")
+        .def_property_readonly("right", [](py::object obj) { return meshView(obj, obj.cast<const StereoMesh&>().right); },
+            "Mesh of the stereo right camera, as a read only float32 array of (y, x) source coordinates with shape (rows, columns, 2)");
+
+    m.def(
+        "generateStereoMesh",
+        [](dai::CalibrationHandler& calibration, std::tuple<unsigned int, unsigned int> size, unsigned int meshStep, const std::string& mxId, bool useCache, const std::string& cacheDirectory) {
+            return getStereoMesh(calibration, std::get<0>(size), std::get<1>(size), meshStep, meshStep, mxId, useCache, cacheDirectory);
+        },
+        py::arg("calibration"),
+        py::arg("size"),
+        py::arg("meshStep") = 16,
+        py::arg("mxId") = "",
+        py::arg("useCache") = true,
+        py::arg("cacheDirectory") = "",
+        "Computes warp meshes rectifying the stereo pair at the given input (width, height). "
+        "Meshes are cached on disk (DEPTHAI_CACHE_DIR, or 'cacheDirectory'), per device 'mxId' and keyed by calibration content and arguments");
+
+    py::class_<PointCloudProjector, std::shared_ptr<PointCloudProjector>>(
+        m, "PointCloudProjector", "Converts depth frames (RAW16, millimeters) of a camera into XYZ points, with per pixel rays computed once from calibration")
+        .def(py::init([](dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, std::tuple<unsigned int, unsigned int> size, bool undistort) {
+                 return std::make_shared<PointCloudProjector>(calibration, camera, std::get<0>(size), std::get<1>(size), undistort);
+             }),
+             py::arg("calibration"),
+             py::arg("camera"),
+             py::arg("size"),
+             py::arg("undistort") = false,
+             "Computes rays of a camera at depth frame (width, height). 'camera' is the camera depth is aligned to, eg. the stereo right camera. "
+             "Rectified depth isn't distorted, 'undistort' accounts for lens distortion of depth aligned to a raw camera")
+        .def("getWidth", &PointCloudProjector::getWidth, "Width of depth frames")
+        .def("getHeight", &PointCloudProjector::getHeight, "Height of depth frames")
+        .def("getRays", [](py::object obj) {
+            const auto& projector = obj.cast<const PointCloudProjector&>();
+            return tableView(obj, projector.getRays(), {projector.getHeight(), projector.getWidth(), 2});
+        }, "Rays as (x / z, y / z), as a read only float32 array of shape (height, width, 2)")
+        .def("setDepthRange", &PointCloudProjector::setDepthRange, py::arg("minDepth"), py::arg("maxDepth"), "Sets range of valid depths, in millimeters. Default: 1 - 65535")
+        .def("getMinDepth", &PointCloudProjector::getMinDepth, "Get minimum valid depth")
+        .def("getMaxDepth", &PointCloudProjector::getMaxDepth, "Get maximum valid depth")
+        .def("setScale", &PointCloudProjector::setScale, py::arg("scale"), "Sets factor of point coordinates, eg. 0.001 for meters. Default: 1 (millimeters)")
+        .def("getScale", &PointCloudProjector::getScale, "Get factor of point coordinates")
+        .def("project", &projectDepth, py::arg("depth"), py::arg("organized") = false, py::arg("decimation") = 1, py::arg("out") = py::none(),
+            "Projects a uint16 depth frame to float32 points. Organized - (height, width, 3) array with NaN for invalid pixels, "
+            "otherwise (N, 3) array of valid points. 'decimation' projects every n-th pixel of every n-th row. "
+            "Writes to 'out' if given (unorganized results are its first N rows). Releases the GIL while projecting");
+
+    py::class_<DepthAligner, std::shared_ptr<DepthAligner>>(
+        m, "DepthAligner", "Registers depth frames (RAW16, millimeters) to another camera's viewpoint (eg. RGB) on host, with a transform computed once from calibration")
+        .def(py::init([](dai::CalibrationHandler& calibration,
+                         dai::CameraBoardSocket depthCamera,
+                         std::tuple<unsigned int, unsigned int> depthSize,
+                         dai::CameraBoardSocket targetCamera,
+                         std::tuple<unsigned int, unsigned int> targetSize,
+                         bool rectified) {
+                 return std::make_shared<DepthAligner>(
+                     calibration, depthCamera, std::get<0>(depthSize), std::get<1>(depthSize), targetCamera, std::get<0>(targetSize), std::get<1>(targetSize), rectified);
+             }),
+             py::arg("calibration"),
+             py::arg("depthCamera"),
+             py::arg("depthSize"),
+             py::arg("targetCamera"),
+             py::arg("targetSize"),
+             py::arg("rectified") = true,
+             "Computes the transform from depth of 'depthCamera' (eg. the stereo right camera) at depth (width, height) to 'targetCamera' at target (width, height). "
+             "'rectified' - depth is rectified (StereoDepth's default), otherwise in the raw view of 'depthCamera'")
+        .def("getDepthSize", [](const DepthAligner& aligner) { return std::make_tuple(aligner.getDepthWidth(), aligner.getDepthHeight()); }, "Size of depth frames")
+        .def("getTargetSize", [](const DepthAligner& aligner) { return std::make_tuple(aligner.getTargetWidth(), aligner.getTargetHeight()); }, "Size of aligned frames")
+        .def("align", &alignDepth, py::arg("depth"), py::arg("out") = py::none(),
+            "Aligns a uint16 depth frame to the target camera, nearest depth wins where pixels overlap and pixels without depth are 0. "
+            "Writes to 'out' if given, otherwise returns a new array. Releases the GIL while aligning");
+
+    py::class_<CalibrationStore>(m, "CalibrationStore", "Local store of device calibrations keyed by device MxId, in CalibrationHandler's binary format")
+        .def(py::init<const std::string&>(), py::arg("directory") = "",
+            "Opens the store in 'directory', 'calibration' in the cache directory (DEPTHAI_CACHE_DIR) if empty. Missing directories are created on store")
+        .def("getDirectory", &CalibrationStore::getDirectory, "Directory of the store")
+        .def("store", &CalibrationStore::store, py::arg("mxId"), py::arg("calibration"),
+            "Stores calibration of a device, replacing the stored one. Must be called again once the device is recalibrated")
+        .def("load", [](const CalibrationStore& store, const std::string& mxId) -> py::object {
+            dai::CalibrationHandler calibration;
+            if(!store.load(mxId, calibration)) return py::none();
+            return py::cast(std::move(calibration));
+        }, py::arg("mxId"), "Loads calibration of a device, None if it isn't stored. Raises if the stored calibration is corrupted")
+        .def("contains", &CalibrationStore::contains, py::arg("mxId"), "Whether calibration of the device is stored")
+        .def("__contains__", &CalibrationStore::contains, py::arg("mxId"))
+        .def("remove", &CalibrationStore::remove, py::arg("mxId"), "Removes calibration of a device, returns False if it wasn't stored");
+}
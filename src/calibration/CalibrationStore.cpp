@@ -0,0 +1,50 @@
+#include "CalibrationStore.hpp"
+
+// std
+#include <cstdio>
+#include <fstream>
+#include <stdexcept>
+#include <vector>
+
+// project
+#include "CalibrationBinary.hpp"
+#include "utility/CacheDirectory.hpp"
+
+CalibrationStore::CalibrationStore(const std::string& directory) : directory(directory.empty() ? getCacheDirectory() + "/calibration" : directory) {}
+
+std::string CalibrationStore::getDirectory() const {
+    return directory;
+}
+
+void CalibrationStore::store(const std::string& mxId, const dai::CalibrationHandler& calibration) const {
+    auto data = calibrationToBinary(calibration.getEepromData());
+    if(!writeFileAtomically(getPath(mxId), data.data(), data.size())) throw std::runtime_error("Couldn't store calibration of device " + mxId);
+}
+
+bool CalibrationStore::load(const std::string& mxId, dai::CalibrationHandler& calibration) const {
+    std::ifstream file(getPath(mxId), std::ios::binary | std::ios::ate);
+    if(!file.is_open()) return false;
+    // Entries are a few kilobytes, read at once
+    std::vector<std::uint8_t> data(static_cast<std::size_t>(file.tellg()));
+    file.seekg(0);
+    file.read(reinterpret_cast<char*>(data.data()), static_cast<std::streamsize>(data.size()));
+    if(!file) throw std::runtime_error("Couldn't read stored calibration of device " + mxId);
+    calibration = dai::CalibrationHandler(calibrationFromBinary(data.data(), data.size()));
+    return true;
+}
+
+bool CalibrationStore::contains(const std::string& mxId) const {
+    return std::ifstream(getPath(mxId), std::ios::binary).is_open();
+}
+
+bool CalibrationStore::remove(const std::string& mxId) const {
+    return std::remove(getPath(mxId).c_str()) == 0;
+}
+
+std::string CalibrationStore::getPath(const std::string& mxId) const {
+    // MxIds are hexadecimal, anything else could escape the store's directory
+    if(mxId.empty() || mxId.find_first_not_of("0123456789ABCDEFabcdef") != std::string::npos) {
+        throw std::invalid_argument("Invalid MxId '" + mxId + "'");
+    }
+    return directory + "/" + mxId + ".bin";
+}
@@ -0,0 +1,42 @@
+#pragma once
+
+// std
+#include <string>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+/**
+ * @brief Local store of device calibrations keyed by device MxId, in the binary format (calibration/CalibrationBinary.hpp).
+ *
+ * Loading a stored calibration avoids reading it from the device or parsing JSON. The store doesn't track changes
+ * of device calibrations, a device's entry must be stored again once the device is recalibrated
+ */
+class CalibrationStore {
+   public:
+    /// @param directory Directory of the store, 'calibration' in the cache directory (utility/CacheDirectory.hpp) if empty
+    explicit CalibrationStore(const std::string& directory = "");
+
+    /// @returns Directory of the store
+    std::string getDirectory() const;
+
+    /// Stores calibration of a device, replacing the stored one. Written atomically, throws if it can't be written
+    void store(const std::string& mxId, const dai::CalibrationHandler& calibration) const;
+
+    /**
+     * Loads calibration of a device. Throws if the stored calibration is corrupted
+     * @returns False if there is no calibration stored for the device
+     */
+    bool load(const std::string& mxId, dai::CalibrationHandler& calibration) const;
+
+    /// @returns True if calibration of the device is stored
+    bool contains(const std::string& mxId) const;
+
+    /// Removes calibration of a device. @returns False if there was no calibration stored for the device
+    bool remove(const std::string& mxId) const;
+
+   private:
+    std::string directory;
+
+    std::string getPath(const std::string& mxId) const;
+};
@@ -0,0 +1,118 @@
+#include "CameraGeometry.hpp"
+
+// std
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+
+// project
+#include "CalibrationBinary.hpp"
+#include "utility/Hash.hpp"
+
+namespace {
+
+constexpr int UNDISTORT_ITERATIONS = 20;
+constexpr double HALF_PI = 1.57079632679489661923;
+
+}  // namespace
+
+void CameraGeometry::distort(double x, double y, double& xd, double& yd) const {
+    const auto& d = distortion;
+    if(model == Model::FISHEYE) {
+        double r = std::sqrt(x * x + y * y);
+        if(r < 1e-12) {
+            xd = x;
+            yd = y;
+            return;
+        }
+        double theta = std::atan(r);
+        double theta2 = theta * theta;
+        double thetaD = theta * (1 + theta2 * (d[0] + theta2 * (d[1] + theta2 * (d[2] + theta2 * d[3]))));
+        xd = x * thetaD / r;
+        yd = y * thetaD / r;
+        return;
+    }
+    double r2 = x * x + y * y;
+    double r4 = r2 * r2;
+    double r6 = r4 * r2;
+    double radial = (1 + d[0] * r2 + d[1] * r4 + d[4] * r6) / (1 + d[5] * r2 + d[6] * r4 + d[7] * r6);
+    xd = x * radial + 2 * d[2] * x * y + d[3] * (r2 + 2 * x * x) + d[8] * r2 + d[9] * r4;
+    yd = y * radial + d[2] * (r2 + 2 * y * y) + 2 * d[3] * x * y + d[10] * r2 + d[11] * r4;
+}
+
+void CameraGeometry::undistort(double xd, double yd, double& x, double& y) const {
+    const auto& d = distortion;
+    if(model == Model::FISHEYE) {
+        double thetaD = std::sqrt(xd * xd + yd * yd);
+        if(thetaD < 1e-12) {
+            x = xd;
+            y = yd;
+            return;
+        }
+        // Newton's method on theta_d = theta * (1 + k1 theta^2 + ... + k4 theta^8)
+        double theta = std::min(thetaD, HALF_PI);
+        for(int i = 0; i < UNDISTORT_ITERATIONS; i++) {
+            double theta2 = theta * theta;
+            double f = theta * (1 + theta2 * (d[0] + theta2 * (d[1] + theta2 * (d[2] + theta2 * d[3])))) - thetaD;
+            double df = 1 + theta2 * (3 * d[0] + theta2 * (5 * d[1] + theta2 * (7 * d[2] + 9 * theta2 * d[3])));
+            if(std::abs(df) < 1e-12) break;
+            double step = f / df;
+            theta -= step;
+            if(std::abs(step) < 1e-12) break;
+        }
+        double scale = std::tan(theta) / thetaD;
+        x = xd * scale;
+        y = yd * scale;
+        return;
+    }
+    // Fixed point iteration, as OpenCV's undistortPoints
+    x = xd;
+    y = yd;
+    for(int i = 0; i < UNDISTORT_ITERATIONS; i++) {
+        double r2 = x * x + y * y;
+        double r4 = r2 * r2;
+        double r6 = r4 * r2;
+        double inverseRadial = (1 + d[5] * r2 + d[6] * r4 + d[7] * r6) / (1 + d[0] * r2 + d[1] * r4 + d[4] * r6);
+        double deltaX = 2 * d[2] * x * y + d[3] * (r2 + 2 * x * x) + d[8] * r2 + d[9] * r4;
+        double deltaY = d[2] * (r2 + 2 * y * y) + 2 * d[3] * x * y + d[10] * r2 + d[11] * r4;
+        x = (xd - deltaX) * inverseRadial;
+        y = (yd - deltaY) * inverseRadial;
+    }
+}
+
+bool CameraGeometry::isDistorted() const {
+    return std::any_of(distortion.begin(), distortion.end(), [](double coefficient) { return coefficient != 0; });
+}
+
+CameraGeometry getCameraGeometry(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, int width, int height) {
+    CameraGeometry geometry;
+    auto eepromData = calibration.getEepromData();
+    auto cameraData = eepromData.cameraData.find(camera);
+    if(cameraData == eepromData.cameraData.end()) throw std::runtime_error("There is no calibration of the requested camera");
+    switch(cameraData->second.cameraType) {
+        case dai::CameraModel::Perspective:
+            geometry.model = CameraGeometry::Model::PERSPECTIVE;
+            break;
+        case dai::CameraModel::Fisheye:
+            geometry.model = CameraGeometry::Model::FISHEYE;
+            break;
+        default:
+            throw std::runtime_error("Only perspective and fisheye camera models are supported");
+    }
+
+    auto intrinsics = calibration.getCameraIntrinsics(camera, width, height);
+    geometry.fx = intrinsics[0][0];
+    geometry.fy = intrinsics[1][1];
+    geometry.cx = intrinsics[0][2];
+    geometry.cy = intrinsics[1][2];
+    const auto& coefficients = cameraData->second.distortionCoeff;
+    std::size_t numCoefficients = std::min(coefficients.size(), geometry.model == CameraGeometry::Model::FISHEYE ? std::size_t(4) : geometry.distortion.size());
+    std::copy(coefficients.begin(), coefficients.begin() + numCoefficients, geometry.distortion.begin());
+    return geometry;
+}
+
+std::uint64_t hashCalibration(const dai::CalibrationHandler& calibration) {
+    // Binary format sorts cameras, so equal calibrations hash equally
+    auto data = calibrationToBinary(calibration.getEepromData());
+    return hash64(data.data(), data.size());
+}
@@ -0,0 +1,41 @@
+#pragma once
+
+// std
+#include <array>
+#include <cstdint>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+/**
+ * @brief Projection model of a calibrated camera at a given resolution.
+ *
+ * Distortion follows OpenCV: the rational and thin prism model for perspective cameras
+ * (tilt coefficients are ignored) and the equidistant model for fisheye cameras.
+ * Coordinates are normalized image coordinates (x / z, y / z) unless stated otherwise.
+ */
+struct CameraGeometry {
+    enum class Model { PERSPECTIVE, FISHEYE };
+
+    Model model = Model::PERSPECTIVE;
+    /// Focal lengths and principal point, in pixels
+    double fx = 1, fy = 1, cx = 0, cy = 0;
+    /// k1, k2, p1, p2, k3, k4, k5, k6, s1, s2, s3, s4 for perspective cameras, k1 - k4 for fisheye cameras
+    std::array<double, 12> distortion{};
+
+    /// Applies lens distortion
+    void distort(double x, double y, double& xd, double& yd) const;
+    /// Removes lens distortion, iteratively
+    void undistort(double xd, double yd, double& x, double& y) const;
+    /// @returns True if any distortion coefficient is set
+    bool isDistorted() const;
+};
+
+/**
+ * Reads the geometry of a camera from calibration, with intrinsics scaled to the given resolution.
+ * Throws if camera isn't calibrated or its model isn't supported
+ */
+CameraGeometry getCameraGeometry(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, int width, int height);
+
+/// @returns Hash of all calibration data, changes whenever the calibration does
+std::uint64_t hashCalibration(const dai::CalibrationHandler& calibration);
@@ -0,0 +1,133 @@
+#include "DepthAligner.hpp"
+
+// std
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
+
+// project
+#include "Rectification.hpp"
+
+namespace {
+
+// Calibrated translations are in centimeters
+constexpr float TRANSLATION_TO_MILLIMETERS = 10;
+
+}  // namespace
+
+DepthAligner::DepthAligner(dai::CalibrationHandler& calibration,
+                           dai::CameraBoardSocket depthCamera,
+                           unsigned int depthWidth,
+                           unsigned int depthHeight,
+                           dai::CameraBoardSocket targetCamera,
+                           unsigned int targetWidth,
+                           unsigned int targetHeight,
+                           bool rectified)
+    : depthWidth(depthWidth), depthHeight(depthHeight), targetWidth(targetWidth), targetHeight(targetHeight) {
+    if(depthWidth == 0 || depthHeight == 0 || targetWidth == 0 || targetHeight == 0) throw std::invalid_argument("Size must be positive");
+
+    auto rectification = getRectification(calibration, depthCamera, static_cast<int>(depthWidth), static_cast<int>(depthHeight));
+    target = getCameraGeometry(calibration, targetCamera, static_cast<int>(targetWidth), static_cast<int>(targetHeight));
+    distorted = target.isDistorted();
+
+    std::array<double, 9> rotation{{1, 0, 0, 0, 1, 0, 0, 0, 1}};
+    if(depthCamera != targetCamera) {
+        auto extrinsics = calibration.getCameraExtrinsics(depthCamera, targetCamera);
+        for(int i = 0; i < 3; i++) {
+            for(int j = 0; j < 3; j++) rotation[i * 3 + j] = extrinsics[i][j];
+            translation[i] = extrinsics[i][3] * TRANSLATION_TO_MILLIMETERS;
+        }
+    }
+
+    directions.resize(static_cast<std::size_t>(depthWidth) * depthHeight * 3);
+    float* direction = directions.data();
+    const auto& r = rectification.rotation;
+    const auto& source = rectification.source;
+    for(unsigned int v = 0; v < depthHeight; v++) {
+        for(unsigned int u = 0; u < depthWidth; u++) {
+            // Point of unit depth in depth camera coordinates
+            double x, y, z;
+            if(rectified) {
+                // Depth is along the rectified view's axis, rotated back into the camera
+                double rx = (u - rectification.cx) / rectification.fx;
+                double ry = (v - rectification.cy) / rectification.fy;
+                x = r[0] * rx + r[3] * ry + r[6];
+                y = r[1] * rx + r[4] * ry + r[7];
+                z = r[2] * rx + r[5] * ry + r[8];
+            } else {
+                source.undistort((u - source.cx) / source.fx, (v - source.cy) / source.fy, x, y);
+                z = 1;
+            }
+            direction[0] = static_cast<float>(rotation[0] * x + rotation[1] * y + rotation[2] * z);
+            direction[1] = static_cast<float>(rotation[3] * x + rotation[4] * y + rotation[5] * z);
+            direction[2] = static_cast<float>(rotation[6] * x + rotation[7] * y + rotation[8] * z);
+            direction += 3;
+        }
+    }
+}
+
+unsigned int DepthAligner::getDepthWidth() const {
+    return depthWidth;
+}
+
+unsigned int DepthAligner::getDepthHeight() const {
+    return depthHeight;
+}
+
+unsigned int DepthAligner::getTargetWidth() const {
+    return targetWidth;
+}
+
+unsigned int DepthAligner::getTargetHeight() const {
+    return targetHeight;
+}
+
+void DepthAligner::align(const std::uint16_t* depth, std::size_t depthStride, std::uint16_t* out, std::size_t outStride) const {
+    for(unsigned int v = 0; v < targetHeight; v++) {
+        auto* row = reinterpret_cast<std::uint16_t*>(reinterpret_cast<std::uint8_t*>(out) + v * outStride);
+        std::fill(row, row + targetWidth, 0);
+    }
+
+    const float fx = static_cast<float>(target.fx), fy = static_cast<float>(target.fy);
+    const float cx = static_cast<float>(target.cx), cy = static_cast<float>(target.cy);
+    std::array<float, 12> k;
+    std::transform(target.distortion.begin(), target.distortion.end(), k.begin(), [](double coefficient) { return static_cast<float>(coefficient); });
+    const bool perspective = target.model == CameraGeometry::Model::PERSPECTIVE;
+    const float* direction = directions.data();
+    for(unsigned int v = 0; v < depthHeight; v++) {
+        const auto* depthRow = reinterpret_cast<const std::uint16_t*>(reinterpret_cast<const std::uint8_t*>(depth) + v * depthStride);
+        for(unsigned int u = 0; u < depthWidth; u++, direction += 3) {
+            std::uint16_t d = depthRow[u];
+            if(d == 0) continue;
+            float z = direction[2] * d + translation[2];
+            if(z < 1 || z > 65535) continue;
+            float inverseZ = 1 / z;
+            float x = (direction[0] * d + translation[0]) * inverseZ;
+            float y = (direction[1] * d + translation[1]) * inverseZ;
+            if(distorted && perspective) {
+                // Single precision CameraGeometry::distort, it's per pixel
+                float r2 = x * x + y * y;
+                float r4 = r2 * r2;
+                float r6 = r4 * r2;
+                float radial = (1 + k[0] * r2 + k[1] * r4 + k[4] * r6) / (1 + k[5] * r2 + k[6] * r4 + k[7] * r6);
+                float xd = x * radial + 2 * k[2] * x * y + k[3] * (r2 + 2 * x * x) + k[8] * r2 + k[9] * r4;
+                float yd = y * radial + k[2] * (r2 + 2 * y * y) + 2 * k[3] * x * y + k[10] * r2 + k[11] * r4;
+                x = xd;
+                y = yd;
+            } else if(distorted) {
+                double xd, yd;
+                target.distort(x, y, xd, yd);
+                x = static_cast<float>(xd);
+                y = static_cast<float>(yd);
+            }
+            // Nearest target pixel, truncation rounds as coordinates are checked to be non negative
+            float px = fx * x + cx + 0.5f;
+            float py = fy * y + cy + 0.5f;
+            if(!(px >= 0 && py >= 0 && px < targetWidth && py < targetHeight)) continue;
+            auto* pixel = reinterpret_cast<std::uint16_t*>(reinterpret_cast<std::uint8_t*>(out) + static_cast<int>(py) * outStride) + static_cast<int>(px);
+            auto aligned = static_cast<std::uint16_t>(z + 0.5f);
+            // Z-buffer, the nearest surface occludes the ones behind it
+            if(*pixel == 0 || aligned < *pixel) *pixel = aligned;
+        }
+    }
+}
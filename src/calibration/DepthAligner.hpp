@@ -0,0 +1,68 @@
+#pragma once
+
+// std
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+// project
+#include "CameraGeometry.hpp"
+
+/**
+ * @brief Registers depth frames (RAW16, millimeters) to another camera's viewpoint, eg. RGB, on host.
+ *
+ * The transform from every depth pixel into the target camera is computed once, so aligning a frame is a single pass
+ * over the depth: each pixel is moved into the target camera and projected, the nearest depth wins where pixels overlap.
+ * Target pixels without depth are 0. Depth is translated by the calibrated extrinsics (centimeters)
+ */
+class DepthAligner {
+   public:
+    /**
+     * Computes the transform
+     * @param depthCamera Camera the depth is aligned to, eg. the stereo right camera
+     * @param depthWidth Width of depth frames
+     * @param depthHeight Height of depth frames
+     * @param targetCamera Camera to align depth to
+     * @param targetWidth Width of target camera frames
+     * @param targetHeight Height of target camera frames
+     * @param rectified Whether depth is rectified (StereoDepth's default), or in the raw (distorted) view of 'depthCamera'
+     */
+    DepthAligner(dai::CalibrationHandler& calibration,
+                 dai::CameraBoardSocket depthCamera,
+                 unsigned int depthWidth,
+                 unsigned int depthHeight,
+                 dai::CameraBoardSocket targetCamera,
+                 unsigned int targetWidth,
+                 unsigned int targetHeight,
+                 bool rectified = true);
+
+    unsigned int getDepthWidth() const;
+    unsigned int getDepthHeight() const;
+    unsigned int getTargetWidth() const;
+    unsigned int getTargetHeight() const;
+
+    /**
+     * Aligns a depth frame, doesn't allocate
+     * @param depth Depth frame of depth size
+     * @param depthStride Distance between rows of the depth frame, in bytes
+     * @param out Aligned depth of target size, overwritten
+     * @param outStride Distance between rows of the output, in bytes
+     */
+    void align(const std::uint16_t* depth, std::size_t depthStride, std::uint16_t* out, std::size_t outStride) const;
+
+   private:
+    const unsigned int depthWidth;
+    const unsigned int depthHeight;
+    const unsigned int targetWidth;
+    const unsigned int targetHeight;
+    // Direction of each depth pixel in target camera coordinates, per unit of depth
+    std::vector<float> directions;
+    // Translation into target camera, millimeters
+    std::array<float, 3> translation{};
+    CameraGeometry target;
+    bool distorted = false;
+};
@@ -0,0 +1,106 @@
+#include "PointCloudProjector.hpp"
+
+// std
+#include <limits>
+#include <stdexcept>
+
+// project
+#include "CameraGeometry.hpp"
+
+PointCloudProjector::PointCloudProjector(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, unsigned int width, unsigned int height, bool undistort)
+    : width(width), height(height) {
+    if(width == 0 || height == 0) throw std::invalid_argument("Size must be positive");
+    auto geometry = getCameraGeometry(calibration, camera, static_cast<int>(width), static_cast<int>(height));
+    undistort = undistort && geometry.isDistorted();
+    rays.resize(static_cast<std::size_t>(width) * height * 2);
+    for(unsigned int v = 0; v < height; v++) {
+        float* row = rays.data() + static_cast<std::size_t>(v) * width * 2;
+        for(unsigned int u = 0; u < width; u++) {
+            double x = (u - geometry.cx) / geometry.fx;
+            double y = (v - geometry.cy) / geometry.fy;
+            if(undistort) geometry.undistort(x, y, x, y);
+            row[2 * u] = static_cast<float>(x);
+            row[2 * u + 1] = static_cast<float>(y);
+        }
+    }
+}
+
+unsigned int PointCloudProjector::getWidth() const {
+    return width;
+}
+
+unsigned int PointCloudProjector::getHeight() const {
+    return height;
+}
+
+const std::vector<float>& PointCloudProjector::getRays() const {
+    return rays;
+}
+
+void PointCloudProjector::setDepthRange(std::uint16_t minDepth, std::uint16_t maxDepth) {
+    if(minDepth > maxDepth) throw std::invalid_argument("Minimum depth must not exceed maximum depth");
+    std::lock_guard<std::mutex> lock(mtx);
+    // Zero is never a valid depth
+    settings.minDepth = minDepth > 0 ? minDepth : 1;
+    settings.maxDepth = maxDepth;
+}
+
+std::uint16_t PointCloudProjector::getMinDepth() const {
+    return getSettings().minDepth;
+}
+
+std::uint16_t PointCloudProjector::getMaxDepth() const {
+    return getSettings().maxDepth;
+}
+
+void PointCloudProjector::setScale(float scale) {
+    std::lock_guard<std::mutex> lock(mtx);
+    settings.scale = scale;
+}
+
+float PointCloudProjector::getScale() const {
+    return getSettings().scale;
+}
+
+unsigned int PointCloudProjector::getOutputWidth(unsigned int decimation) const {
+    if(decimation == 0) throw std::invalid_argument("Decimation must be positive");
+    return (width + decimation - 1) / decimation;
+}
+
+unsigned int PointCloudProjector::getOutputHeight(unsigned int decimation) const {
+    if(decimation == 0) throw std::invalid_argument("Decimation must be positive");
+    return (height + decimation - 1) / decimation;
+}
+
+std::size_t PointCloudProjector::project(const std::uint16_t* depth, std::size_t depthStride, float* points, bool organized, unsigned int decimation) const {
+    if(decimation == 0) throw std::invalid_argument("Decimation must be positive");
+    // Settings are read once, so a frame is projected consistently while they change
+    auto current = getSettings();
+    const float nan = std::numeric_limits<float>::quiet_NaN();
+    float* out = points;
+    for(unsigned int v = 0; v < height; v += decimation) {
+        const auto* depthRow = reinterpret_cast<const std::uint16_t*>(reinterpret_cast<const std::uint8_t*>(depth) + v * depthStride);
+        const float* rayRow = rays.data() + static_cast<std::size_t>(v) * width * 2;
+        for(unsigned int u = 0; u < width; u += decimation) {
+            std::uint16_t d = depthRow[u];
+            if(d >= current.minDepth && d <= current.maxDepth) {
+                float z = d * current.scale;
+                out[0] = rayRow[2 * u] * z;
+                out[1] = rayRow[2 * u + 1] * z;
+                out[2] = z;
+                out += 3;
+            } else if(organized) {
+                out[0] = nan;
+                out[1] = nan;
+                out[2] = nan;
+                out += 3;
+            }
+        }
+    }
+    return static_cast<std::size_t>(out - points) / 3;
+}
+
+PointCloudProjector::Settings PointCloudProjector::getSettings() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return settings;
+}
@@ -0,0 +1,74 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <mutex>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+/**
+ * @brief Converts depth frames (RAW16, millimeters) of a camera into XYZ points.
+ *
+ * The ray of every pixel is computed once from calibration, so projecting a frame is a multiplication per coordinate.
+ * Points are in the camera's coordinate system (x right, y down, z forward), in millimeters times the scale.
+ * Pixels with no depth (0) or depth outside of the range are invalid
+ */
+class PointCloudProjector {
+   public:
+    /**
+     * Computes the ray table
+     * @param camera Camera the depth is aligned to, eg. the stereo right camera for rectified right aligned depth
+     * @param width Width of depth frames
+     * @param height Height of depth frames
+     * @param undistort Whether rays account for lens distortion. Rectified depth isn't distorted, depth aligned to a raw camera is
+     */
+    PointCloudProjector(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, unsigned int width, unsigned int height, bool undistort = false);
+
+    unsigned int getWidth() const;
+    unsigned int getHeight() const;
+    /// @returns Rays as (x / z, y / z) pairs, row by row
+    const std::vector<float>& getRays() const;
+
+    /// Sets range of valid depths, in millimeters. Default: 1 - 65535
+    void setDepthRange(std::uint16_t minDepth, std::uint16_t maxDepth);
+    std::uint16_t getMinDepth() const;
+    std::uint16_t getMaxDepth() const;
+    /// Sets factor of point coordinates, eg. 0.001 for meters. Default: 1 (millimeters)
+    void setScale(float scale);
+    float getScale() const;
+
+    /// @returns Width of organized output with given decimation
+    unsigned int getOutputWidth(unsigned int decimation = 1) const;
+    /// @returns Height of organized output with given decimation
+    unsigned int getOutputHeight(unsigned int decimation = 1) const;
+
+    /**
+     * Projects a depth frame
+     * @param depth Depth frame of projector's size
+     * @param depthStride Distance between rows of the depth frame, in bytes
+     * @param points Output of at least getOutputWidth(decimation) * getOutputHeight(decimation) XYZ points
+     * @param organized True - a point per output pixel, invalid ones are NaN. False - only valid points, in row order
+     * @param decimation Projects only every n-th pixel of every n-th row
+     * @returns Number of points written
+     */
+    std::size_t project(const std::uint16_t* depth, std::size_t depthStride, float* points, bool organized, unsigned int decimation = 1) const;
+
+   private:
+    struct Settings {
+        std::uint16_t minDepth = 1;
+        std::uint16_t maxDepth = 65535;
+        float scale = 1;
+    };
+
+    Settings getSettings() const;
+
+    const unsigned int width;
+    const unsigned int height;
+    std::vector<float> rays;
+
+    mutable std::mutex mtx;
+    Settings settings;
+};
@@ -0,0 +1,334 @@
+#include "Rectification.hpp"
+
+// std
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <limits>
+#include <stdexcept>
+
+// project
+#include "utility/CacheDirectory.hpp"
+#include "utility/Hash.hpp"
+#include "utility/ThreadPool.hpp"
+
+constexpr int RectificationMaps::INTER_BITS;
+constexpr int RectificationMaps::INTER_TAB_SIZE;
+
+namespace {
+
+// Version of cached contents, part of the key
+constexpr std::uint32_t FORMAT_VERSION = 1;
+// Camera image is sampled on a grid of this many points per side to find the valid region
+constexpr int GRID_SIZE = 9;
+// Rows computed per task
+constexpr unsigned int ROWS_PER_TASK = 32;
+// Weights of bilinear interpolation sum to 1 << WEIGHT_BITS
+constexpr int WEIGHT_BITS = 15;
+
+using Matrix3 = std::array<double, 9>;
+
+Matrix3 toMatrix3(const std::vector<std::vector<float>>& matrix) {
+    if(matrix.size() != 3 || matrix[0].size() != 3 || matrix[1].size() != 3 || matrix[2].size() != 3) throw std::runtime_error("Rotation matrix must be 3x3");
+    Matrix3 result;
+    for(int i = 0; i < 3; i++) {
+        for(int j = 0; j < 3; j++) result[i * 3 + j] = matrix[i][j];
+    }
+    return result;
+}
+
+struct Rect {
+    double x0, y0, x1, y1;
+};
+
+// Bounds of the camera image in the rectified view (normalized coordinates), inner contains only valid pixels
+void getBounds(const CameraGeometry& geometry, const Matrix3& rotation, int width, int height, Rect& inner, Rect& outer) {
+    inner = {-std::numeric_limits<double>::infinity(), -std::numeric_limits<double>::infinity(), std::numeric_limits<double>::infinity(), std::numeric_limits<double>::infinity()};
+    outer = {std::numeric_limits<double>::infinity(), std::numeric_limits<double>::infinity(), -std::numeric_limits<double>::infinity(), -std::numeric_limits<double>::infinity()};
+    for(int i = 0; i < GRID_SIZE; i++) {
+        for(int j = 0; j < GRID_SIZE; j++) {
+            double u = static_cast<double>(width - 1) * j / (GRID_SIZE - 1);
+            double v = static_cast<double>(height - 1) * i / (GRID_SIZE - 1);
+            double x, y;
+            geometry.undistort((u - geometry.cx) / geometry.fx, (v - geometry.cy) / geometry.fy, x, y);
+            const auto& r = rotation;
+            double z = r[6] * x + r[7] * y + r[8];
+            if(z <= 0) continue;
+            double rx = (r[0] * x + r[1] * y + r[2]) / z;
+            double ry = (r[3] * x + r[4] * y + r[5]) / z;
+            outer = {std::min(outer.x0, rx), std::min(outer.y0, ry), std::max(outer.x1, rx), std::max(outer.y1, ry)};
+            if(j == 0) inner.x0 = std::max(inner.x0, rx);
+            if(j == GRID_SIZE - 1) inner.x1 = std::min(inner.x1, rx);
+            if(i == 0) inner.y0 = std::max(inner.y0, ry);
+            if(i == GRID_SIZE - 1) inner.y1 = std::min(inner.y1, ry);
+        }
+    }
+}
+
+// Bilinear weights for each fraction index
+const std::vector<std::array<std::uint32_t, 4>>& getBilinearWeights() {
+    static const auto weights = []() {
+        constexpr int SIZE = RectificationMaps::INTER_TAB_SIZE;
+        std::vector<std::array<std::uint32_t, 4>> table(SIZE * SIZE);
+        for(int fy = 0; fy < SIZE; fy++) {
+            for(int fx = 0; fx < SIZE; fx++) {
+                double a = static_cast<double>(fx) / SIZE;
+                double b = static_cast<double>(fy) / SIZE;
+                std::array<double, 4> exact = {(1 - a) * (1 - b), a * (1 - b), (1 - a) * b, a * b};
+                auto& entry = table[fy * SIZE + fx];
+                std::int64_t sum = 0;
+                for(int k = 0; k < 4; k++) {
+                    entry[k] = static_cast<std::uint32_t>(std::lround(exact[k] * (1 << WEIGHT_BITS)));
+                    sum += entry[k];
+                }
+                // Rounding error goes to the largest weight, so weights always sum to one
+                auto largest = std::max_element(entry.begin(), entry.end());
+                *largest = static_cast<std::uint32_t>(*largest + ((1 << WEIGHT_BITS) - sum));
+            }
+        }
+        return table;
+    }();
+    return weights;
+}
+
+template <typename T>
+void remapRows(const std::uint8_t* src,
+               unsigned int srcWidth,
+               unsigned int srcHeight,
+               std::size_t srcStride,
+               unsigned int channels,
+               const RectificationMaps& maps,
+               std::uint8_t* dst,
+               std::size_t dstStride) {
+    const auto& weights = getBilinearWeights();
+    constexpr std::uint32_t ROUND = 1u << (WEIGHT_BITS - 1);
+    auto sample = [&](int x, int y, unsigned int c) -> std::uint32_t {
+        if(x < 0 || y < 0 || x >= static_cast<int>(srcWidth) || y >= static_cast<int>(srcHeight)) return 0;
+        return reinterpret_cast<const T*>(src + y * srcStride)[x * channels + c];
+    };
+    for(unsigned int y = 0; y < maps.height; y++) {
+        const std::int16_t* coordinates = maps.coordinates.data() + static_cast<std::size_t>(y) * maps.width * 2;
+        const std::uint16_t* fractions = maps.fractions.data() + static_cast<std::size_t>(y) * maps.width;
+        T* out = reinterpret_cast<T*>(dst + y * dstStride);
+        for(unsigned int x = 0; x < maps.width; x++) {
+            int sx = coordinates[2 * x];
+            int sy = coordinates[2 * x + 1];
+            const auto& w = weights[fractions[x]];
+            T* pixel = out + x * channels;
+            if(sx >= 0 && sy >= 0 && sx + 1 < static_cast<int>(srcWidth) && sy + 1 < static_cast<int>(srcHeight)) {
+                const T* top = reinterpret_cast<const T*>(src + sy * srcStride) + sx * channels;
+                const T* bottom = reinterpret_cast<const T*>(src + (sy + 1) * srcStride) + sx * channels;
+                for(unsigned int c = 0; c < channels; c++) {
+                    std::uint32_t value = top[c] * w[0] + top[c + channels] * w[1] + bottom[c] * w[2] + bottom[c + channels] * w[3];
+                    pixel[c] = static_cast<T>((value + ROUND) >> WEIGHT_BITS);
+                }
+            } else {
+                // Border, samples outside of the source are black
+                for(unsigned int c = 0; c < channels; c++) {
+                    std::uint32_t value = sample(sx, sy, c) * w[0] + sample(sx + 1, sy, c) * w[1] + sample(sx, sy + 1, c) * w[2] + sample(sx + 1, sy + 1, c) * w[3];
+                    pixel[c] = static_cast<T>((value + ROUND) >> WEIGHT_BITS);
+                }
+            }
+        }
+    }
+}
+
+std::string getCachePath(const std::string& directory, std::uint64_t key) {
+    return (directory.empty() ? getCacheDirectory() : directory) + "/rectification_" + hashToHex(key) + ".bin";
+}
+
+// Contents: camera matrix, coordinates, fractions. Size is part of the key
+std::shared_ptr<RectificationMaps> loadMaps(const std::string& path, std::uint64_t key, unsigned int width, unsigned int height) {
+    std::vector<std::uint8_t> data;
+    if(!loadCacheFile(path, key, data)) return nullptr;
+    auto maps = std::make_shared<RectificationMaps>();
+    maps->width = width;
+    maps->height = height;
+    maps->coordinates.resize(static_cast<std::size_t>(width) * height * 2);
+    maps->fractions.resize(static_cast<std::size_t>(width) * height);
+    std::size_t coordinatesSize = maps->coordinates.size() * sizeof(std::int16_t);
+    std::size_t fractionsSize = maps->fractions.size() * sizeof(std::uint16_t);
+    if(data.size() != sizeof(maps->cameraMatrix) + coordinatesSize + fractionsSize) return nullptr;
+    const std::uint8_t* position = data.data();
+    std::memcpy(maps->cameraMatrix.data(), position, sizeof(maps->cameraMatrix));
+    position += sizeof(maps->cameraMatrix);
+    std::memcpy(maps->coordinates.data(), position, coordinatesSize);
+    position += coordinatesSize;
+    std::memcpy(maps->fractions.data(), position, fractionsSize);
+    return maps;
+}
+
+void storeMaps(const std::string& path, std::uint64_t key, const RectificationMaps& maps) {
+    std::size_t coordinatesSize = maps.coordinates.size() * sizeof(std::int16_t);
+    std::size_t fractionsSize = maps.fractions.size() * sizeof(std::uint16_t);
+    std::vector<std::uint8_t> data(sizeof(maps.cameraMatrix) + coordinatesSize + fractionsSize);
+    std::uint8_t* position = data.data();
+    std::memcpy(position, maps.cameraMatrix.data(), sizeof(maps.cameraMatrix));
+    position += sizeof(maps.cameraMatrix);
+    std::memcpy(position, maps.coordinates.data(), coordinatesSize);
+    position += coordinatesSize;
+    std::memcpy(position, maps.fractions.data(), fractionsSize);
+    // Cache is an optimization, failing to store it isn't an error
+    storeCacheFile(path, key, data);
+}
+
+}  // namespace
+
+bool Rectification::toSource(double u, double v, double& x, double& y) const {
+    double rx = (u - cx) / fx;
+    double ry = (v - cy) / fy;
+    // Inverse rotation is the transpose
+    const auto& r = rotation;
+    double sx = r[0] * rx + r[3] * ry + r[6];
+    double sy = r[1] * rx + r[4] * ry + r[7];
+    double sz = r[2] * rx + r[5] * ry + r[8];
+    if(sz <= 0) return false;
+    double xd, yd;
+    source.distort(sx / sz, sy / sz, xd, yd);
+    x = source.fx * xd + source.cx;
+    y = source.fy * yd + source.cy;
+    return std::isfinite(x) && std::isfinite(y);
+}
+
+Rectification getRectification(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, int width, int height, float alpha) {
+    if(width <= 0 || height <= 0) throw std::invalid_argument("Size must be positive");
+    if(alpha > 1) throw std::invalid_argument("Alpha must be at most 1");
+
+    Rectification rectification;
+    rectification.source = getCameraGeometry(calibration, camera, width, height);
+
+    // Stereo cameras are rectified together with the other camera of the pair
+    auto left = calibration.getStereoLeftCameraId();
+    auto right = calibration.getStereoRightCameraId();
+    bool stereo = left != dai::CameraBoardSocket::AUTO && right != dai::CameraBoardSocket::AUTO && left != right && (camera == left || camera == right);
+    Rectification other;
+    if(stereo) {
+        auto otherCamera = camera == left ? right : left;
+        rectification.rotation = toMatrix3(camera == left ? calibration.getStereoLeftRectificationRotation() : calibration.getStereoRightRectificationRotation());
+        other.source = getCameraGeometry(calibration, otherCamera, width, height);
+        other.rotation = toMatrix3(camera == left ? calibration.getStereoRightRectificationRotation() : calibration.getStereoLeftRectificationRotation());
+    }
+
+    if(alpha < 0) {
+        const auto& intrinsics = stereo && camera == left ? other.source : rectification.source;
+        rectification.fx = intrinsics.fx;
+        rectification.fy = intrinsics.fy;
+        rectification.cx = intrinsics.cx;
+        rectification.cy = intrinsics.cy;
+        return rectification;
+    }
+
+    Rect inner, outer;
+    getBounds(rectification.source, rectification.rotation, width, height, inner, outer);
+    if(stereo) {
+        // Views of both cameras must be valid (inner) or fully visible (outer)
+        Rect otherInner, otherOuter;
+        getBounds(other.source, other.rotation, width, height, otherInner, otherOuter);
+        inner = {std::max(inner.x0, otherInner.x0), std::max(inner.y0, otherInner.y0), std::min(inner.x1, otherInner.x1), std::min(inner.y1, otherInner.y1)};
+        outer = {std::min(outer.x0, otherOuter.x0), std::min(outer.y0, otherOuter.y0), std::max(outer.x1, otherOuter.x1), std::max(outer.y1, otherOuter.y1)};
+    }
+    if(!(inner.x1 > inner.x0 && inner.y1 > inner.y0 && outer.x1 > outer.x0 && outer.y1 > outer.y0)) {
+        throw std::runtime_error("Camera has no valid region after rectification");
+    }
+
+    // Square pixels, centered on the region
+    double w = width - 1;
+    double h = height - 1;
+    double innerFocal = std::max(w / (inner.x1 - inner.x0), h / (inner.y1 - inner.y0));
+    double outerFocal = std::min(w / (outer.x1 - outer.x0), h / (outer.y1 - outer.y0));
+    double focal = innerFocal + (outerFocal - innerFocal) * alpha;
+    double centerX = (inner.x0 + inner.x1) / 2 + ((outer.x0 + outer.x1) / 2 - (inner.x0 + inner.x1) / 2) * alpha;
+    double centerY = (inner.y0 + inner.y1) / 2 + ((outer.y0 + outer.y1) / 2 - (inner.y0 + inner.y1) / 2) * alpha;
+    rectification.fx = focal;
+    rectification.fy = focal;
+    rectification.cx = w / 2 - focal * centerX;
+    rectification.cy = h / 2 - focal * centerY;
+    return rectification;
+}
+
+RectificationMaps computeRectificationMaps(const Rectification& rectification, unsigned int width, unsigned int height) {
+    if(width == 0 || height == 0) throw std::invalid_argument("Size must be positive");
+    if(width > static_cast<unsigned int>(std::numeric_limits<std::int16_t>::max())) throw std::invalid_argument("Width doesn't fit fixed point maps");
+    if(height > static_cast<unsigned int>(std::numeric_limits<std::int16_t>::max())) throw std::invalid_argument("Height doesn't fit fixed point maps");
+
+    RectificationMaps maps;
+    maps.width = width;
+    maps.height = height;
+    maps.cameraMatrix = {static_cast<float>(rectification.fx), 0, static_cast<float>(rectification.cx), 0, static_cast<float>(rectification.fy), static_cast<float>(rectification.cy), 0, 0, 1};
+    maps.coordinates.resize(static_cast<std::size_t>(width) * height * 2);
+    maps.fractions.resize(static_cast<std::size_t>(width) * height);
+
+    constexpr double LIMIT = std::numeric_limits<std::int16_t>::max();
+    auto computeRows = [&rectification, &maps, width, LIMIT](unsigned int begin, unsigned int end) {
+        for(unsigned int v = begin; v < end; v++) {
+            std::int16_t* coordinates = maps.coordinates.data() + static_cast<std::size_t>(v) * width * 2;
+            std::uint16_t* fractions = maps.fractions.data() + static_cast<std::size_t>(v) * width;
+            for(unsigned int u = 0; u < width; u++) {
+                double x, y;
+                if(!rectification.toSource(u, v, x, y)) {
+                    // Far outside of any image
+                    x = -LIMIT;
+                    y = -LIMIT;
+                }
+                auto ix = static_cast<long>(std::lround(std::max(-LIMIT, std::min(LIMIT, x)) * RectificationMaps::INTER_TAB_SIZE));
+                auto iy = static_cast<long>(std::lround(std::max(-LIMIT, std::min(LIMIT, y)) * RectificationMaps::INTER_TAB_SIZE));
+                coordinates[2 * u] = static_cast<std::int16_t>(std::max(-LIMIT - 1, std::min(LIMIT, static_cast<double>(ix >> RectificationMaps::INTER_BITS))));
+                coordinates[2 * u + 1] = static_cast<std::int16_t>(std::max(-LIMIT - 1, std::min(LIMIT, static_cast<double>(iy >> RectificationMaps::INTER_BITS))));
+                fractions[u] = static_cast<std::uint16_t>((iy & (RectificationMaps::INTER_TAB_SIZE - 1)) * RectificationMaps::INTER_TAB_SIZE + (ix & (RectificationMaps::INTER_TAB_SIZE - 1)));
+            }
+        }
+    };
+
+    ThreadPool pool;
+    for(unsigned int begin = 0; begin < height; begin += ROWS_PER_TASK) {
+        unsigned int end = std::min(height, begin + ROWS_PER_TASK);
+        pool.submit([&computeRows, begin, end]() { computeRows(begin, end); });
+    }
+    pool.wait();
+    return maps;
+}
+
+std::shared_ptr<RectificationMaps> getRectificationMaps(dai::CalibrationHandler& calibration,
+                                                        dai::CameraBoardSocket camera,
+                                                        unsigned int width,
+                                                        unsigned int height,
+                                                        float alpha,
+                                                        bool useCache,
+                                                        const std::string& cacheDirectory) {
+    std::string path;
+    std::uint64_t key = 0;
+    if(useCache) {
+        // Negative alphas are all equal
+        float keyAlpha = std::max(alpha, -1.0f);
+        std::int32_t arguments[4] = {static_cast<std::int32_t>(camera), static_cast<std::int32_t>(width), static_cast<std::int32_t>(height), 0};
+        std::memcpy(&arguments[3], &keyAlpha, sizeof(keyAlpha));
+        key = hash64(arguments, sizeof(arguments), hashCalibration(calibration) + FORMAT_VERSION);
+        path = getCachePath(cacheDirectory, key);
+        auto maps = loadMaps(path, key, width, height);
+        if(maps != nullptr) return maps;
+    }
+
+    auto rectification = getRectification(calibration, camera, static_cast<int>(width), static_cast<int>(height), alpha);
+    auto maps = std::make_shared<RectificationMaps>(computeRectificationMaps(rectification, width, height));
+    if(useCache) storeMaps(path, key, *maps);
+    return maps;
+}
+
+void remap(const std::uint8_t* src,
+           unsigned int srcWidth,
+           unsigned int srcHeight,
+           std::size_t srcStride,
+           unsigned int channels,
+           unsigned int bytesPerSample,
+           const RectificationMaps& maps,
+           std::uint8_t* dst,
+           std::size_t dstStride) {
+    if(channels == 0) throw std::invalid_argument("Image must have at least one channel");
+    if(bytesPerSample == 1) {
+        remapRows<std::uint8_t>(src, srcWidth, srcHeight, srcStride, channels, maps, dst, dstStride);
+    } else if(bytesPerSample == 2) {
+        remapRows<std::uint16_t>(src, srcWidth, srcHeight, srcStride, channels, maps, dst, dstStride);
+    } else {
+        throw std::invalid_argument("Only 8 and 16 bit samples can be remapped");
+    }
+}
@@ -0,0 +1,99 @@
+#pragma once
+
+// std
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+// project
+#include "CameraGeometry.hpp"
+
+/**
+ * @brief Mapping of a rectified (undistorted and, for stereo cameras, rotated) view back to the camera's image
+ */
+struct Rectification {
+    /// Geometry of the camera's image
+    CameraGeometry source;
+    /// Rotation from the camera to the rectified view, row major
+    std::array<double, 9> rotation{{1, 0, 0, 0, 1, 0, 0, 0, 1}};
+    /// Intrinsics of the rectified view, in pixels
+    double fx = 1, fy = 1, cx = 0, cy = 0;
+
+    /**
+     * Maps a pixel of the rectified view to the camera's image
+     * @returns False if the pixel's ray doesn't reach the camera
+     */
+    bool toSource(double u, double v, double& x, double& y) const;
+};
+
+/**
+ * Computes rectification of a camera. Stereo cameras are rotated by their rectification rotations
+ * and share the intrinsics of the rectified view, other cameras are only undistorted.
+ *
+ * @param width Width of camera and rectified images
+ * @param height Height of camera and rectified images
+ * @param alpha Negative keeps the intrinsics of the stereo right camera (own intrinsics for other cameras), as on device.
+ * Between 0 and 1 scales the view, from only valid pixels (0) to all pixels of the camera (1)
+ */
+Rectification getRectification(dai::CalibrationHandler& calibration, dai::CameraBoardSocket camera, int width, int height, float alpha = -1);
+
+/**
+ * @brief Remap tables in fixed point, the same layout as OpenCV's CV_16SC2 and CV_16UC1 maps.
+ *
+ * Each pixel takes 6 bytes instead of 8 for float maps, and can also be passed to cv2.remap with INTER_LINEAR
+ */
+struct RectificationMaps {
+    /// Bits of fractional source coordinates
+    static constexpr int INTER_BITS = 5;
+    static constexpr int INTER_TAB_SIZE = 1 << INTER_BITS;
+
+    unsigned int width = 0;
+    unsigned int height = 0;
+    /// Intrinsics of the rectified image, row major 3x3
+    std::array<float, 9> cameraMatrix{};
+    /// Integer part of source coordinates, x and y interleaved
+    std::vector<std::int16_t> coordinates;
+    /// Fractional part of source coordinates in 1/32 pixels, y fraction * 32 + x fraction
+    std::vector<std::uint16_t> fractions;
+};
+
+/// Computes remap tables of a rectification, rows are computed in parallel
+RectificationMaps computeRectificationMaps(const Rectification& rectification, unsigned int width, unsigned int height);
+
+/**
+ * Returns remap tables of a camera, loading them from the disk cache when possible.
+ * Cached tables are keyed by a hash of all calibration data and the arguments
+ *
+ * @param alpha See getRectification
+ * @param useCache Whether tables are loaded from and stored to the disk cache
+ * @param cacheDirectory Directory of cached tables, empty for getCacheDirectory()
+ */
+std::shared_ptr<RectificationMaps> getRectificationMaps(dai::CalibrationHandler& calibration,
+                                                        dai::CameraBoardSocket camera,
+                                                        unsigned int width,
+                                                        unsigned int height,
+                                                        float alpha = -1,
+                                                        bool useCache = true,
+                                                        const std::string& cacheDirectory = "");
+
+/**
+ * Remaps an image with bilinear interpolation, pixels outside of the source are black
+ * @param src Source image, rows of 'channels' interleaved samples
+ * @param bytesPerSample 1 (8 bit) or 2 (16 bit samples)
+ * @param dst Destination image of maps' size, same format as source
+ */
+void remap(const std::uint8_t* src,
+           unsigned int srcWidth,
+           unsigned int srcHeight,
+           std::size_t srcStride,
+           unsigned int channels,
+           unsigned int bytesPerSample,
+           const RectificationMaps& maps,
+           std::uint8_t* dst,
+           std::size_t dstStride);
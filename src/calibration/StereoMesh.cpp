@@ -0,0 +1,110 @@
+#include "StereoMesh.hpp"
+
+// std
+#include <algorithm>
+#include <cstring>
+#include <stdexcept>
+
+// project
+#include "Rectification.hpp"
+#include "utility/CacheDirectory.hpp"
+#include "utility/Hash.hpp"
+
+namespace {
+
+// Version of cached contents, part of the key
+constexpr std::uint32_t FORMAT_VERSION = 1;
+
+std::vector<std::uint8_t> computeMesh(const Rectification& rectification, const StereoMesh& mesh) {
+    std::vector<float> points;
+    points.reserve(static_cast<std::size_t>(mesh.numColumns) * mesh.numRows * 2);
+    for(unsigned int row = 0; row < mesh.numRows; row++) {
+        // Last row and column sample the edge pixels
+        unsigned int v = std::min(row * mesh.stepHeight, mesh.height - 1);
+        for(unsigned int column = 0; column <= mesh.width / mesh.stepWidth; column++) {
+            unsigned int u = std::min(column * mesh.stepWidth, mesh.width - 1);
+            double x, y;
+            if(!rectification.toSource(u, v, x, y)) {
+                // Ray doesn't reach the camera, sampled from outside of the image
+                x = -1;
+                y = -1;
+            }
+            points.push_back(static_cast<float>(y));
+            points.push_back(static_cast<float>(x));
+        }
+        if(points.size() % (mesh.numColumns * 2) != 0) {
+            points.push_back(0);
+            points.push_back(0);
+        }
+    }
+    std::vector<std::uint8_t> data(points.size() * sizeof(float));
+    std::memcpy(data.data(), points.data(), data.size());
+    return data;
+}
+
+// Mesh without points
+StereoMesh getLayout(unsigned int width, unsigned int height, unsigned int stepWidth, unsigned int stepHeight) {
+    StereoMesh mesh;
+    mesh.width = width;
+    mesh.height = height;
+    mesh.stepWidth = stepWidth;
+    mesh.stepHeight = stepHeight;
+    mesh.numColumns = width / stepWidth + 1 + ((width % stepWidth) % 2 != 0 ? 1 : 0);
+    mesh.numRows = height / stepHeight + 1;
+    return mesh;
+}
+
+std::string getCachePath(const std::string& directory, const std::string& mxId, std::uint64_t key) {
+    return (directory.empty() ? getCacheDirectory() : directory) + "/mesh_" + (mxId.empty() ? "" : mxId + "_") + hashToHex(key) + ".bin";
+}
+
+}  // namespace
+
+StereoMesh computeStereoMesh(dai::CalibrationHandler& calibration, unsigned int width, unsigned int height, unsigned int stepWidth, unsigned int stepHeight) {
+    if(width == 0 || height == 0) throw std::invalid_argument("Size must be positive");
+    if(stepWidth == 0 || stepHeight == 0 || stepWidth > width || stepHeight > height) throw std::invalid_argument("Mesh step must be positive and at most the size");
+    auto left = calibration.getStereoLeftCameraId();
+    auto right = calibration.getStereoRightCameraId();
+    if(left == dai::CameraBoardSocket::AUTO || right == dai::CameraBoardSocket::AUTO || left == right) {
+        throw std::runtime_error("Calibration has no stereo pair");
+    }
+
+    auto mesh = getLayout(width, height, stepWidth, stepHeight);
+    // Only mesh points are computed, a small fraction of a full remap table
+    mesh.left = computeMesh(getRectification(calibration, left, static_cast<int>(width), static_cast<int>(height)), mesh);
+    mesh.right = computeMesh(getRectification(calibration, right, static_cast<int>(width), static_cast<int>(height)), mesh);
+    return mesh;
+}
+
+std::shared_ptr<StereoMesh> getStereoMesh(dai::CalibrationHandler& calibration,
+                                          unsigned int width,
+                                          unsigned int height,
+                                          unsigned int stepWidth,
+                                          unsigned int stepHeight,
+                                          const std::string& mxId,
+                                          bool useCache,
+                                          const std::string& cacheDirectory) {
+    if(!useCache) return std::make_shared<StereoMesh>(computeStereoMesh(calibration, width, height, stepWidth, stepHeight));
+
+    std::uint32_t arguments[4] = {width, height, stepWidth, stepHeight};
+    std::uint64_t key = hash64(arguments, sizeof(arguments), hashCalibration(calibration) + FORMAT_VERSION);
+    auto path = getCachePath(cacheDirectory, mxId, key);
+
+    // Contents: left mesh followed by the right one, sizes follow from the key
+    std::vector<std::uint8_t> data;
+    if(loadCacheFile(path, key, data)) {
+        auto mesh = std::make_shared<StereoMesh>(getLayout(width, height, stepWidth, stepHeight));
+        if(data.size() == static_cast<std::size_t>(mesh->numColumns) * mesh->numRows * 2 * sizeof(float) * 2) {
+            mesh->left.assign(data.begin(), data.begin() + data.size() / 2);
+            mesh->right.assign(data.begin() + data.size() / 2, data.end());
+            return mesh;
+        }
+    }
+
+    auto mesh = std::make_shared<StereoMesh>(computeStereoMesh(calibration, width, height, stepWidth, stepHeight));
+    data = mesh->left;
+    data.insert(data.end(), mesh->right.begin(), mesh->right.end());
+    // Cache is an optimization, failing to store it isn't an error
+    storeCacheFile(path, key, data);
+    return mesh;
+}
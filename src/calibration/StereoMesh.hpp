@@ -0,0 +1,51 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+/**
+ * @brief Warp meshes rectifying the stereo pair, in the format of StereoDepth::loadMeshData.
+ *
+ * A mesh is a grid of (y, x) floats, row by row, with source coordinates of every step-th rectified pixel
+ * including the right and bottom edges. Rows are padded with a (0, 0) point when width % stepWidth is odd.
+ * Both cameras are rectified to the stereo right camera's intrinsics, as on device
+ */
+struct StereoMesh {
+    unsigned int width = 0;
+    unsigned int height = 0;
+    unsigned int stepWidth = 0;
+    unsigned int stepHeight = 0;
+    /// Number of points per row, including padding
+    unsigned int numColumns = 0;
+    unsigned int numRows = 0;
+    /// Mesh of the stereo left camera
+    std::vector<std::uint8_t> left;
+    /// Mesh of the stereo right camera
+    std::vector<std::uint8_t> right;
+};
+
+/// Computes meshes of the stereo pair at given input resolution. Throws if calibration has no stereo pair
+StereoMesh computeStereoMesh(dai::CalibrationHandler& calibration, unsigned int width, unsigned int height, unsigned int stepWidth = 16, unsigned int stepHeight = 16);
+
+/**
+ * Returns meshes of the stereo pair, loading them from the disk cache when possible.
+ * Cached meshes are stored per device and keyed by a hash of all calibration data and the arguments
+ *
+ * @param mxId MxId of the device, groups cached meshes per device. May be empty
+ * @param useCache Whether meshes are loaded from and stored to the disk cache
+ * @param cacheDirectory Directory of cached meshes, empty for getCacheDirectory()
+ */
+std::shared_ptr<StereoMesh> getStereoMesh(dai::CalibrationHandler& calibration,
+                                          unsigned int width,
+                                          unsigned int height,
+                                          unsigned int stepWidth = 16,
+                                          unsigned int stepHeight = 16,
+                                          const std::string& mxId = "",
+                                          bool useCache = true,
+                                          const std::string& cacheDirectory = "");
@@ -0,0 +1,114 @@
+#include "CalibrationCache.hpp"
+
+template <typename Key, typename Value, typename Compute>
+Value CalibrationCache::lookup(std::map<Key, Value>& results, const Key& key, Compute compute) {
+    std::uint64_t current;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        current = generation;
+    }
+    return lookup(results, key, current, compute);
+}
+
+template <typename Key, typename Value, typename Compute>
+Value CalibrationCache::lookup(std::map<Key, Value>& results, const Key& key, std::uint64_t generation, Compute compute) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        auto it = results.find(key);
+        if(it != results.end()) return it->second;
+    }
+    Value value = compute();
+    std::lock_guard<std::mutex> lock(mtx);
+    // Calibration changed during compute, the result is returned but not memoized
+    if(generation == this->generation) results[key] = value;
+    return value;
+}
+
+CalibrationCache::Matrix CalibrationCache::getCameraIntrinsics(dai::CalibrationHandler& calibration,
+                                                               dai::CameraBoardSocket cameraId,
+                                                               int resizeWidth,
+                                                               int resizeHeight,
+                                                               dai::Point2f topLeftPixelId,
+                                                               dai::Point2f bottomRightPixelId) {
+    IntrinsicsKey key{cameraId, resizeWidth, resizeHeight, topLeftPixelId.x, topLeftPixelId.y, bottomRightPixelId.x, bottomRightPixelId.y};
+    return lookup(intrinsics, key, [&]() { return calibration.getCameraIntrinsics(cameraId, resizeWidth, resizeHeight, topLeftPixelId, bottomRightPixelId); });
+}
+
+std::vector<float> CalibrationCache::getDistortionCoefficients(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId) {
+    return lookup(distortions, cameraId, [&]() { return calibration.getDistortionCoefficients(cameraId); });
+}
+
+CalibrationCache::Matrix CalibrationCache::getCameraExtrinsics(dai::CalibrationHandler& calibration,
+                                                               dai::CameraBoardSocket srcCamera,
+                                                               dai::CameraBoardSocket dstCamera,
+                                                               bool useSpecTranslation) {
+    ExtrinsicsKey key{CAMERA, srcCamera, dstCamera, useSpecTranslation};
+    return lookup(extrinsics, key, [&]() { return calibration.getCameraExtrinsics(srcCamera, dstCamera, useSpecTranslation); });
+}
+
+CalibrationCache::Matrix CalibrationCache::getCameraToImuExtrinsics(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId, bool useSpecTranslation) {
+    ExtrinsicsKey key{CAMERA_TO_IMU, cameraId, dai::CameraBoardSocket::AUTO, useSpecTranslation};
+    return lookup(extrinsics, key, [&]() { return calibration.getCameraToImuExtrinsics(cameraId, useSpecTranslation); });
+}
+
+CalibrationCache::Matrix CalibrationCache::getImuToCameraExtrinsics(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId, bool useSpecTranslation) {
+    ExtrinsicsKey key{IMU_TO_CAMERA, cameraId, dai::CameraBoardSocket::AUTO, useSpecTranslation};
+    return lookup(extrinsics, key, [&]() { return calibration.getImuToCameraExtrinsics(cameraId, useSpecTranslation); });
+}
+
+CalibrationCache::Matrix CalibrationCache::getStereoLeftRectificationRotation(dai::CalibrationHandler& calibration) {
+    ExtrinsicsKey key{LEFT_RECTIFICATION, dai::CameraBoardSocket::AUTO, dai::CameraBoardSocket::AUTO, false};
+    return lookup(extrinsics, key, [&]() { return calibration.getStereoLeftRectificationRotation(); });
+}
+
+CalibrationCache::Matrix CalibrationCache::getStereoRightRectificationRotation(dai::CalibrationHandler& calibration) {
+    ExtrinsicsKey key{RIGHT_RECTIFICATION, dai::CameraBoardSocket::AUTO, dai::CameraBoardSocket::AUTO, false};
+    return lookup(extrinsics, key, [&]() { return calibration.getStereoRightRectificationRotation(); });
+}
+
+std::shared_ptr<RectificationMaps> CalibrationCache::getRectificationMaps(dai::CalibrationHandler& calibration,
+                                                                         dai::CameraBoardSocket camera,
+                                                                         unsigned int width,
+                                                                         unsigned int height,
+                                                                         float alpha,
+                                                                         bool useCache,
+                                                                         const std::string& cacheDirectory) {
+    // Disk cache arguments don't change the result
+    MapsKey key{camera, width, height, alpha < 0 ? -1.0f : alpha};
+    return lookup(rectificationMaps, key, [&]() { return ::getRectificationMaps(calibration, camera, width, height, alpha, useCache, cacheDirectory); });
+}
+
+std::shared_ptr<RectificationMaps> CalibrationCache::getRectificationMaps(Snapshot& snapshot,
+                                                                         dai::CameraBoardSocket camera,
+                                                                         unsigned int width,
+                                                                         unsigned int height,
+                                                                         float alpha,
+                                                                         bool useCache,
+                                                                         const std::string& cacheDirectory) {
+    MapsKey key{camera, width, height, alpha < 0 ? -1.0f : alpha};
+    return lookup(rectificationMaps, key, snapshot.generation, [&]() {
+        return ::getRectificationMaps(snapshot.calibration, camera, width, height, alpha, useCache, cacheDirectory);
+    });
+}
+
+CalibrationCache::Snapshot CalibrationCache::snapshot(const dai::CalibrationHandler& calibration) const {
+    Snapshot result;
+    result.calibration = calibration;
+    std::lock_guard<std::mutex> lock(mtx);
+    result.generation = generation;
+    return result;
+}
+
+void CalibrationCache::clear() {
+    std::lock_guard<std::mutex> lock(mtx);
+    generation++;
+    intrinsics.clear();
+    distortions.clear();
+    extrinsics.clear();
+    rectificationMaps.clear();
+}
+
+std::size_t CalibrationCache::getSize() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return intrinsics.size() + distortions.size() + extrinsics.size() + rectificationMaps.size();
+}
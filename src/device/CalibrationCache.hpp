@@ -0,0 +1,99 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <tuple>
+#include <vector>
+
+// depthai
+#include "depthai/device/CalibrationHandler.hpp"
+
+// project
+#include "calibration/Rectification.hpp"
+
+/**
+ * @brief Memoizes matrices derived from a calibration, so repeated queries don't recompute them from EEPROM data.
+ *
+ * Results are keyed by their arguments (camera, destination shape, crop, ...). The cache doesn't track changes
+ * of the calibration, it must be cleared whenever the calibration is modified.
+ */
+class CalibrationCache {
+   public:
+    using Matrix = std::vector<std::vector<float>>;
+
+    /// Copy of a calibration taken along with the cache generation, so results can be computed while the original is modified
+    struct Snapshot {
+        dai::CalibrationHandler calibration;
+        std::uint64_t generation = 0;
+    };
+
+    /// Same as CalibrationHandler::getCameraIntrinsics, with a destination size of -1 keeping the calibrated size
+    Matrix getCameraIntrinsics(dai::CalibrationHandler& calibration,
+                               dai::CameraBoardSocket cameraId,
+                               int resizeWidth = -1,
+                               int resizeHeight = -1,
+                               dai::Point2f topLeftPixelId = dai::Point2f(),
+                               dai::Point2f bottomRightPixelId = dai::Point2f());
+    /// Same as CalibrationHandler::getDistortionCoefficients
+    std::vector<float> getDistortionCoefficients(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId);
+    /// Same as CalibrationHandler::getCameraExtrinsics
+    Matrix getCameraExtrinsics(dai::CalibrationHandler& calibration, dai::CameraBoardSocket srcCamera, dai::CameraBoardSocket dstCamera, bool useSpecTranslation = false);
+    /// Same as CalibrationHandler::getCameraToImuExtrinsics
+    Matrix getCameraToImuExtrinsics(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId, bool useSpecTranslation = false);
+    /// Same as CalibrationHandler::getImuToCameraExtrinsics
+    Matrix getImuToCameraExtrinsics(dai::CalibrationHandler& calibration, dai::CameraBoardSocket cameraId, bool useSpecTranslation = false);
+    /// Same as CalibrationHandler::getStereoLeftRectificationRotation
+    Matrix getStereoLeftRectificationRotation(dai::CalibrationHandler& calibration);
+    /// Same as CalibrationHandler::getStereoRightRectificationRotation
+    Matrix getStereoRightRectificationRotation(dai::CalibrationHandler& calibration);
+    /// Same as getRectificationMaps (calibration/Rectification.hpp), tables are shared between calls
+    std::shared_ptr<RectificationMaps> getRectificationMaps(dai::CalibrationHandler& calibration,
+                                                            dai::CameraBoardSocket camera,
+                                                            unsigned int width,
+                                                            unsigned int height,
+                                                            float alpha = -1,
+                                                            bool useCache = true,
+                                                            const std::string& cacheDirectory = "");
+    /// Same as getRectificationMaps, computed from a snapshot. Maps aren't memoized if the cache was cleared since the snapshot was taken
+    std::shared_ptr<RectificationMaps> getRectificationMaps(Snapshot& snapshot,
+                                                            dai::CameraBoardSocket camera,
+                                                            unsigned int width,
+                                                            unsigned int height,
+                                                            float alpha = -1,
+                                                            bool useCache = true,
+                                                            const std::string& cacheDirectory = "");
+
+    /// @returns Copy of the calibration, to be taken while the calibration can't be modified (eg. with the GIL held)
+    Snapshot snapshot(const dai::CalibrationHandler& calibration) const;
+    /// Drops all memoized results, must be called when the calibration changes
+    void clear();
+    /// @returns Number of memoized results
+    std::size_t getSize() const;
+
+   private:
+    using IntrinsicsKey = std::tuple<dai::CameraBoardSocket, int, int, float, float, float, float>;
+    using ExtrinsicsKey = std::tuple<int, dai::CameraBoardSocket, dai::CameraBoardSocket, bool>;
+    using MapsKey = std::tuple<dai::CameraBoardSocket, unsigned int, unsigned int, float>;
+
+    enum ExtrinsicsKind { CAMERA, CAMERA_TO_IMU, IMU_TO_CAMERA, LEFT_RECTIFICATION, RIGHT_RECTIFICATION };
+
+    // Computes outside of the lock, errors aren't memoized
+    template <typename Key, typename Value, typename Compute>
+    Value lookup(std::map<Key, Value>& results, const Key& key, Compute compute);
+    // Same, for a calibration read at 'generation'. Result isn't memoized if the cache was cleared since
+    template <typename Key, typename Value, typename Compute>
+    Value lookup(std::map<Key, Value>& results, const Key& key, std::uint64_t generation, Compute compute);
+
+    mutable std::mutex mtx;
+    // Incremented by clear, so results computed from an older calibration can be told apart
+    std::uint64_t generation = 0;
+    std::map<IntrinsicsKey, Matrix> intrinsics;
+    std::map<dai::CameraBoardSocket, std::vector<float>> distortions;
+    std::map<ExtrinsicsKey, Matrix> extrinsics;
+    std::map<MapsKey, std::shared_ptr<RectificationMaps>> rectificationMaps;
+};
@@ -0,0 +1,136 @@
+#include "DeviceOpener.hpp"
+
+// std
+#include <chrono>
+#include <memory>
+#include <mutex>
+#include <set>
+#include <string>
+#include <thread>
+#include <tuple>
+
+// depthai
+#include "depthai/xlink/XLinkConnection.hpp"
+
+// project
+#include "pipeline/PipelineBlobs.hpp"
+
+namespace {
+
+// Devices selected by opens which haven't finished booting them yet, by XLink name
+std::mutex claimedMutex;
+std::set<std::string> claimedDevices;
+
+// Set on shutdown, aborts all pending opens
+std::atomic<bool> shuttingDown{false};
+
+std::mutex workerMutex;
+std::unique_ptr<ThreadPool> worker;
+
+// Claim on a device for the duration of its boot, so concurrent searches select different devices
+class DeviceClaim {
+   public:
+    DeviceClaim() = default;
+    DeviceClaim(const DeviceClaim&) = delete;
+    DeviceClaim& operator=(const DeviceClaim&) = delete;
+    ~DeviceClaim() {
+        if(name.empty()) return;
+        std::unique_lock<std::mutex> lock(claimedMutex);
+        claimedDevices.erase(name);
+    }
+
+    // Claims the first available device which isn't claimed already, in the order of Device::getFirstAvailableDevice
+    bool claimAvailable(dai::DeviceInfo& info) {
+        auto devices = dai::Device::getAllAvailableDevices();
+        std::unique_lock<std::mutex> lock(claimedMutex);
+        for(auto state : {X_LINK_UNBOOTED, X_LINK_BOOTLOADER}) {
+            for(const auto& device : devices) {
+                if(device.state == state && claimLocked(device)) {
+                    info = device;
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
+
+    bool claim(const dai::DeviceInfo& info) {
+        std::unique_lock<std::mutex> lock(claimedMutex);
+        return claimLocked(info);
+    }
+
+   private:
+    std::string name;
+
+    bool claimLocked(const dai::DeviceInfo& info) {
+        if(!claimedDevices.insert(info.desc.name).second) return false;
+        name = info.desc.name;
+        return true;
+    }
+};
+
+bool isCancelled(const std::atomic<bool>& cancelled) {
+    return cancelled || shuttingDown;
+}
+
+}  // namespace
+
+std::unique_ptr<dai::Device> openDevice(const dai::Pipeline& pipeline, const dai::DeviceInfo* deviceInfo, bool usb2Mode, const std::atomic<bool>& cancelled) {
+    using namespace std::chrono;
+
+    // Fail before searching and booting if blobs can't run with pipeline OpenVINO version
+    validatePipelineOpenVINOVersion(pipeline);
+
+    bool found = false;
+    dai::DeviceInfo info;
+    DeviceClaim claim;
+    if(deviceInfo != nullptr) {
+        info = *deviceInfo;
+        if(!claim.claim(info)) throw std::runtime_error("Device is already being opened");
+        found = true;
+    } else {
+        auto startTime = steady_clock::now();
+        do {
+            if(isCancelled(cancelled)) throw DeviceOpenCancelled();
+            found = claim.claimAvailable(info);
+            if(found) break;
+            // block for 100ms
+            std::this_thread::sleep_for(milliseconds(100));
+        } while(steady_clock::now() - startTime < dai::Device::DEFAULT_SEARCH_TIME);
+
+        // If neither UNBOOTED nor BOOTLOADER were found (after 'DEFAULT_SEARCH_TIME'), try BOOTED
+        if(!found) {
+            std::tie(found, info) = dai::XLinkConnection::getFirstDevice(X_LINK_BOOTED);
+            if(found && !claim.claim(info)) found = false;
+        }
+    }
+
+    // if no devices found, then throw
+    if(!found) throw std::runtime_error("No available devices");
+    if(isCancelled(cancelled)) throw DeviceOpenCancelled();
+
+    // Booting itself can't be interrupted
+    std::unique_ptr<dai::Device> device(new dai::Device(pipeline, info, usb2Mode));
+    if(isCancelled(cancelled)) {
+        device->close();
+        throw DeviceOpenCancelled();
+    }
+    return device;
+}
+
+ThreadPool& getDeviceWorker() {
+    std::unique_lock<std::mutex> lock(workerMutex);
+    if(!worker) worker.reset(new ThreadPool(4));
+    return *worker;
+}
+
+void shutdownDeviceWorker() {
+    shuttingDown = true;
+    std::unique_ptr<ThreadPool> finished;
+    {
+        std::unique_lock<std::mutex> lock(workerMutex);
+        finished = std::move(worker);
+    }
+    // Joins the workers after their pending tasks finish, opens abort as they are cancelled
+    finished.reset();
+}
@@ -0,0 +1,49 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <memory>
+#include <stdexcept>
+#include <string>
+
+// depthai
+#include "depthai/device/Device.hpp"
+#include "depthai/pipeline/Pipeline.hpp"
+
+// project
+#include "utility/ThreadPool.hpp"
+
+/**
+ * @brief Thrown when a device open is aborted through its cancel flag
+ */
+struct DeviceOpenCancelled : public std::runtime_error {
+    DeviceOpenCancelled() : std::runtime_error("Device open cancelled") {}
+};
+
+/**
+ * Searches for a device (same as blocking Device constructor) and boots it with the pipeline.
+ * Search is aborted as soon as 'cancelled' is set. A device which finishes booting after being
+ * cancelled is closed before throwing. Concurrent opens select different devices, a device
+ * which is being opened isn't selected again until its open finishes.
+ *
+ * @param pipeline Pipeline to start
+ * @param deviceInfo Device to boot, nullptr to search for first available device
+ * @param usb2Mode Boot device using USB2 mode firmware
+ * @param cancelled Flag which aborts the open when set
+ * @returns Opened device, throws DeviceOpenCancelled if cancelled or std::runtime_error if no device found
+ */
+std::unique_ptr<dai::Device> openDevice(const dai::Pipeline& pipeline,
+                                        const dai::DeviceInfo* deviceInfo,
+                                        bool usb2Mode,
+                                        const std::atomic<bool>& cancelled);
+
+/**
+ * @returns Worker threads on which asynchronous device opens and closes are executed
+ */
+ThreadPool& getDeviceWorker();
+
+/**
+ * Cancels pending opens and joins the device worker threads, once their submitted tasks finish.
+ * Must be called before interpreter shutdown, as tasks acquire the GIL to resolve their results
+ */
+void shutdownDeviceWorker();
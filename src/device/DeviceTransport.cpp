@@ -0,0 +1,78 @@
+#include "DeviceTransport.hpp"
+
+// std
+#include <stdexcept>
+#include <thread>
+#include <tuple>
+
+constexpr std::chrono::seconds XLinkDeviceTransport::DEFAULT_SEARCH_TIME;
+
+XLinkDeviceTransport::XLinkDeviceTransport(bool usb2Mode, std::chrono::milliseconds searchTime) : usb2Mode(usb2Mode), searchTime(searchTime) {}
+
+XLinkDeviceTransport::~XLinkDeviceTransport() {
+    disconnect();
+}
+
+std::string XLinkDeviceTransport::connect(const dai::Pipeline& pipeline, const std::string& mxId, MessageCallback callback) {
+    using namespace std::chrono;
+
+    // Search for the device (a rebooted device shows up as UNBOOTED or BOOTLOADER)
+    bool found = false;
+    dai::DeviceInfo deviceInfo;
+    auto startTime = steady_clock::now();
+    do {
+        if(mxId.empty()) {
+            std::tie(found, deviceInfo) = dai::Device::getFirstAvailableDevice();
+        } else {
+            std::tie(found, deviceInfo) = dai::Device::getDeviceByMxId(mxId);
+        }
+        if(found) break;
+        std::this_thread::sleep_for(milliseconds(100));
+    } while(steady_clock::now() - startTime < searchTime);
+
+    if(!found) {
+        throw std::runtime_error(mxId.empty() ? std::string("No available devices") : "Device with MxId '" + mxId + "' not found");
+    }
+
+    // Boot and start the pipeline
+    auto newDevice = std::make_shared<dai::Device>(pipeline, deviceInfo, usb2Mode);
+
+    // Forward all output streams. Device side queues are kept small and non-blocking,
+    // buffering and blocking behavior is up to the receiving side
+    for(const auto& name : newDevice->getOutputQueueNames()) {
+        newDevice->getOutputQueue(name, 4, false)->addCallback(callback);
+    }
+
+    std::string connectedMxId = newDevice->getMxId();
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        device = std::move(newDevice);
+    }
+    return connectedMxId;
+}
+
+void XLinkDeviceTransport::disconnect() {
+    std::shared_ptr<dai::Device> toClose;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toClose = std::move(device);
+        device = nullptr;
+    }
+    if(toClose) toClose->close();
+}
+
+bool XLinkDeviceTransport::isConnected() {
+    std::lock_guard<std::mutex> lock(mtx);
+    return device != nullptr && !device->isClosed();
+}
+
+bool XLinkDeviceTransport::send(const std::string& streamName, std::shared_ptr<dai::ADatatype> msg, std::chrono::milliseconds timeout) {
+    auto dev = getDevice();
+    if(dev == nullptr) return false;
+    return dev->getInputQueue(streamName)->send(msg, timeout);
+}
+
+std::shared_ptr<dai::Device> XLinkDeviceTransport::getDevice() {
+    std::lock_guard<std::mutex> lock(mtx);
+    return device;
+}
@@ -0,0 +1,76 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+
+// depthai
+#include "depthai/device/Device.hpp"
+#include "depthai/pipeline/Pipeline.hpp"
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+/**
+ * @brief Connection to a single device, as seen by ReconnectingDevice.
+ *
+ * Abstracts device discovery, boot and the message streams, so reconnection logic
+ * can be driven by something else than a physical device (eg. a simulated transport in tests).
+ */
+class DeviceTransport {
+   public:
+    /// Called for every message received on any output stream
+    using MessageCallback = std::function<void(std::string, std::shared_ptr<dai::ADatatype>)>;
+
+    virtual ~DeviceTransport() = default;
+
+    /**
+     * Discovers the device, boots it and starts the pipeline.
+     * Throws if device couldn't be found or booted.
+     *
+     * @param pipeline Pipeline to upload
+     * @param mxId MxId of device to connect to, empty for first available device
+     * @param callback Callback to be called with messages from all output streams
+     * @returns MxId of connected device
+     */
+    virtual std::string connect(const dai::Pipeline& pipeline, const std::string& mxId, MessageCallback callback) = 0;
+
+    /// Closes the connection (if any). Must be safe to call multiple times
+    virtual void disconnect() = 0;
+
+    /// @returns True if connection to the device is alive
+    virtual bool isConnected() = 0;
+
+    /**
+     * Sends a message to an input stream
+     * @returns True if message was sent, false on timeout
+     */
+    virtual bool send(const std::string& streamName, std::shared_ptr<dai::ADatatype> msg, std::chrono::milliseconds timeout) = 0;
+};
+
+/**
+ * @brief DeviceTransport over XLink, backed by dai::Device
+ */
+class XLinkDeviceTransport : public DeviceTransport {
+   public:
+    /// Default time to search for a device before giving up a connect attempt
+    static constexpr std::chrono::seconds DEFAULT_SEARCH_TIME{3};
+
+    explicit XLinkDeviceTransport(bool usb2Mode = false, std::chrono::milliseconds searchTime = DEFAULT_SEARCH_TIME);
+    ~XLinkDeviceTransport() override;
+
+    std::string connect(const dai::Pipeline& pipeline, const std::string& mxId, MessageCallback callback) override;
+    void disconnect() override;
+    bool isConnected() override;
+    bool send(const std::string& streamName, std::shared_ptr<dai::ADatatype> msg, std::chrono::milliseconds timeout) override;
+
+    /// @returns Currently connected device or nullptr
+    std::shared_ptr<dai::Device> getDevice();
+
+   private:
+    bool usb2Mode;
+    std::chrono::milliseconds searchTime;
+    std::mutex mtx;
+    std::shared_ptr<dai::Device> device;
+};
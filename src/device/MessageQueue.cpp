@@ -0,0 +1,224 @@
+#include "MessageQueue.hpp"
+
+// std
+#include <stdexcept>
+
+MessageQueue::MessageQueue(std::string name, unsigned int maxSize, bool blocking) : name(std::move(name)), maxSize(maxSize), blocking(blocking) {
+    if(maxSize == 0) throw std::invalid_argument("Queue size can't be 0!");
+}
+
+MessageQueue::~MessageQueue() {
+    close();
+}
+
+std::string MessageQueue::getName() const {
+    return name;
+}
+
+void MessageQueue::setBlocking(bool blocking) {
+    {
+        std::lock_guard<std::mutex> lock(guard);
+        this->blocking = blocking;
+    }
+    signalPop.notify_all();
+}
+
+bool MessageQueue::getBlocking() const {
+    std::lock_guard<std::mutex> lock(guard);
+    return blocking;
+}
+
+void MessageQueue::setMaxSize(unsigned int maxSize) {
+    if(maxSize == 0) throw std::invalid_argument("Queue size can't be 0!");
+    {
+        std::lock_guard<std::mutex> lock(guard);
+        this->maxSize = maxSize;
+    }
+    signalPop.notify_all();
+}
+
+unsigned int MessageQueue::getMaxSize() const {
+    std::lock_guard<std::mutex> lock(guard);
+    return maxSize;
+}
+
+std::size_t MessageQueue::getSize() const {
+    std::lock_guard<std::mutex> lock(guard);
+    return queue.size();
+}
+
+std::uint64_t MessageQueue::getNumPushed() const {
+    return numPushed;
+}
+
+std::uint64_t MessageQueue::getNumDropped() const {
+    return numDropped;
+}
+
+MessageQueue::CallbackId MessageQueue::addCallback(std::function<void(std::string, std::shared_ptr<dai::ADatatype>)> callback) {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    CallbackId id = uniqueCallbackId++;
+    callbacks[id] = std::move(callback);
+    return id;
+}
+
+MessageQueue::CallbackId MessageQueue::addCallback(std::function<void(std::shared_ptr<dai::ADatatype>)> callback) {
+    return addCallback([callback = std::move(callback)](std::string, std::shared_ptr<dai::ADatatype> msg) { callback(std::move(msg)); });
+}
+
+MessageQueue::CallbackId MessageQueue::addCallback(std::function<void()> callback) {
+    return addCallback([callback = std::move(callback)](std::string, std::shared_ptr<dai::ADatatype>) { callback(); });
+}
+
+bool MessageQueue::removeCallback(CallbackId callbackId) {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    return callbacks.erase(callbackId) > 0;
+}
+
+void MessageQueue::callCallbacks(const std::shared_ptr<dai::ADatatype>& msg) {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    for(const auto& kv : callbacks) {
+        // A misbehaving callback mustn't stop the producer
+        try {
+            kv.second(name, msg);
+        } catch(const std::exception&) {
+        }
+    }
+}
+
+bool MessageQueue::send(const std::shared_ptr<dai::ADatatype>& msg) {
+    {
+        std::unique_lock<std::mutex> lock(guard);
+        if(closed) return false;
+        if(!blocking) {
+            // if non blocking, remove as many oldest elements as necessary, so next one will fit
+            while(queue.size() >= maxSize) {
+                queue.pop_front();
+                numDropped++;
+            }
+        } else {
+            signalPop.wait(lock, [this]() { return queue.size() < maxSize || !blocking || closed; });
+            if(closed) return false;
+            while(queue.size() >= maxSize) {
+                queue.pop_front();
+                numDropped++;
+            }
+        }
+        queue.push_back(msg);
+        numPushed++;
+    }
+    signalPush.notify_all();
+    callCallbacks(msg);
+    return true;
+}
+
+bool MessageQueue::send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) {
+    {
+        std::unique_lock<std::mutex> lock(guard);
+        if(closed) return false;
+        if(blocking) {
+            bool pred = signalPop.wait_for(lock, timeout, [this]() { return queue.size() < maxSize || !blocking || closed; });
+            if(!pred || closed) return false;
+        }
+        while(queue.size() >= maxSize) {
+            queue.pop_front();
+            numDropped++;
+        }
+        queue.push_back(msg);
+        numPushed++;
+    }
+    signalPush.notify_all();
+    callCallbacks(msg);
+    return true;
+}
+
+void MessageQueue::checkClosed() const {
+    if(closed) {
+        std::lock_guard<std::mutex> lock(guard);
+        throw std::runtime_error(closeReason);
+    }
+}
+
+bool MessageQueue::has() {
+    checkClosed();
+    std::lock_guard<std::mutex> lock(guard);
+    return !queue.empty();
+}
+
+std::shared_ptr<dai::ADatatype> MessageQueue::tryGet() {
+    checkClosed();
+    std::shared_ptr<dai::ADatatype> msg;
+    {
+        std::lock_guard<std::mutex> lock(guard);
+        if(queue.empty()) return nullptr;
+        msg = std::move(queue.front());
+        queue.pop_front();
+    }
+    signalPop.notify_all();
+    return msg;
+}
+
+std::vector<std::shared_ptr<dai::ADatatype>> MessageQueue::tryGetAll() {
+    checkClosed();
+    std::vector<std::shared_ptr<dai::ADatatype>> messages;
+    {
+        std::lock_guard<std::mutex> lock(guard);
+        messages.assign(std::make_move_iterator(queue.begin()), std::make_move_iterator(queue.end()));
+        queue.clear();
+    }
+    signalPop.notify_all();
+    return messages;
+}
+
+std::shared_ptr<dai::ADatatype> MessageQueue::get(std::chrono::milliseconds timeout, bool& hasTimedout) {
+    checkClosed();
+    std::shared_ptr<dai::ADatatype> msg;
+    {
+        std::unique_lock<std::mutex> lock(guard);
+        bool pred = signalPush.wait_for(lock, timeout, [this]() { return !queue.empty() || closed; });
+        if(closed) throw std::runtime_error(closeReason);
+        if(!pred) {
+            hasTimedout = true;
+            return nullptr;
+        }
+        msg = std::move(queue.front());
+        queue.pop_front();
+    }
+    hasTimedout = false;
+    signalPop.notify_all();
+    return msg;
+}
+
+std::vector<std::shared_ptr<dai::ADatatype>> MessageQueue::getAll(std::chrono::milliseconds timeout, bool& hasTimedout) {
+    checkClosed();
+    std::vector<std::shared_ptr<dai::ADatatype>> messages;
+    {
+        std::unique_lock<std::mutex> lock(guard);
+        bool pred = signalPush.wait_for(lock, timeout, [this]() { return !queue.empty() || closed; });
+        if(closed) throw std::runtime_error(closeReason);
+        if(!pred) {
+            hasTimedout = true;
+            return messages;
+        }
+        messages.assign(std::make_move_iterator(queue.begin()), std::make_move_iterator(queue.end()));
+        queue.clear();
+    }
+    hasTimedout = false;
+    signalPop.notify_all();
+    return messages;
+}
+
+void MessageQueue::close(const std::string& reason) {
+    {
+        std::lock_guard<std::mutex> lock(guard);
+        if(closed) return;
+        closeReason = reason;
+        closed = true;
+    }
+    signalPush.notify_all();
+    signalPop.notify_all();
+}
+
+bool MessageQueue::isClosed() const {
+    return closed;
+}
@@ -0,0 +1,138 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+/**
+ * @brief Host side message queue which mirrors DataOutputQueue API.
+ *
+ * Unlike DataOutputQueue it isn't tied to a single XLink stream, so the same
+ * queue object can be fed by different producers (reconnected devices, replays, host nodes)
+ * during its lifetime.
+ */
+class MessageQueue {
+   public:
+    /// Alias for callback id
+    using CallbackId = int;
+
+    explicit MessageQueue(std::string name, unsigned int maxSize = 16, bool blocking = true);
+    ~MessageQueue();
+
+    /// @returns Name of the queue
+    std::string getName() const;
+
+    /**
+     * Sets queue behavior when full (maxSize)
+     * @param blocking True - blocking, false - overwriting oldest messages
+     */
+    void setBlocking(bool blocking);
+    /// @returns Current queue behavior when full (maxSize)
+    bool getBlocking() const;
+
+    /**
+     * Sets maximum queue size
+     * @param maxSize Maximum queue size, can't be 0
+     */
+    void setMaxSize(unsigned int maxSize);
+    /// @returns Maximum queue size
+    unsigned int getMaxSize() const;
+
+    /// @returns Number of messages currently waiting in the queue
+    std::size_t getSize() const;
+    /// @returns Number of messages pushed into the queue since creation
+    std::uint64_t getNumPushed() const;
+    /// @returns Number of messages discarded by a non-blocking queue since creation
+    std::uint64_t getNumDropped() const;
+
+    /**
+     * Adds a callback on message received
+     * @param callback Callback function with queue name and message pointer
+     * @returns Callback id
+     */
+    CallbackId addCallback(std::function<void(std::string, std::shared_ptr<dai::ADatatype>)> callback);
+    /// @overload
+    CallbackId addCallback(std::function<void(std::shared_ptr<dai::ADatatype>)> callback);
+    /// @overload
+    CallbackId addCallback(std::function<void()> callback);
+    /**
+     * Removes a callback
+     * @param callbackId Id of callback to be removed
+     * @returns True if callback was removed, false otherwise
+     */
+    bool removeCallback(CallbackId callbackId);
+
+    /**
+     * Pushes a message into the queue and calls callbacks.
+     * If queue is blocking and full, waits until there is space or the queue is closed.
+     * @returns True if message was added, false if queue was closed
+     */
+    bool send(const std::shared_ptr<dai::ADatatype>& msg);
+
+    /**
+     * Pushes a message into the queue, waiting at most 'timeout' if queue is blocking and full
+     * @returns True if message was added, false on timeout or if queue was closed
+     */
+    bool send(const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout);
+
+    /// @returns True if any message is available, throws if queue was closed
+    bool has();
+    /// @returns Oldest message or nullptr if queue is empty, throws if queue was closed
+    std::shared_ptr<dai::ADatatype> tryGet();
+    /// @returns All messages currently in queue, throws if queue was closed
+    std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll();
+    /**
+     * Waits at most 'timeout' for a message
+     * @param timeout Maximum duration to wait
+     * @param[out] hasTimedout Set to true if timeout expired, false otherwise
+     * @returns Oldest message or nullptr on timeout, throws if queue was closed
+     */
+    std::shared_ptr<dai::ADatatype> get(std::chrono::milliseconds timeout, bool& hasTimedout);
+    /**
+     * Waits at most 'timeout' for at least one message and retrieves all of them
+     * @param timeout Maximum duration to wait
+     * @param[out] hasTimedout Set to true if timeout expired, false otherwise
+     * @returns Messages in queue, throws if queue was closed
+     */
+    std::vector<std::shared_ptr<dai::ADatatype>> getAll(std::chrono::milliseconds timeout, bool& hasTimedout);
+
+    /**
+     * Closes the queue. Blocked producers and consumers are woken up,
+     * consumers receive an exception with the specified reason
+     */
+    void close(const std::string& reason = "Queue closed");
+    /// @returns True if queue was closed
+    bool isClosed() const;
+
+   private:
+    void checkClosed() const;
+    void callCallbacks(const std::shared_ptr<dai::ADatatype>& msg);
+
+    const std::string name;
+    mutable std::mutex guard;
+    std::condition_variable signalPush;
+    std::condition_variable signalPop;
+    std::deque<std::shared_ptr<dai::ADatatype>> queue;
+    unsigned int maxSize;
+    bool blocking;
+    std::atomic<bool> closed{false};
+    std::string closeReason;
+    std::atomic<std::uint64_t> numPushed{0};
+    std::atomic<std::uint64_t> numDropped{0};
+
+    std::mutex callbacksMtx;
+    std::unordered_map<CallbackId, std::function<void(std::string, std::shared_ptr<dai::ADatatype>)>> callbacks;
+    CallbackId uniqueCallbackId{0};
+};
@@ -0,0 +1,502 @@
+#include "MetricsExporter.hpp"
+
+// std
+#include <algorithm>
+#include <cctype>
+#include <cstdio>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+
+// sockets
+#if defined(_WIN32)
+    #include <winsock2.h>
+    #include <ws2tcpip.h>
+using socklen_t = int;
+using socket_t = SOCKET;
+    #define CLOSE_SOCKET closesocket
+    #define IS_INVALID_SOCKET(s) ((s) == INVALID_SOCKET)
+#else
+    #include <arpa/inet.h>
+    #include <netinet/in.h>
+    #include <sys/select.h>
+    #include <sys/socket.h>
+    #include <unistd.h>
+using socket_t = int;
+    #define CLOSE_SOCKET close
+    #define IS_INVALID_SOCKET(s) ((s) < 0)
+#endif
+
+// depthai
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+constexpr std::chrono::milliseconds MetricsExporter::DEFAULT_COLLECTION_INTERVAL;
+
+namespace {
+
+std::string escapeLabel(const std::string& value) {
+    std::string escaped;
+    escaped.reserve(value.size());
+    for(char c : value) {
+        if(c == '\\') {
+            escaped += "\\\\";
+        } else if(c == '"') {
+            escaped += "\\\"";
+        } else if(c == '\n') {
+            escaped += "\\n";
+        } else {
+            escaped += c;
+        }
+    }
+    return escaped;
+}
+
+const char* usbSpeedName(dai::UsbSpeed speed) {
+    switch(speed) {
+        case dai::UsbSpeed::LOW:
+            return "LOW";
+        case dai::UsbSpeed::FULL:
+            return "FULL";
+        case dai::UsbSpeed::HIGH:
+            return "HIGH";
+        case dai::UsbSpeed::SUPER:
+            return "SUPER";
+        case dai::UsbSpeed::SUPER_PLUS:
+            return "SUPER_PLUS";
+        case dai::UsbSpeed::UNKNOWN:
+        default:
+            return "UNKNOWN";
+    }
+}
+
+double usbSpeedMbps(dai::UsbSpeed speed) {
+    switch(speed) {
+        case dai::UsbSpeed::LOW:
+            return 1.5;
+        case dai::UsbSpeed::FULL:
+            return 12;
+        case dai::UsbSpeed::HIGH:
+            return 480;
+        case dai::UsbSpeed::SUPER:
+            return 5000;
+        case dai::UsbSpeed::SUPER_PLUS:
+            return 10000;
+        case dai::UsbSpeed::UNKNOWN:
+        default:
+            return 0;
+    }
+}
+
+// Helper which writes metric families in either of the text formats
+class MetricsWriter {
+   public:
+    explicit MetricsWriter(MetricsExporter::Format format) : format(format) {
+        out.precision(17);
+    }
+
+    void family(const std::string& name, const std::string& type, const std::string& help) {
+        // Prometheus text format names counters including the '_total' suffix
+        std::string familyName = name;
+        if(format == MetricsExporter::Format::PROMETHEUS && type == "counter") familyName += "_total";
+        out << "# HELP " << familyName << " " << help << "\n";
+        out << "# TYPE " << familyName << " " << type << "\n";
+    }
+
+    void sample(const std::string& name, const std::vector<std::pair<std::string, std::string>>& labels, double value) {
+        out << name;
+        if(!labels.empty()) {
+            out << "{";
+            for(std::size_t i = 0; i < labels.size(); i++) {
+                if(i > 0) out << ",";
+                out << labels[i].first << "=\"" << escapeLabel(labels[i].second) << "\"";
+            }
+            out << "}";
+        }
+        out << " " << value << "\n";
+    }
+
+    std::string str() {
+        if(format == MetricsExporter::Format::OPENMETRICS) out << "# EOF\n";
+        return out.str();
+    }
+
+   private:
+    MetricsExporter::Format format;
+    std::ostringstream out;
+};
+
+}  // namespace
+
+MetricsExporter::MetricsExporter() {
+#if defined(_WIN32)
+    WSADATA wsaData;
+    WSAStartup(MAKEWORD(2, 2), &wsaData);
+#endif
+    collectorThread = std::thread(&MetricsExporter::collectorLoop, this);
+}
+
+MetricsExporter::~MetricsExporter() {
+    stop();
+#if defined(_WIN32)
+    WSACleanup();
+#endif
+}
+
+void MetricsExporter::addDevice(dai::Device& device) {
+    addDeviceEntry(device, nullptr);
+}
+
+void MetricsExporter::addDevice(dai::Device& device, std::shared_ptr<SystemInformationBuffer> buffer) {
+    addDeviceEntry(device, std::move(buffer));
+}
+
+void MetricsExporter::addDeviceEntry(dai::Device& device, std::shared_ptr<SystemInformationBuffer> buffer) {
+    auto entry = std::make_shared<DeviceEntry>();
+    entry->device = &device;
+    entry->buffer = std::move(buffer);
+    entry->mxId = device.getMxId();
+    entry->usbSpeed = device.getUsbSpeed();
+    entry->up = !device.isClosed();
+
+    std::lock_guard<std::mutex> lock(mtx);
+    devices.push_back(entry);
+}
+
+bool MetricsExporter::removeDevice(dai::Device& device) {
+    // Wait for an ongoing collection, which might be using the device
+    std::lock_guard<std::mutex> collectLock(collectGuard);
+    std::lock_guard<std::mutex> lock(mtx);
+    auto it = std::find_if(devices.begin(), devices.end(), [&device](const std::shared_ptr<DeviceEntry>& e) { return e->device == &device; });
+    if(it == devices.end()) return false;
+    devices.erase(it);
+    return true;
+}
+
+void MetricsExporter::trackMessage(QueueStats& stats, const std::shared_ptr<dai::ADatatype>& msg) {
+    using namespace std::chrono;
+    stats.numMessages++;
+    auto frame = std::dynamic_pointer_cast<dai::ImgFrame>(msg);
+    if(frame) {
+        auto latency = duration_cast<microseconds>(steady_clock::now() - frame->getTimestamp()).count();
+        if(latency >= 0) {
+            stats.latencySumUs += static_cast<std::uint64_t>(latency);
+            stats.latencyCount++;
+        }
+    }
+}
+
+void MetricsExporter::addQueue(dai::DataOutputQueue& queue, const std::string& mxId) {
+    auto stats = std::make_shared<QueueStats>();
+    stats->name = queue.getName();
+    stats->mxId = mxId;
+    queue.addCallback([stats](std::shared_ptr<dai::ADatatype> msg) { trackMessage(*stats, msg); });
+
+    std::lock_guard<std::mutex> lock(mtx);
+    queues.push_back(stats);
+}
+
+void MetricsExporter::addQueue(std::shared_ptr<MessageQueue> queue, const std::string& mxId) {
+    if(queue == nullptr) throw std::invalid_argument("Queue can't be null");
+    auto stats = std::make_shared<QueueStats>();
+    stats->name = queue->getName();
+    stats->mxId = mxId;
+    stats->messageQueue = queue;
+    queue->addCallback([stats](std::shared_ptr<dai::ADatatype> msg) { trackMessage(*stats, msg); });
+
+    std::lock_guard<std::mutex> lock(mtx);
+    queues.push_back(stats);
+}
+
+void MetricsExporter::setCollectionInterval(std::chrono::milliseconds interval) {
+    if(interval.count() <= 0) throw std::invalid_argument("Collection interval must be positive");
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        collectionInterval = interval;
+    }
+    cv.notify_all();
+}
+
+void MetricsExporter::collect() {
+    std::lock_guard<std::mutex> collectLock(collectGuard);
+
+    std::vector<std::shared_ptr<DeviceEntry>> toCollect;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toCollect = devices;
+    }
+
+    // Device calls are done without holding the lock, so rendering isn't blocked by them
+    for(auto& entry : toCollect) {
+        bool up = !entry->device->isClosed();
+        bool hasInfo = false;
+        dai::RawSystemInformation info;
+        if(up) {
+            try {
+                std::shared_ptr<dai::SystemInformation> sysInfo;
+                if(entry->buffer) {
+                    sysInfo = entry->buffer->getLatest();
+                } else {
+                    sysInfo = getSystemSnapshot(*entry->device);
+                }
+                if(sysInfo) {
+                    info.ddrMemoryUsage = sysInfo->ddrMemoryUsage;
+                    info.cmxMemoryUsage = sysInfo->cmxMemoryUsage;
+                    info.leonCssMemoryUsage = sysInfo->leonCssMemoryUsage;
+                    info.leonMssMemoryUsage = sysInfo->leonMssMemoryUsage;
+                    info.leonCssCpuUsage = sysInfo->leonCssCpuUsage;
+                    info.leonMssCpuUsage = sysInfo->leonMssCpuUsage;
+                    info.chipTemperature = sysInfo->chipTemperature;
+                    hasInfo = true;
+                }
+            } catch(const std::exception&) {
+                up = false;
+            }
+        }
+
+        std::lock_guard<std::mutex> lock(mtx);
+        entry->up = up;
+        if(hasInfo) {
+            entry->info = info;
+            entry->hasInfo = true;
+        }
+    }
+}
+
+std::string MetricsExporter::render(Format format) {
+    MetricsWriter w(format);
+    std::lock_guard<std::mutex> lock(mtx);
+
+    // Devices
+    w.family("depthai_device_up", "gauge", "Whether the device is connected");
+    for(const auto& d : devices) w.sample("depthai_device_up", {{"mxid", d->mxId}}, d->up ? 1 : 0);
+
+    w.family("depthai_device_usb_speed_mbps", "gauge", "USB link speed of the device in Mbps");
+    for(const auto& d : devices) w.sample("depthai_device_usb_speed_mbps", {{"mxid", d->mxId}, {"speed", usbSpeedName(d->usbSpeed)}}, usbSpeedMbps(d->usbSpeed));
+
+    w.family("depthai_device_chip_temperature_celsius", "gauge", "Chip temperature");
+    for(const auto& d : devices) {
+        if(!d->hasInfo) continue;
+        const auto& t = d->info.chipTemperature;
+        const std::vector<std::pair<std::string, float>> sensors = {{"css", t.css}, {"mss", t.mss}, {"upa", t.upa}, {"dss", t.dss}, {"average", t.average}};
+        for(const auto& s : sensors) w.sample("depthai_device_chip_temperature_celsius", {{"mxid", d->mxId}, {"sensor", s.first}}, s.second);
+    }
+
+    w.family("depthai_device_cpu_usage_ratio", "gauge", "Average CPU usage (0-1)");
+    for(const auto& d : devices) {
+        if(!d->hasInfo) continue;
+        w.sample("depthai_device_cpu_usage_ratio", {{"mxid", d->mxId}, {"cpu", "leon_css"}}, d->info.leonCssCpuUsage.average);
+        w.sample("depthai_device_cpu_usage_ratio", {{"mxid", d->mxId}, {"cpu", "leon_mss"}}, d->info.leonMssCpuUsage.average);
+    }
+
+    const std::vector<std::pair<std::string, dai::MemoryInfo dai::RawSystemInformation::*>> memories = {
+        {"ddr", &dai::RawSystemInformation::ddrMemoryUsage},
+        {"cmx", &dai::RawSystemInformation::cmxMemoryUsage},
+        {"leon_css_heap", &dai::RawSystemInformation::leonCssMemoryUsage},
+        {"leon_mss_heap", &dai::RawSystemInformation::leonMssMemoryUsage},
+    };
+    w.family("depthai_device_memory_used_bytes", "gauge", "Used memory");
+    for(const auto& d : devices) {
+        if(!d->hasInfo) continue;
+        for(const auto& mem : memories) w.sample("depthai_device_memory_used_bytes", {{"mxid", d->mxId}, {"memory", mem.first}}, (d->info.*(mem.second)).used);
+    }
+    w.family("depthai_device_memory_total_bytes", "gauge", "Total memory");
+    for(const auto& d : devices) {
+        if(!d->hasInfo) continue;
+        for(const auto& mem : memories) w.sample("depthai_device_memory_total_bytes", {{"mxid", d->mxId}, {"memory", mem.first}}, (d->info.*(mem.second)).total);
+    }
+
+    // Queues
+    auto queueLabels = [](const QueueStats& q) {
+        std::vector<std::pair<std::string, std::string>> labels = {{"queue", q.name}};
+        if(!q.mxId.empty()) labels.emplace_back("mxid", q.mxId);
+        return labels;
+    };
+
+    w.family("depthai_queue_messages", "counter", "Messages received by the queue");
+    for(const auto& q : queues) {
+        auto mq = q->messageQueue.lock();
+        double value = mq ? mq->getNumPushed() : q->numMessages.load();
+        w.sample("depthai_queue_messages_total", queueLabels(*q), value);
+    }
+
+    w.family("depthai_queue_dropped_messages", "counter", "Messages discarded by a full non-blocking queue (host side queues only)");
+    for(const auto& q : queues) {
+        auto mq = q->messageQueue.lock();
+        if(mq) w.sample("depthai_queue_dropped_messages_total", queueLabels(*q), mq->getNumDropped());
+    }
+
+    w.family("depthai_queue_depth", "gauge", "Messages waiting in the queue (host side queues only)");
+    for(const auto& q : queues) {
+        auto mq = q->messageQueue.lock();
+        if(mq) w.sample("depthai_queue_depth", queueLabels(*q), mq->getSize());
+    }
+
+    w.family("depthai_queue_latency_seconds", "summary", "Time from frame capture to arrival on host");
+    for(const auto& q : queues) {
+        w.sample("depthai_queue_latency_seconds_sum", queueLabels(*q), q->latencySumUs.load() / 1e6);
+        w.sample("depthai_queue_latency_seconds_count", queueLabels(*q), q->latencyCount.load());
+    }
+
+    return w.str();
+}
+
+void MetricsExporter::collectorLoop() {
+    while(running) {
+        collect();
+        writeTextfile();
+
+        std::unique_lock<std::mutex> lock(collectMtx);
+        std::chrono::milliseconds interval;
+        {
+            std::lock_guard<std::mutex> l(mtx);
+            interval = collectionInterval;
+        }
+        cv.wait_for(lock, interval, [this]() { return !running; });
+    }
+}
+
+void MetricsExporter::startTextfile(const std::string& path) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        textfilePath = path;
+    }
+    writeTextfile();
+}
+
+void MetricsExporter::writeTextfile() {
+    std::string path;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        path = textfilePath;
+    }
+    if(path.empty()) return;
+
+    // Write to temporary file and rename, so readers never see a partially written file
+    std::string tmpPath = path + ".tmp";
+    {
+        std::ofstream file(tmpPath, std::ios::binary | std::ios::trunc);
+        if(!file) return;
+        file << render(Format::PROMETHEUS);
+    }
+#if defined(_WIN32)
+    std::remove(path.c_str());
+#endif
+    std::rename(tmpPath.c_str(), path.c_str());
+}
+
+int MetricsExporter::startHttpServer(int port, const std::string& host) {
+    if(serving) throw std::runtime_error("HTTP server already running");
+
+    socket_t sock = socket(AF_INET, SOCK_STREAM, IPPROTO_TCP);
+    if(IS_INVALID_SOCKET(sock)) throw std::runtime_error("Couldn't create socket");
+    int reuse = 1;
+    setsockopt(sock, SOL_SOCKET, SO_REUSEADDR, reinterpret_cast<const char*>(&reuse), sizeof(reuse));
+
+    sockaddr_in addr = {};
+    addr.sin_family = AF_INET;
+    addr.sin_port = htons(static_cast<std::uint16_t>(port));
+    if(inet_pton(AF_INET, host.c_str(), &addr.sin_addr) != 1) {
+        CLOSE_SOCKET(sock);
+        throw std::invalid_argument("Invalid address '" + host + "'");
+    }
+    if(bind(sock, reinterpret_cast<sockaddr*>(&addr), sizeof(addr)) != 0 || listen(sock, 16) != 0) {
+        CLOSE_SOCKET(sock);
+        throw std::runtime_error("Couldn't listen on " + host + ":" + std::to_string(port));
+    }
+
+    socklen_t len = sizeof(addr);
+    getsockname(sock, reinterpret_cast<sockaddr*>(&addr), &len);
+    httpPort = ntohs(addr.sin_port);
+
+    serverSocket = static_cast<std::intptr_t>(sock);
+    serving = true;
+    serverThread = std::thread(&MetricsExporter::serverLoop, this);
+    return httpPort;
+}
+
+int MetricsExporter::getHttpPort() const {
+    return httpPort;
+}
+
+void MetricsExporter::serverLoop() {
+    auto sock = static_cast<socket_t>(serverSocket);
+    while(serving) {
+        // Wait for a connection, periodically checking whether to stop
+        fd_set readSet;
+        FD_ZERO(&readSet);
+        FD_SET(sock, &readSet);
+        timeval timeout = {0, 100 * 1000};
+        if(select(static_cast<int>(sock + 1), &readSet, nullptr, nullptr, &timeout) <= 0) continue;
+
+        socket_t client = accept(sock, nullptr, nullptr);
+        if(IS_INVALID_SOCKET(client)) continue;
+
+        // Read request headers
+        std::string request;
+        char buffer[1024];
+        while(request.size() < 8192 && request.find("\r\n\r\n") == std::string::npos) {
+            fd_set clientSet;
+            FD_ZERO(&clientSet);
+            FD_SET(client, &clientSet);
+            timeval clientTimeout = {1, 0};
+            if(select(static_cast<int>(client + 1), &clientSet, nullptr, nullptr, &clientTimeout) <= 0) break;
+            auto n = recv(client, buffer, sizeof(buffer), 0);
+            if(n <= 0) break;
+            request.append(buffer, static_cast<std::size_t>(n));
+        }
+
+        std::string status = "200 OK";
+        std::string contentType;
+        std::string body;
+        std::istringstream requestStream(request);
+        std::string method, path;
+        requestStream >> method >> path;
+        auto query = path.find('?');
+        if(query != std::string::npos) path = path.substr(0, query);
+
+        if(method != "GET") {
+            status = "405 Method Not Allowed";
+            contentType = "text/plain";
+            body = "Method not allowed\n";
+        } else if(path != "/metrics" && path != "/") {
+            status = "404 Not Found";
+            contentType = "text/plain";
+            body = "Not found\n";
+        } else {
+            // Serve OpenMetrics only to clients which ask for it
+            std::string lower = request;
+            std::transform(lower.begin(), lower.end(), lower.begin(), [](char c) { return static_cast<char>(::tolower(c)); });
+            if(lower.find("application/openmetrics-text") != std::string::npos) {
+                contentType = "application/openmetrics-text; version=1.0.0; charset=utf-8";
+                body = render(Format::OPENMETRICS);
+            } else {
+                contentType = "text/plain; version=0.0.4; charset=utf-8";
+                body = render(Format::PROMETHEUS);
+            }
+        }
+
+        std::string response = "HTTP/1.1 " + status + "\r\nContent-Type: " + contentType + "\r\nContent-Length: " + std::to_string(body.size())
+                               + "\r\nConnection: close\r\n\r\n" + body;
+        std::size_t sent = 0;
+        while(sent < response.size()) {
+            auto n = send(client, response.data() + sent, static_cast<int>(response.size() - sent), 0);
+            if(n <= 0) break;
+            sent += static_cast<std::size_t>(n);
+        }
+        CLOSE_SOCKET(client);
+    }
+    CLOSE_SOCKET(sock);
+}
+
+void MetricsExporter::stop() {
+    if(serving.exchange(false)) {
+        if(serverThread.joinable()) serverThread.join();
+        httpPort = -1;
+    }
+    {
+        std::lock_guard<std::mutex> lock(collectMtx);
+        running = false;
+    }
+    cv.notify_all();
+    if(collectorThread.joinable()) collectorThread.join();
+}
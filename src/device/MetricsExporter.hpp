@@ -0,0 +1,134 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/device/Device.hpp"
+
+// project
+#include "MessageQueue.hpp"
+#include "SystemInformationBuffer.hpp"
+
+/**
+ * @brief Exports device and queue metrics in OpenMetrics / Prometheus text format.
+ *
+ * Device system information is collected on a background thread, queue statistics are
+ * gathered by native queue callbacks using atomic counters only. Metrics can be served
+ * over HTTP and/or periodically written to a textfile (eg. for node_exporter textfile collector).
+ */
+class MetricsExporter {
+   public:
+    enum class Format { OPENMETRICS, PROMETHEUS };
+
+    /// Default interval of device metrics collection and textfile updates
+    static constexpr std::chrono::milliseconds DEFAULT_COLLECTION_INTERVAL{1000};
+
+    MetricsExporter();
+    ~MetricsExporter();
+
+    MetricsExporter(const MetricsExporter&) = delete;
+    MetricsExporter& operator=(const MetricsExporter&) = delete;
+
+    /**
+     * Adds a device, its system information is retrieved at every collection interval.
+     * Device must outlive the exporter or be removed before being destroyed
+     */
+    void addDevice(dai::Device& device);
+    /**
+     * Adds a device, using latest system information recorded by the buffer (eg. from SystemLogger)
+     * instead of retrieving it from device
+     */
+    void addDevice(dai::Device& device, std::shared_ptr<SystemInformationBuffer> buffer);
+    /// Removes a device, returns true if it was added before
+    bool removeDevice(dai::Device& device);
+
+    /**
+     * Adds a queue. Tracks number of received messages and latency (for messages carrying a timestamp)
+     * @param queue Queue to track
+     * @param mxId Optional MxId of the device, used as label
+     */
+    void addQueue(dai::DataOutputQueue& queue, const std::string& mxId = "");
+    /// Adds a host side queue. Additionally tracks queue depth and dropped messages
+    void addQueue(std::shared_ptr<MessageQueue> queue, const std::string& mxId = "");
+
+    /// Sets interval of device metrics collection and textfile updates
+    void setCollectionInterval(std::chrono::milliseconds interval);
+
+    /**
+     * Starts serving metrics over HTTP on '/metrics'. Format is chosen based on request Accept header
+     * @param port Port to listen on, 0 to pick a free one
+     * @param host Address to bind to
+     * @returns Port the server is listening on
+     */
+    int startHttpServer(int port = 9000, const std::string& host = "127.0.0.1");
+    /// @returns Port HTTP server is listening on, or -1 if not running
+    int getHttpPort() const;
+
+    /**
+     * Periodically (each collection interval) writes metrics in Prometheus text format to the file.
+     * File is replaced atomically, as expected by node_exporter textfile collector
+     */
+    void startTextfile(const std::string& path);
+
+    /// Collects device metrics immediately, instead of waiting for collection interval
+    void collect();
+
+    /// Renders current metrics
+    std::string render(Format format = Format::OPENMETRICS);
+
+    /// Stops HTTP server, textfile updates and background collection
+    void stop();
+
+   private:
+    struct DeviceEntry {
+        dai::Device* device = nullptr;
+        std::shared_ptr<SystemInformationBuffer> buffer;
+        std::string mxId;
+        dai::UsbSpeed usbSpeed = dai::UsbSpeed::UNKNOWN;
+        bool up = false;
+        bool hasInfo = false;
+        dai::RawSystemInformation info;
+    };
+    struct QueueStats {
+        std::string name;
+        std::string mxId;
+        std::weak_ptr<MessageQueue> messageQueue;
+        std::atomic<std::uint64_t> numMessages{0};
+        std::atomic<std::uint64_t> latencyCount{0};
+        std::atomic<std::uint64_t> latencySumUs{0};
+    };
+
+    void addDeviceEntry(dai::Device& device, std::shared_ptr<SystemInformationBuffer> buffer);
+    static void trackMessage(QueueStats& stats, const std::shared_ptr<dai::ADatatype>& msg);
+    void collectorLoop();
+    void serverLoop();
+    void writeTextfile();
+
+    std::mutex mtx;
+    std::vector<std::shared_ptr<DeviceEntry>> devices;
+    std::vector<std::shared_ptr<QueueStats>> queues;
+    std::chrono::milliseconds collectionInterval{DEFAULT_COLLECTION_INTERVAL};
+    std::string textfilePath;
+
+    // Serializes collections, so devices can be removed safely
+    std::mutex collectGuard;
+    std::mutex collectMtx;
+    std::condition_variable cv;
+    std::atomic<bool> running{true};
+    std::thread collectorThread;
+
+    std::atomic<bool> serving{false};
+    std::intptr_t serverSocket = -1;
+    std::atomic<int> httpPort{-1};
+    std::thread serverThread;
+};
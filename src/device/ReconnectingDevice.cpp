@@ -0,0 +1,273 @@
+#include "ReconnectingDevice.hpp"
+
+// std
+#include <stdexcept>
+#include <vector>
+
+constexpr std::chrono::milliseconds ReconnectingDevice::DEFAULT_POLL_INTERVAL;
+constexpr std::chrono::milliseconds ReconnectingDevice::DEFAULT_RETRY_INTERVAL;
+
+ReconnectingDevice::ReconnectingDevice(const dai::Pipeline& pipeline, const std::string& mxId, std::shared_ptr<DeviceTransport> transport)
+    : pipeline(pipeline), transport(std::move(transport)) {
+    if(this->transport == nullptr) {
+        this->transport = std::make_shared<XLinkDeviceTransport>();
+    }
+
+    // Initial connection is done synchronously, so errors are reported to the caller
+    this->mxId = this->transport->connect(this->pipeline, mxId, makeMessageCallback());
+    connected = true;
+
+    supervisorThread = std::thread(&ReconnectingDevice::supervise, this);
+}
+
+ReconnectingDevice::~ReconnectingDevice() {
+    close();
+    if(supervisorThread.joinable()) {
+        // Destroyed from a reconnect callback, the supervisor can't be joined from its own thread
+        if(supervisorThread.get_id() == std::this_thread::get_id()) {
+            *destroyed = true;
+            supervisorThread.detach();
+        } else {
+            supervisorThread.join();
+        }
+    }
+}
+
+DeviceTransport::MessageCallback ReconnectingDevice::makeMessageCallback() const {
+    std::weak_ptr<OutputQueues> weak = outputQueues;
+    return [weak](std::string name, std::shared_ptr<dai::ADatatype> msg) {
+        auto outputs = weak.lock();
+        if(outputs == nullptr) return;
+        std::shared_ptr<MessageQueue> queue;
+        {
+            std::lock_guard<std::mutex> lock(outputs->mtx);
+            auto it = outputs->queues.find(name);
+            if(it == outputs->queues.end()) return;
+            queue = it->second;
+        }
+        queue->send(msg);
+    };
+}
+
+bool ReconnectingDevice::waitFor(std::chrono::milliseconds duration) {
+    std::unique_lock<std::mutex> lock(mtx);
+    cv.wait_for(lock, duration, [this]() { return !running; });
+    return running;
+}
+
+void ReconnectingDevice::supervise() {
+    using namespace std::chrono;
+
+    // Callbacks may destroy the device, it mustn't be touched after emit once this is set
+    auto destroyed = this->destroyed;
+
+    while(waitFor(pollInterval)) {
+        if(transport->isConnected()) continue;
+
+        // Connection dropped
+        connected = false;
+        auto outageStart = steady_clock::now();
+        ReconnectEvent disconnected;
+        disconnected.type = ReconnectEvent::Type::DISCONNECTED;
+        disconnected.mxId = getMxId();
+        emit(disconnected);
+        if(*destroyed) return;
+
+        transport->disconnect();
+
+        // Rediscover the same device and upload the pipeline again
+        int attempts = 0;
+        std::string lastError;
+        bool reconnected = false;
+        while(running) {
+            attempts++;
+            try {
+                transport->connect(pipeline, getMxId(), makeMessageCallback());
+                reconnected = true;
+                break;
+            } catch(const std::exception& ex) {
+                lastError = ex.what();
+            }
+            if(!waitFor(retryInterval)) break;
+        }
+        if(!reconnected) break;
+
+        auto outage = duration_cast<microseconds>(steady_clock::now() - outageStart);
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            lastOutageDuration = outage;
+            reconnectCount++;
+        }
+        connected = true;
+
+        ReconnectEvent event;
+        event.type = ReconnectEvent::Type::RECONNECTED;
+        event.mxId = getMxId();
+        event.outageDuration = outage;
+        event.attempts = attempts;
+        event.lastError = lastError;
+        emit(event);
+        if(*destroyed) return;
+    }
+}
+
+void ReconnectingDevice::emit(const ReconnectEvent& event) {
+    // Copy callbacks, so they can add or remove callbacks themselves
+    std::vector<std::function<void(ReconnectEvent)>> toCall;
+    {
+        std::lock_guard<std::mutex> lock(callbacksMtx);
+        for(const auto& kv : callbacks) toCall.push_back(kv.second);
+    }
+    auto destroyed = this->destroyed;
+    for(const auto& cb : toCall) {
+        // A misbehaving callback mustn't stop reconnecting, its error is kept for getLastCallbackError
+        try {
+            cb(event);
+        } catch(const std::exception& ex) {
+            if(*destroyed) continue;
+            std::lock_guard<std::mutex> lock(callbacksMtx);
+            lastCallbackError = ex.what();
+        }
+    }
+}
+
+void ReconnectingDevice::forwardInputs(std::shared_ptr<MessageQueue> queue) {
+    std::shared_ptr<dai::ADatatype> pending;
+    while(running) {
+        if(pending == nullptr) {
+            bool timedout = false;
+            try {
+                pending = queue->get(pollInterval, timedout);
+            } catch(const std::runtime_error&) {
+                // Queue closed
+                return;
+            }
+            if(timedout) continue;
+        }
+
+        // Hold on to the message until it gets delivered, which may be after a reconnect
+        if(!connected) {
+            waitFor(pollInterval);
+            continue;
+        }
+        try {
+            if(transport->send(queue->getName(), pending, pollInterval)) pending = nullptr;
+        } catch(const std::exception&) {
+            // Connection dropped mid send, supervisor takes care of it
+            waitFor(pollInterval);
+        }
+    }
+}
+
+std::shared_ptr<MessageQueue> ReconnectingDevice::getOutputQueue(const std::string& name, unsigned int maxSize, bool blocking) {
+    std::lock_guard<std::mutex> lock(outputQueues->mtx);
+    if(!running) throw std::runtime_error("Device already closed");
+    auto& queues = outputQueues->queues;
+    auto it = queues.find(name);
+    if(it != queues.end()) {
+        it->second->setMaxSize(maxSize);
+        it->second->setBlocking(blocking);
+        return it->second;
+    }
+    auto queue = std::make_shared<MessageQueue>(name, maxSize, blocking);
+    queues[name] = queue;
+    return queue;
+}
+
+std::shared_ptr<MessageQueue> ReconnectingDevice::getInputQueue(const std::string& name, unsigned int maxSize, bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(!running) throw std::runtime_error("Device already closed");
+    auto it = inputQueues.find(name);
+    if(it != inputQueues.end()) {
+        it->second->setMaxSize(maxSize);
+        it->second->setBlocking(blocking);
+        return it->second;
+    }
+    auto queue = std::make_shared<MessageQueue>(name, maxSize, blocking);
+    inputQueues[name] = queue;
+    inputThreads.emplace_back(&ReconnectingDevice::forwardInputs, this, queue);
+    return queue;
+}
+
+ReconnectingDevice::CallbackId ReconnectingDevice::addReconnectCallback(std::function<void(ReconnectEvent)> callback) {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    CallbackId id = uniqueCallbackId++;
+    callbacks[id] = std::move(callback);
+    return id;
+}
+
+bool ReconnectingDevice::removeReconnectCallback(CallbackId callbackId) {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    return callbacks.erase(callbackId) > 0;
+}
+
+std::string ReconnectingDevice::getMxId() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return mxId;
+}
+
+bool ReconnectingDevice::isConnected() const {
+    return connected;
+}
+
+int ReconnectingDevice::getReconnectCount() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return reconnectCount;
+}
+
+std::chrono::microseconds ReconnectingDevice::getLastOutageDuration() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return lastOutageDuration;
+}
+
+std::shared_ptr<DeviceTransport> ReconnectingDevice::getTransport() const {
+    return transport;
+}
+
+std::string ReconnectingDevice::getLastCallbackError() const {
+    std::lock_guard<std::mutex> lock(callbacksMtx);
+    return lastCallbackError;
+}
+
+void ReconnectingDevice::setPollInterval(std::chrono::milliseconds interval) {
+    pollInterval = interval;
+}
+
+void ReconnectingDevice::setRetryInterval(std::chrono::milliseconds interval) {
+    retryInterval = interval;
+}
+
+void ReconnectingDevice::close() {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(!running) return;
+        running = false;
+    }
+    cv.notify_all();
+
+    // close() may be called from a reconnect callback, the supervisor is then joined on destruction
+    if(supervisorThread.joinable() && supervisorThread.get_id() != std::this_thread::get_id()) {
+        supervisorThread.join();
+    }
+
+    transport->disconnect();
+    connected = false;
+
+    std::vector<std::thread> threads;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        for(auto& kv : inputQueues) kv.second->close("Device closed");
+        threads = std::move(inputThreads);
+    }
+    {
+        std::lock_guard<std::mutex> lock(outputQueues->mtx);
+        for(auto& kv : outputQueues->queues) kv.second->close("Device closed");
+    }
+    for(auto& t : threads) {
+        if(t.joinable()) t.join();
+    }
+}
+
+bool ReconnectingDevice::isClosed() const {
+    return !running;
+}
@@ -0,0 +1,146 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <unordered_map>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+
+// project
+#include "DeviceTransport.hpp"
+#include "MessageQueue.hpp"
+
+/**
+ * @brief Describes a change of connection state of a ReconnectingDevice
+ */
+struct ReconnectEvent {
+    enum class Type { DISCONNECTED, RECONNECTED };
+    /// Type of event
+    Type type = Type::DISCONNECTED;
+    /// MxId of the device
+    std::string mxId;
+    /// How long the device was unavailable (zero for DISCONNECTED events)
+    std::chrono::microseconds outageDuration{0};
+    /// Number of connect attempts it took to reconnect (zero for DISCONNECTED events)
+    int attempts = 0;
+    /// Last error message seen while reconnecting
+    std::string lastError;
+};
+
+/**
+ * @brief Device which survives disconnects.
+ *
+ * Keeps the pipeline, and when the connection drops, rediscovers the same device (by MxId),
+ * reboots it and uploads the pipeline again. Queues retrieved from it stay valid across
+ * reconnects, so callbacks and queue handles held by the application don't need to be recreated.
+ */
+class ReconnectingDevice {
+   public:
+    using CallbackId = int;
+
+    /// Default period of connection checks
+    static constexpr std::chrono::milliseconds DEFAULT_POLL_INTERVAL{100};
+    /// Default delay between consecutive reconnect attempts
+    static constexpr std::chrono::milliseconds DEFAULT_RETRY_INTERVAL{500};
+
+    /**
+     * Connects to a device and starts the pipeline. Throws if initial connection fails.
+     *
+     * @param pipeline Pipeline to run, kept for subsequent reconnects
+     * @param mxId MxId of device to use, empty for first available device
+     * @param transport Transport to use, XLinkDeviceTransport if nullptr
+     */
+    explicit ReconnectingDevice(const dai::Pipeline& pipeline, const std::string& mxId = "", std::shared_ptr<DeviceTransport> transport = nullptr);
+    ~ReconnectingDevice();
+
+    /**
+     * Gets a stable output queue for the stream. Queue stays valid across reconnects.
+     * If the queue already exists, its maxSize and blocking behavior are updated.
+     */
+    std::shared_ptr<MessageQueue> getOutputQueue(const std::string& name, unsigned int maxSize = 16, bool blocking = true);
+
+    /**
+     * Gets a stable input queue for the stream. Messages sent while device is disconnected
+     * are buffered according to maxSize and blocking behavior and delivered after reconnect.
+     */
+    std::shared_ptr<MessageQueue> getInputQueue(const std::string& name, unsigned int maxSize = 16, bool blocking = true);
+
+    /**
+     * Adds a callback which gets called on every disconnect and reconnect
+     * @returns Callback id
+     */
+    CallbackId addReconnectCallback(std::function<void(ReconnectEvent)> callback);
+    /// Removes a reconnect callback, returns true if it existed
+    bool removeReconnectCallback(CallbackId callbackId);
+
+    /// @returns MxId of the device
+    std::string getMxId() const;
+    /// @returns True if device is currently connected
+    bool isConnected() const;
+    /// @returns Number of successful reconnects
+    int getReconnectCount() const;
+    /// @returns Duration of last outage, zero if there wasn't any
+    std::chrono::microseconds getLastOutageDuration() const;
+    /// @returns Transport used by this device
+    std::shared_ptr<DeviceTransport> getTransport() const;
+    /// @returns Message of the last exception thrown by a reconnect callback, empty if there wasn't any
+    std::string getLastCallbackError() const;
+
+    /// Sets how often connection is checked
+    void setPollInterval(std::chrono::milliseconds interval);
+    /// Sets delay between reconnect attempts
+    void setRetryInterval(std::chrono::milliseconds interval);
+
+    /// Stops reconnecting, closes the device and all queues
+    void close();
+    /// @returns True if device was closed
+    bool isClosed() const;
+
+   private:
+    // Output queues by stream name, shared with transport callbacks, which may outlive the device
+    struct OutputQueues {
+        std::mutex mtx;
+        std::unordered_map<std::string, std::shared_ptr<MessageQueue>> queues;
+    };
+
+    DeviceTransport::MessageCallback makeMessageCallback() const;
+    void supervise();
+    void emit(const ReconnectEvent& event);
+    // Waits for the specified duration, returns false if device was closed in between
+    bool waitFor(std::chrono::milliseconds duration);
+    void forwardInputs(std::shared_ptr<MessageQueue> queue);
+
+    const dai::Pipeline pipeline;
+    std::shared_ptr<DeviceTransport> transport;
+
+    mutable std::mutex mtx;
+    std::condition_variable cv;
+    std::string mxId;
+    std::shared_ptr<OutputQueues> outputQueues = std::make_shared<OutputQueues>();
+    std::unordered_map<std::string, std::shared_ptr<MessageQueue>> inputQueues;
+    std::vector<std::thread> inputThreads;
+    std::atomic<std::chrono::milliseconds> pollInterval{DEFAULT_POLL_INTERVAL};
+    std::atomic<std::chrono::milliseconds> retryInterval{DEFAULT_RETRY_INTERVAL};
+    std::chrono::microseconds lastOutageDuration{0};
+    int reconnectCount = 0;
+
+    mutable std::mutex callbacksMtx;
+    std::unordered_map<CallbackId, std::function<void(ReconnectEvent)>> callbacks;
+    CallbackId uniqueCallbackId = 0;
+    std::string lastCallbackError;
+
+    std::atomic<bool> connected{false};
+    std::atomic<bool> running{true};
+    std::thread supervisorThread;
+    // Set when the device is destroyed by its own reconnect callback, supervisor then returns without touching it
+    std::shared_ptr<std::atomic<bool>> destroyed = std::make_shared<std::atomic<bool>>(false);
+};
@@ -0,0 +1,176 @@
+#include "SystemInformationBuffer.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+constexpr std::size_t SystemInformationBuffer::NUM_FIELDS;
+constexpr std::size_t SystemInformationBuffer::DEFAULT_CAPACITY;
+
+std::shared_ptr<dai::SystemInformation> getSystemSnapshot(dai::Device& device) {
+    auto raw = std::make_shared<dai::RawSystemInformation>();
+    raw->ddrMemoryUsage = device.getDdrMemoryUsage();
+    raw->cmxMemoryUsage = device.getCmxMemoryUsage();
+    raw->leonCssMemoryUsage = device.getLeonCssHeapUsage();
+    raw->leonMssMemoryUsage = device.getLeonMssHeapUsage();
+    raw->leonCssCpuUsage = device.getLeonCssCpuUsage();
+    raw->leonMssCpuUsage = device.getLeonMssCpuUsage();
+    raw->chipTemperature = device.getChipTemperature();
+    return std::make_shared<dai::SystemInformation>(raw);
+}
+
+SystemInformationBuffer::SystemInformationBuffer(std::size_t capacity) : capacity(capacity) {
+    if(capacity == 0) throw std::invalid_argument("Buffer capacity can't be 0!");
+    rows.resize(capacity);
+}
+
+const std::array<std::string, SystemInformationBuffer::NUM_FIELDS>& SystemInformationBuffer::getFieldNames() {
+    static const std::array<std::string, NUM_FIELDS> names = {{
+        "timestamp",
+        "ddrMemoryUsage.used",
+        "ddrMemoryUsage.remaining",
+        "ddrMemoryUsage.total",
+        "cmxMemoryUsage.used",
+        "cmxMemoryUsage.remaining",
+        "cmxMemoryUsage.total",
+        "leonCssMemoryUsage.used",
+        "leonCssMemoryUsage.remaining",
+        "leonCssMemoryUsage.total",
+        "leonMssMemoryUsage.used",
+        "leonMssMemoryUsage.remaining",
+        "leonMssMemoryUsage.total",
+        "leonCssCpuUsage.average",
+        "leonMssCpuUsage.average",
+        "chipTemperature.css",
+        "chipTemperature.mss",
+        "chipTemperature.upa",
+        "chipTemperature.dss",
+        "chipTemperature.average",
+    }};
+    return names;
+}
+
+void SystemInformationBuffer::add(const dai::SystemInformation& info) {
+    add(info, std::chrono::steady_clock::now());
+}
+
+void SystemInformationBuffer::add(const dai::SystemInformation& info, std::chrono::steady_clock::time_point timestamp) {
+    using namespace std::chrono;
+
+    Row row = {{
+        duration_cast<duration<double>>(timestamp.time_since_epoch()).count(),
+        static_cast<double>(info.ddrMemoryUsage.used),
+        static_cast<double>(info.ddrMemoryUsage.remaining),
+        static_cast<double>(info.ddrMemoryUsage.total),
+        static_cast<double>(info.cmxMemoryUsage.used),
+        static_cast<double>(info.cmxMemoryUsage.remaining),
+        static_cast<double>(info.cmxMemoryUsage.total),
+        static_cast<double>(info.leonCssMemoryUsage.used),
+        static_cast<double>(info.leonCssMemoryUsage.remaining),
+        static_cast<double>(info.leonCssMemoryUsage.total),
+        static_cast<double>(info.leonMssMemoryUsage.used),
+        static_cast<double>(info.leonMssMemoryUsage.remaining),
+        static_cast<double>(info.leonMssMemoryUsage.total),
+        info.leonCssCpuUsage.average,
+        info.leonMssCpuUsage.average,
+        info.chipTemperature.css,
+        info.chipTemperature.mss,
+        info.chipTemperature.upa,
+        info.chipTemperature.dss,
+        info.chipTemperature.average,
+    }};
+
+    // Keep own copy of latest sample, as messages may be modified by their receivers
+    auto raw = std::make_shared<dai::RawSystemInformation>();
+    raw->ddrMemoryUsage = info.ddrMemoryUsage;
+    raw->cmxMemoryUsage = info.cmxMemoryUsage;
+    raw->leonCssMemoryUsage = info.leonCssMemoryUsage;
+    raw->leonMssMemoryUsage = info.leonMssMemoryUsage;
+    raw->leonCssCpuUsage = info.leonCssCpuUsage;
+    raw->leonMssCpuUsage = info.leonMssCpuUsage;
+    raw->chipTemperature = info.chipTemperature;
+
+    std::lock_guard<std::mutex> lock(mtx);
+    rows[head] = row;
+    head = (head + 1) % capacity;
+    size = std::min(size + 1, capacity);
+    numAdded++;
+    latest = std::make_shared<dai::SystemInformation>(raw);
+    latestTimestamp = timestamp;
+}
+
+int SystemInformationBuffer::attach(dai::DataOutputQueue& queue) {
+    std::weak_ptr<SystemInformationBuffer> weak = shared_from_this();
+    return queue.addCallback([weak](std::shared_ptr<dai::ADatatype> msg) {
+        auto buffer = weak.lock();
+        auto info = std::dynamic_pointer_cast<dai::SystemInformation>(msg);
+        if(buffer && info) buffer->add(*info);
+    });
+}
+
+int SystemInformationBuffer::attach(MessageQueue& queue) {
+    std::weak_ptr<SystemInformationBuffer> weak = shared_from_this();
+    return queue.addCallback([weak](std::shared_ptr<dai::ADatatype> msg) {
+        auto buffer = weak.lock();
+        auto info = std::dynamic_pointer_cast<dai::SystemInformation>(msg);
+        if(buffer && info) buffer->add(*info);
+    });
+}
+
+std::shared_ptr<dai::SystemInformation> SystemInformationBuffer::getLatest() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return latest;
+}
+
+std::chrono::steady_clock::time_point SystemInformationBuffer::getLatestTimestamp() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return latestTimestamp;
+}
+
+std::vector<double> SystemInformationBuffer::getSeries(const std::string& field) const {
+    const auto& names = getFieldNames();
+    auto it = std::find(names.begin(), names.end(), field);
+    if(it == names.end()) throw std::invalid_argument("Unknown field '" + field + "'");
+    std::size_t column = it - names.begin();
+
+    std::lock_guard<std::mutex> lock(mtx);
+    std::vector<double> series;
+    series.reserve(size);
+    std::size_t start = (head + capacity - size) % capacity;
+    for(std::size_t i = 0; i < size; i++) {
+        series.push_back(rows[(start + i) % capacity][column]);
+    }
+    return series;
+}
+
+std::vector<std::vector<double>> SystemInformationBuffer::getColumns() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    std::vector<std::vector<double>> columns(NUM_FIELDS, std::vector<double>(size));
+    std::size_t start = (head + capacity - size) % capacity;
+    for(std::size_t i = 0; i < size; i++) {
+        const auto& row = rows[(start + i) % capacity];
+        for(std::size_t c = 0; c < NUM_FIELDS; c++) columns[c][i] = row[c];
+    }
+    return columns;
+}
+
+std::size_t SystemInformationBuffer::getSize() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return size;
+}
+
+std::size_t SystemInformationBuffer::getCapacity() const {
+    return capacity;
+}
+
+std::uint64_t SystemInformationBuffer::getNumAdded() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return numAdded;
+}
+
+void SystemInformationBuffer::clear() {
+    std::lock_guard<std::mutex> lock(mtx);
+    head = 0;
+    size = 0;
+    latest = nullptr;
+}
@@ -0,0 +1,99 @@
+#pragma once
+
+// std
+#include <array>
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/device/Device.hpp"
+#include "depthai/pipeline/datatype/SystemInformation.hpp"
+
+// project
+#include "MessageQueue.hpp"
+
+/**
+ * Retrieves all system information of the device (memory, cpu usage and temperatures) in one call.
+ * Blocks until all values are retrieved, doesn't require the caller to hold any locks in between.
+ *
+ * @returns SystemInformation message filled with current values
+ */
+std::shared_ptr<dai::SystemInformation> getSystemSnapshot(dai::Device& device);
+
+/**
+ * @brief Fixed capacity ring buffer of SystemInformation samples.
+ *
+ * Samples are stored natively as rows of numbers, so they can be exported as time series
+ * without accumulating python objects. Can be fed directly by a SystemLogger output queue.
+ */
+class SystemInformationBuffer : public std::enable_shared_from_this<SystemInformationBuffer> {
+   public:
+    /// Number of values stored per sample
+    static constexpr std::size_t NUM_FIELDS = 20;
+    /// Default number of samples kept
+    static constexpr std::size_t DEFAULT_CAPACITY = 3600;
+
+    explicit SystemInformationBuffer(std::size_t capacity = DEFAULT_CAPACITY);
+
+    /**
+     * Names of stored values, in column order. First one is 'timestamp',
+     * host steady clock time in seconds at which sample was added
+     */
+    static const std::array<std::string, NUM_FIELDS>& getFieldNames();
+
+    /// Adds a sample, overwriting the oldest one if buffer is full
+    void add(const dai::SystemInformation& info);
+    /// Adds a sample with explicit timestamp, overwriting the oldest one if buffer is full
+    void add(const dai::SystemInformation& info, std::chrono::steady_clock::time_point timestamp);
+
+    /**
+     * Records all SystemInformation messages arriving to the queue.
+     * Recording happens on the queue's reading thread and stops once this buffer is destroyed
+     * @returns Callback id, which can be used to detach the buffer with queue.removeCallback
+     */
+    int attach(dai::DataOutputQueue& queue);
+    /// @overload
+    int attach(MessageQueue& queue);
+
+    /// @returns Latest sample or nullptr if buffer is empty
+    std::shared_ptr<dai::SystemInformation> getLatest() const;
+    /// @returns Timestamp of latest sample
+    std::chrono::steady_clock::time_point getLatestTimestamp() const;
+
+    /**
+     * Copies a single column in chronological order
+     * @param field Name of the value, one of getFieldNames()
+     */
+    std::vector<double> getSeries(const std::string& field) const;
+
+    /// Copies all columns in chronological order, columns are ordered as getFieldNames()
+    std::vector<std::vector<double>> getColumns() const;
+
+    /// @returns Number of samples currently stored
+    std::size_t getSize() const;
+    /// @returns Maximum number of samples stored
+    std::size_t getCapacity() const;
+    /// @returns Number of samples added since creation
+    std::uint64_t getNumAdded() const;
+    /// Removes all samples
+    void clear();
+
+   private:
+    using Row = std::array<double, NUM_FIELDS>;
+
+    mutable std::mutex mtx;
+    std::vector<Row> rows;
+    std::size_t capacity;
+    // Index of the next row to be written
+    std::size_t head = 0;
+    std::size_t size = 0;
+    std::uint64_t numAdded = 0;
+    std::shared_ptr<dai::SystemInformation> latest;
+    std::chrono::steady_clock::time_point latestTimestamp;
+};
@@ -0,0 +1,398 @@
+#include "HostNode.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+// project
+#include "HostPipeline.hpp"
+
+namespace {
+
+// Number of recent process calls fps is computed over
+constexpr std::size_t FPS_WINDOW = 32;
+
+// Node whose process call runs on the current thread
+thread_local const HostNode* processingNode = nullptr;
+
+}  // namespace
+
+// Input
+
+HostNode::Input::Input(HostNode& parent, std::string name, unsigned int queueSize, bool blocking)
+    : parent(parent), name(std::move(name)), queue(std::make_shared<MessageQueue>(this->name, queueSize, blocking)) {}
+
+HostNode& HostNode::Input::getParent() {
+    return parent;
+}
+
+std::string HostNode::Input::getName() const {
+    return name;
+}
+
+void HostNode::Input::setBlocking(bool blocking) {
+    queue->setBlocking(blocking);
+}
+
+bool HostNode::Input::getBlocking() const {
+    return queue->getBlocking();
+}
+
+void HostNode::Input::setQueueSize(unsigned int size) {
+    queue->setMaxSize(size);
+}
+
+unsigned int HostNode::Input::getQueueSize() const {
+    return queue->getMaxSize();
+}
+
+bool HostNode::Input::has() const {
+    return queue->getSize() > 0;
+}
+
+std::shared_ptr<dai::ADatatype> HostNode::Input::tryGet() {
+    auto msg = queue->tryGet();
+    if(msg != nullptr) numTaken++;
+    return msg;
+}
+
+std::vector<std::shared_ptr<dai::ADatatype>> HostNode::Input::tryGetAll() {
+    auto msgs = queue->tryGetAll();
+    numTaken += msgs.size();
+    return msgs;
+}
+
+std::shared_ptr<dai::ADatatype> HostNode::Input::get() {
+    // Wait in steps, so a stopped pipeline is noticed even if nothing closes the queue
+    while(true) {
+        bool timedout = false;
+        auto msg = get(std::chrono::milliseconds(100), timedout);
+        if(!timedout) return msg;
+    }
+}
+
+std::shared_ptr<dai::ADatatype> HostNode::Input::get(std::chrono::milliseconds timeout, bool& timedout) {
+    auto msg = queue->get(timeout, timedout);
+    if(timedout) {
+        if(parent.stopped) throw std::runtime_error("Host pipeline stopped");
+        return msg;
+    }
+    numTaken++;
+    return msg;
+}
+
+std::shared_ptr<MessageQueue> HostNode::Input::getQueue() const {
+    return queue;
+}
+
+bool HostNode::Input::push(const std::shared_ptr<dai::ADatatype>& msg) {
+    if(!queue->send(msg)) return false;
+    parent.numPushed++;
+    parent.wake();
+    return true;
+}
+
+bool HostNode::Input::isFull() const {
+    return queue->getBlocking() && queue->getSize() >= queue->getMaxSize();
+}
+
+// Output
+
+HostNode::Output::Output(HostNode& parent, std::string name) : parent(parent), name(std::move(name)) {}
+
+HostNode& HostNode::Output::getParent() {
+    return parent;
+}
+
+std::string HostNode::Output::getName() const {
+    return name;
+}
+
+void HostNode::Output::link(Input& in) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(std::find(connections.begin(), connections.end(), &in) != connections.end()) {
+        throw std::logic_error("Output '" + name + "' is already linked to input '" + in.getName() + "'");
+    }
+    connections.push_back(&in);
+}
+
+bool HostNode::Output::unlink(Input& in) {
+    std::lock_guard<std::mutex> lock(mtx);
+    auto it = std::find(connections.begin(), connections.end(), &in);
+    if(it == connections.end()) return false;
+    connections.erase(it);
+    return true;
+}
+
+std::vector<HostNode::Input*> HostNode::Output::getConnections() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return connections;
+}
+
+bool HostNode::Output::send(const std::shared_ptr<dai::ADatatype>& msg) {
+    // Process calls mustn't block pool threads on full inputs, as the consumer may need the same thread
+    bool defer = processingNode == &parent;
+    bool delivered = true;
+    for(auto* in : getConnections()) {
+        if(defer) {
+            std::lock_guard<std::mutex> lock(mtx);
+            auto& queue = deferred[in];
+            if(!queue.empty() || in->isFull()) {
+                queue.push_back(msg);
+                continue;
+            }
+        }
+        delivered = in->push(msg) && delivered;
+    }
+    parent.countSent();
+    return delivered;
+}
+
+bool HostNode::Output::canSend() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    for(const auto* in : connections) {
+        if(in->isFull()) return false;
+    }
+    for(const auto& kv : deferred) {
+        if(!kv.second.empty()) return false;
+    }
+    return true;
+}
+
+bool HostNode::Output::canFlush() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    for(const auto& kv : deferred) {
+        if(!kv.second.empty() && !kv.first->isFull()) return true;
+    }
+    return false;
+}
+
+void HostNode::Output::flush() {
+    while(true) {
+        Input* in = nullptr;
+        std::shared_ptr<dai::ADatatype> msg;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            for(auto& kv : deferred) {
+                if(kv.second.empty() || kv.first->isFull()) continue;
+                in = kv.first;
+                msg = std::move(kv.second.front());
+                kv.second.pop_front();
+                break;
+            }
+        }
+        if(in == nullptr) return;
+        // Pushed without the lock, as it wakes up the consumer. Closed inputs discard the message
+        in->push(msg);
+    }
+}
+
+// HostNode
+
+HostNode::HostNode() = default;
+
+HostNode::~HostNode() = default;
+
+HostNode::Id HostNode::getId() const {
+    return id;
+}
+
+std::string HostNode::getName() const {
+    std::lock_guard<std::mutex> lock(statsMtx);
+    return name;
+}
+
+void HostNode::setName(const std::string& name) {
+    std::lock_guard<std::mutex> lock(statsMtx);
+    this->name = name;
+}
+
+HostNode::Input& HostNode::createInput(const std::string& name, unsigned int queueSize, bool blocking) {
+    if(pipeline != nullptr) throw std::logic_error("Inputs can't be created after node was added to a pipeline");
+    for(const auto& in : inputs) {
+        if(in->getName() == name) throw std::invalid_argument("Input '" + name + "' already exists");
+    }
+    inputs.push_back(std::unique_ptr<Input>(new Input(*this, name, queueSize, blocking)));
+    return *inputs.back();
+}
+
+HostNode::Output& HostNode::createOutput(const std::string& name) {
+    if(pipeline != nullptr) throw std::logic_error("Outputs can't be created after node was added to a pipeline");
+    for(const auto& out : outputs) {
+        if(out->getName() == name) throw std::invalid_argument("Output '" + name + "' already exists");
+    }
+    outputs.push_back(std::unique_ptr<Output>(new Output(*this, name)));
+    return *outputs.back();
+}
+
+HostNode::Input& HostNode::getInput(const std::string& name) {
+    for(const auto& in : inputs) {
+        if(in->getName() == name) return *in;
+    }
+    throw std::invalid_argument("Node '" + getName() + "' has no input named: " + name);
+}
+
+HostNode::Output& HostNode::getOutput(const std::string& name) {
+    for(const auto& out : outputs) {
+        if(out->getName() == name) return *out;
+    }
+    throw std::invalid_argument("Node '" + getName() + "' has no output named: " + name);
+}
+
+std::vector<HostNode::Input*> HostNode::getInputs() {
+    std::vector<Input*> result;
+    for(const auto& in : inputs) result.push_back(in.get());
+    return result;
+}
+
+std::vector<HostNode::Output*> HostNode::getOutputs() {
+    std::vector<Output*> result;
+    for(const auto& out : outputs) result.push_back(out.get());
+    return result;
+}
+
+HostNodeStats HostNode::getStats() const {
+    std::uint64_t numReceived = 0, numDropped = 0;
+    for(const auto& in : inputs) {
+        numReceived += in->numTaken;
+        numDropped += in->queue->getNumDropped();
+    }
+    std::lock_guard<std::mutex> lock(statsMtx);
+    HostNodeStats result = stats;
+    result.numReceived = numReceived;
+    result.numDropped = numDropped;
+    return result;
+}
+
+void HostNode::process() {}
+
+void HostNode::onStart() {}
+
+void HostNode::onStop() {}
+
+void HostNode::runOnce() {
+    using namespace std::chrono;
+
+    // Deferred messages go first, node isn't processed until all of them are sent
+    for(const auto& out : outputs) out->flush();
+    if(!isReady()) return;
+
+    std::uint64_t pushedBefore = numPushed;
+    std::uint64_t takenBefore = 0;
+    for(const auto& in : inputs) takenBefore += in->numTaken;
+
+    auto start = steady_clock::now();
+    std::string error;
+    processingNode = this;
+    try {
+        process();
+    } catch(const std::exception& ex) {
+        error = ex.what();
+        if(error.empty()) error = "Unknown error";
+    }
+    processingNode = nullptr;
+    auto end = steady_clock::now();
+
+    // If nothing was taken (eg. node waits for messages on other inputs), don't run again until a new message arrives
+    std::uint64_t takenAfter = 0;
+    for(const auto& in : inputs) takenAfter += in->numTaken;
+    if(!inputs.empty() && takenAfter == takenBefore) idlePushCount = pushedBefore;
+
+    auto latency = duration_cast<microseconds>(end - start);
+    std::lock_guard<std::mutex> lock(statsMtx);
+    stats.numProcessed++;
+    if(!error.empty()) {
+        stats.numErrors++;
+        stats.lastError = error;
+    }
+    stats.lastLatency = latency;
+    stats.maxLatency = std::max(stats.maxLatency, latency);
+    totalLatency += latency;
+    stats.averageLatency = totalLatency / stats.numProcessed;
+    recentCalls.push_back(end);
+    if(recentCalls.size() > FPS_WINDOW) recentCalls.pop_front();
+    if(recentCalls.size() > 1) {
+        double seconds = duration<double>(recentCalls.back() - recentCalls.front()).count();
+        if(seconds > 0) stats.fps = (recentCalls.size() - 1) / seconds;
+    }
+}
+
+bool HostNode::isRunnable() const {
+    for(const auto& out : outputs) {
+        if(out->canFlush()) return true;
+    }
+    return isReady();
+}
+
+bool HostNode::isReady() const {
+    for(const auto& out : outputs) {
+        if(!out->canSend()) return false;
+    }
+    // Sources run continuously
+    if(inputs.empty()) return true;
+    if(numPushed == idlePushCount) return false;
+    for(const auto& in : inputs) {
+        if(in->has()) return true;
+    }
+    return false;
+}
+
+void HostNode::wake() {
+    if(pipeline != nullptr) pipeline->schedule(*this);
+}
+
+void HostNode::countSent() {
+    std::lock_guard<std::mutex> lock(statsMtx);
+    stats.numSent++;
+}
+
+// DeviceOutputNode
+
+DeviceOutputNode::DeviceOutputNode(std::shared_ptr<dai::DataOutputQueue> queue, unsigned int queueSize, bool blocking)
+    : in(createInput("in", queueSize, blocking)), out(createOutput("out")) {
+    setName("DeviceOutput(" + queue->getName() + ")");
+    queue->setMaxSize(1);
+    queue->setBlocking(false);
+    subscribe = [this, queue]() { return queue->addCallback([this](std::shared_ptr<dai::ADatatype> msg) { in.push(msg); }); };
+    unsubscribe = [queue](int id) { queue->removeCallback(id); };
+}
+
+DeviceOutputNode::DeviceOutputNode(std::shared_ptr<MessageQueue> queue, unsigned int queueSize, bool blocking)
+    : in(createInput("in", queueSize, blocking)), out(createOutput("out")) {
+    setName("DeviceOutput(" + queue->getName() + ")");
+    subscribe = [this, queue]() { return queue->addCallback([this](std::shared_ptr<dai::ADatatype> msg) { in.push(msg); }); };
+    unsubscribe = [queue](int id) { queue->removeCallback(id); };
+}
+
+void DeviceOutputNode::process() {
+    for(const auto& msg : in.tryGetAll()) {
+        if(!out.send(msg)) return;
+    }
+}
+
+void DeviceOutputNode::onStart() {
+    callbackId = subscribe();
+}
+
+void DeviceOutputNode::onStop() {
+    if(callbackId >= 0) unsubscribe(callbackId);
+    callbackId = -1;
+}
+
+// DeviceInputNode
+
+DeviceInputNode::DeviceInputNode(std::shared_ptr<dai::DataInputQueue> queue, unsigned int queueSize, bool blocking)
+    : in(createInput("in", queueSize, blocking)) {
+    setName("DeviceInput(" + queue->getName() + ")");
+    sendToDevice = [queue](const std::shared_ptr<dai::ADatatype>& msg) { queue->send(msg); };
+}
+
+DeviceInputNode::DeviceInputNode(std::shared_ptr<MessageQueue> queue, unsigned int queueSize, bool blocking)
+    : in(createInput("in", queueSize, blocking)) {
+    setName("DeviceInput(" + queue->getName() + ")");
+    sendToDevice = [queue](const std::shared_ptr<dai::ADatatype>& msg) { queue->send(msg); };
+}
+
+void DeviceInputNode::process() {
+    for(const auto& msg : in.tryGetAll()) sendToDevice(msg);
+}
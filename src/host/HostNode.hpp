@@ -0,0 +1,268 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+// project
+#include "device/MessageQueue.hpp"
+
+class HostPipeline;
+class DeviceOutputNode;
+
+/// Processing counters of a host node
+struct HostNodeStats {
+    /// Number of process calls
+    std::uint64_t numProcessed = 0;
+    /// Number of messages taken from inputs
+    std::uint64_t numReceived = 0;
+    /// Number of messages sent from outputs
+    std::uint64_t numSent = 0;
+    /// Number of messages discarded by non-blocking inputs
+    std::uint64_t numDropped = 0;
+    /// Number of process calls which threw
+    std::uint64_t numErrors = 0;
+    /// Message of last error thrown by process
+    std::string lastError;
+    /// Process calls per second, over recent calls
+    double fps = 0;
+    /// Duration of process calls
+    std::chrono::microseconds lastLatency{0};
+    std::chrono::microseconds averageLatency{0};
+    std::chrono::microseconds maxLatency{0};
+};
+
+/**
+ * @brief Processing stage running on host, mirroring Node API.
+ *
+ * Nodes are added to a HostPipeline, which calls process() on its thread pool whenever any input
+ * has new messages, and only while all blocking inputs linked to node outputs have space.
+ * Messages a process call sends to full blocking inputs are deferred and sent before the next call.
+ * Nodes without inputs (sources) are called repeatedly and should block until they have data.
+ * Calls of a single node never overlap.
+ */
+class HostNode : public std::enable_shared_from_this<HostNode> {
+    friend class HostPipeline;
+
+   public:
+    using Id = std::int64_t;
+
+    class Output;
+
+    /// Bounded message queue of a host node
+    class Input {
+        friend class HostNode;
+        friend class HostPipeline;
+        friend class Output;
+        friend class ::DeviceOutputNode;
+
+       public:
+        Input(HostNode& parent, std::string name, unsigned int queueSize, bool blocking);
+
+        /// @returns Node owning the input
+        HostNode& getParent();
+        /// @returns Name of the input
+        std::string getName() const;
+
+        /**
+         * Sets queue behavior when full
+         * @param blocking True - producers wait for space, false - oldest messages are discarded
+         */
+        void setBlocking(bool blocking);
+        /// @returns Whether queue is blocking
+        bool getBlocking() const;
+        /// Sets maximum number of messages in queue
+        void setQueueSize(unsigned int size);
+        /// @returns Maximum number of messages in queue
+        unsigned int getQueueSize() const;
+
+        /// @returns True if any message is waiting
+        bool has() const;
+        /// @returns Oldest message or nullptr if queue is empty
+        std::shared_ptr<dai::ADatatype> tryGet();
+        /// @returns All waiting messages
+        std::vector<std::shared_ptr<dai::ADatatype>> tryGetAll();
+        /// @returns Oldest message, waiting for one. Throws if pipeline was stopped
+        std::shared_ptr<dai::ADatatype> get();
+        /**
+         * Waits for a message up to 'timeout'
+         * @returns Oldest message or nullptr on timeout. Throws if pipeline was stopped
+         */
+        std::shared_ptr<dai::ADatatype> get(std::chrono::milliseconds timeout, bool& timedout);
+
+        /// @returns Underlying queue
+        std::shared_ptr<MessageQueue> getQueue() const;
+
+       private:
+        // Pushes a message and wakes up the node, false if input was closed
+        bool push(const std::shared_ptr<dai::ADatatype>& msg);
+        bool isFull() const;
+
+        HostNode& parent;
+        const std::string name;
+        std::shared_ptr<MessageQueue> queue;
+        std::atomic<std::uint64_t> numTaken{0};
+    };
+
+    /// Output of a host node, sending messages to linked inputs
+    class Output {
+        friend class HostNode;
+        friend class HostPipeline;
+
+       public:
+        Output(HostNode& parent, std::string name);
+
+        /// @returns Node owning the output
+        HostNode& getParent();
+        /// @returns Name of the output
+        std::string getName() const;
+
+        /// Links output to an input. Links must be made before the pipeline is started
+        void link(Input& in);
+        /// Removes link to an input, returns true if it existed
+        bool unlink(Input& in);
+        /// @returns Linked inputs
+        std::vector<Input*> getConnections() const;
+
+        /**
+         * Sends a message to all linked inputs. Called from process(), messages for full blocking inputs
+         * are deferred until they have space. Otherwise waits for space on blocking inputs.
+         * @returns False if the pipeline was stopped
+         */
+        bool send(const std::shared_ptr<dai::ADatatype>& msg);
+
+       private:
+        // Whether all blocking linked inputs have space and no messages are deferred
+        bool canSend() const;
+        // Whether any deferred message can be pushed
+        bool canFlush() const;
+        // Pushes deferred messages to inputs which have space, in order
+        void flush();
+
+        HostNode& parent;
+        const std::string name;
+        mutable std::mutex mtx;
+        std::vector<Input*> connections;
+        // Messages deferred by process calls, by input
+        std::map<Input*, std::deque<std::shared_ptr<dai::ADatatype>>> deferred;
+    };
+
+    HostNode();
+    virtual ~HostNode();
+
+    HostNode(const HostNode&) = delete;
+    HostNode& operator=(const HostNode&) = delete;
+
+    /// @returns Id of node, assigned when added to a pipeline, -1 before
+    Id getId() const;
+    /// @returns Name of node
+    std::string getName() const;
+    /// Sets name of node, shown in stats and errors
+    void setName(const std::string& name);
+
+    /**
+     * Creates an input
+     * @param name Name of the input, unique within node
+     * @param queueSize Maximum number of messages in queue
+     * @param blocking Whether producers wait for space when queue is full
+     */
+    Input& createInput(const std::string& name, unsigned int queueSize = 8, bool blocking = true);
+    /// Creates an output, name must be unique within node
+    Output& createOutput(const std::string& name);
+    /// @returns Input with given name, throws if it doesn't exist
+    Input& getInput(const std::string& name);
+    /// @returns Output with given name, throws if it doesn't exist
+    Output& getOutput(const std::string& name);
+    std::vector<Input*> getInputs();
+    std::vector<Output*> getOutputs();
+
+    /// @returns Processing counters
+    HostNodeStats getStats() const;
+
+    /// Processes waiting messages, called on pipeline thread pool
+    virtual void process();
+    /// Called when pipeline starts, before any process call
+    virtual void onStart();
+    /// Called when pipeline stops, after all process calls finished
+    virtual void onStop();
+
+   private:
+    void runOnce();
+    bool isRunnable() const;
+    bool isReady() const;
+    void wake();
+    void countSent();
+
+    HostPipeline* pipeline = nullptr;
+    Id id = -1;
+    std::string name = "HostNode";
+    std::vector<std::unique_ptr<Input>> inputs;
+    std::vector<std::unique_ptr<Output>> outputs;
+
+    // Scheduling state, guarded by pipeline
+    std::atomic<bool> scheduled{false};
+    // Set when the pipeline stops, so waiting for input messages can give up
+    std::atomic<bool> stopped{false};
+    std::atomic<std::uint64_t> numPushed{0};
+    // Number of pushes seen by last process call which didn't take any message
+    std::atomic<std::uint64_t> idlePushCount{UINT64_MAX};
+
+    mutable std::mutex statsMtx;
+    HostNodeStats stats;
+    std::chrono::microseconds totalLatency{0};
+    std::deque<std::chrono::steady_clock::time_point> recentCalls;
+};
+
+/// Forwards messages of a device output stream (XLinkOut) into the host pipeline
+class DeviceOutputNode : public HostNode {
+   public:
+    /**
+     * Takes over a device output queue. The queue is made non-blocking with size 1, as messages
+     * are buffered by the 'in' input of this node, which applies backpressure to the stream
+     */
+    explicit DeviceOutputNode(std::shared_ptr<dai::DataOutputQueue> queue, unsigned int queueSize = 8, bool blocking = true);
+    /// Forwards messages of a host queue (eg. ReconnectingDevice output queue)
+    explicit DeviceOutputNode(std::shared_ptr<MessageQueue> queue, unsigned int queueSize = 8, bool blocking = true);
+
+    /// Messages received from device
+    Input& in;
+    /// Messages forwarded into host pipeline
+    Output& out;
+
+    void process() override;
+    void onStart() override;
+    void onStop() override;
+
+   private:
+    std::function<int()> subscribe;
+    std::function<void(int)> unsubscribe;
+    int callbackId = -1;
+};
+
+/// Sends messages from the host pipeline to a device input stream (XLinkIn)
+class DeviceInputNode : public HostNode {
+   public:
+    explicit DeviceInputNode(std::shared_ptr<dai::DataInputQueue> queue, unsigned int queueSize = 8, bool blocking = true);
+    /// Sends into a host queue (eg. ReconnectingDevice input queue)
+    explicit DeviceInputNode(std::shared_ptr<MessageQueue> queue, unsigned int queueSize = 8, bool blocking = true);
+
+    /// Messages to be sent to device
+    Input& in;
+
+    void process() override;
+
+   private:
+    std::function<void(const std::shared_ptr<dai::ADatatype>&)> sendToDevice;
+};
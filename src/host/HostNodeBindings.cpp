@@ -0,0 +1,158 @@
+#include "HostNodeBindings.hpp"
+
+// std
+#include <chrono>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/device/Device.hpp"
+
+// project
+#include "HostNode.hpp"
+#include "HostPipeline.hpp"
+
+// Trampoline class, so host nodes can be implemented in python
+class PyHostNode : public HostNode {
+   public:
+    using HostNode::HostNode;
+
+    void process() override {
+        PYBIND11_OVERRIDE(void, HostNode, process, );
+    }
+    void onStart() override {
+        PYBIND11_OVERRIDE(void, HostNode, onStart, );
+    }
+    void onStop() override {
+        PYBIND11_OVERRIDE(void, HostNode, onStop, );
+    }
+};
+
+void HostNodeBindings::bind(pybind11::module& m){
+
+    using namespace dai;
+    using namespace std::chrono;
+
+    py::class_<HostNodeStats>(m, "HostNodeStats", "Processing counters of a host node")
+        .def(py::init<>())
+        .def_readonly("numProcessed", &HostNodeStats::numProcessed, "Number of process calls")
+        .def_readonly("numReceived", &HostNodeStats::numReceived, "Number of messages taken from inputs")
+        .def_readonly("numSent", &HostNodeStats::numSent, "Number of messages sent from outputs")
+        .def_readonly("numDropped", &HostNodeStats::numDropped, "Number of messages discarded by non-blocking inputs")
+        .def_readonly("numErrors", &HostNodeStats::numErrors, "Number of process calls which threw")
+        .def_readonly("lastError", &HostNodeStats::lastError, "Message of last error thrown by process")
+        .def_readonly("fps", &HostNodeStats::fps, "Process calls per second, over recent calls")
+        .def_readonly("lastLatency", &HostNodeStats::lastLatency, "Duration of last process call")
+        .def_readonly("averageLatency", &HostNodeStats::averageLatency, "Average duration of process calls")
+        .def_readonly("maxLatency", &HostNodeStats::maxLatency, "Maximum duration of process calls")
+        ;
+
+    py::class_<HostNode, PyHostNode, std::shared_ptr<HostNode>> hostNode(m, "HostNode", "Processing stage running on host, mirroring Node API. Override 'process', which is called on the host pipeline thread pool whenever any input has new messages");
+    py::class_<HostNode::Input> hostNodeInput(hostNode, "Input", "Bounded message queue of a host node");
+    py::class_<HostNode::Output> hostNodeOutput(hostNode, "Output", "Output of a host node, sending messages to linked inputs");
+
+    hostNodeInput
+        .def("getParent", &HostNode::Input::getParent, py::return_value_policy::reference, "Get node owning the input")
+        .def("getName", &HostNode::Input::getName, "Get name of the input")
+        .def("setBlocking", &HostNode::Input::setBlocking, py::arg("blocking"), "Sets queue behavior when full. True - producers wait for space, false - oldest messages are discarded")
+        .def("getBlocking", &HostNode::Input::getBlocking, "Gets queue behavior when full")
+        .def("setQueueSize", &HostNode::Input::setQueueSize, py::arg("size"), "Sets maximum number of messages in queue")
+        .def("getQueueSize", &HostNode::Input::getQueueSize, "Gets maximum number of messages in queue")
+        .def("has", &HostNode::Input::has, "Check whether any message is waiting")
+        .def("tryGet", &HostNode::Input::tryGet, "Try to retrieve oldest message. Returns None if no message is available")
+        .def("tryGetAll", &HostNode::Input::tryGetAll, "Try to retrieve all waiting messages")
+        .def("get", [](HostNode::Input& in){
+
+            std::shared_ptr<ADatatype> d = nullptr;
+            bool timedout = true;
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+
+                    // block for 100ms
+                    d = in.get(milliseconds(100), timedout);
+                }
+
+                // check if interrupt triggered in between
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+
+            } while(timedout);
+
+            return d;
+        }, "Blocks until a message is available and retrieves it. Throws if pipeline was stopped")
+        .def("getQueue", &HostNode::Input::getQueue, "Get underlying queue")
+        ;
+
+    hostNodeOutput
+        .def("getParent", &HostNode::Output::getParent, py::return_value_policy::reference, "Get node owning the output")
+        .def("getName", &HostNode::Output::getName, "Get name of the output")
+        .def("link", &HostNode::Output::link, py::arg("input"), "Links output to an input. Links must be made before the pipeline is started")
+        .def("unlink", &HostNode::Output::unlink, py::arg("input"), "Removes link to an input, returns True if it existed")
+        .def("getConnections", &HostNode::Output::getConnections, py::return_value_policy::reference, "Get linked inputs")
+        .def("send", &HostNode::Output::send, py::arg("msg"), py::call_guard<py::gil_scoped_release>(), "Sends a message to all linked inputs. Called from process, messages for full blocking inputs are deferred until they have space, otherwise waits for space on blocking inputs. Returns False if the pipeline was stopped")
+        ;
+
+    hostNode
+        .def(py::init<>())
+        .def("getId", &HostNode::getId, "Get id of node, assigned when added to a pipeline, -1 before")
+        .def("getName", &HostNode::getName, "Get name of node")
+        .def("setName", &HostNode::setName, py::arg("name"), "Sets name of node, shown in stats and errors")
+        .def("createInput", &HostNode::createInput, py::arg("name"), py::arg("queueSize") = 8, py::arg("blocking") = true, py::return_value_policy::reference_internal, "Creates an input, name must be unique within node")
+        .def("createOutput", &HostNode::createOutput, py::arg("name"), py::return_value_policy::reference_internal, "Creates an output, name must be unique within node")
+        .def("getInput", &HostNode::getInput, py::arg("name"), py::return_value_policy::reference_internal, "Get input with given name")
+        .def("getOutput", &HostNode::getOutput, py::arg("name"), py::return_value_policy::reference_internal, "Get output with given name")
+        .def("getInputs", &HostNode::getInputs, py::return_value_policy::reference_internal, "Get all inputs")
+        .def("getOutputs", &HostNode::getOutputs, py::return_value_policy::reference_internal, "Get all outputs")
+        .def("getStats", &HostNode::getStats, "Get processing counters")
+        .def("process", &HostNode::process, "Processes waiting messages, called on pipeline thread pool")
+        .def("onStart", &HostNode::onStart, "Called when pipeline starts, before any process call")
+        .def("onStop", &HostNode::onStop, "Called when pipeline stops, after all process calls finished")
+        ;
+
+    py::class_<DeviceOutputNode, HostNode, std::shared_ptr<DeviceOutputNode>>(m, "DeviceOutputNode", "Forwards messages of a device output stream (XLinkOut) into the host pipeline")
+        .def(py::init<std::shared_ptr<DataOutputQueue>, unsigned int, bool>(), py::arg("queue"), py::arg("queueSize") = 8, py::arg("blocking") = true, "Takes over a device output queue, messages are buffered by the 'in' input of this node")
+        .def(py::init<std::shared_ptr<MessageQueue>, unsigned int, bool>(), py::arg("queue"), py::arg("queueSize") = 8, py::arg("blocking") = true, "Forwards messages of a host queue (eg. ReconnectingDevice output queue)")
+        .def_property_readonly("input", [](DeviceOutputNode& n) -> HostNode::Input& { return n.in; }, py::return_value_policy::reference_internal, "Messages received from device")
+        .def_property_readonly("out", [](DeviceOutputNode& n) -> HostNode::Output& { return n.out; }, py::return_value_policy::reference_internal, "Messages forwarded into host pipeline")
+        ;
+
+    py::class_<DeviceInputNode, HostNode, std::shared_ptr<DeviceInputNode>>(m, "DeviceInputNode", "Sends messages from the host pipeline to a device input stream (XLinkIn)")
+        .def(py::init<std::shared_ptr<DataInputQueue>, unsigned int, bool>(), py::arg("queue"), py::arg("queueSize") = 8, py::arg("blocking") = true)
+        .def(py::init<std::shared_ptr<MessageQueue>, unsigned int, bool>(), py::arg("queue"), py::arg("queueSize") = 8, py::arg("blocking") = true, "Sends into a host queue (eg. ReconnectingDevice input queue)")
+        .def_property_readonly("input", [](DeviceInputNode& n) -> HostNode::Input& { return n.in; }, py::return_value_policy::reference_internal, "Messages to be sent to device")
+        ;
+
+    py::class_<HostPipeline, std::shared_ptr<HostPipeline>>(m, "HostPipeline", "Collection of host nodes, scheduled on a managed thread pool. Backpressure of blocking inputs propagates upstream, up to device output streams")
+        .def(py::init([](std::size_t numThreads){
+            // Stopping waits for process calls, which may need the GIL
+            return std::shared_ptr<HostPipeline>(new HostPipeline(numThreads), [](HostPipeline* p) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete p;
+                } else {
+                    delete p;
+                }
+            });
+        }), py::arg("numThreads") = 0, "Creates a host pipeline. 'numThreads' - number of pool threads, 0 for one thread per node")
+        .def("add", &HostPipeline::add, py::arg("node"), py::keep_alive<1, 2>(), "Adds a node to the pipeline")
+        .def("getAllNodes", &HostPipeline::getAllNodes, "Get all nodes")
+        .def("getNode", &HostPipeline::getNode, py::arg("id"), "Get node with given id, None if it doesn't exist")
+        .def("createDeviceOutput", &HostPipeline::createDeviceOutput, py::arg("device"), py::arg("streamName"), py::arg("queueSize") = 8, py::arg("blocking") = true, py::keep_alive<1, 2>(), "Creates a node forwarding device output stream 'streamName' into the pipeline")
+        .def("createDeviceInput", &HostPipeline::createDeviceInput, py::arg("device"), py::arg("streamName"), py::arg("queueSize") = 8, py::arg("blocking") = true, py::keep_alive<1, 2>(), "Creates a node sending messages to device input stream 'streamName'")
+        .def("setNumThreads", &HostPipeline::setNumThreads, py::arg("numThreads"), "Sets number of pool threads, 0 for one thread per node. Takes effect on start")
+        .def("getNumThreads", &HostPipeline::getNumThreads, "Get number of pool threads")
+        .def("start", &HostPipeline::start, py::call_guard<py::gil_scoped_release>(), "Starts scheduling nodes")
+        .def("stop", &HostPipeline::stop, py::call_guard<py::gil_scoped_release>(), "Stops scheduling, closes node inputs and waits for running process calls. Pipeline can't be restarted")
+        .def("isRunning", &HostPipeline::isRunning, "Check whether pipeline is running")
+        .def("__enter__", [](HostPipeline& p) -> HostPipeline& {
+            py::gil_scoped_release release;
+            p.start();
+            return p;
+        }, py::return_value_policy::reference_internal)
+        .def("__exit__", [](HostPipeline& p, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            p.stop();
+        })
+        ;
+
+}
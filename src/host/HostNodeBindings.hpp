@@ -0,0 +1,8 @@
+#pragma once
+
+// pybind
+#include "pybind11_common.hpp"
+
+struct HostNodeBindings {
+    static void bind(pybind11::module& m);
+};
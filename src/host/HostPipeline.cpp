@@ -0,0 +1,142 @@
+#include "HostPipeline.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+HostPipeline::HostPipeline(std::size_t numThreads) : numThreads(numThreads) {}
+
+HostPipeline::~HostPipeline() {
+    stop();
+}
+
+void HostPipeline::add(std::shared_ptr<HostNode> node) {
+    if(node == nullptr) throw std::invalid_argument("Node can't be null");
+    std::lock_guard<std::mutex> lock(mtx);
+    if(running || stopped) throw std::logic_error("Nodes can't be added to a started pipeline");
+    if(node->pipeline != nullptr) throw std::logic_error("Node '" + node->getName() + "' already belongs to a pipeline");
+    node->pipeline = this;
+    node->id = nextId++;
+    nodes.push_back(std::move(node));
+}
+
+std::vector<std::shared_ptr<HostNode>> HostPipeline::getAllNodes() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return nodes;
+}
+
+std::shared_ptr<HostNode> HostPipeline::getNode(HostNode::Id id) const {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(id < 0 || id >= static_cast<HostNode::Id>(nodes.size())) return nullptr;
+    return nodes[id];
+}
+
+std::shared_ptr<DeviceOutputNode> HostPipeline::createDeviceOutput(dai::Device& device, const std::string& streamName, unsigned int queueSize, bool blocking) {
+    return create<DeviceOutputNode>(device.getOutputQueue(streamName), queueSize, blocking);
+}
+
+std::shared_ptr<DeviceInputNode> HostPipeline::createDeviceInput(dai::Device& device, const std::string& streamName, unsigned int queueSize, bool blocking) {
+    return create<DeviceInputNode>(device.getInputQueue(streamName), queueSize, blocking);
+}
+
+void HostPipeline::setNumThreads(std::size_t numThreads) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->numThreads = numThreads;
+}
+
+std::size_t HostPipeline::getNumThreads() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(pool != nullptr) return pool->getNumThreads();
+    return numThreads > 0 ? numThreads : std::max<std::size_t>(nodes.size(), 1);
+}
+
+void HostPipeline::start() {
+    std::vector<std::shared_ptr<HostNode>> toSchedule;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(stopped) throw std::logic_error("Host pipeline can't be restarted");
+        if(running) return;
+
+        // Links are fixed from now on, producers are rescheduled when their consumers take messages
+        producers.assign(nodes.size(), {});
+        for(const auto& node : nodes) {
+            for(const auto& out : node->outputs) {
+                for(auto* in : out->getConnections()) {
+                    auto& consumer = in->getParent();
+                    if(consumer.pipeline != this) {
+                        throw std::logic_error("Output '" + out->getName() + "' of node '" + node->getName() + "' is linked to a node outside of the pipeline");
+                    }
+                    auto& list = producers[consumer.id];
+                    if(std::find(list.begin(), list.end(), node.get()) == list.end()) list.push_back(node.get());
+                }
+            }
+        }
+
+        std::size_t threads = numThreads > 0 ? numThreads : std::max<std::size_t>(nodes.size(), 1);
+        pool.reset(new ThreadPool(threads));
+        try {
+            for(const auto& node : nodes) node->onStart();
+        } catch(...) {
+            pool.reset();
+            throw;
+        }
+        running = true;
+        toSchedule = nodes;
+    }
+
+    for(const auto& node : toSchedule) schedule(*node);
+}
+
+void HostPipeline::stop() {
+    std::unique_ptr<ThreadPool> toJoin;
+    std::vector<std::shared_ptr<HostNode>> toStop;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(!running) return;
+        running = false;
+        stopped = true;
+        toJoin = std::move(pool);
+        toStop = nodes;
+    }
+
+    // Wake up producers blocked on full inputs and consumers waiting for messages
+    for(const auto& node : toStop) {
+        node->stopped = true;
+        for(const auto& in : node->inputs) in->getQueue()->close("Host pipeline stopped");
+    }
+    // Waits for running process calls
+    toJoin.reset();
+    for(const auto& node : toStop) {
+        try {
+            node->onStop();
+        } catch(const std::exception&) {
+        }
+    }
+}
+
+bool HostPipeline::isRunning() const {
+    return running;
+}
+
+void HostPipeline::schedule(HostNode& node) {
+    if(!running || !node.isRunnable()) return;
+    bool expected = false;
+    if(!node.scheduled.compare_exchange_strong(expected, true)) return;
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(!running) {
+        node.scheduled = false;
+        return;
+    }
+    auto self = node.shared_from_this();
+    pool->submit([this, self]() { run(self); });
+}
+
+void HostPipeline::run(const std::shared_ptr<HostNode>& node) {
+    if(running && node->isRunnable()) node->runOnce();
+    node->scheduled = false;
+
+    // Taken messages freed space for producers
+    for(auto* producer : producers[node->id]) schedule(*producer);
+    schedule(*node);
+}
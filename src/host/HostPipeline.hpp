@@ -0,0 +1,85 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <cstddef>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/Device.hpp"
+
+// project
+#include "HostNode.hpp"
+#include "utility/ThreadPool.hpp"
+
+/**
+ * @brief Collection of host nodes, scheduled on a managed thread pool.
+ *
+ * A node is scheduled when any of its inputs receives a message, as long as all blocking inputs
+ * its outputs are linked to have space. Consumers taking messages reschedule their producers,
+ * so backpressure propagates upstream without blocking pool threads.
+ */
+class HostPipeline {
+   public:
+    /**
+     * @param numThreads Number of pool threads, 0 for one thread per node
+     */
+    explicit HostPipeline(std::size_t numThreads = 0);
+    /// Stops the pipeline
+    ~HostPipeline();
+
+    HostPipeline(const HostPipeline&) = delete;
+    HostPipeline& operator=(const HostPipeline&) = delete;
+
+    /// Creates a node and adds it to the pipeline
+    template <typename N, typename... Args>
+    std::shared_ptr<N> create(Args&&... args) {
+        auto node = std::make_shared<N>(std::forward<Args>(args)...);
+        add(node);
+        return node;
+    }
+
+    /// Adds a node, throws if it already belongs to a pipeline or pipeline is running
+    void add(std::shared_ptr<HostNode> node);
+    /// @returns All nodes
+    std::vector<std::shared_ptr<HostNode>> getAllNodes() const;
+    /// @returns Node with given id, nullptr if it doesn't exist
+    std::shared_ptr<HostNode> getNode(HostNode::Id id) const;
+
+    /// Creates a node forwarding device output stream 'streamName' into the pipeline
+    std::shared_ptr<DeviceOutputNode> createDeviceOutput(dai::Device& device, const std::string& streamName, unsigned int queueSize = 8, bool blocking = true);
+    /// Creates a node sending messages to device input stream 'streamName'
+    std::shared_ptr<DeviceInputNode> createDeviceInput(dai::Device& device, const std::string& streamName, unsigned int queueSize = 8, bool blocking = true);
+
+    /// Sets number of pool threads, 0 for one thread per node. Takes effect on start
+    void setNumThreads(std::size_t numThreads);
+    /// @returns Number of pool threads
+    std::size_t getNumThreads() const;
+
+    /// Starts scheduling nodes. Throws if links refer to nodes outside of the pipeline
+    void start();
+    /// Stops scheduling, closes node inputs and waits for running process calls. Pipeline can't be restarted
+    void stop();
+    /// @returns True if pipeline is running
+    bool isRunning() const;
+
+   private:
+    friend class HostNode;
+
+    void schedule(HostNode& node);
+    void run(const std::shared_ptr<HostNode>& node);
+
+    mutable std::mutex mtx;
+    std::vector<std::shared_ptr<HostNode>> nodes;
+    // Producers of each node, by node id
+    std::vector<std::vector<HostNode*>> producers;
+    HostNode::Id nextId = 0;
+    std::size_t numThreads;
+    std::unique_ptr<ThreadPool> pool;
+    std::atomic<bool> running{false};
+    bool stopped = false;
+};
@@ -0,0 +1,191 @@
+#include "BlobInfo.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+// project
+#include "utility/MappedFile.hpp"
+
+namespace {
+
+// Layout of blob headers, see OpenVINO vpu/graph_transformer blob format.
+// ELF header precedes the blob header, both are packed and little endian
+constexpr std::size_t ELF_HEADER_SIZE = 52;
+constexpr std::size_t BLOB_HEADER_SIZE = 80;
+constexpr std::uint32_t BLOB_MAGIC_NUMBER = 9709;
+// Dimensions of input and output tensors are stored in the blob constants section
+constexpr std::int32_t LOCATION_BLOB = 3;
+// Dimension names by index, in dims order codes each nibble holds (index + 1), innermost first
+constexpr char DIM_NAMES[] = {'W', 'H', 'C', 'N', 'D'};
+
+// Bounds checked little endian reader
+class Reader {
+   public:
+    Reader(const std::uint8_t* data, std::size_t size) : data(data), size(size) {}
+
+    std::uint32_t u32(std::size_t& offset) const {
+        check(offset, 4);
+        const std::uint8_t* p = data + offset;
+        offset += 4;
+        return static_cast<std::uint32_t>(p[0]) | static_cast<std::uint32_t>(p[1]) << 8 | static_cast<std::uint32_t>(p[2]) << 16
+               | static_cast<std::uint32_t>(p[3]) << 24;
+    }
+
+    std::string str(std::size_t& offset, std::size_t length) const {
+        check(offset, length);
+        std::string s(reinterpret_cast<const char*>(data + offset), length);
+        offset += length;
+        // Names are zero padded
+        return s.substr(0, s.find('\0'));
+    }
+
+   private:
+    void check(std::size_t offset, std::size_t length) const {
+        if(offset > size || length > size - offset) throw std::invalid_argument("BlobInfo | Blob is truncated or corrupted");
+    }
+
+    const std::uint8_t* data;
+    std::size_t size;
+};
+
+std::vector<TensorInfo> parseTensors(const Reader& reader, std::size_t offset, std::uint32_t count, std::uint32_t constDataOffset) {
+    std::vector<TensorInfo> tensors;
+    for(std::uint32_t i = 0; i < count; i++) {
+        TensorInfo tensor;
+        // index
+        reader.u32(offset);
+        tensor.offset = static_cast<std::int32_t>(reader.u32(offset));
+        auto nameLength = reader.u32(offset);
+        tensor.name = reader.str(offset, nameLength);
+        auto dataType = reader.u32(offset);
+        if(dataType > static_cast<std::uint32_t>(TensorInfo::DataType::I8)) throw std::invalid_argument("BlobInfo | Unknown data type of tensor: " + tensor.name);
+        tensor.dataType = static_cast<TensorInfo::DataType>(dataType);
+        auto orderCode = reader.u32(offset);
+        auto numDims = reader.u32(offset);
+        auto dimsLocation = static_cast<std::int32_t>(reader.u32(offset));
+        std::size_t dimsOffset = static_cast<std::size_t>(constDataOffset) + reader.u32(offset);
+        // strides location and offset
+        reader.u32(offset);
+        reader.u32(offset);
+
+        // Order code lists dimensions innermost first
+        std::vector<char> order;
+        for(std::uint32_t code = orderCode; code != 0; code >>= 4) {
+            std::uint32_t dim = (code & 0xF) - 1;
+            if(dim >= sizeof(DIM_NAMES)) throw std::invalid_argument("BlobInfo | Unknown dims order of tensor: " + tensor.name);
+            order.push_back(DIM_NAMES[dim]);
+        }
+        if(order.size() != numDims) throw std::invalid_argument("BlobInfo | Dims order doesn't match number of dims of tensor: " + tensor.name);
+
+        // Dimensions stored elsewhere are only known at runtime
+        if(dimsLocation == LOCATION_BLOB) {
+            for(std::uint32_t d = 0; d < numDims; d++) tensor.dims.push_back(reader.u32(dimsOffset));
+            std::reverse(tensor.dims.begin(), tensor.dims.end());
+        }
+        tensor.order.assign(order.rbegin(), order.rend());
+        tensors.push_back(std::move(tensor));
+    }
+    return tensors;
+}
+
+const TensorInfo& findTensor(const std::vector<TensorInfo>& tensors, const std::string& name, const char* kind) {
+    for(const auto& tensor : tensors) {
+        if(tensor.name == name) return tensor;
+    }
+    throw std::invalid_argument(std::string("BlobInfo | Blob has no ") + kind + " named: " + name);
+}
+
+}  // namespace
+
+std::size_t TensorInfo::getNumElements() const {
+    std::size_t num = 1;
+    for(auto dim : dims) num *= dim;
+    return num;
+}
+
+std::size_t TensorInfo::getElementSize() const {
+    switch(dataType) {
+        case DataType::FP16:
+            return 2;
+        case DataType::U8F:
+        case DataType::I8:
+            return 1;
+        case DataType::INT:
+        case DataType::FP32:
+            return 4;
+    }
+    return 0;
+}
+
+std::size_t TensorInfo::getSize() const {
+    return getNumElements() * getElementSize();
+}
+
+BlobInfo::BlobInfo(const std::string& path) {
+    MappedFile file(path);
+    parse(file.data(), file.size());
+}
+
+BlobInfo::BlobInfo(const std::uint8_t* data, std::size_t size) {
+    parse(data, size);
+}
+
+void BlobInfo::parse(const std::uint8_t* data, std::size_t blobSize) {
+    if(data == nullptr || blobSize < ELF_HEADER_SIZE + BLOB_HEADER_SIZE) throw std::invalid_argument("BlobInfo | Blob is empty or too small");
+
+    Reader reader(data, blobSize);
+    std::size_t offset = ELF_HEADER_SIZE;
+    if(reader.u32(offset) != BLOB_MAGIC_NUMBER) throw std::invalid_argument("BlobInfo | Data does not seem to be a supported neural network blob");
+    size = blobSize;
+
+    // file size
+    reader.u32(offset);
+    versionMajor = reader.u32(offset);
+    versionMinor = reader.u32(offset);
+    auto inputsCount = reader.u32(offset);
+    auto outputsCount = reader.u32(offset);
+    numStages = reader.u32(offset);
+    inputsSize = reader.u32(offset);
+    outputsSize = reader.u32(offset);
+    // batch size
+    reader.u32(offset);
+    bssMemSize = reader.u32(offset);
+    numSlices = reader.u32(offset);
+    numShaves = reader.u32(offset);
+    // hw, shave and dma stage flags
+    offset += 3 * 4;
+    auto inputInfoOffset = reader.u32(offset);
+    auto outputInfoOffset = reader.u32(offset);
+    // stage section
+    reader.u32(offset);
+    auto constDataOffset = reader.u32(offset);
+
+    inputs = parseTensors(reader, inputInfoOffset, inputsCount, constDataOffset);
+    outputs = parseTensors(reader, outputInfoOffset, outputsCount, constDataOffset);
+}
+
+std::vector<dai::OpenVINO::Version> BlobInfo::getSupportedOpenVINOVersions() const {
+    return dai::OpenVINO::getBlobSupportedVersions(versionMajor, versionMinor);
+}
+
+dai::OpenVINO::Version BlobInfo::getOpenVINOVersion() const {
+    if(getSupportedOpenVINOVersions().empty()) {
+        throw std::runtime_error("BlobInfo | Blob version " + std::to_string(versionMajor) + "." + std::to_string(versionMinor)
+                                 + " isn't supported by any known OpenVINO version");
+    }
+    return dai::OpenVINO::getBlobLatestSupportedVersion(versionMajor, versionMinor);
+}
+
+bool BlobInfo::isCompatible(dai::OpenVINO::Version version) const {
+    auto versions = getSupportedOpenVINOVersions();
+    return std::find(versions.begin(), versions.end(), version) != versions.end();
+}
+
+const TensorInfo& BlobInfo::getInput(const std::string& name) const {
+    return findTensor(inputs, name, "input");
+}
+
+const TensorInfo& BlobInfo::getOutput(const std::string& name) const {
+    return findTensor(outputs, name, "output");
+}
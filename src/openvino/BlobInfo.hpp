@@ -0,0 +1,79 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/openvino/OpenVINO.hpp"
+
+/// Description of a network input or output tensor, as compiled into the blob
+struct TensorInfo {
+    /// Data types of tensors
+    enum class DataType : std::int32_t { FP16 = 0, U8F = 1, INT = 2, FP32 = 3, I8 = 4 };
+
+    /// Tensor name
+    std::string name;
+    DataType dataType = DataType::FP16;
+    /// Order of dimensions, outermost first (eg. 'NCHW')
+    std::string order;
+    /// Dimensions, in the same order as 'order'
+    std::vector<std::uint32_t> dims;
+    /// Offset of the tensor in input or output buffer
+    std::int32_t offset = 0;
+
+    /// @returns Number of elements in tensor
+    std::size_t getNumElements() const;
+    /// @returns Size of a single element in bytes
+    std::size_t getElementSize() const;
+    /// @returns Size of tensor in bytes
+    std::size_t getSize() const;
+};
+
+/**
+ * @brief Information parsed from a compiled MyriadX neural network blob header, without a device.
+ *
+ * Blob is parsed in place, files are memory mapped and only the header pages are read.
+ */
+class BlobInfo {
+   public:
+    /// Parses blob at path, throws if file can't be read or isn't a blob
+    explicit BlobInfo(const std::string& path);
+    /// Parses blob in memory, throws if data isn't a blob
+    BlobInfo(const std::uint8_t* data, std::size_t size);
+
+    /// Blob format version
+    std::uint32_t versionMajor = 0;
+    std::uint32_t versionMinor = 0;
+    /// Size of blob in bytes
+    std::size_t size = 0;
+    /// Number of SHAVEs and CMX slices the blob was compiled for
+    std::uint32_t numShaves = 0;
+    std::uint32_t numSlices = 0;
+    /// Number of stages (layers)
+    std::uint32_t numStages = 0;
+    /// Size of inputs and outputs buffers in bytes
+    std::uint32_t inputsSize = 0;
+    std::uint32_t outputsSize = 0;
+    /// Size of intermediate buffers in bytes
+    std::uint32_t bssMemSize = 0;
+
+    std::vector<TensorInfo> inputs;
+    std::vector<TensorInfo> outputs;
+
+    /// @returns OpenVINO versions able to run the blob, empty if blob version is unknown
+    std::vector<dai::OpenVINO::Version> getSupportedOpenVINOVersions() const;
+    /// @returns Latest OpenVINO version able to run the blob, throws if blob version is unknown
+    dai::OpenVINO::Version getOpenVINOVersion() const;
+    /// @returns Whether blob can run with given OpenVINO version
+    bool isCompatible(dai::OpenVINO::Version version) const;
+
+    /// @returns Input or output with given name, throws if there is none
+    const TensorInfo& getInput(const std::string& name) const;
+    const TensorInfo& getOutput(const std::string& name) const;
+
+   private:
+    void parse(const std::uint8_t* data, std::size_t size);
+};
@@ -3,6 +3,9 @@
 // depthai
 #include "depthai/openvino/OpenVINO.hpp"
 
+// project
+#include "BlobInfo.hpp"
+
 void OpenVINOBindings::bind(pybind11::module& m){
 
     using namespace dai;
@@ -35,7 +38,55 @@ void OpenVINOBindings::bind(pybind11::module& m){
         .export_values()
     ;
 
-}
-
+    // Bind TensorInfo
+    py::class_<TensorInfo> tensorInfo(m, "TensorInfo", "Description of a network input or output tensor, as compiled into the blob");
+    py::enum_<TensorInfo::DataType>(tensorInfo, "DataType")
+        .value("FP16", TensorInfo::DataType::FP16)
+        .value("U8F", TensorInfo::DataType::U8F)
+        .value("INT", TensorInfo::DataType::INT)
+        .value("FP32", TensorInfo::DataType::FP32)
+        .value("I8", TensorInfo::DataType::I8)
+    ;
+    tensorInfo
+        .def_readonly("name", &TensorInfo::name)
+        .def_readonly("dataType", &TensorInfo::dataType)
+        .def_readonly("order", &TensorInfo::order, "Order of dimensions, outermost first (eg. 'NCHW')")
+        .def_readonly("dims", &TensorInfo::dims, "Dimensions, in the same order as 'order'")
+        .def_readonly("offset", &TensorInfo::offset)
+        .def("getNumElements", &TensorInfo::getNumElements)
+        .def("getElementSize", &TensorInfo::getElementSize)
+        .def("getSize", &TensorInfo::getSize, "Size of tensor in bytes")
+        .def("__repr__", [](const TensorInfo& t){
+            std::string dims;
+            for(auto d : t.dims) dims += (dims.empty() ? "" : ", ") + std::to_string(d);
+            return "TensorInfo(name='" + t.name + "', order='" + t.order + "', dims=[" + dims + "])";
+        })
+    ;
 
+    // Bind BlobInfo
+    py::class_<BlobInfo>(m, "BlobInfo", "Information parsed from a compiled neural network blob header, without a device")
+        .def(py::init([](const py::buffer& blob){
+            py::buffer_info info = blob.request();
+            if(!PyBuffer_IsContiguous(info.view(), 'C')) throw std::invalid_argument("Blob buffer must be C contiguous");
+            return BlobInfo(static_cast<const std::uint8_t*>(info.ptr), static_cast<std::size_t>(info.size * info.itemsize));
+        }), py::arg("blob"), "Parses blob from any object supporting the buffer protocol (bytes, numpy array, MappedFile)")
+        .def(py::init<const std::string&>(), py::arg("path"), "Parses blob at path, only the header pages of the memory mapped file are read")
+        .def_readonly("versionMajor", &BlobInfo::versionMajor)
+        .def_readonly("versionMinor", &BlobInfo::versionMinor)
+        .def_readonly("size", &BlobInfo::size)
+        .def_readonly("numShaves", &BlobInfo::numShaves)
+        .def_readonly("numSlices", &BlobInfo::numSlices)
+        .def_readonly("numStages", &BlobInfo::numStages)
+        .def_readonly("inputsSize", &BlobInfo::inputsSize)
+        .def_readonly("outputsSize", &BlobInfo::outputsSize)
+        .def_readonly("bssMemSize", &BlobInfo::bssMemSize)
+        .def_readonly("inputs", &BlobInfo::inputs)
+        .def_readonly("outputs", &BlobInfo::outputs)
+        .def("getSupportedOpenVINOVersions", &BlobInfo::getSupportedOpenVINOVersions, "OpenVINO versions able to run the blob")
+        .def("getOpenVINOVersion", &BlobInfo::getOpenVINOVersion, "Latest OpenVINO version able to run the blob")
+        .def("isCompatible", &BlobInfo::isCompatible, py::arg("version"), "Whether blob can run with given OpenVINO version")
+        .def("getInput", &BlobInfo::getInput, py::arg("name"), py::return_value_policy::reference_internal)
+        .def("getOutput", &BlobInfo::getOutput, py::arg("name"), py::return_value_policy::reference_internal)
+    ;
 
+}
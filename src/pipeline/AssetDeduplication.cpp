@@ -0,0 +1,140 @@
+#include "AssetDeduplication.hpp"
+
+// std
+#include <algorithm>
+#include <cstring>
+#include <map>
+#include <memory>
+#include <utility>
+
+// depthai
+#include "depthai/pipeline/node/NeuralNetwork.hpp"
+
+// project
+#include "NodeAccess.hpp"
+#include "utility/Hash.hpp"
+
+namespace {
+
+bool isSameContent(const dai::Asset& a, const dai::Asset& b) {
+    return a.data.size() == b.data.size() && (a.data.empty() || std::memcmp(a.data.data(), b.data.data(), a.data.size()) == 0);
+}
+
+std::uint64_t hashAsset(const dai::Asset& asset) {
+    return hash64(asset.data.data(), asset.data.size());
+}
+
+// Groups assets by content. Hash collisions are resolved by comparing contents
+template <typename AssetPtr>
+std::vector<std::vector<AssetPtr>> groupByContent(const std::vector<AssetPtr>& assets) {
+    std::map<std::uint64_t, std::vector<std::size_t>> buckets;
+    std::vector<std::vector<AssetPtr>> groups;
+    for(const auto& asset : assets) {
+        auto& bucket = buckets[hashAsset(*asset)];
+        bool found = false;
+        for(auto index : bucket) {
+            if(isSameContent(*groups[index].front(), *asset)) {
+                groups[index].push_back(asset);
+                found = true;
+                break;
+            }
+        }
+        if(!found) {
+            bucket.push_back(groups.size());
+            groups.push_back({asset});
+        }
+    }
+    return groups;
+}
+
+}  // namespace
+
+AssetStats getAssetStats(const dai::AssetManager& assetManager) {
+    AssetStats stats;
+    auto assets = assetManager.getAll();
+    for(const auto& group : groupByContent(assets)) {
+        stats.numAssets += group.size();
+        stats.numUnique++;
+        stats.totalSize += group.size() * group.front()->data.size();
+        stats.deduplicatedSize += group.front()->data.size();
+        if(group.size() > 1) {
+            std::vector<std::string> keys;
+            for(const auto& asset : group) keys.push_back(asset->key);
+            stats.duplicates.push_back(keys);
+        }
+    }
+    return stats;
+}
+
+void serializeAssetsDeduplicated(const dai::AssetManager& assetManager, dai::Assets& assets, std::vector<std::uint8_t>& assetStorage) {
+    std::vector<std::uint8_t> storage;
+    dai::AssetsMutable mutableAssets;
+
+    // Same layout as AssetManager::serialize, except identical content is stored once
+    for(const auto& group : groupByContent(assetManager.getAll())) {
+        // Satisfy the strictest alignment within the group
+        std::uint32_t alignment = 1;
+        for(const auto& asset : group) alignment = std::max(alignment, asset->alignment);
+
+        std::size_t toAdd = 0;
+        if(alignment > 1 && storage.size() % alignment != 0) {
+            toAdd = alignment - (storage.size() % alignment);
+        }
+        auto offset = static_cast<std::uint32_t>(storage.size() + toAdd);
+        storage.resize(storage.size() + toAdd);
+        const auto& data = group.front()->data;
+        storage.insert(storage.end(), data.begin(), data.end());
+
+        for(const auto& asset : group) {
+            mutableAssets.set(asset->key, offset, static_cast<std::uint32_t>(data.size()), asset->alignment);
+        }
+    }
+
+    assetStorage = std::move(storage);
+    assets = dai::Assets(mutableAssets);
+}
+
+AssetStats deduplicatePipelineAssets(dai::Pipeline& pipeline) {
+    const std::string prefix = "asset:";
+
+    // Collect blobs of all neural network nodes
+    struct Blob {
+        std::shared_ptr<dai::node::NeuralNetwork> node;
+        std::shared_ptr<dai::Asset> asset;
+    };
+    std::vector<Blob> blobs;
+    for(const auto& node : pipeline.getAllNodes()) {
+        auto nn = std::dynamic_pointer_cast<dai::node::NeuralNetwork>(node);
+        if(!nn) continue;
+        const auto& uri = NeuralNetworkAccess::propertiesOf(*nn).blobUri;
+        if(uri.compare(0, prefix.size(), prefix) != 0) continue;
+        auto& nodeAssets = NodeAccess::assetsOf(*nn);
+        auto key = uri.substr(prefix.size());
+        auto all = nodeAssets.getAll();
+        auto it = std::find_if(all.begin(), all.end(), [&key](const std::shared_ptr<dai::Asset>& a) { return a->key == key; });
+        if(it != all.end()) blobs.push_back({nn, *it});
+    }
+
+    std::vector<std::shared_ptr<dai::Asset>> assets;
+    for(const auto& blob : blobs) assets.push_back(blob.asset);
+
+    auto& pipelineAssets = pipeline.getAssetManager();
+    for(const auto& group : groupByContent(assets)) {
+        if(group.size() < 2) continue;
+
+        // Store a single copy in the pipeline, keyed by content
+        std::string key = "blob/" + hashToHex(hashAsset(*group.front()));
+        dai::Asset shared;
+        shared.data = group.front()->data;
+        shared.alignment = group.front()->alignment;
+        pipelineAssets.set(key, std::move(shared));
+
+        for(const auto& blob : blobs) {
+            if(std::find(group.begin(), group.end(), blob.asset) == group.end()) continue;
+            NeuralNetworkAccess::propertiesOf(*blob.node).blobUri = prefix + key;
+            NodeAccess::assetsOf(*blob.node).remove(blob.asset->key);
+        }
+    }
+
+    return getAssetStats(pipeline.getAllAssets());
+}
@@ -0,0 +1,42 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/AssetManager.hpp"
+#include "depthai/pipeline/Pipeline.hpp"
+
+/// Sizes of assets, with identical assets accounted for once
+struct AssetStats {
+    /// Number of assets
+    std::size_t numAssets = 0;
+    /// Number of assets with distinct content
+    std::size_t numUnique = 0;
+    /// Sum of sizes of all assets in bytes
+    std::uint64_t totalSize = 0;
+    /// Sum of sizes of assets with distinct content in bytes
+    std::uint64_t deduplicatedSize = 0;
+    /// Groups of keys of assets with identical content
+    std::vector<std::vector<std::string>> duplicates;
+};
+
+/// @returns Statistics of assets in the asset manager
+AssetStats getAssetStats(const dai::AssetManager& assetManager);
+
+/**
+ * Serializes assets, storing identical content only once.
+ * Keys of identical assets refer to the same region of the storage
+ */
+void serializeAssetsDeduplicated(const dai::AssetManager& assetManager, dai::Assets& assets, std::vector<std::uint8_t>& assetStorage);
+
+/**
+ * Moves identical neural network blobs of the pipeline into a single pipeline asset, keyed by content hash,
+ * and points the nodes to it. Host memory and upload size are reduced by the removed copies.
+ *
+ * Should be called after the pipeline is built, blobs set afterwards are stored by their nodes again
+ * @returns Statistics of all pipeline assets after deduplication
+ */
+AssetStats deduplicatePipelineAssets(dai::Pipeline& pipeline);
@@ -3,6 +3,24 @@
 // depthai
 #include "depthai/pipeline/AssetManager.hpp"
 
+// project
+#include "AssetDeduplication.hpp"
+#include "utility/MappedFile.hpp"
+
+namespace {
+
+// Copies contents of a contiguous buffer into the asset, without intermediate conversions
+void setAssetData(dai::Asset& asset, const py::buffer& buffer) {
+    py::buffer_info info = buffer.request();
+    if(!PyBuffer_IsContiguous(info.view(), 'C')) throw std::invalid_argument("Buffer must be C contiguous");
+    const auto* ptr = static_cast<const std::uint8_t*>(info.ptr);
+    std::size_t size = static_cast<std::size_t>(info.size * info.itemsize);
+    py::gil_scoped_release release;
+    asset.data.assign(ptr, ptr + size);
+}
+
+}  // namespace
+
 void AssetManagerBindings::bind(pybind11::module& m){
 
     using namespace dai;
@@ -21,6 +39,27 @@ void AssetManagerBindings::bind(pybind11::module& m){
             a.data = {array.data(), array.data() + array.size()};
         })
         .def_readwrite("alignment", &Asset::alignment)
+        .def("setData", &setAssetData, py::arg("buffer"), "Sets asset contents from any object supporting the buffer protocol (bytes, numpy array, MappedFile), copying it once")
+        .def("loadFile", [](Asset& asset, const std::string& path){
+            py::gil_scoped_release release;
+            MappedFile file(path);
+            asset.data.assign(file.data(), file.data() + file.size());
+        }, py::arg("path"), "Sets asset contents from a file, read through a memory mapping without intermediate buffers")
+    ;
+
+    // Bind MappedFile
+    py::class_<MappedFile>(m, "MappedFile", py::buffer_protocol(), "Read-only memory mapped file. Supports the buffer protocol, so contents can be viewed without copying (eg. numpy.frombuffer) and are shared through the page cache between processes")
+        .def(py::init<const std::string&>(), py::arg("path"))
+        .def("size", &MappedFile::size, "Size of the file in bytes")
+        .def("__len__", &MappedFile::size)
+        .def("getPath", &MappedFile::getPath, "Path of the mapped file")
+        .def_buffer([](MappedFile& file) {
+            // Empty files have no mapping, point to a valid address anyway
+            static const std::uint8_t empty = 0;
+            const std::uint8_t* ptr = file.data() != nullptr ? file.data() : &empty;
+            return py::buffer_info(const_cast<std::uint8_t*>(ptr), sizeof(std::uint8_t), py::format_descriptor<std::uint8_t>::format(), 1,
+                {static_cast<py::ssize_t>(file.size())}, {static_cast<py::ssize_t>(sizeof(std::uint8_t))}, true);
+        })
     ;
 
 
@@ -37,6 +76,7 @@ void AssetManagerBindings::bind(pybind11::module& m){
         .def("getAll", static_cast<std::vector<std::shared_ptr<Asset>> (AssetManager::*)()>(&AssetManager::getAll), DOC(dai, AssetManager, getAll, 2))
         .def("size", &AssetManager::size, DOC(dai, AssetManager, size))
         .def("remove", &AssetManager::remove, py::arg("key"), DOC(dai, AssetManager, remove))
+        .def("getStats", &getAssetStats, "Sizes of stored assets, with identical assets accounted for once")
     ;
 
 }
\ No newline at end of file
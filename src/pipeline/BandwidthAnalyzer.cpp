@@ -0,0 +1,521 @@
+#include "BandwidthAnalyzer.hpp"
+
+// std
+#include <algorithm>
+#include <cmath>
+#include <iomanip>
+#include <set>
+#include <sstream>
+#include <stdexcept>
+#include <tuple>
+#include <utility>
+
+// shared
+#include "depthai-shared/datatype/RawSystemInformation.hpp"
+
+namespace {
+
+// Frame types, in RawImgFrame::Type order, with bytes per pixel
+const std::vector<std::pair<const char*, double>>& getFrameTypes() {
+    static const std::vector<std::pair<const char*, double>> types = {
+        {"YUV422i", 2},  {"YUV444p", 3},     {"YUV420p", 1.5},       {"YUV422p", 2},         {"YUV400p", 1},         {"RGBA8888", 4},
+        {"RGB161616", 6}, {"RGB888p", 3},    {"BGR888p", 3},         {"RGB888i", 3},         {"BGR888i", 3},         {"LUT2", 0.125},
+        {"LUT4", 0.25},  {"LUT16", 0.5},     {"RAW16", 2},           {"RAW14", 2},           {"RAW12", 2},           {"RAW10", 2},
+        {"RAW8", 1},     {"PACK10", 1.25},   {"PACK12", 1.5},        {"YUV444i", 3},         {"NV12", 1.5},          {"NV21", 1.5},
+        {"BITSTREAM", 0}, {"HDR", 2},        {"RGBF16F16F16p", 6},   {"BGRF16F16F16p", 6},   {"RGBF16F16F16i", 6},   {"BGRF16F16F16i", 6},
+        {"GRAY8", 1},    {"GRAYF16", 2},     {"NONE", 0},
+    };
+    return types;
+}
+
+double getBytesPerPixel(const std::string& format) {
+    for(const auto& type : getFrameTypes()) {
+        if(format == type.first) return type.second;
+    }
+    return 0;
+}
+
+std::string getFrameTypeName(int type) {
+    const auto& types = getFrameTypes();
+    if(type < 0 || type >= static_cast<int>(types.size())) return "NONE";
+    return types[type].first;
+}
+
+// Rough sizes of variable sized messages
+constexpr double DETECTIONS_SIZE = 1024;
+constexpr double SPATIAL_DETECTIONS_SIZE = 2048;
+constexpr double TRACKLETS_SIZE = 2048;
+constexpr double SPATIAL_LOCATIONS_SIZE = 512;
+constexpr double IMU_REPORT_SIZE = 40;
+
+StreamRate frame(double fps, int width, int height, const std::string& format) {
+    StreamRate rate;
+    rate.fps = fps;
+    rate.width = width;
+    rate.height = height;
+    rate.format = format;
+    rate.bytesPerFrame = static_cast<double>(width) * height * getBytesPerPixel(format);
+    rate.known = true;
+    return rate;
+}
+
+StreamRate message(double fps, double size, const std::string& format, bool approximate) {
+    StreamRate rate;
+    rate.fps = fps;
+    rate.bytesPerFrame = size;
+    rate.format = format;
+    rate.known = true;
+    rate.approximate = approximate;
+    return rate;
+}
+
+int scaled(int size, int num, int den) {
+    if(num > 0 && den > 0) return (size * num - 1) / den + 1;
+    return size;
+}
+
+template <typename T>
+T get(const nlohmann::json& j, const char* key, T def) {
+    auto it = j.find(key);
+    if(it == j.end() || it->is_null()) return def;
+    return it->get<T>();
+}
+
+std::string formatBytes(double bytes) {
+    std::ostringstream ss;
+    ss << std::fixed << std::setprecision(1);
+    if(bytes >= 1e6) {
+        ss << bytes / 1e6 << " MB";
+    } else if(bytes >= 1e3) {
+        ss << bytes / 1e3 << " KB";
+    } else {
+        ss << std::setprecision(0) << bytes << " B";
+    }
+    return ss.str();
+}
+
+std::string describe(const StreamRate& rate) {
+    if(!rate.known) return "unknown";
+    std::ostringstream ss;
+    if(rate.width > 0 && rate.height > 0) ss << rate.width << "x" << rate.height << " ";
+    ss << rate.format << ", " << (rate.approximate ? "~" : "") << formatBytes(rate.bytesPerFrame) << " @ " << std::fixed << std::setprecision(1) << rate.fps
+       << " fps";
+    return ss.str();
+}
+
+std::string formatRate(double bytesPerSecond) {
+    return formatBytes(bytesPerSecond) + "/s";
+}
+
+std::string formatPercent(double ratio) {
+    std::ostringstream ss;
+    ss << std::fixed << std::setprecision(1) << ratio * 100 << "%";
+    return ss.str();
+}
+
+std::string getUsbSpeedName(dai::UsbSpeed speed) {
+    switch(speed) {
+        case dai::UsbSpeed::LOW:
+            return "USB LOW";
+        case dai::UsbSpeed::FULL:
+            return "USB FULL";
+        case dai::UsbSpeed::HIGH:
+            return "USB HIGH";
+        case dai::UsbSpeed::SUPER:
+            return "USB SUPER";
+        case dai::UsbSpeed::SUPER_PLUS:
+            return "USB SUPER_PLUS";
+        case dai::UsbSpeed::UNKNOWN:
+        default:
+            return "custom link";
+    }
+}
+
+std::string escape(const std::string& str) {
+    std::string escaped;
+    for(char c : str) {
+        if(c == '"' || c == '\\') escaped += '\\';
+        escaped += c;
+    }
+    return escaped;
+}
+
+/// Propagates rates through the pipeline, from sources towards sinks
+class RateEstimator {
+    using Port = std::pair<std::int64_t, std::string>;
+
+    const dai::PipelineSchema& schema;
+    const std::map<std::string, float>& xlinkInFps;
+    std::map<Port, Port> inputSources;
+    std::map<Port, StreamRate> cache;
+    std::set<Port> inProgress;
+
+   public:
+    RateEstimator(const dai::PipelineSchema& s, const std::map<std::string, float>& fps) : schema(s), xlinkInFps(fps) {
+        for(const auto& conn : schema.connections) {
+            inputSources[{conn.node2Id, conn.node2Input}] = {conn.node1Id, conn.node1Output};
+        }
+    }
+
+    StreamRate input(std::int64_t nodeId, const std::string& name) {
+        auto it = inputSources.find({nodeId, name});
+        if(it == inputSources.end()) return {};
+        return output(it->second.first, it->second.second);
+    }
+
+    StreamRate output(std::int64_t nodeId, const std::string& name) {
+        Port port{nodeId, name};
+        auto cached = cache.find(port);
+        if(cached != cache.end()) return cached->second;
+        // Loops are broken by treating the repeated output as unknown
+        if(inProgress.count(port) > 0) return {};
+        inProgress.insert(port);
+        auto rate = estimate(schema.nodes.at(nodeId), name);
+        inProgress.erase(port);
+        cache[port] = rate;
+        return rate;
+    }
+
+   private:
+    StreamRate estimate(const dai::NodeObjInfo& node, const std::string& out) {
+        const auto& props = node.properties;
+        const auto& name = node.name;
+
+        if(name == "ColorCamera") {
+            static const int sensorSizes[][2] = {{1920, 1080}, {3840, 2160}, {4056, 3040}};
+            int resolution = std::min(std::max(get<int>(props, "resolution", 0), 0), 2);
+            int sensorWidth = sensorSizes[resolution][0];
+            int sensorHeight = sensorSizes[resolution][1];
+            auto ispScale = props.value("ispScale", nlohmann::json::object());
+            int hNum = get<int>(ispScale, "horizNumerator", 0), hDen = get<int>(ispScale, "horizDenominator", 0);
+            int vNum = get<int>(ispScale, "vertNumerator", 0), vDen = get<int>(ispScale, "vertDenominator", 0);
+            float fps = get<float>(props, "fps", 30.0f);
+
+            if(out == "raw") return frame(fps, sensorWidth, sensorHeight, "RAW10");
+            if(out == "isp") return frame(fps, scaled(sensorWidth, hNum, hDen), scaled(sensorHeight, vNum, vDen), "YUV420p");
+            if(out == "video") {
+                int width = get<int>(props, "videoWidth", -1), height = get<int>(props, "videoHeight", -1);
+                if(width < 0 || height < 0) {
+                    width = resolution == 0 ? 1920 : 3840;
+                    height = resolution == 0 ? 1080 : 2160;
+                    width = scaled(width, hNum, hDen);
+                    height = scaled(height, vNum, vDen);
+                }
+                return frame(fps, width, height, "NV12");
+            }
+            if(out == "still") {
+                static const int stillSizes[][2] = {{1920, 1080}, {3840, 2160}, {4032, 3040}};
+                int width = get<int>(props, "stillWidth", -1), height = get<int>(props, "stillHeight", -1);
+                if(width < 0 || height < 0) {
+                    width = scaled(stillSizes[resolution][0], hNum, hDen);
+                    height = scaled(stillSizes[resolution][1], vNum, vDen);
+                }
+                // Stills are only produced on capture request
+                return frame(0, width, height, "NV12");
+            }
+            if(out == "preview") {
+                bool rgb = get<int>(props, "colorOrder", 0) == 1;
+                bool interleaved = get<bool>(props, "interleaved", true);
+                std::string format = std::string(rgb ? "RGB" : "BGR") + (get<bool>(props, "fp16", false) ? "F16F16F16" : "888") + (interleaved ? "i" : "p");
+                return frame(fps, get<int>(props, "previewWidth", 300), get<int>(props, "previewHeight", 300), format);
+            }
+        } else if(name == "MonoCamera") {
+            static const int sensorSizes[][2] = {{1280, 720}, {1280, 800}, {640, 400}};
+            int resolution = std::min(std::max(get<int>(props, "resolution", 0), 0), 2);
+            if(out == "out") return frame(get<float>(props, "fps", 30.0f), sensorSizes[resolution][0], sensorSizes[resolution][1], "RAW8");
+        } else if(name == "StereoDepth") {
+            auto left = input(node.id, "left");
+            auto right = input(node.id, "right");
+            if(!left.known) return {};
+            double fps = right.known ? std::min(left.fps, right.fps) : left.fps;
+            int width = get<int>(props, "width", left.width);
+            int height = get<int>(props, "height", left.height);
+            if(out == "syncedLeft" || out == "syncedRight" || out == "rectifiedLeft" || out == "rectifiedRight") return frame(fps, width, height, "RAW8");
+            int outWidth = get<int>(props, "outWidth", width);
+            int outHeight = get<int>(props, "outHeight", height);
+            if(out == "depth") return frame(fps, outWidth, outHeight, "RAW16");
+            if(out == "disparity") return frame(fps, outWidth, outHeight, get<bool>(props, "enableSubpixel", false) ? "RAW16" : "RAW8");
+        } else if(name == "VideoEncoder") {
+            auto in = input(node.id, "in");
+            if(out != "bitstream") return {};
+            double fps = in.known ? in.fps : get<float>(props, "frameRate", 30.0f);
+            int width = in.known ? in.width : get<int>(props, "width", 1920);
+            int height = in.known ? in.height : get<int>(props, "height", 1080);
+            bool mjpeg = get<int>(props, "profile", 0) == 4;
+            double size;
+            if(mjpeg) {
+                // JPEG size grows steeply with quality, from ~0.5 to ~3 bits per pixel
+                double quality = std::min(std::max(get<int>(props, "quality", 80), 1), 100) / 100.0;
+                double bitsPerPixel = get<bool>(props, "lossless", false) ? 6.0 : 0.5 + 2.5 * quality * quality * quality;
+                size = width * static_cast<double>(height) * bitsPerPixel / 8;
+            } else {
+                int bitrate = get<int>(props, "bitrate", 8000);
+                if(get<int>(props, "rateCtrlMode", 0) == 1) bitrate = std::max(bitrate, get<int>(props, "maxBitrate", bitrate));
+                if(bitrate <= 0 || fps <= 0) {
+                    size = width * static_cast<double>(height) * 0.1 / 8;
+                } else {
+                    size = bitrate * 1000.0 / 8 / fps;
+                }
+            }
+            auto rate = message(fps, size, mjpeg ? "MJPEG" : "BITSTREAM", true);
+            rate.width = width;
+            rate.height = height;
+            return rate;
+        } else if(name == "ImageManip") {
+            auto in = input(node.id, "inputImage");
+            if(out != "out" || !in.known) return {};
+            auto config = props.value("initialConfig", nlohmann::json::object());
+            int width = in.width, height = in.height;
+            auto resize = config.value("resizeConfig", nlohmann::json::object());
+            if(get<bool>(config, "enableResize", false) && get<int>(resize, "width", 0) > 0 && get<int>(resize, "height", 0) > 0) {
+                width = get<int>(resize, "width", 0);
+                height = get<int>(resize, "height", 0);
+            }
+            std::string format = in.format;
+            if(get<bool>(config, "enableFormat", false)) {
+                format = getFrameTypeName(get<int>(config.value("formatConfig", nlohmann::json::object()), "type", 7));
+            }
+            auto rate = frame(in.fps, width, height, format);
+            // Crops without resize aren't accounted for, size is capped by output pool frame size
+            rate.approximate = get<bool>(config, "enableCrop", false) && !get<bool>(config, "enableResize", false);
+            rate.bytesPerFrame = std::min(rate.bytesPerFrame, static_cast<double>(get<int>(props, "outputFrameSize", 1024 * 1024)));
+            return rate;
+        } else if(name == "EdgeDetector") {
+            auto in = input(node.id, "inputImage");
+            if(out != "outputImage" || !in.known) return {};
+            auto rate = frame(in.fps, in.width, in.height, "GRAY8");
+            rate.bytesPerFrame = std::min(rate.bytesPerFrame, static_cast<double>(get<int>(props, "outputFrameSize", 1024 * 1024)));
+            return rate;
+        } else if(name == "NeuralNetwork" || name == "DetectionNetwork" || name == "SpatialDetectionNetwork") {
+            auto in = input(node.id, "in");
+            if(out == "passthrough") return in;
+            if(out == "passthroughDepth") return input(node.id, "inputDepth");
+            if(!in.known) return {};
+            if(name == "DetectionNetwork" && out == "out") return message(in.fps, DETECTIONS_SIZE, "ImgDetections", true);
+            if(name == "SpatialDetectionNetwork" && out == "out") return message(in.fps, SPATIAL_DETECTIONS_SIZE, "SpatialImgDetections", true);
+            if(out == "boundingBoxMapping") return message(in.fps, SPATIAL_LOCATIONS_SIZE, "SpatialLocationCalculatorConfig", true);
+            // Size of NNData depends on the blob outputs, rate is known
+            auto rate = message(in.fps, 0, "NNData", true);
+            rate.known = false;
+            return rate;
+        } else if(name == "ObjectTracker") {
+            if(out == "passthroughTrackerFrame") return input(node.id, "inputTrackerFrame");
+            if(out == "passthroughDetectionFrame") return input(node.id, "inputDetectionFrame");
+            if(out == "passthroughDetections") return input(node.id, "inputDetections");
+            auto in = input(node.id, "inputTrackerFrame");
+            if(out == "out" && in.known) return message(in.fps, TRACKLETS_SIZE, "Tracklets", true);
+        } else if(name == "SpatialLocationCalculator") {
+            auto in = input(node.id, "inputDepth");
+            if(out == "passthroughDepth") return in;
+            if(out == "out" && in.known) return message(in.fps, SPATIAL_LOCATIONS_SIZE, "SpatialLocationCalculatorData", true);
+        } else if(name == "SystemLogger") {
+            if(out == "out") return message(get<float>(props, "rateHz", 1.0f), sizeof(dai::RawSystemInformation), "SystemInformation", false);
+        } else if(name == "IMU") {
+            double maxRate = 0, reportsPerSecond = 0;
+            for(const auto& sensor : props.value("imuSensors", nlohmann::json::array())) {
+                double reportRate = get<int>(sensor, "reportRate", 0);
+                maxRate = std::max(maxRate, reportRate);
+                reportsPerSecond += reportRate;
+            }
+            double fps = maxRate / std::max(get<int>(props, "batchReportThreshold", 1), 1);
+            if(out == "out" && fps > 0) return message(fps, reportsPerSecond / fps * IMU_REPORT_SIZE, "IMUData", true);
+        } else if(name == "XLinkIn") {
+            auto it = xlinkInFps.find(get<std::string>(props, "streamName", ""));
+            if(out != "out" || it == xlinkInFps.end()) return {};
+            // Messages are at most the size of XLinkIn buffers
+            return message(it->second, get<double>(props, "maxDataSize", 0), "Buffer", true);
+        }
+        return {};
+    }
+};
+
+}  // namespace
+
+constexpr double BandwidthAnalyzer::MESSAGE_METADATA_SIZE;
+
+double BandwidthAnalyzer::getBytesPerPixel(const std::string& format) {
+    return ::getBytesPerPixel(format);
+}
+
+std::map<std::pair<std::int64_t, std::string>, StreamRate> BandwidthAnalyzer::estimateRates(const dai::PipelineSchema& schema,
+                                                                                              const std::map<std::string, float>& xlinkInFps) {
+    RateEstimator estimator(schema, xlinkInFps);
+    std::map<std::pair<std::int64_t, std::string>, StreamRate> rates;
+    for(const auto& kv : schema.nodes) {
+        for(const auto& io : kv.second.ioInfo) {
+            auto type = io.second.type;
+            if(type != dai::NodeIoInfo::Type::MSender && type != dai::NodeIoInfo::Type::SSender) continue;
+            rates[{kv.first, io.second.name}] = estimator.output(kv.first, io.second.name);
+        }
+    }
+    return rates;
+}
+
+double BandwidthAnalyzer::getLinkCapacity(dai::UsbSpeed speed) {
+    // Measured XLink throughput is well below nominal signalling rates, due to protocol overhead
+    switch(speed) {
+        case dai::UsbSpeed::LOW:
+            return 0.15e6;
+        case dai::UsbSpeed::FULL:
+            return 1e6;
+        case dai::UsbSpeed::HIGH:
+            return 40e6;
+        case dai::UsbSpeed::SUPER:
+            return 400e6;
+        case dai::UsbSpeed::SUPER_PLUS:
+            return 800e6;
+        case dai::UsbSpeed::UNKNOWN:
+        default:
+            throw std::invalid_argument("Link capacity of UsbSpeed.UNKNOWN isn't known, specify capacity explicitly");
+    }
+}
+
+BandwidthReport BandwidthAnalyzer::analyze(const dai::PipelineSchema& schema, dai::UsbSpeed speed, const std::map<std::string, float>& xlinkInFps) {
+    auto report = analyze(schema, getLinkCapacity(speed), speed == dai::UsbSpeed::SUPER || speed == dai::UsbSpeed::SUPER_PLUS, xlinkInFps);
+    report.usbSpeed = speed;
+    return report;
+}
+
+BandwidthReport BandwidthAnalyzer::analyze(const dai::PipelineSchema& schema, double capacity, bool fullDuplex, const std::map<std::string, float>& xlinkInFps) {
+    if(capacity <= 0) throw std::invalid_argument("Link capacity must be positive");
+
+    BandwidthReport report;
+    report.capacity = capacity;
+    report.fullDuplex = fullDuplex;
+
+    std::map<std::int64_t, const dai::NodeObjInfo*> nodes;
+    for(const auto& kv : schema.nodes) {
+        nodes[kv.first] = &kv.second;
+        report.nodes[kv.first] = kv.second.name;
+    }
+
+    RateEstimator estimator(schema, xlinkInFps);
+
+    for(const auto& conn : schema.connections) {
+        ConnectionReport connection;
+        connection.outputNodeId = conn.node1Id;
+        connection.outputName = conn.node1Output;
+        connection.inputNodeId = conn.node2Id;
+        connection.inputName = conn.node2Input;
+        connection.rate = estimator.output(conn.node1Id, conn.node1Output);
+        report.connections.push_back(connection);
+    }
+    std::sort(report.connections.begin(), report.connections.end(), [](const ConnectionReport& a, const ConnectionReport& b) {
+        return std::tie(a.outputNodeId, a.outputName, a.inputNodeId, a.inputName) < std::tie(b.outputNodeId, b.outputName, b.inputNodeId, b.inputName);
+    });
+
+    for(const auto& kv : nodes) {
+        const auto& node = *kv.second;
+        LinkReport link;
+        link.nodeId = node.id;
+        link.streamName = get<std::string>(node.properties, "streamName", "");
+
+        if(node.name == "XLinkOut") {
+            link.direction = LinkReport::Direction::DEVICE_TO_HOST;
+            link.rate = estimator.input(node.id, "in");
+            for(const auto& conn : report.connections) {
+                if(conn.inputNodeId == node.id) link.source = report.nodes[conn.outputNodeId] + "(" + std::to_string(conn.outputNodeId) + ")." + conn.outputName;
+            }
+            float fpsLimit = get<float>(node.properties, "maxFpsLimit", -1);
+            if(fpsLimit > 0 && link.rate.fps > fpsLimit) link.rate.fps = fpsLimit;
+            if(get<bool>(node.properties, "metadataOnly", false)) {
+                link.rate.bytesPerFrame = 0;
+                link.rate.approximate = false;
+                link.rate.format += " (metadata only)";
+            }
+        } else if(node.name == "XLinkIn") {
+            link.direction = LinkReport::Direction::HOST_TO_DEVICE;
+            link.rate = estimator.output(node.id, "out");
+            for(const auto& conn : report.connections) {
+                if(conn.outputNodeId != node.id) continue;
+                if(!link.source.empty()) link.source += ", ";
+                link.source += report.nodes[conn.inputNodeId] + "(" + std::to_string(conn.inputNodeId) + ")." + conn.inputName;
+            }
+        } else {
+            continue;
+        }
+
+        double messageSize = link.rate.bytesPerFrame + MESSAGE_METADATA_SIZE;
+        link.bytesPerSecond = link.rate.fps * messageSize;
+        link.utilization = link.bytesPerSecond / capacity;
+        link.transferTime = messageSize / capacity;
+
+        if(!link.rate.known) {
+            if(link.direction == LinkReport::Direction::HOST_TO_DEVICE) {
+                report.warnings.push_back("Rate of stream '" + link.streamName + "' is sent by host, specify it in xlinkInFps");
+            } else if(link.rate.fps > 0) {
+                report.warnings.push_back("Message size of stream '" + link.streamName + "' (" + link.source + ") can't be derived from properties, only metadata is accounted for");
+            } else {
+                report.warnings.push_back("Rate of stream '" + link.streamName + "' can't be derived from properties");
+            }
+        }
+
+        if(link.direction == LinkReport::Direction::DEVICE_TO_HOST) {
+            report.deviceToHost += link.bytesPerSecond;
+        } else {
+            report.hostToDevice += link.bytesPerSecond;
+        }
+        report.links.push_back(link);
+    }
+
+    if(fullDuplex) {
+        report.utilization = std::max(report.deviceToHost, report.hostToDevice) / capacity;
+    } else {
+        report.utilization = (report.deviceToHost + report.hostToDevice) / capacity;
+    }
+    report.withinBudget = report.utilization <= 1.0;
+    return report;
+}
+
+std::string BandwidthReport::toString() const {
+    std::ostringstream ss;
+    ss << "Link: " << getUsbSpeedName(usbSpeed) << ", " << formatRate(capacity) << (fullDuplex ? " per direction" : " shared by both directions") << "\n";
+    for(const auto& link : links) {
+        ss << "  " << (link.direction == LinkReport::Direction::DEVICE_TO_HOST ? "<- " : "-> ") << "'" << link.streamName << "'";
+        if(!link.source.empty()) ss << " [" << link.source << "]";
+        ss << ": " << describe(link.rate) << " = " << formatRate(link.bytesPerSecond) << " (" << formatPercent(link.utilization) << " of link, "
+           << std::fixed << std::setprecision(2) << link.transferTime * 1000 << " ms per message)\n";
+    }
+    ss << "Device to host: " << formatRate(deviceToHost) << "\n";
+    ss << "Host to device: " << formatRate(hostToDevice) << "\n";
+    ss << "Utilization: " << formatPercent(utilization) << (withinBudget ? " (within budget)" : " (OVER BUDGET)") << "\n";
+    for(const auto& warning : warnings) {
+        ss << "Warning: " << warning << "\n";
+    }
+    return ss.str();
+}
+
+std::string BandwidthReport::toDot() const {
+    std::ostringstream ss;
+    ss << "digraph pipeline {\n";
+    ss << "  rankdir=LR;\n";
+    ss << "  node [shape=box];\n";
+    for(const auto& kv : nodes) {
+        std::string label = escape(kv.second) + " (" + std::to_string(kv.first) + ")";
+        for(const auto& link : links) {
+            if(link.nodeId == kv.first) label += "\\n'" + escape(link.streamName) + "'";
+        }
+        ss << "  n" << kv.first << " [label=\"" << label << "\"];\n";
+    }
+    ss << "  host [shape=ellipse, label=\"Host\\n" << getUsbSpeedName(usbSpeed) << " " << formatRate(capacity) << "\\n" << formatPercent(utilization)
+       << " used\"" << (withinBudget ? "" : ", color=red") << "];\n";
+
+    for(const auto& conn : connections) {
+        ss << "  n" << conn.outputNodeId << " -> n" << conn.inputNodeId << " [label=\"" << escape(conn.outputName + " -> " + conn.inputName) << "\\n"
+           << escape(describe(conn.rate));
+        if(conn.rate.known) ss << "\\n" << formatRate(conn.rate.getBytesPerSecond());
+        ss << "\"];\n";
+    }
+    for(const auto& link : links) {
+        std::string attributes = "label=\"'" + escape(link.streamName) + "'\\n" + formatRate(link.bytesPerSecond) + " (" + formatPercent(link.utilization) + ")\"";
+        if(link.utilization > 1.0) attributes += ", color=red, penwidth=2";
+        if(!link.rate.known) attributes += ", style=dashed";
+        if(link.direction == LinkReport::Direction::DEVICE_TO_HOST) {
+            ss << "  n" << link.nodeId << " -> host [" << attributes << "];\n";
+        } else {
+            ss << "  host -> n" << link.nodeId << " [" << attributes << "];\n";
+        }
+    }
+    ss << "}\n";
+    return ss.str();
+}
@@ -0,0 +1,141 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <map>
+#include <string>
+#include <utility>
+#include <vector>
+
+// shared
+#include "depthai-shared/common/UsbSpeed.hpp"
+#include "depthai-shared/pipeline/PipelineSchema.hpp"
+
+/// Estimated rate of messages flowing out of a node output
+struct StreamRate {
+    /// Messages per second
+    double fps = 0;
+    /// Payload size of a single message in bytes
+    double bytesPerFrame = 0;
+    /// Frame size, 0 if stream doesn't carry frames
+    int width = 0;
+    int height = 0;
+    /// Frame type (eg. NV12) or message type
+    std::string format;
+    /// Whether rate could be derived from node properties
+    bool known = false;
+    /// Whether size is a rough estimate (compressed or variable sized messages)
+    bool approximate = false;
+
+    double getBytesPerSecond() const {
+        return fps * bytesPerFrame;
+    }
+};
+
+/// Estimated bandwidth of a single XLink stream
+struct LinkReport {
+    enum class Direction { DEVICE_TO_HOST, HOST_TO_DEVICE };
+
+    /// XLink stream name
+    std::string streamName;
+    Direction direction = Direction::DEVICE_TO_HOST;
+    /// Id of XLinkOut or XLinkIn node
+    std::int64_t nodeId = -1;
+    /// Output feeding the XLinkOut (eg. 'ColorCamera(1).video'), or XLinkIn consumers
+    std::string source;
+    /// Rate of messages, as sent over the link
+    StreamRate rate;
+    /// Bytes per second, including message metadata
+    double bytesPerSecond = 0;
+    /// Fraction of link capacity used by this stream
+    double utilization = 0;
+    /// Seconds spent transferring a single message at full link capacity
+    double transferTime = 0;
+};
+
+/// Estimated rate over a single connection between nodes
+struct ConnectionReport {
+    std::int64_t outputNodeId = -1;
+    std::string outputName;
+    std::int64_t inputNodeId = -1;
+    std::string inputName;
+    StreamRate rate;
+};
+
+/// Result of a pipeline bandwidth analysis
+struct BandwidthReport {
+    /// Speed the capacity is derived from, UNKNOWN if capacity was specified explicitly
+    dai::UsbSpeed usbSpeed = dai::UsbSpeed::UNKNOWN;
+    /// Usable link capacity in bytes per second
+    double capacity = 0;
+    /// Whether both directions have full capacity available (USB3) or share it (USB2)
+    bool fullDuplex = false;
+
+    std::vector<LinkReport> links;
+    std::vector<ConnectionReport> connections;
+    /// Node names, by id
+    std::map<std::int64_t, std::string> nodes;
+
+    /// Total bytes per second sent from device to host
+    double deviceToHost = 0;
+    /// Total bytes per second sent from host to device
+    double hostToDevice = 0;
+    /// Fraction of capacity used, in the more loaded direction for full duplex links
+    double utilization = 0;
+    /// Whether all streams fit into the link capacity
+    bool withinBudget = true;
+    /// Streams whose rate couldn't be derived and other notes
+    std::vector<std::string> warnings;
+
+    /// @returns Human readable per link report
+    std::string toString() const;
+    /// @returns Graphviz DOT graph of the pipeline, with connections and links annotated with rates
+    std::string toDot() const;
+};
+
+/**
+ * @brief Estimates XLink bandwidth of a pipeline from node properties, without a device.
+ *
+ * Rates are propagated from sources (cameras, SystemLogger, IMU, XLinkIn) through the nodes.
+ * Sizes of uncompressed frames are exact, encoded bitstreams and detection results are estimated.
+ */
+class BandwidthAnalyzer {
+   public:
+    /// Approximate size of message metadata sent along each message
+    static constexpr double MESSAGE_METADATA_SIZE = 128;
+
+    /// @returns Approximate usable XLink capacity in bytes per second for given USB speed
+    static double getLinkCapacity(dai::UsbSpeed speed);
+
+    /// @returns Bytes per pixel of a frame type (eg. 'NV12'), 0 if unknown
+    static double getBytesPerPixel(const std::string& format);
+
+    /**
+     * Estimates rates of all node outputs
+     * @param schema Pipeline schema
+     * @param xlinkInFps Rate at which host sends messages to XLinkIn streams, by stream name
+     * @returns Rates by node id and output name
+     */
+    static std::map<std::pair<std::int64_t, std::string>, StreamRate> estimateRates(const dai::PipelineSchema& schema,
+                                                                                   const std::map<std::string, float>& xlinkInFps = {});
+
+    /**
+     * Analyzes the pipeline against the USB link capacity
+     * @param schema Pipeline schema
+     * @param speed USB speed of the link
+     * @param xlinkInFps Rate at which host sends messages to XLinkIn streams, by stream name
+     */
+    static BandwidthReport analyze(const dai::PipelineSchema& schema, dai::UsbSpeed speed, const std::map<std::string, float>& xlinkInFps = {});
+
+    /**
+     * Analyzes the pipeline against an explicit link capacity
+     * @param schema Pipeline schema
+     * @param capacity Usable link capacity in bytes per second
+     * @param fullDuplex Whether both directions have full capacity available
+     * @param xlinkInFps Rate at which host sends messages to XLinkIn streams, by stream name
+     */
+    static BandwidthReport analyze(const dai::PipelineSchema& schema,
+                                   double capacity,
+                                   bool fullDuplex,
+                                   const std::map<std::string, float>& xlinkInFps = {});
+};
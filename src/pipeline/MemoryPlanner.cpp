@@ -0,0 +1,243 @@
+#include "MemoryPlanner.hpp"
+
+// std
+#include <algorithm>
+#include <cmath>
+#include <iomanip>
+#include <sstream>
+#include <stdexcept>
+#include <utility>
+
+// project
+#include "BandwidthAnalyzer.hpp"
+
+namespace {
+
+// Pool sizes of nodes without pool settings, as allocated by firmware
+constexpr int CAMERA_POOL_FRAMES = 3;
+constexpr int STEREO_POOL_FRAMES = 3;
+// Inference threads used when NeuralNetwork.setNumInferenceThreads isn't set
+constexpr int DEFAULT_INFERENCE_THREADS = 2;
+// One frame is filled while another one is consumed
+constexpr int MIN_POOL_FRAMES = 2;
+// Encoder bitstream buffers are sized for NV12 frames
+constexpr double ENCODER_BYTES_PER_PIXEL = 1.5;
+
+template <typename T>
+T get(const nlohmann::json& j, const char* key, T def) {
+    auto it = j.find(key);
+    if(it == j.end() || it->is_null()) return def;
+    return it->get<T>();
+}
+
+std::string formatBytes(double bytes) {
+    std::ostringstream ss;
+    ss << std::fixed << std::setprecision(1);
+    if(std::abs(bytes) >= 1e6) {
+        ss << bytes / 1e6 << " MB";
+    } else if(std::abs(bytes) >= 1e3) {
+        ss << bytes / 1e3 << " KB";
+    } else {
+        ss << std::setprecision(0) << bytes << " B";
+    }
+    return ss.str();
+}
+
+std::string formatPercent(double ratio) {
+    std::ostringstream ss;
+    ss << std::fixed << std::setprecision(1) << ratio * 100 << "%";
+    return ss.str();
+}
+
+std::string describeNode(const dai::NodeObjInfo& node) {
+    return "'" + node.name + "' node (id: " + std::to_string(node.id) + ")";
+}
+
+// Size of a frame before it's capped by the output pool frame size
+double getFrameSize(const StreamRate& rate) {
+    return static_cast<double>(rate.width) * rate.height * BandwidthAnalyzer::getBytesPerPixel(rate.format);
+}
+
+}  // namespace
+
+constexpr double MemoryPlanner::CMX_SLICE_SIZE;
+constexpr double MemoryPlanner::DEFAULT_DDR_BUDGET;
+constexpr double MemoryPlanner::DEFAULT_CMX_BUDGET;
+
+MemoryPlan MemoryPlanner::plan(const dai::PipelineSchema& schema,
+                               const std::map<std::int64_t, BlobInfo>& blobs,
+                               double ddrBudget,
+                               double cmxBudget,
+                               float targetFps,
+                               float targetLatency,
+                               const std::map<std::string, float>& xlinkInFps) {
+    if(ddrBudget <= 0 || cmxBudget <= 0) throw std::invalid_argument("Memory budgets must be positive");
+    if(targetFps < 0 || targetLatency < 0) throw std::invalid_argument("Target fps and latency can't be negative");
+
+    MemoryPlan plan;
+    plan.ddrBudget = ddrBudget;
+    plan.cmxBudget = cmxBudget;
+    plan.targetFps = targetFps;
+    plan.targetLatency = targetLatency;
+
+    auto rates = BandwidthAnalyzer::estimateRates(schema, xlinkInFps);
+    auto rateOf = [&rates](std::int64_t id, const std::string& output) {
+        auto it = rates.find({id, output});
+        return it == rates.end() ? StreamRate() : it->second;
+    };
+
+    // Messages held in consumer queues keep their pool frames in use
+    std::map<std::pair<std::int64_t, std::string>, int> queueSizes;
+    for(const auto& conn : schema.connections) {
+        int queueSize = 0;
+        auto consumer = schema.nodes.find(conn.node2Id);
+        if(consumer != schema.nodes.end()) {
+            auto io = consumer->second.ioInfo.find(conn.node2Input);
+            if(io != consumer->second.ioInfo.end()) queueSize = io->second.queueSize;
+        }
+        queueSizes[{conn.node1Id, conn.node1Output}] += queueSize;
+    }
+
+    auto addPool = [&](const dai::NodeObjInfo& node, const std::string& name, const std::string& setting, int numFrames, double frameSize, bool approximate) -> PoolReport& {
+        PoolReport pool;
+        pool.nodeId = node.id;
+        pool.nodeName = node.name;
+        pool.name = name;
+        pool.setting = setting;
+        pool.numFrames = numFrames;
+        pool.frameSize = frameSize;
+        pool.size = numFrames * frameSize;
+        pool.approximate = approximate;
+        auto rate = rateOf(node.id, name);
+        pool.fps = rate.fps;
+        auto queue = queueSizes.find({node.id, name});
+        if(queue != queueSizes.end()) pool.queueSize = queue->second;
+        plan.pools.push_back(pool);
+        return plan.pools.back();
+    };
+    auto checkFrameSize = [&](const dai::NodeObjInfo& node, const StreamRate& rate, int outputFrameSize) {
+        if(rate.known && getFrameSize(rate) > outputFrameSize) {
+            plan.warnings.push_back(describeNode(node) + " output of " + std::to_string(rate.width) + "x" + std::to_string(rate.height) + " " + rate.format
+                                    + " (" + formatBytes(getFrameSize(rate)) + ") doesn't fit into frames of " + formatBytes(outputFrameSize)
+                                    + ", increase them with setMaxOutputFrameSize");
+        }
+    };
+
+    for(const auto& kv : schema.nodes) {
+        const auto& node = kv.second;
+        const auto& props = node.properties;
+
+        if(node.name == "ColorCamera" || node.name == "MonoCamera" || node.name == "StereoDepth") {
+            // Only outputs in use are accounted for
+            int numFrames = node.name == "StereoDepth" ? STEREO_POOL_FRAMES : CAMERA_POOL_FRAMES;
+            for(const auto& io : node.ioInfo) {
+                if(queueSizes.count({node.id, io.first}) == 0) continue;
+                auto rate = rateOf(node.id, io.first);
+                if(!rate.known) {
+                    plan.warnings.push_back("Frame size of " + describeNode(node) + " output '" + io.first + "' can't be derived from properties");
+                    continue;
+                }
+                addPool(node, io.first, "", numFrames, rate.bytesPerFrame, true);
+            }
+        } else if(node.name == "ImageManip") {
+            int outputFrameSize = get<int>(props, "outputFrameSize", 1024 * 1024);
+            addPool(node, "out", "ImageManip.setNumFramesPool", get<int>(props, "numFramesPool", 4), outputFrameSize, false);
+            checkFrameSize(node, rateOf(node.id, "out"), outputFrameSize);
+        } else if(node.name == "EdgeDetector") {
+            int outputFrameSize = get<int>(props, "outputFrameSize", 1024 * 1024);
+            addPool(node, "outputImage", "EdgeDetector.setNumFramesPool", get<int>(props, "numFramesPool", 4), outputFrameSize, false);
+            checkFrameSize(node, rateOf(node.id, "outputImage"), outputFrameSize);
+        } else if(node.name == "VideoEncoder") {
+            auto rate = rateOf(node.id, "bitstream");
+            int width = rate.width > 0 ? rate.width : get<int>(props, "width", 1920);
+            int height = rate.height > 0 ? rate.height : get<int>(props, "height", 1080);
+            addPool(node, "bitstream", "VideoEncoder.setNumFramesPool", get<int>(props, "numFramesPool", 4), width * static_cast<double>(height) * ENCODER_BYTES_PER_PIXEL, true);
+        } else if(node.name == "XLinkIn") {
+            addPool(node, "out", "XLinkIn.setNumFrames", get<int>(props, "numFrames", 8), get<double>(props, "maxDataSize", 0), false);
+        } else if(node.name == "NeuralNetwork" || node.name == "DetectionNetwork" || node.name == "SpatialDetectionNetwork") {
+            int numFrames = get<int>(props, "numFrames", 8);
+            auto blob = blobs.find(node.id);
+            if(blob == blobs.end()) {
+                plan.warnings.push_back("Blob of " + describeNode(node) + " isn't known, its memory isn't accounted for");
+                continue;
+            }
+            const auto& info = blob->second;
+            int threads = get<int>(props, "numThreads", 0);
+            if(threads <= 0) threads = DEFAULT_INFERENCE_THREADS;
+
+            addPool(node, "out", "NeuralNetwork.setNumPoolFrames", numFrames, info.outputsSize, false);
+            addPool(node, "blob", "", 1, static_cast<double>(info.size), false);
+            // Each inference thread has its own intermediate buffers and CMX slices
+            addPool(node, "inference buffers", "", threads, info.bssMemSize, false);
+            auto& cmx = addPool(node, "CMX slices", "", threads, info.numSlices * CMX_SLICE_SIZE, false);
+            cmx.memory = PoolReport::Memory::CMX;
+        }
+    }
+
+    for(auto& pool : plan.pools) {
+        if(pool.memory == PoolReport::Memory::DDR) {
+            plan.ddrEstimate += pool.size;
+        } else {
+            plan.cmxEstimate += pool.size;
+        }
+        if(pool.setting.empty()) continue;
+
+        // Frames in flight for given rate and latency (Little's law), plus one being filled.
+        // Frames beyond what consumer queues can hold aren't ever in use
+        pool.suggestedNumFrames = pool.numFrames;
+        double fps = targetFps > 0 ? targetFps : pool.fps;
+        if(fps <= 0) continue;
+        int needed = static_cast<int>(std::ceil(fps * targetLatency)) + 1;
+        if(pool.queueSize > 0) needed = std::min(needed, pool.queueSize + 1);
+        pool.suggestedNumFrames = std::max(needed, MIN_POOL_FRAMES);
+        if(pool.numFrames < needed) {
+            std::ostringstream ss;
+            ss << "Pool of '" << pool.nodeName << "' node (id: " << pool.nodeId << ") has " << pool.numFrames << " frames, which may stall at " << std::fixed
+               << std::setprecision(1) << fps << " fps with " << targetLatency * 1000 << " ms latency, use " << pool.setting << "(" << pool.suggestedNumFrames
+               << ")";
+            plan.warnings.push_back(ss.str());
+        }
+    }
+
+    plan.withinBudget = plan.ddrEstimate <= ddrBudget && plan.cmxEstimate <= cmxBudget;
+    return plan;
+}
+
+MemoryComparison MemoryPlan::compare(const dai::MemoryInfo& ddrUsage, const dai::MemoryInfo& cmxUsage) const {
+    MemoryComparison comparison;
+    comparison.ddrEstimate = ddrEstimate;
+    comparison.ddrUsed = ddrUsage.used;
+    comparison.ddrTotal = ddrUsage.total;
+    comparison.cmxEstimate = cmxEstimate;
+    comparison.cmxUsed = cmxUsage.used;
+    comparison.cmxTotal = cmxUsage.total;
+    return comparison;
+}
+
+std::string MemoryPlan::toString() const {
+    std::ostringstream ss;
+    for(const auto& pool : pools) {
+        ss << "  " << pool.nodeName << "(" << pool.nodeId << ")." << pool.name << ": " << pool.numFrames << " x " << (pool.approximate ? "~" : "")
+           << formatBytes(pool.frameSize) << " = " << formatBytes(pool.size) << (pool.memory == PoolReport::Memory::CMX ? " CMX" : "");
+        if(pool.suggestedNumFrames > 0 && pool.suggestedNumFrames != pool.numFrames) {
+            ss << " (suggested " << pool.setting << "(" << pool.suggestedNumFrames << "))";
+        }
+        ss << "\n";
+    }
+    ss << "DDR: " << formatBytes(ddrEstimate) << " of " << formatBytes(ddrBudget) << " (" << formatPercent(ddrEstimate / ddrBudget) << ")\n";
+    ss << "CMX: " << formatBytes(cmxEstimate) << " of " << formatBytes(cmxBudget) << " (" << formatPercent(cmxEstimate / cmxBudget) << ")\n";
+    ss << (withinBudget ? "Within budget" : "OVER BUDGET") << "\n";
+    for(const auto& warning : warnings) {
+        ss << "Warning: " << warning << "\n";
+    }
+    return ss.str();
+}
+
+std::string MemoryComparison::toString() const {
+    std::ostringstream ss;
+    ss << "DDR: estimated " << formatBytes(ddrEstimate) << ", used " << formatBytes(static_cast<double>(ddrUsed)) << " of " << formatBytes(static_cast<double>(ddrTotal))
+       << ", unaccounted " << formatBytes(getDdrUnaccounted()) << "\n";
+    ss << "CMX: estimated " << formatBytes(cmxEstimate) << ", used " << formatBytes(static_cast<double>(cmxUsed)) << " of " << formatBytes(static_cast<double>(cmxTotal))
+       << ", unaccounted " << formatBytes(getCmxUnaccounted()) << "\n";
+    return ss.str();
+}
@@ -0,0 +1,124 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <map>
+#include <string>
+#include <vector>
+
+// shared
+#include "depthai-shared/common/MemoryInfo.hpp"
+#include "depthai-shared/pipeline/PipelineSchema.hpp"
+
+// project
+#include "openvino/BlobInfo.hpp"
+
+/// Estimated memory of a single pool of messages, or of other memory used by a node
+struct PoolReport {
+    enum class Memory { DDR, CMX };
+
+    std::int64_t nodeId = -1;
+    std::string nodeName;
+    /// Output the pool serves, or what the memory is used for (eg. 'blob')
+    std::string name;
+    Memory memory = Memory::DDR;
+    /// Setting controlling the size of the pool (eg. 'ImageManip.setNumFramesPool'), empty if it isn't configurable
+    std::string setting;
+    /// Number of frames in pool
+    int numFrames = 0;
+    /// Size of a single frame in bytes
+    double frameSize = 0;
+    /// Total size in bytes
+    double size = 0;
+    /// Whether pool size or frame size are assumed (firmware defaults, encoded streams)
+    bool approximate = false;
+    /// Estimated rate of messages leaving the pool, 0 if unknown
+    double fps = 0;
+    /// Sum of queue sizes of inputs consuming the pool
+    int queueSize = 0;
+    /// Suggested number of frames for the target fps and latency, 0 if pool isn't configurable
+    int suggestedNumFrames = 0;
+};
+
+/// Estimate compared to memory usage reported by a running device
+struct MemoryComparison {
+    /// Estimated and reported DDR usage in bytes
+    double ddrEstimate = 0;
+    std::int64_t ddrUsed = 0;
+    std::int64_t ddrTotal = 0;
+    /// Estimated and reported CMX usage in bytes
+    double cmxEstimate = 0;
+    std::int64_t cmxUsed = 0;
+    std::int64_t cmxTotal = 0;
+
+    /// @returns Reported minus estimated DDR usage, which includes firmware and node internals not accounted for by pools
+    double getDdrUnaccounted() const {
+        return ddrUsed - ddrEstimate;
+    }
+    /// @returns Reported minus estimated CMX usage
+    double getCmxUnaccounted() const {
+        return cmxUsed - cmxEstimate;
+    }
+
+    /// @returns Human readable comparison
+    std::string toString() const;
+};
+
+/// Result of pipeline memory planning
+struct MemoryPlan {
+    /// DDR and CMX memory available to the pipeline in bytes
+    double ddrBudget = 0;
+    double cmxBudget = 0;
+    /// Fps and latency the suggestions are made for, fps of 0 uses estimated rates
+    float targetFps = 0;
+    float targetLatency = 0;
+
+    std::vector<PoolReport> pools;
+    /// Total estimated DDR and CMX usage in bytes
+    double ddrEstimate = 0;
+    double cmxEstimate = 0;
+    /// Whether estimates fit into the budgets
+    bool withinBudget = true;
+    /// Pools that may stall the pipeline and other notes
+    std::vector<std::string> warnings;
+
+    /// @returns Pools estimate compared to memory usage reported by the device
+    MemoryComparison compare(const dai::MemoryInfo& ddrUsage, const dai::MemoryInfo& cmxUsage) const;
+    /// @returns Human readable per pool report
+    std::string toString() const;
+};
+
+/**
+ * @brief Estimates device memory used by node pools, from node properties, without a device.
+ *
+ * Frame sizes are derived the same way as by BandwidthAnalyzer. Sizes of NeuralNetwork outputs and
+ * CMX usage are taken from blob headers. Pools of cameras and StereoDepth aren't configurable
+ * and are estimated from firmware defaults.
+ */
+class MemoryPlanner {
+   public:
+    /// Size of a single CMX slice in bytes
+    static constexpr double CMX_SLICE_SIZE = 128 * 1024;
+    /// Approximate DDR memory available to the pipeline on a 512 MiB device
+    static constexpr double DEFAULT_DDR_BUDGET = 320 * 1024 * 1024;
+    /// CMX memory available to neural networks (16 slices)
+    static constexpr double DEFAULT_CMX_BUDGET = 16 * CMX_SLICE_SIZE;
+
+    /**
+     * Plans memory of the pipeline
+     * @param schema Pipeline schema
+     * @param blobs Information of neural network blobs, by node id
+     * @param ddrBudget DDR memory available to the pipeline in bytes
+     * @param cmxBudget CMX memory available to the pipeline in bytes
+     * @param targetFps Rate pool sizes are suggested for, 0 to use rates estimated from node properties
+     * @param targetLatency Time in seconds a message may be held by consumers, before its pool frame is returned
+     * @param xlinkInFps Rate at which host sends messages to XLinkIn streams, by stream name
+     */
+    static MemoryPlan plan(const dai::PipelineSchema& schema,
+                           const std::map<std::int64_t, BlobInfo>& blobs,
+                           double ddrBudget = DEFAULT_DDR_BUDGET,
+                           double cmxBudget = DEFAULT_CMX_BUDGET,
+                           float targetFps = 0,
+                           float targetLatency = 0.1f,
+                           const std::map<std::string, float>& xlinkInFps = {});
+};
@@ -0,0 +1,42 @@
+#include "NeuralNetworkBlob.hpp"
+
+// std
+#include <limits>
+#include <stdexcept>
+
+// project
+#include "NodeAccess.hpp"
+#include "openvino/BlobInfo.hpp"
+#include "utility/MappedFile.hpp"
+
+namespace {
+
+constexpr std::uint32_t BLOB_ALIGNMENT = 64;
+
+}  // namespace
+
+void setNeuralNetworkBlob(dai::node::NeuralNetwork& node, const std::uint8_t* data, std::size_t size) {
+    if(size > std::numeric_limits<std::uint32_t>::max()) throw std::invalid_argument("NeuralNetwork node | Blob is too large");
+    // Throws if data isn't a blob or its version isn't supported, before node is modified
+    auto version = BlobInfo(data, size).getOpenVINOVersion();
+
+    // Asset is created in place, so contents are copied only once
+    std::string assetKey = std::to_string(node.id) + "/blob";
+    auto& assets = NodeAccess::assetsOf(node);
+    assets.set(assetKey, dai::Asset());
+    auto asset = assets.get(assetKey);
+    asset->alignment = BLOB_ALIGNMENT;
+    asset->data.assign(data, data + size);
+
+    NeuralNetworkAccess::blobVersionOf(node) = version;
+    NeuralNetworkAccess::blobPathOf(node).clear();
+    auto& properties = NeuralNetworkAccess::propertiesOf(node);
+    properties.blobUri = std::string("asset:") + assetKey;
+    properties.blobSize = static_cast<std::uint32_t>(size);
+}
+
+void setNeuralNetworkBlobMapped(dai::node::NeuralNetwork& node, const std::string& path) {
+    MappedFile file(path);
+    setNeuralNetworkBlob(node, file.data(), file.size());
+    NeuralNetworkAccess::blobPathOf(node) = path;
+}
@@ -0,0 +1,25 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+// depthai
+#include "depthai/pipeline/node/NeuralNetwork.hpp"
+
+/**
+ * Sets the blob of a neural network node from memory, like setBlobPath does from a file.
+ * Blob header is parsed in place and contents are copied once, directly into the node asset
+ * @param node Neural network node
+ * @param data Pointer to blob contents
+ * @param size Size of blob in bytes
+ */
+void setNeuralNetworkBlob(dai::node::NeuralNetwork& node, const std::uint8_t* data, std::size_t size);
+
+/**
+ * Sets the blob of a neural network node from a memory mapped file, without intermediate buffers. Used by setBlobPath binding
+ * @param node Neural network node
+ * @param path Path to the blob
+ */
+void setNeuralNetworkBlobMapped(dai::node::NeuralNetwork& node, const std::string& path);
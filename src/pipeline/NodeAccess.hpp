@@ -0,0 +1,28 @@
+#pragma once
+
+// depthai
+#include "depthai/pipeline/Node.hpp"
+#include "depthai/pipeline/node/NeuralNetwork.hpp"
+
+// Accessors of protected node members, for host side utilities working on existing node types.
+// Only pointers to members are formed here, nodes themselves are never constructed as these types.
+
+/// Access to node assets
+struct NodeAccess : dai::Node {
+    static dai::AssetManager& assetsOf(dai::Node& node) {
+        return node.*(&NodeAccess::assetManager);
+    }
+};
+
+/// Access to neural network properties and detected blob version
+struct NeuralNetworkAccess : dai::node::NeuralNetwork {
+    static Properties& propertiesOf(dai::node::NeuralNetwork& node) {
+        return (node.*(&NeuralNetworkAccess::getPropertiesRef))();
+    }
+    static dai::OpenVINO::Version& blobVersionOf(dai::node::NeuralNetwork& node) {
+        return node.*(&NeuralNetworkAccess::networkOpenvinoVersion);
+    }
+    static std::string& blobPathOf(dai::node::NeuralNetwork& node) {
+        return node.*(&NeuralNetworkAccess::blobPath);
+    }
+};
@@ -17,10 +17,27 @@
 #include "depthai/pipeline/node/ObjectTracker.hpp"
 #include "depthai/pipeline/node/IMU.hpp"
 #include "depthai/pipeline/node/EdgeDetector.hpp"
+#include "depthai/device/Device.hpp"
+
+// project
+#include "NeuralNetworkBlob.hpp"
+#include "calibration/StereoMesh.hpp"
+#include "SerializedNode.hpp"
 
 // Libraries
 #include "hedley/hedley.h"
 
+// Generates (or loads cached) warp meshes and sets them on the node
+static void stereoGenerateMeshHelper(dai::node::StereoDepth& stereo, dai::CalibrationHandler& calibration, std::tuple<unsigned int, unsigned int> size, unsigned int meshStep, const std::string& mxId, bool useCache, const std::string& cacheDirectory){
+    std::shared_ptr<StereoMesh> mesh;
+    {
+        py::gil_scoped_release release;
+        mesh = getStereoMesh(calibration, std::get<0>(size), std::get<1>(size), meshStep, meshStep, mxId, useCache, cacheDirectory);
+    }
+    stereo.setMeshStep(meshStep, meshStep);
+    stereo.loadMeshData(mesh->left, mesh->right);
+}
+
 void NodeBindings::bind(pybind11::module& m){
 
     using namespace dai;
@@ -178,7 +195,18 @@ void NodeBindings::bind(pybind11::module& m){
         .def_readonly("input", &NeuralNetwork::input, DOC(dai, node, NeuralNetwork, input))
         .def_readonly("out", &NeuralNetwork::out, DOC(dai, node, NeuralNetwork, out))
         .def_readonly("passthrough", &NeuralNetwork::passthrough, DOC(dai, node, NeuralNetwork, passthrough))
-        .def("setBlobPath", &NeuralNetwork::setBlobPath, py::arg("path"), DOC(dai, node, NeuralNetwork, setBlobPath))
+        .def("setBlobPath", [](NeuralNetwork& nn, const std::string& path){
+            py::gil_scoped_release release;
+            setNeuralNetworkBlobMapped(nn, path);
+        }, py::arg("path"), "Load network blob into assets and use once pipeline is started. The file is memory mapped and copied once, directly into the node asset")
+        .def("setBlob", [](NeuralNetwork& nn, const py::buffer& blob){
+            py::buffer_info info = blob.request();
+            if(!PyBuffer_IsContiguous(info.view(), 'C')) throw std::invalid_argument("Blob buffer must be C contiguous");
+            const auto* ptr = static_cast<const std::uint8_t*>(info.ptr);
+            std::size_t size = static_cast<std::size_t>(info.size * info.itemsize);
+            py::gil_scoped_release release;
+            setNeuralNetworkBlob(nn, ptr, size);
+        }, py::arg("blob"), "Sets the blob from any object supporting the buffer protocol (bytes, numpy array, MappedFile). Contents are copied once, directly into the node asset")
         .def("setNumPoolFrames", &NeuralNetwork::setNumPoolFrames, py::arg("numFrames"), DOC(dai, node, NeuralNetwork, setNumPoolFrames))
         .def("setNumInferenceThreads", &NeuralNetwork::setNumInferenceThreads, py::arg("numThreads"), DOC(dai, node, NeuralNetwork, setNumInferenceThreads))
         .def("setNumNCEPerInferenceThread", &NeuralNetwork::setNumNCEPerInferenceThread, py::arg("numNCEPerThread"), DOC(dai, node, NeuralNetwork, setNumNCEPerInferenceThread))
@@ -306,6 +334,14 @@ void NodeBindings::bind(pybind11::module& m){
         .def("loadMeshFiles",           &StereoDepth::loadMeshFiles, py::arg("pathLeft"), py::arg("pathRight"), DOC(dai, node, StereoDepth, loadMeshFiles))
         .def("loadMeshData",            &StereoDepth::loadMeshData, py::arg("dataLeft"), py::arg("dataRight"), DOC(dai, node, StereoDepth, loadMeshData))
         .def("setMeshStep",             &StereoDepth::setMeshStep, py::arg("width"), py::arg("height"), DOC(dai, node, StereoDepth, setMeshStep))
+        .def("generateMesh",            &stereoGenerateMeshHelper, py::arg("calibration"), py::arg("size"), py::arg("meshStep") = 16, py::arg("mxId") = "", py::arg("useCache") = true, py::arg("cacheDirectory") = "",
+            "Generates warp meshes rectifying the stereo pair from calibration, for input frames of given (width, height), and loads them with the given mesh step. "
+            "Meshes are cached on disk (DEPTHAI_CACHE_DIR, or 'cacheDirectory'), per device 'mxId' and keyed by calibration content and arguments")
+        .def("generateMesh", [](StereoDepth& stereo, Device& device, std::tuple<unsigned int, unsigned int> size, unsigned int meshStep, bool useCache, const std::string& cacheDirectory) {
+            auto calibration = device.readCalibration();
+            stereoGenerateMeshHelper(stereo, calibration, size, meshStep, device.getMxId(), useCache, cacheDirectory);
+        }, py::arg("device"), py::arg("size"), py::arg("meshStep") = 16, py::arg("useCache") = true, py::arg("cacheDirectory") = "",
+            "Same as generateMesh, with calibration and MxId read from the device")
         .def("setInputResolution",      &StereoDepth::setInputResolution, py::arg("width"), py::arg("height"), DOC(dai, node, StereoDepth, setInputResolution))
         .def("setOutputSize",           &StereoDepth::setOutputSize, py::arg("width"), py::arg("height"), DOC(dai, node, StereoDepth, setOutputSize))
         .def("setOutputKeepAspectRatio",&StereoDepth::setOutputKeepAspectRatio, py::arg("keep"), DOC(dai, node, StereoDepth, setOutputKeepAspectRatio))
@@ -516,6 +552,19 @@ void NodeBindings::bind(pybind11::module& m){
         .def("setMaxOutputFrameSize", &EdgeDetector::setMaxOutputFrameSize, DOC(dai, node, EdgeDetector, setMaxOutputFrameSize))
         ;
 
+    // SerializedNode node
+    py::class_<SerializedNode, Node, std::shared_ptr<SerializedNode>>(m, "SerializedNode", "Node restored from a serialized pipeline. Constructed on the device as the original node type")
+        .def("getInput", &SerializedNode::getInput, py::arg("name"), py::return_value_policy::reference_internal, "Retrieves input with given name")
+        .def("getOutput", &SerializedNode::getOutput, py::arg("name"), py::return_value_policy::reference_internal, "Retrieves output with given name")
+        .def("getProperties", [](SerializedNode& node) {
+            return py::module::import("json").attr("loads")(node.getProperties().dump());
+        }, "Retrieves node properties as a dictionary")
+        .def("setProperties", [](SerializedNode& node, py::object properties) {
+            std::string str = py::module::import("json").attr("dumps")(properties).cast<std::string>();
+            node.setProperties(nlohmann::json::parse(str));
+        }, py::arg("properties"), "Sets node properties from a dictionary, passed as is to the device")
+        ;
+
     ////////////////////////////////////
     // Node properties bindings
     ////////////////////////////////////
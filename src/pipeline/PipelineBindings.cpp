@@ -2,6 +2,7 @@
 
 // depthai
 #include "depthai/pipeline/Pipeline.hpp"
+#include "depthai/device/Device.hpp"
 
 // depthai - nodes
 #include "depthai/pipeline/node/XLinkIn.hpp"
@@ -24,11 +25,134 @@
 // depthai-shared
 #include "depthai-shared/properties/GlobalProperties.hpp"
 
+// project
+#include "AssetDeduplication.hpp"
+#include "BandwidthAnalyzer.hpp"
+#include "MemoryPlanner.hpp"
+#include "PipelineBlobs.hpp"
+#include "PipelineClone.hpp"
+#include "PipelineSchemaBuilder.hpp"
+#include "PipelineSerializer.hpp"
+
 void PipelineBindings::bind(pybind11::module& m){
 
     using namespace dai;
 
 
+    // Asset deduplication
+    py::class_<AssetStats>(m, "AssetStats", "Sizes of assets, with identical assets accounted for once")
+        .def_readonly("numAssets", &AssetStats::numAssets, "Number of assets")
+        .def_readonly("numUnique", &AssetStats::numUnique, "Number of assets with distinct content")
+        .def_readonly("totalSize", &AssetStats::totalSize, "Sum of sizes of all assets in bytes")
+        .def_readonly("deduplicatedSize", &AssetStats::deduplicatedSize, "Sum of sizes of assets with distinct content in bytes")
+        .def_readonly("duplicates", &AssetStats::duplicates, "Groups of keys of assets with identical content")
+        ;
+
+    // Bandwidth analysis
+    py::class_<StreamRate>(m, "StreamRate", "Estimated rate of messages flowing out of a node output")
+        .def_readonly("fps", &StreamRate::fps, "Messages per second")
+        .def_readonly("bytesPerFrame", &StreamRate::bytesPerFrame, "Payload size of a single message in bytes")
+        .def_readonly("width", &StreamRate::width, "Frame width, 0 if stream doesn't carry frames")
+        .def_readonly("height", &StreamRate::height, "Frame height, 0 if stream doesn't carry frames")
+        .def_readonly("format", &StreamRate::format, "Frame type (eg. NV12) or message type")
+        .def_readonly("known", &StreamRate::known, "Whether rate could be derived from node properties")
+        .def_readonly("approximate", &StreamRate::approximate, "Whether size is a rough estimate (compressed or variable sized messages)")
+        .def("getBytesPerSecond", &StreamRate::getBytesPerSecond)
+        ;
+
+    py::class_<LinkReport> linkReport(m, "LinkReport", "Estimated bandwidth of a single XLink stream");
+    py::enum_<LinkReport::Direction>(linkReport, "Direction")
+        .value("DEVICE_TO_HOST", LinkReport::Direction::DEVICE_TO_HOST)
+        .value("HOST_TO_DEVICE", LinkReport::Direction::HOST_TO_DEVICE)
+        ;
+    linkReport
+        .def_readonly("streamName", &LinkReport::streamName, "XLink stream name")
+        .def_readonly("direction", &LinkReport::direction)
+        .def_readonly("nodeId", &LinkReport::nodeId, "Id of XLinkOut or XLinkIn node")
+        .def_readonly("source", &LinkReport::source, "Output feeding the XLinkOut, or XLinkIn consumers")
+        .def_readonly("rate", &LinkReport::rate, "Rate of messages, as sent over the link")
+        .def_readonly("bytesPerSecond", &LinkReport::bytesPerSecond, "Bytes per second, including message metadata")
+        .def_readonly("utilization", &LinkReport::utilization, "Fraction of link capacity used by this stream")
+        .def_readonly("transferTime", &LinkReport::transferTime, "Seconds spent transferring a single message at full link capacity")
+        ;
+
+    py::class_<ConnectionReport>(m, "ConnectionReport", "Estimated rate over a single connection between nodes")
+        .def_readonly("outputNodeId", &ConnectionReport::outputNodeId)
+        .def_readonly("outputName", &ConnectionReport::outputName)
+        .def_readonly("inputNodeId", &ConnectionReport::inputNodeId)
+        .def_readonly("inputName", &ConnectionReport::inputName)
+        .def_readonly("rate", &ConnectionReport::rate)
+        ;
+
+    py::class_<BandwidthReport>(m, "BandwidthReport", "Result of a pipeline bandwidth analysis")
+        .def_readonly("usbSpeed", &BandwidthReport::usbSpeed, "Speed the capacity is derived from, UNKNOWN if capacity was specified explicitly")
+        .def_readonly("capacity", &BandwidthReport::capacity, "Usable link capacity in bytes per second")
+        .def_readonly("fullDuplex", &BandwidthReport::fullDuplex, "Whether both directions have full capacity available (USB3) or share it (USB2)")
+        .def_readonly("links", &BandwidthReport::links)
+        .def_readonly("connections", &BandwidthReport::connections)
+        .def_readonly("nodes", &BandwidthReport::nodes, "Node names, by id")
+        .def_readonly("deviceToHost", &BandwidthReport::deviceToHost, "Total bytes per second sent from device to host")
+        .def_readonly("hostToDevice", &BandwidthReport::hostToDevice, "Total bytes per second sent from host to device")
+        .def_readonly("utilization", &BandwidthReport::utilization, "Fraction of capacity used, in the more loaded direction for full duplex links")
+        .def_readonly("withinBudget", &BandwidthReport::withinBudget, "Whether all streams fit into the link capacity")
+        .def_readonly("warnings", &BandwidthReport::warnings)
+        .def("toString", &BandwidthReport::toString, "Human readable per link report")
+        .def("toDot", &BandwidthReport::toDot, "Graphviz DOT graph of the pipeline, with connections and links annotated with rates")
+        .def("__str__", &BandwidthReport::toString)
+        ;
+
+    py::class_<PoolReport> poolReport(m, "PoolReport", "Estimated memory of a single pool of messages, or of other memory used by a node");
+    py::enum_<PoolReport::Memory>(poolReport, "Memory")
+        .value("DDR", PoolReport::Memory::DDR)
+        .value("CMX", PoolReport::Memory::CMX)
+        ;
+    poolReport
+        .def_readonly("nodeId", &PoolReport::nodeId)
+        .def_readonly("nodeName", &PoolReport::nodeName)
+        .def_readonly("name", &PoolReport::name, "Output the pool serves, or what the memory is used for (eg. 'blob')")
+        .def_readonly("memory", &PoolReport::memory)
+        .def_readonly("setting", &PoolReport::setting, "Setting controlling the size of the pool (eg. 'ImageManip.setNumFramesPool'), empty if it isn't configurable")
+        .def_readonly("numFrames", &PoolReport::numFrames, "Number of frames in pool")
+        .def_readonly("frameSize", &PoolReport::frameSize, "Size of a single frame in bytes")
+        .def_readonly("size", &PoolReport::size, "Total size in bytes")
+        .def_readonly("approximate", &PoolReport::approximate, "Whether pool size or frame size are assumed (firmware defaults, encoded streams)")
+        .def_readonly("fps", &PoolReport::fps, "Estimated rate of messages leaving the pool, 0 if unknown")
+        .def_readonly("queueSize", &PoolReport::queueSize, "Sum of queue sizes of inputs consuming the pool")
+        .def_readonly("suggestedNumFrames", &PoolReport::suggestedNumFrames, "Suggested number of frames for the target fps and latency, 0 if pool isn't configurable")
+        ;
+
+    py::class_<MemoryComparison>(m, "MemoryComparison", "Memory estimate compared to memory usage reported by a running device")
+        .def_readonly("ddrEstimate", &MemoryComparison::ddrEstimate)
+        .def_readonly("ddrUsed", &MemoryComparison::ddrUsed)
+        .def_readonly("ddrTotal", &MemoryComparison::ddrTotal)
+        .def_readonly("cmxEstimate", &MemoryComparison::cmxEstimate)
+        .def_readonly("cmxUsed", &MemoryComparison::cmxUsed)
+        .def_readonly("cmxTotal", &MemoryComparison::cmxTotal)
+        .def("getDdrUnaccounted", &MemoryComparison::getDdrUnaccounted, "Reported minus estimated DDR usage, which includes firmware and node internals not accounted for by pools")
+        .def("getCmxUnaccounted", &MemoryComparison::getCmxUnaccounted, "Reported minus estimated CMX usage")
+        .def("toString", &MemoryComparison::toString)
+        .def("__str__", &MemoryComparison::toString)
+        ;
+
+    py::class_<MemoryPlan>(m, "MemoryPlan", "Result of pipeline memory planning")
+        .def_readonly("ddrBudget", &MemoryPlan::ddrBudget, "DDR memory available to the pipeline in bytes")
+        .def_readonly("cmxBudget", &MemoryPlan::cmxBudget, "CMX memory available to the pipeline in bytes")
+        .def_readonly("targetFps", &MemoryPlan::targetFps)
+        .def_readonly("targetLatency", &MemoryPlan::targetLatency)
+        .def_readonly("pools", &MemoryPlan::pools)
+        .def_readonly("ddrEstimate", &MemoryPlan::ddrEstimate, "Total estimated DDR usage in bytes")
+        .def_readonly("cmxEstimate", &MemoryPlan::cmxEstimate, "Total estimated CMX usage in bytes")
+        .def_readonly("withinBudget", &MemoryPlan::withinBudget, "Whether estimates fit into the budgets")
+        .def_readonly("warnings", &MemoryPlan::warnings)
+        .def("compare", &MemoryPlan::compare, py::arg("ddrUsage"), py::arg("cmxUsage"), "Compares the estimate to memory usage reported by the device")
+        .def("compare", [](const MemoryPlan& plan, Device& device) {
+            py::gil_scoped_release release;
+            return plan.compare(device.getDdrMemoryUsage(), device.getCmxMemoryUsage());
+        }, py::arg("device"), "Compares the estimate to memory usage of a running device")
+        .def("toString", &MemoryPlan::toString, "Human readable per pool report")
+        .def("__str__", &MemoryPlan::toString)
+        ;
+
     // Bind global properties
     py::class_<GlobalProperties>(m, "GlobalProperties", DOC(dai, GlobalProperties))
         .def_readwrite("leonOsFrequencyHz", &GlobalProperties::leonCssFrequencyHz)
@@ -43,6 +167,11 @@ void PipelineBindings::bind(pybind11::module& m){
     py::class_<Pipeline>(m, "Pipeline", DOC(dai, Pipeline, 2))
         .def(py::init<>(), DOC(dai, Pipeline, Pipeline))
         //.def(py::init<const Pipeline&>())
+        .def("clone", &clonePipeline, py::arg("streamNamePrefix") = "",
+        "Clones the pipeline: nodes, properties, connections and global properties. Assets (eg. blobs) are shared with the original pipeline, not copied. "
+        "The clone is independent of the original pipeline, its nodes can be linked and configured (eg. stream names, calibration) per device")
+        .def("__deepcopy__", [](const Pipeline& p, py::dict) { return clonePipeline(p); }, py::arg("memo"))
+        .def("addStreamNamePrefix", &addStreamNamePrefix, py::arg("prefix"), "Adds prefix to all XLinkIn and XLinkOut stream names")
         .def("getGlobalProperties", &Pipeline::getGlobalProperties, DOC(dai, Pipeline, getGlobalProperties))
         //.def("create", &Pipeline::create<node::XLinkIn>)
         .def("remove", &Pipeline::remove, py::arg("node"), DOC(dai, Pipeline, remove))
@@ -60,9 +189,64 @@ void PipelineBindings::bind(pybind11::module& m){
         .def("getAssetManager", static_cast<AssetManager& (Pipeline::*)()>(&Pipeline::getAssetManager), py::return_value_policy::reference_internal, DOC(dai, Pipeline, getAssetManager))
         .def("setOpenVINOVersion", &Pipeline::setOpenVINOVersion, py::arg("version") = Pipeline::DEFAULT_OPENVINO_VERSION, DOC(dai, Pipeline, setOpenVINOVersion))
         .def("getOpenVINOVersion", &Pipeline::getOpenVINOVersion, DOC(dai, Pipeline, getOpenVINOVersion))
+        .def("getBlobInfos", &getPipelineBlobInfos, "Information parsed from headers of neural network blobs in the pipeline, by node id")
+        .def("resolveOpenVINOVersion", &resolvePipelineOpenVINOVersion, "Sets and returns the latest OpenVINO version able to run all blobs in the pipeline. Raises if blobs require incompatible versions")
+        .def("validateOpenVINOVersion", [](const Pipeline& p, tl::optional<OpenVINO::Version> version) {
+            if(version) {
+                validatePipelineOpenVINOVersion(p, *version);
+            } else {
+                validatePipelineOpenVINOVersion(p);
+            }
+        }, py::arg("version") = py::none(), "Raises if any blob in the pipeline can't run with given OpenVINO version (pipeline version by default), without a device")
         .def("setCameraTuningBlobPath", &Pipeline::setCameraTuningBlobPath, py::arg("path"), DOC(dai, Pipeline, setCameraTuningBlobPath))
         .def("setCalibrationData", &Pipeline::setCalibrationData, py::arg("calibrationDataHandler"), DOC(dai, Pipeline, setCalibrationData))
         .def("getCalibrationData", &Pipeline::getCalibrationData, DOC(dai, Pipeline, getCalibrationData))
+        .def("serialize", [](const Pipeline& p) {
+            std::vector<std::uint8_t> data;
+            {
+                py::gil_scoped_release release;
+                data = PipelineSerializer::serialize(p);
+            }
+            return py::bytes(reinterpret_cast<const char*>(data.data()), data.size());
+        }, "Serializes pipeline (schema, node properties, connections, global properties and assets) into a compact binary form")
+        .def_static("deserialize", [](py::buffer buffer) {
+            py::buffer_info info = buffer.request();
+            py::gil_scoped_release release;
+            return PipelineSerializer::deserialize(static_cast<const std::uint8_t*>(info.ptr), info.size * info.itemsize);
+        }, py::arg("data"), "Restores pipeline serialized with 'serialize'. Nodes are restored as SerializedNode")
+        .def("getContentHash", [](const Pipeline& p) {
+            py::gil_scoped_release release;
+            return PipelineSerializer::getContentHash(p);
+        }, "Hash of the serialized pipeline, equal for pipelines which construct the same on the device")
+        .def("getAssetStats", [](const Pipeline& p) {
+            py::gil_scoped_release release;
+            return getAssetStats(p.getAllAssets());
+        }, "Sizes of all pipeline assets, with identical assets accounted for once")
+        .def("deduplicateAssets", &deduplicatePipelineAssets, py::call_guard<py::gil_scoped_release>(),
+        "Stores identical neural network blobs of the pipeline once, reducing host memory and upload size. "
+        "Call after the pipeline is built. Returns statistics of pipeline assets after deduplication")
+        .def("analyzeBandwidth", [](Pipeline& p, UsbSpeed usbSpeed, const std::map<std::string, float>& xlinkInFps) {
+            return BandwidthAnalyzer::analyze(buildPipelineSchema(p), usbSpeed, xlinkInFps);
+        }, py::arg("usbSpeed"), py::arg("xlinkInFps") = std::map<std::string, float>{},
+        "Estimates bandwidth of each XLink stream from node properties and compares it to the USB link capacity. Doesn't require a device")
+        .def("analyzeBandwidth", [](Pipeline& p, double capacity, bool fullDuplex, const std::map<std::string, float>& xlinkInFps) {
+            return BandwidthAnalyzer::analyze(buildPipelineSchema(p), capacity, fullDuplex, xlinkInFps);
+        }, py::arg("capacity"), py::arg("fullDuplex") = true, py::arg("xlinkInFps") = std::map<std::string, float>{},
+        "Estimates bandwidth of each XLink stream from node properties and compares it to given link capacity in bytes per second")
+        .def("planMemory", [](Pipeline& p, double ddrBudget, double cmxBudget, float targetFps, float targetLatency, const std::map<std::string, float>& xlinkInFps) {
+            return MemoryPlanner::plan(buildPipelineSchema(p), getPipelineBlobInfos(p), ddrBudget, cmxBudget, targetFps, targetLatency, xlinkInFps);
+        }, py::arg("ddrBudget") = MemoryPlanner::DEFAULT_DDR_BUDGET, py::arg("cmxBudget") = MemoryPlanner::DEFAULT_CMX_BUDGET, py::arg("targetFps") = 0.0f,
+        py::arg("targetLatency") = 0.1f, py::arg("xlinkInFps") = std::map<std::string, float>{},
+        "Estimates device memory used by node pools and compares it to the budgets. Suggests pool sizes for target fps (estimated rates by default) and latency in seconds. Doesn't require a device")
+        .def_static("loadCached", [](const std::string& path, py::object builder, const std::string& key, const std::vector<std::string>& dependencies) -> py::object {
+            if(builder.is_none()) {
+                if(!PipelineSerializer::isCacheValid(path, key, dependencies)) return py::none();
+                return py::cast(PipelineSerializer::loadCached(path, nullptr, key, dependencies));
+            }
+            return py::cast(PipelineSerializer::loadCached(path, [&builder]() { return builder().cast<Pipeline>(); }, key, dependencies));
+        }, py::arg("path"), py::arg("builder") = py::none(), py::arg("key") = "", py::arg("dependencies") = std::vector<std::string>{},
+        "Loads pipeline from cache file if it matches key and dependencies (checked by size and modification time), "
+        "otherwise calls builder to construct the pipeline and stores it to the cache file. Returns None on a miss if builder isn't specified")
          // templated create<NODE> function
         .def("createXLinkIn", &Pipeline::create<node::XLinkIn>)
         .def("createXLinkOut", &Pipeline::create<node::XLinkOut>)
@@ -0,0 +1,100 @@
+#include "PipelineBlobs.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// project
+#include "PipelineSchemaBuilder.hpp"
+
+namespace {
+
+constexpr const char* ASSET_URI_PREFIX = "asset:";
+
+std::string describeVersions(const std::vector<dai::OpenVINO::Version>& versions) {
+    std::string str;
+    for(const auto& v : versions) {
+        if(!str.empty()) str += ", ";
+        str += dai::OpenVINO::getVersionName(v);
+    }
+    return str;
+}
+
+std::string describeNode(const dai::Pipeline& pipeline, std::int64_t id) {
+    auto node = pipeline.getNode(id);
+    std::string name = node ? node->getName() : "Node";
+    return "'" + name + "' node (id: " + std::to_string(id) + ")";
+}
+
+}  // namespace
+
+std::map<std::int64_t, BlobInfo> getPipelineBlobInfos(const dai::Pipeline& pipeline) {
+    dai::PipelineSchema schema = buildPipelineSchema(pipeline);
+    dai::AssetManager assets = pipeline.getAllAssets();
+
+    std::map<std::int64_t, BlobInfo> infos;
+    for(const auto& kv : schema.nodes) {
+        const auto& properties = kv.second.properties;
+        auto it = properties.find("blobUri");
+        if(it == properties.end() || !it->is_string()) continue;
+        std::string uri = it->get<std::string>();
+        if(uri.compare(0, std::string(ASSET_URI_PREFIX).size(), ASSET_URI_PREFIX) != 0) continue;
+
+        auto asset = assets.get(uri.substr(std::string(ASSET_URI_PREFIX).size()));
+        if(asset == nullptr) {
+            throw std::runtime_error("Pipeline - Blob of " + describeNode(pipeline, kv.first) + " is missing: " + uri);
+        }
+        // Blob is parsed in place
+        infos.emplace(kv.first, BlobInfo(asset->data.data(), asset->data.size()));
+    }
+    return infos;
+}
+
+dai::OpenVINO::Version resolvePipelineOpenVINOVersion(dai::Pipeline& pipeline) {
+    auto infos = getPipelineBlobInfos(pipeline);
+    if(infos.empty()) return pipeline.getOpenVINOVersion();
+
+    // Intersect versions supported by each blob, keeping the order of known versions
+    std::vector<dai::OpenVINO::Version> candidates = dai::OpenVINO::getVersions();
+    for(const auto& kv : infos) {
+        auto supported = kv.second.getSupportedOpenVINOVersions();
+        if(supported.empty()) {
+            throw std::runtime_error("Pipeline - Blob of " + describeNode(pipeline, kv.first) + " has unknown version "
+                                     + std::to_string(kv.second.versionMajor) + "." + std::to_string(kv.second.versionMinor));
+        }
+        candidates.erase(std::remove_if(candidates.begin(),
+                                        candidates.end(),
+                                        [&supported](dai::OpenVINO::Version v) { return std::find(supported.begin(), supported.end(), v) == supported.end(); }),
+                         candidates.end());
+    }
+
+    if(candidates.empty()) {
+        std::string err = "Pipeline - Blobs require incompatible OpenVINO versions:";
+        for(const auto& kv : infos) {
+            err += " " + describeNode(pipeline, kv.first) + ": " + describeVersions(kv.second.getSupportedOpenVINOVersions()) + ";";
+        }
+        throw std::runtime_error(err);
+    }
+
+    auto version = *std::max_element(candidates.begin(), candidates.end());
+    pipeline.setOpenVINOVersion(version);
+    return version;
+}
+
+void validatePipelineOpenVINOVersion(const dai::Pipeline& pipeline, dai::OpenVINO::Version version) {
+    for(const auto& kv : getPipelineBlobInfos(pipeline)) {
+        if(!kv.second.isCompatible(version)) {
+            auto supported = kv.second.getSupportedOpenVINOVersions();
+            throw std::runtime_error("Pipeline - Blob of " + describeNode(pipeline, kv.first) + " can't run with OpenVINO "
+                                     + dai::OpenVINO::getVersionName(version) + ", it was compiled for: "
+                                     + (supported.empty() ? std::string("unknown version") : describeVersions(supported))
+                                     + ". Use Pipeline.setOpenVINOVersion or Pipeline.resolveOpenVINOVersion");
+        }
+    }
+}
+
+void validatePipelineOpenVINOVersion(const dai::Pipeline& pipeline) {
+    validatePipelineOpenVINOVersion(pipeline, pipeline.getOpenVINOVersion());
+}
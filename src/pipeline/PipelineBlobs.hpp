@@ -0,0 +1,30 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <map>
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+
+// project
+#include "openvino/BlobInfo.hpp"
+
+/// @returns Information of neural network blobs in the pipeline, by node id
+std::map<std::int64_t, BlobInfo> getPipelineBlobInfos(const dai::Pipeline& pipeline);
+
+/**
+ * Picks the latest OpenVINO version able to run all blobs in the pipeline and sets it on the pipeline.
+ * Throws if blobs require incompatible versions
+ * @returns Picked version, or pipeline version if it has no blobs
+ */
+dai::OpenVINO::Version resolvePipelineOpenVINOVersion(dai::Pipeline& pipeline);
+
+/**
+ * Checks that all blobs in the pipeline can run with given OpenVINO version, throws otherwise.
+ * Lets incompatibilities be found before a device is booted
+ */
+void validatePipelineOpenVINOVersion(const dai::Pipeline& pipeline, dai::OpenVINO::Version version);
+
+/// Checks that all blobs in the pipeline can run with the pipeline OpenVINO version, throws otherwise
+void validatePipelineOpenVINOVersion(const dai::Pipeline& pipeline);
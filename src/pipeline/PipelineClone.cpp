@@ -0,0 +1,131 @@
+#include "PipelineClone.hpp"
+
+// std
+#include <new>
+#include <stdexcept>
+
+// depthai
+#include "depthai/pipeline/node/ColorCamera.hpp"
+#include "depthai/pipeline/node/DetectionNetwork.hpp"
+#include "depthai/pipeline/node/EdgeDetector.hpp"
+#include "depthai/pipeline/node/IMU.hpp"
+#include "depthai/pipeline/node/ImageManip.hpp"
+#include "depthai/pipeline/node/MonoCamera.hpp"
+#include "depthai/pipeline/node/MyProducer.hpp"
+#include "depthai/pipeline/node/NeuralNetwork.hpp"
+#include "depthai/pipeline/node/ObjectTracker.hpp"
+#include "depthai/pipeline/node/SPIOut.hpp"
+#include "depthai/pipeline/node/SpatialDetectionNetwork.hpp"
+#include "depthai/pipeline/node/SpatialLocationCalculator.hpp"
+#include "depthai/pipeline/node/StereoDepth.hpp"
+#include "depthai/pipeline/node/SystemLogger.hpp"
+#include "depthai/pipeline/node/VideoEncoder.hpp"
+#include "depthai/pipeline/node/XLinkIn.hpp"
+#include "depthai/pipeline/node/XLinkOut.hpp"
+
+// project
+#include "SerializedNode.hpp"
+
+namespace {
+
+// Core nodes are cloned with their copy constructors, which copy inputs and outputs along with the reference to their parent.
+// They are recreated in place with the clone as parent, as SerializedNode's copy constructor does
+struct NodeIoRebuilder : dai::Node {
+    static void rebuild(dai::Node& node, Input& in) {
+        Input rebuilt(node, in.name, in.type, in.defaultBlocking, in.defaultQueueSize, in.possibleDatatypes);
+        rebuilt.blocking = in.blocking;
+        rebuilt.queueSize = in.queueSize;
+        in.~Input();
+        new(&in) Input(rebuilt);
+    }
+
+    static void rebuild(dai::Node& node, Output& out) {
+        Output rebuilt(node, out.name, out.type, out.possibleDatatypes);
+        out.~Output();
+        new(&out) Output(rebuilt);
+    }
+
+    // Rebuilds the given IO members if the node is of type T, members hidden by a derived type are listed by each type
+    template <typename T, typename... Ios>
+    static bool rebuildAs(dai::Node& node, Ios T::*... ios) {
+        auto* typed = dynamic_cast<T*>(&node);
+        if(typed == nullptr) return false;
+        using expand = int[];
+        (void)expand{0, (rebuild(node, typed->*ios), 0)...};
+        return true;
+    }
+
+    static void rebuildIos(dai::Node& node) {
+        using namespace dai::node;
+        if(dynamic_cast<SerializedNode*>(&node) != nullptr) return;
+        bool known = false;
+        known |= rebuildAs<ColorCamera>(
+            node, &ColorCamera::inputConfig, &ColorCamera::inputControl, &ColorCamera::video, &ColorCamera::preview, &ColorCamera::still, &ColorCamera::isp, &ColorCamera::raw);
+        known |= rebuildAs<MonoCamera>(node, &MonoCamera::inputControl, &MonoCamera::out, &MonoCamera::raw);
+        known |= rebuildAs<StereoDepth>(node,
+                                        &StereoDepth::inputConfig,
+                                        &StereoDepth::left,
+                                        &StereoDepth::right,
+                                        &StereoDepth::depth,
+                                        &StereoDepth::disparity,
+                                        &StereoDepth::syncedLeft,
+                                        &StereoDepth::syncedRight,
+                                        &StereoDepth::rectifiedLeft,
+                                        &StereoDepth::rectifiedRight);
+        known |= rebuildAs<NeuralNetwork>(node, &NeuralNetwork::input, &NeuralNetwork::out, &NeuralNetwork::passthrough);
+        rebuildAs<DetectionNetwork>(node, &DetectionNetwork::input, &DetectionNetwork::out, &DetectionNetwork::passthrough);
+        rebuildAs<SpatialDetectionNetwork>(node,
+                                           &SpatialDetectionNetwork::input,
+                                           &SpatialDetectionNetwork::inputDepth,
+                                           &SpatialDetectionNetwork::out,
+                                           &SpatialDetectionNetwork::boundingBoxMapping,
+                                           &SpatialDetectionNetwork::passthrough,
+                                           &SpatialDetectionNetwork::passthroughDepth);
+        known |= rebuildAs<ImageManip>(node, &ImageManip::inputConfig, &ImageManip::inputImage, &ImageManip::out);
+        known |= rebuildAs<VideoEncoder>(node, &VideoEncoder::input, &VideoEncoder::bitstream);
+        known |= rebuildAs<XLinkIn>(node, &XLinkIn::out);
+        known |= rebuildAs<XLinkOut>(node, &XLinkOut::input);
+        known |= rebuildAs<SPIOut>(node, &SPIOut::input);
+        known |= rebuildAs<SystemLogger>(node, &SystemLogger::out);
+        known |= rebuildAs<SpatialLocationCalculator>(
+            node, &SpatialLocationCalculator::inputConfig, &SpatialLocationCalculator::inputDepth, &SpatialLocationCalculator::out, &SpatialLocationCalculator::passthroughDepth);
+        known |= rebuildAs<ObjectTracker>(node,
+                                          &ObjectTracker::inputTrackerFrame,
+                                          &ObjectTracker::inputDetectionFrame,
+                                          &ObjectTracker::inputDetections,
+                                          &ObjectTracker::out,
+                                          &ObjectTracker::passthroughTrackerFrame,
+                                          &ObjectTracker::passthroughDetectionFrame,
+                                          &ObjectTracker::passthroughDetections);
+        known |= rebuildAs<IMU>(node, &IMU::out);
+        known |= rebuildAs<EdgeDetector>(node, &EdgeDetector::inputConfig, &EdgeDetector::inputImage, &EdgeDetector::outputImage);
+        known |= rebuildAs<MyProducer>(node, &MyProducer::out);
+        if(!known) throw std::runtime_error("Cloning node '" + node.getName() + "' isn't supported");
+    }
+};
+
+}  // namespace
+
+dai::Pipeline clonePipeline(const dai::Pipeline& pipeline, const std::string& streamNamePrefix) {
+    // Node copies share AssetManager entries, so assets are shared by reference.
+    // Setting an asset replaces the entry, so assets set on the clone (eg. setBlobPath) don't change the original
+    auto clone = pipeline.clone();
+    for(const auto& node : clone.getAllNodes()) NodeIoRebuilder::rebuildIos(*node);
+    if(!streamNamePrefix.empty()) addStreamNamePrefix(clone, streamNamePrefix);
+    return clone;
+}
+
+void addStreamNamePrefix(dai::Pipeline& pipeline, const std::string& prefix) {
+    for(const auto& node : pipeline.getAllNodes()) {
+        if(auto xout = std::dynamic_pointer_cast<dai::node::XLinkOut>(node)) {
+            xout->setStreamName(prefix + xout->getStreamName());
+        } else if(auto xin = std::dynamic_pointer_cast<dai::node::XLinkIn>(node)) {
+            xin->setStreamName(prefix + xin->getStreamName());
+        } else if(auto serialized = std::dynamic_pointer_cast<SerializedNode>(node)) {
+            if(serialized->getName() != "XLinkOut" && serialized->getName() != "XLinkIn") continue;
+            auto properties = serialized->getProperties();
+            properties["streamName"] = prefix + properties.value("streamName", std::string());
+            serialized->setProperties(properties);
+        }
+    }
+}
@@ -0,0 +1,22 @@
+#pragma once
+
+// std
+#include <string>
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+
+/**
+ * Clones the pipeline, duplicating nodes, their properties, connections and global properties.
+ * Inputs and outputs of cloned nodes belong to the clone, so it can be linked and modified independently of the original.
+ * Assets (eg. blobs) aren't copied, clones share them with the original pipeline until they are set on the clone.
+ * Throws if the pipeline contains a node type which can't be cloned
+ *
+ * @param pipeline Pipeline to clone
+ * @param streamNamePrefix Prefix added to XLinkIn and XLinkOut stream names of the clone
+ * @returns Cloned pipeline
+ */
+dai::Pipeline clonePipeline(const dai::Pipeline& pipeline, const std::string& streamNamePrefix = "");
+
+/// Adds prefix to all XLinkIn and XLinkOut stream names in the pipeline
+void addStreamNamePrefix(dai::Pipeline& pipeline, const std::string& prefix);
@@ -0,0 +1,52 @@
+#include "PipelineSchemaBuilder.hpp"
+
+namespace {
+
+// Node properties and IO types are protected, read them the same way PipelineImpl::getPipelineSchema does
+struct NodeSchemaBuilder : dai::Node {
+    static dai::NodeObjInfo build(dai::Node& node) {
+        dai::NodeObjInfo info;
+        info.id = node.id;
+        info.name = node.getName();
+        info.properties = (node.*(&NodeSchemaBuilder::getProperties))();
+
+        auto inputs = node.getInputs();
+        auto outputs = node.getOutputs();
+        info.ioInfo.reserve(inputs.size() + outputs.size());
+        for(const auto& input : inputs) {
+            dai::NodeIoInfo io;
+            io.blocking = input.getBlocking();
+            io.queueSize = input.getQueueSize();
+            io.name = input.name;
+            io.type = input.type == Input::Type::MReceiver ? dai::NodeIoInfo::Type::MReceiver : dai::NodeIoInfo::Type::SReceiver;
+            info.ioInfo[io.name] = io;
+        }
+        for(const auto& output : outputs) {
+            dai::NodeIoInfo io;
+            io.blocking = false;
+            io.name = output.name;
+            io.type = output.type == Output::Type::MSender ? dai::NodeIoInfo::Type::MSender : dai::NodeIoInfo::Type::SSender;
+            info.ioInfo[io.name] = io;
+        }
+        return info;
+    }
+};
+
+}  // namespace
+
+dai::PipelineSchema buildPipelineSchema(const dai::Pipeline& pipeline) {
+    // Pipeline is a handle, a copy refers to the same nodes
+    dai::Pipeline handle = pipeline;
+    dai::PipelineSchema schema;
+    schema.globalProperties = handle.getGlobalProperties();
+    for(const auto& node : handle.getAllNodes()) schema.nodes[node->id] = NodeSchemaBuilder::build(*node);
+    for(const auto& connection : handle.getConnections()) {
+        dai::NodeConnectionSchema c;
+        c.node1Id = connection.outputId;
+        c.node1Output = connection.outputName;
+        c.node2Id = connection.inputId;
+        c.node2Input = connection.inputName;
+        schema.connections.push_back(c);
+    }
+    return schema;
+}
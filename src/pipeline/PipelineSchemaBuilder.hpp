@@ -0,0 +1,11 @@
+#pragma once
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+
+/**
+ * Builds the schema of the pipeline (nodes, properties, connections, global properties), as sent to the device.
+ * Pipeline::getPipelineSchema is declared by the library but not defined, this builds the same schema from public node data
+ * @returns Pipeline schema
+ */
+dai::PipelineSchema buildPipelineSchema(const dai::Pipeline& pipeline);
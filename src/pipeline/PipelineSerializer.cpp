@@ -0,0 +1,379 @@
+#include "PipelineSerializer.hpp"
+
+// std
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iterator>
+#include <map>
+#include <stdexcept>
+#include <utility>
+
+#include <sys/stat.h>
+
+// shared
+#include "depthai-shared/pipeline/Assets.hpp"
+#include "depthai-shared/pipeline/PipelineSchema.hpp"
+
+// project
+#include "AssetDeduplication.hpp"
+#include "PipelineSchemaBuilder.hpp"
+#include "utility/Hash.hpp"
+
+namespace {
+
+constexpr char MAGIC[4] = {'D', 'A', 'I', 'P'};
+constexpr const char* CAMERA_TUNING_ASSET_KEY = "camTuning";
+
+// Serialized parts of a pipeline
+struct Parts {
+    std::uint32_t version = 0;
+    std::vector<std::uint8_t> schema;
+    std::vector<std::uint8_t> assets;
+    std::vector<std::uint8_t> storage;
+};
+
+class Writer {
+    std::vector<std::uint8_t>& buffer;
+
+   public:
+    explicit Writer(std::vector<std::uint8_t>& b) : buffer(b) {}
+    void write(const void* data, std::size_t size) {
+        const auto* p = static_cast<const std::uint8_t*>(data);
+        buffer.insert(buffer.end(), p, p + size);
+    }
+    void writeU32(std::uint32_t v) {
+        for(int i = 0; i < 4; i++) buffer.push_back(static_cast<std::uint8_t>(v >> (8 * i)));
+    }
+    void writeU64(std::uint64_t v) {
+        for(int i = 0; i < 8; i++) buffer.push_back(static_cast<std::uint8_t>(v >> (8 * i)));
+    }
+    void writeBytes(const std::vector<std::uint8_t>& bytes) {
+        writeU64(bytes.size());
+        write(bytes.data(), bytes.size());
+    }
+};
+
+class Reader {
+    const std::uint8_t* data;
+    std::size_t size;
+    std::size_t pos = 0;
+
+    void require(std::size_t n) const {
+        if(size - pos < n) throw std::runtime_error("Serialized pipeline is truncated");
+    }
+
+   public:
+    Reader(const std::uint8_t* d, std::size_t s) : data(d), size(s) {}
+    const std::uint8_t* read(std::size_t n) {
+        require(n);
+        const auto* p = data + pos;
+        pos += n;
+        return p;
+    }
+    std::uint32_t readU32() {
+        const auto* p = read(4);
+        std::uint32_t v = 0;
+        for(int i = 0; i < 4; i++) v |= static_cast<std::uint32_t>(p[i]) << (8 * i);
+        return v;
+    }
+    std::uint64_t readU64() {
+        const auto* p = read(8);
+        std::uint64_t v = 0;
+        for(int i = 0; i < 8; i++) v |= static_cast<std::uint64_t>(p[i]) << (8 * i);
+        return v;
+    }
+    std::vector<std::uint8_t> readBytes() {
+        auto n = readU64();
+        require(n);
+        const auto* p = read(static_cast<std::size_t>(n));
+        return std::vector<std::uint8_t>(p, p + n);
+    }
+    std::string readString() {
+        auto bytes = readBytes();
+        return std::string(bytes.begin(), bytes.end());
+    }
+};
+
+Parts toParts(const dai::Pipeline& pipeline) {
+    dai::PipelineSchema schema = buildPipelineSchema(pipeline);
+    dai::Assets assets;
+    Parts parts;
+    // Identical assets (eg. same blob used by multiple nodes) are stored once
+    serializeAssetsDeduplicated(pipeline.getAllAssets(), assets, parts.storage);
+    parts.version = static_cast<std::uint32_t>(pipeline.getOpenVINOVersion());
+
+    // Nodes and connections are stored in unordered containers, sort them so equal pipelines serialize equally
+    nlohmann::json jsonSchema = schema;
+    auto& nodes = jsonSchema["nodes"];
+    std::sort(nodes.begin(), nodes.end(), [](const nlohmann::json& a, const nlohmann::json& b) { return a.at(0) < b.at(0); });
+    auto& connections = jsonSchema["connections"];
+    std::sort(connections.begin(), connections.end());
+
+    parts.schema = nlohmann::json::to_msgpack(jsonSchema);
+    parts.assets = nlohmann::json::to_msgpack(nlohmann::json(assets));
+    return parts;
+}
+
+std::uint64_t hashParts(const Parts& parts) {
+    std::uint8_t version[4];
+    for(int i = 0; i < 4; i++) version[i] = static_cast<std::uint8_t>(parts.version >> (8 * i));
+    std::uint64_t hash = hash64(version, sizeof(version));
+    hash = hash64(parts.schema.data(), parts.schema.size(), hash);
+    hash = hash64(parts.assets.data(), parts.assets.size(), hash);
+    hash = hash64(parts.storage.data(), parts.storage.size(), hash);
+    return hash;
+}
+
+struct Header {
+    std::uint64_t hash = 0;
+    std::string key;
+};
+
+// Reads and validates header, leaves reader at start of parts
+Header readHeader(Reader& reader) {
+    if(std::memcmp(reader.read(sizeof(MAGIC)), MAGIC, sizeof(MAGIC)) != 0) {
+        throw std::runtime_error("Data is not a serialized pipeline");
+    }
+    auto formatVersion = reader.readU32();
+    if(formatVersion != PipelineSerializer::FORMAT_VERSION) {
+        throw std::runtime_error("Unsupported serialized pipeline format version: " + std::to_string(formatVersion));
+    }
+    Header header;
+    header.hash = reader.readU64();
+    header.key = reader.readString();
+    return header;
+}
+
+Parts readParts(Reader& reader, std::uint64_t expectedHash) {
+    Parts parts;
+    parts.version = reader.readU32();
+    parts.schema = reader.readBytes();
+    parts.assets = reader.readBytes();
+    parts.storage = reader.readBytes();
+    if(hashParts(parts) != expectedHash) {
+        throw std::runtime_error("Serialized pipeline is corrupted (content hash mismatch)");
+    }
+    return parts;
+}
+
+// Replaces "asset:<from>" strings anywhere in properties
+void replaceAssetUri(nlohmann::json& j, const std::string& from, const std::string& to) {
+    if(j.is_string()) {
+        if(j.get_ref<const std::string&>() == "asset:" + from) j = "asset:" + to;
+    } else if(j.is_structured()) {
+        for(auto& el : j) replaceAssetUri(el, from, to);
+    }
+}
+
+std::vector<std::uint8_t> readFile(const std::string& path) {
+    std::ifstream file(path, std::ios::binary);
+    if(!file.is_open()) return {};
+    return std::vector<std::uint8_t>(std::istreambuf_iterator<char>(file), {});
+}
+
+std::string getTemporaryDirectory() {
+    for(const char* var : {"TMPDIR", "TEMP", "TMP"}) {
+        const char* dir = std::getenv(var);
+        if(dir != nullptr && dir[0] != '\0') return dir;
+    }
+#if defined(_WIN32)
+    return ".";
+#else
+    return "/tmp";
+#endif
+}
+
+}  // namespace
+
+constexpr std::uint32_t PipelineSerializer::FORMAT_VERSION;
+
+std::vector<std::uint8_t> PipelineSerializer::serialize(const dai::Pipeline& pipeline, const std::string& key) {
+    auto parts = toParts(pipeline);
+
+    std::vector<std::uint8_t> data;
+    data.reserve(64 + key.size() + parts.schema.size() + parts.assets.size() + parts.storage.size());
+    Writer writer(data);
+    writer.write(MAGIC, sizeof(MAGIC));
+    writer.writeU32(FORMAT_VERSION);
+    writer.writeU64(hashParts(parts));
+    writer.writeBytes(std::vector<std::uint8_t>(key.begin(), key.end()));
+    writer.writeU32(parts.version);
+    writer.writeBytes(parts.schema);
+    writer.writeBytes(parts.assets);
+    writer.writeBytes(parts.storage);
+    return data;
+}
+
+dai::Pipeline PipelineSerializer::deserialize(const std::vector<std::uint8_t>& data) {
+    return deserialize(data.data(), data.size());
+}
+
+dai::Pipeline PipelineSerializer::deserialize(const std::uint8_t* data, std::size_t size) {
+    Reader reader(data, size);
+    auto header = readHeader(reader);
+    auto parts = readParts(reader, header.hash);
+
+    dai::PipelineSchema schema = nlohmann::json::from_msgpack(parts.schema);
+    dai::Assets assets = nlohmann::json::from_msgpack(parts.assets);
+    assets.setStorage(parts.storage.data());
+
+    dai::Pipeline pipeline;
+
+    // Create nodes in original order. Ids may differ from the original ones, if nodes were removed before serializing
+    std::map<std::int64_t, dai::NodeObjInfo> infos;
+    for(const auto& kv : schema.nodes) infos[kv.first] = kv.second;
+    std::map<std::int64_t, std::shared_ptr<SerializedNode>> nodes;
+    std::map<std::string, std::string> assetKeys;
+    for(auto& kv : infos) {
+        auto node = pipeline.create<SerializedNode>();
+        // Node assets are keyed by node id, rekey them so they don't clash with nodes added later on
+        if(node->id != kv.first) {
+            const std::string oldPrefix = std::to_string(kv.first) + "/";
+            const std::string newPrefix = std::to_string(node->id) + "/";
+            for(const auto& asset : assets.getAll()) {
+                if(asset.first.compare(0, oldPrefix.size(), oldPrefix) != 0) continue;
+                auto newKey = newPrefix + asset.first.substr(oldPrefix.size());
+                replaceAssetUri(kv.second.properties, asset.first, newKey);
+                assetKeys[asset.first] = newKey;
+            }
+        }
+        nodes[kv.first] = node;
+    }
+
+    // Identical assets are stored once by serialize, so their keys refer to the same region of storage.
+    // Group restored keys by region, in key order so the restored pipeline doesn't depend on map ordering
+    std::map<std::string, dai::AssetView> restoredAssets;
+    for(const auto& kv : assets.getAll()) {
+        auto it = assetKeys.find(kv.first);
+        restoredAssets.emplace(it == assetKeys.end() ? kv.first : it->second, kv.second);
+    }
+    std::map<std::pair<const std::uint8_t*, std::uint32_t>, std::vector<std::string>> regions;
+    for(const auto& kv : restoredAssets) regions[{kv.second.data, kv.second.size}].push_back(kv.first);
+
+    // Node assets are only referred to by properties of their node, point them to a single shared copy.
+    // Other keys (eg. camera tuning) may be looked up by key and keep their own copy
+    std::vector<std::string> nodePrefixes;
+    for(const auto& kv : nodes) nodePrefixes.push_back(std::to_string(kv.second->id) + "/");
+    auto isNodeAsset = [&nodePrefixes](const std::string& key) {
+        return std::any_of(nodePrefixes.begin(), nodePrefixes.end(), [&key](const std::string& prefix) { return key.compare(0, prefix.size(), prefix) == 0; });
+    };
+    for(const auto& region : regions) {
+        const auto& keys = region.second;
+        auto shared = std::find_if(keys.begin(), keys.end(), [&isNodeAsset](const std::string& key) { return !isNodeAsset(key); });
+        const std::string& sharedKey = shared == keys.end() ? keys.front() : *shared;
+        auto& sharedAsset = restoredAssets.at(sharedKey);
+        for(const auto& key : keys) {
+            if(key == sharedKey || !isNodeAsset(key)) continue;
+            // Shared copy satisfies the strictest alignment
+            sharedAsset.alignment = std::max(sharedAsset.alignment, restoredAssets.at(key).alignment);
+            for(auto& kv : infos) replaceAssetUri(kv.second.properties, key, sharedKey);
+            restoredAssets.erase(key);
+        }
+    }
+    for(auto& kv : infos) nodes[kv.first]->setNodeInfo(kv.second);
+
+    for(const auto& conn : schema.connections) {
+        auto out = nodes.find(conn.node1Id);
+        auto in = nodes.find(conn.node2Id);
+        if(out == nodes.end() || in == nodes.end()) throw std::runtime_error("Serialized pipeline connects nonexistent nodes");
+        out->second->getOutput(conn.node1Output).link(in->second->getInput(conn.node2Input));
+    }
+
+    // Restore assets into pipelines asset manager
+    auto& assetManager = pipeline.getAssetManager();
+    bool hasCameraTuning = false;
+    for(const auto& kv : restoredAssets) {
+        if(kv.first == CAMERA_TUNING_ASSET_KEY && schema.globalProperties.cameraTuningBlobSize) {
+            hasCameraTuning = true;
+        }
+        dai::Asset asset;
+        asset.data.assign(kv.second.data, kv.second.data + kv.second.size);
+        asset.alignment = kv.second.alignment;
+        assetManager.set(kv.first, std::move(asset));
+    }
+
+    // Restore global properties which can be set
+    if(schema.globalProperties.calibData) {
+        pipeline.setCalibrationData(dai::CalibrationHandler(*schema.globalProperties.calibData));
+    }
+    if(hasCameraTuning) {
+        // Camera tuning can only be set from a file
+        auto tuning = assetManager.get(CAMERA_TUNING_ASSET_KEY);
+        std::string tmpPath = getTemporaryDirectory() + "/depthai_camtuning_" + hashToHex(hash64(tuning->data.data(), tuning->data.size())) + ".bin";
+        {
+            std::ofstream file(tmpPath, std::ios::binary | std::ios::trunc);
+            file.write(reinterpret_cast<const char*>(tuning->data.data()), tuning->data.size());
+            if(!file) throw std::runtime_error("Couldn't write camera tuning blob to: " + tmpPath);
+        }
+        pipeline.setCameraTuningBlobPath(tmpPath);
+        std::remove(tmpPath.c_str());
+    }
+
+    pipeline.setOpenVINOVersion(static_cast<dai::OpenVINO::Version>(parts.version));
+    return pipeline;
+}
+
+std::string PipelineSerializer::getContentHash(const dai::Pipeline& pipeline) {
+    return hashToHex(hashParts(toParts(pipeline)));
+}
+
+std::string PipelineSerializer::getCacheKey(const std::string& key, const std::vector<std::string>& dependencies) {
+    std::string cacheKey = key;
+    for(const auto& path : dependencies) {
+        struct stat info;
+        if(stat(path.c_str(), &info) != 0) throw std::runtime_error("Pipeline dependency doesn't exist: " + path);
+        cacheKey += "\n" + path + ":" + std::to_string(static_cast<long long>(info.st_size)) + ":" + std::to_string(static_cast<long long>(info.st_mtime));
+    }
+    return cacheKey;
+}
+
+bool PipelineSerializer::isCacheValid(const std::string& path, const std::string& key, const std::vector<std::string>& dependencies) {
+    auto data = readFile(path);
+    if(data.empty()) return false;
+    try {
+        Reader reader(data.data(), data.size());
+        auto header = readHeader(reader);
+        if(header.key != getCacheKey(key, dependencies)) return false;
+        readParts(reader, header.hash);
+    } catch(const std::exception&) {
+        return false;
+    }
+    return true;
+}
+
+dai::Pipeline PipelineSerializer::loadCached(const std::string& path,
+                                             const std::function<dai::Pipeline()>& builder,
+                                             const std::string& key,
+                                             const std::vector<std::string>& dependencies) {
+    auto cacheKey = getCacheKey(key, dependencies);
+
+    auto data = readFile(path);
+    if(!data.empty()) {
+        try {
+            Reader reader(data.data(), data.size());
+            if(readHeader(reader).key == cacheKey) return deserialize(data);
+        } catch(const std::exception&) {
+            // Stale or corrupted cache, rebuild
+        }
+    }
+
+    if(!builder) throw std::runtime_error("Pipeline cache '" + path + "' is not valid and no builder was specified");
+    auto pipeline = builder();
+
+    // Write to temporary file and rename, so concurrent loaders never see a partially written cache
+    data = serialize(pipeline, cacheKey);
+    std::string tmpPath = path + ".tmp";
+    {
+        std::ofstream file(tmpPath, std::ios::binary | std::ios::trunc);
+        file.write(reinterpret_cast<const char*>(data.data()), data.size());
+        if(!file) throw std::runtime_error("Couldn't write pipeline cache to: " + tmpPath);
+    }
+#if defined(_WIN32)
+    std::remove(path.c_str());
+#endif
+    std::rename(tmpPath.c_str(), path.c_str());
+    return pipeline;
+}
@@ -0,0 +1,74 @@
+#pragma once
+
+// std
+#include <cstdint>
+#include <functional>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/Pipeline.hpp"
+
+// project
+#include "SerializedNode.hpp"
+
+/**
+ * @brief Serializes pipelines into a compact binary form and restores them.
+ *
+ * Serialized form holds the pipeline schema (nodes, properties, connections, global properties),
+ * required OpenVINO version and all assets. Restored pipelines consist of SerializedNode nodes,
+ * which are constructed on the device the same as the original ones.
+ */
+class PipelineSerializer {
+   public:
+    /// Version of the binary format
+    static constexpr std::uint32_t FORMAT_VERSION = 1;
+
+    /**
+     * Serializes the pipeline
+     * @param pipeline Pipeline to serialize
+     * @param key Optional key stored alongside, used by loadCached
+     * @returns Serialized pipeline
+     */
+    static std::vector<std::uint8_t> serialize(const dai::Pipeline& pipeline, const std::string& key = "");
+
+    /**
+     * Restores a serialized pipeline. Throws if data is malformed or corrupted.
+     * Node assets with identical content (eg. a blob used by multiple nodes) are restored as a single shared copy
+     * @param data Serialized pipeline
+     * @param size Size of serialized pipeline in bytes
+     * @returns New pipeline, required OpenVINO version is set explicitly
+     */
+    static dai::Pipeline deserialize(const std::uint8_t* data, std::size_t size);
+    /// @overload
+    static dai::Pipeline deserialize(const std::vector<std::uint8_t>& data);
+
+    /**
+     * Computes content hash of the pipeline, equal for pipelines which construct the same on the device
+     * @returns Hash formatted as hexadecimal string
+     */
+    static std::string getContentHash(const dai::Pipeline& pipeline);
+
+    /**
+     * Loads pipeline from cache file if it is valid for the given key, otherwise builds it and stores it to the cache file.
+     *
+     * Cache file is valid if it isn't corrupted and was stored with the same key and dependencies.
+     * Dependencies (eg. blob paths) are checked by their size and modification time only, so they aren't read.
+     *
+     * @param path Path of the cache file
+     * @param builder Function constructing the pipeline on cache miss. If empty, an error is thrown on a miss
+     * @param key User key, eg. version of the pipeline building code
+     * @param dependencies Paths of files the pipeline is built from
+     * @returns Loaded or built pipeline
+     */
+    static dai::Pipeline loadCached(const std::string& path,
+                                    const std::function<dai::Pipeline()>& builder,
+                                    const std::string& key = "",
+                                    const std::vector<std::string>& dependencies = {});
+
+    /// @returns True if cache file exists, isn't corrupted and matches key and dependencies
+    static bool isCacheValid(const std::string& path, const std::string& key = "", const std::vector<std::string>& dependencies = {});
+
+   private:
+    static std::string getCacheKey(const std::string& key, const std::vector<std::string>& dependencies);
+};
@@ -0,0 +1,92 @@
+#include "SerializedNode.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+SerializedNode::SerializedNode(const std::shared_ptr<dai::PipelineImpl>& par, int64_t nodeId) : Node(par, nodeId) {}
+
+SerializedNode::SerializedNode(const SerializedNode& other) : Node(other), name(other.name), properties(other.properties) {
+    // IOs reference their parent node, so they must be recreated instead of copied
+    inputs.reserve(other.inputs.size());
+    for(const auto& in : other.inputs) {
+        inputs.emplace_back(*this, in.name, in.type, in.getBlocking(), in.getQueueSize(), in.possibleDatatypes);
+    }
+    outputs.reserve(other.outputs.size());
+    for(const auto& out : other.outputs) {
+        outputs.emplace_back(*this, out.name, out.type, out.possibleDatatypes);
+    }
+}
+
+void SerializedNode::setNodeInfo(const dai::NodeObjInfo& info) {
+    name = info.name;
+    properties = info.properties;
+
+    // Order IOs by name, for deterministic schema
+    std::vector<dai::NodeIoInfo> ios;
+    ios.reserve(info.ioInfo.size());
+    for(const auto& kv : info.ioInfo) ios.push_back(kv.second);
+    std::sort(ios.begin(), ios.end(), [](const dai::NodeIoInfo& a, const dai::NodeIoInfo& b) { return a.name < b.name; });
+
+    // Actual datatypes aren't serialized, device validates the connections
+    const std::vector<DatatypeHierarchy> anyType{{dai::DatatypeEnum::Buffer, true}};
+
+    inputs.clear();
+    outputs.clear();
+    inputs.reserve(ios.size());
+    outputs.reserve(ios.size());
+    for(const auto& io : ios) {
+        switch(io.type) {
+            case dai::NodeIoInfo::Type::MSender:
+                outputs.emplace_back(*this, io.name, Output::Type::MSender, anyType);
+                break;
+            case dai::NodeIoInfo::Type::SSender:
+                outputs.emplace_back(*this, io.name, Output::Type::SSender, anyType);
+                break;
+            case dai::NodeIoInfo::Type::MReceiver:
+                inputs.emplace_back(*this, io.name, Input::Type::MReceiver, io.blocking, io.queueSize, anyType);
+                break;
+            case dai::NodeIoInfo::Type::SReceiver:
+                inputs.emplace_back(*this, io.name, Input::Type::SReceiver, io.blocking, io.queueSize, anyType);
+                break;
+        }
+    }
+}
+
+std::string SerializedNode::getName() const {
+    return name;
+}
+
+std::vector<dai::Node::Input> SerializedNode::getInputs() {
+    return inputs;
+}
+
+std::vector<dai::Node::Output> SerializedNode::getOutputs() {
+    return outputs;
+}
+
+nlohmann::json SerializedNode::getProperties() {
+    return properties;
+}
+
+void SerializedNode::setProperties(nlohmann::json props) {
+    properties = std::move(props);
+}
+
+dai::Node::Input& SerializedNode::getInput(const std::string& inputName) {
+    for(auto& in : inputs) {
+        if(in.name == inputName) return in;
+    }
+    throw std::invalid_argument("Node '" + name + "' has no input named '" + inputName + "'");
+}
+
+dai::Node::Output& SerializedNode::getOutput(const std::string& outputName) {
+    for(auto& out : outputs) {
+        if(out.name == outputName) return out;
+    }
+    throw std::invalid_argument("Node '" + name + "' has no output named '" + outputName + "'");
+}
+
+std::shared_ptr<dai::Node> SerializedNode::clone() {
+    return std::make_shared<SerializedNode>(*this);
+}
@@ -0,0 +1,52 @@
+#pragma once
+
+// std
+#include <memory>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/Node.hpp"
+
+// shared
+#include "depthai-shared/pipeline/NodeObjInfo.hpp"
+
+/**
+ * @brief Node restored from a serialized pipeline.
+ *
+ * Carries name, properties and IOs of the original node as they were serialized,
+ * so device constructs the original node type. Properties can be inspected and modified as JSON.
+ */
+class SerializedNode : public dai::Node {
+   public:
+    SerializedNode(const std::shared_ptr<dai::PipelineImpl>& par, int64_t nodeId);
+    SerializedNode(const SerializedNode& other);
+
+    /**
+     * Sets name, properties and IOs from serialized node information.
+     * Any previously retrieved inputs and outputs are invalidated
+     */
+    void setNodeInfo(const dai::NodeObjInfo& info);
+
+    std::string getName() const override;
+    std::vector<Input> getInputs() override;
+    std::vector<Output> getOutputs() override;
+    nlohmann::json getProperties() override;
+
+    /// Sets properties, passed as is to the device
+    void setProperties(nlohmann::json props);
+
+    /// @returns Input with given name or throws if it doesn't exist
+    Input& getInput(const std::string& name);
+    /// @returns Output with given name or throws if it doesn't exist
+    Output& getOutput(const std::string& name);
+
+   protected:
+    std::shared_ptr<dai::Node> clone() override;
+
+   private:
+    std::string name;
+    nlohmann::json properties;
+    std::vector<Input> inputs;
+    std::vector<Output> outputs;
+};
@@ -22,9 +22,12 @@
 #include "XLinkConnectionBindings.hpp"
 #include "DeviceBindings.hpp"
 #include "CalibrationHandlerBindings.hpp"
+#include "calibration/CalibrationBindings.hpp"
 #include "DeviceBootloaderBindings.hpp"
 #include "DatatypeBindings.hpp"
 #include "DataQueueBindings.hpp"
+#include "host/HostNodeBindings.hpp"
+#include "record/RecordBindings.hpp"
 #include "openvino/OpenVINOBindings.hpp"
 #include "log/LogBindings.hpp"
 
@@ -47,11 +50,14 @@ PYBIND11_MODULE(depthai,m)
     XLinkConnectionBindings::bind(m);
     DeviceBindings::bind(m);
     CommonBindings::bind(m);
+    CalibrationBindings::bind(m);
     CalibrationHandlerBindings::bind(m);
     DeviceBootloaderBindings::bind(m);
     
     DatatypeBindings::bind(m);
     DataQueueBindings::bind(m);
+    HostNodeBindings::bind(m);
+    RecordBindings::bind(m);
     LogBindings::bind(m);
 
     // Call dai::initialize on 'import depthai' to initialize asap with additional information to print
@@ -0,0 +1,337 @@
+#include "Bitstream.hpp"
+
+// std
+#include <stdexcept>
+
+namespace bitstream {
+
+Codec toCodec(dai::VideoEncoderProperties::Profile profile) {
+    using Profile = dai::VideoEncoderProperties::Profile;
+    switch(profile) {
+        case Profile::H264_BASELINE:
+        case Profile::H264_HIGH:
+        case Profile::H264_MAIN:
+            return Codec::H264;
+        case Profile::H265_MAIN:
+            return Codec::H265;
+        case Profile::MJPEG:
+            return Codec::MJPEG;
+    }
+    throw std::invalid_argument("Unknown encoding profile");
+}
+
+namespace {
+
+// Reads bits of a NAL unit payload, with emulation prevention bytes removed
+class BitReader {
+   public:
+    BitReader(const std::uint8_t* data, std::size_t size) {
+        rbsp.reserve(size);
+        for(std::size_t i = 0; i < size; i++) {
+            if(i >= 2 && data[i] == 3 && data[i - 1] == 0 && data[i - 2] == 0) continue;
+            rbsp.push_back(data[i]);
+        }
+    }
+
+    std::uint32_t bits(unsigned int count) {
+        std::uint32_t value = 0;
+        for(unsigned int i = 0; i < count; i++) {
+            if(position >= rbsp.size() * 8) throw std::runtime_error("Parameter set is truncated");
+            value = (value << 1) | ((rbsp[position / 8] >> (7 - position % 8)) & 1);
+            position++;
+        }
+        return value;
+    }
+
+    void skip(std::size_t count) {
+        position += count;
+        if(position > rbsp.size() * 8) throw std::runtime_error("Parameter set is truncated");
+    }
+
+    // Exp-Golomb unsigned
+    std::uint32_t ue() {
+        unsigned int zeros = 0;
+        while(bits(1) == 0) {
+            if(++zeros > 31) throw std::runtime_error("Malformed Exp-Golomb code in parameter set");
+        }
+        return ((1u << zeros) - 1) + bits(zeros);
+    }
+
+    // Exp-Golomb signed
+    std::int32_t se() {
+        std::uint32_t value = ue();
+        return (value & 1) ? static_cast<std::int32_t>((value + 1) / 2) : -static_cast<std::int32_t>(value / 2);
+    }
+
+    const std::vector<std::uint8_t>& getRbsp() const {
+        return rbsp;
+    }
+
+   private:
+    std::vector<std::uint8_t> rbsp;
+    std::size_t position = 0;
+};
+
+VideoSize parseH264Sps(const NalUnit& sps) {
+    BitReader reader(sps.data + 1, sps.size - 1);
+    unsigned int profile = reader.bits(8);
+    reader.skip(16);  // constraint flags, level
+    reader.ue();      // seq_parameter_set_id
+
+    unsigned int chromaFormat = 1;
+    static const unsigned int highProfiles[] = {100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139, 134, 135};
+    for(auto p : highProfiles) {
+        if(profile != p) continue;
+        chromaFormat = reader.ue();
+        if(chromaFormat == 3) reader.skip(1);  // separate_colour_plane_flag
+        reader.ue();                           // bit_depth_luma_minus8
+        reader.ue();                           // bit_depth_chroma_minus8
+        reader.skip(1);                        // qpprime_y_zero_transform_bypass_flag
+        if(reader.bits(1)) {
+            // Scaling lists
+            for(unsigned int i = 0; i < (chromaFormat != 3 ? 8u : 12u); i++) {
+                if(!reader.bits(1)) continue;
+                int last = 8, next = 8;
+                for(int j = 0; j < (i < 6 ? 16 : 64) && next != 0; j++) {
+                    next = (last + reader.se() + 256) % 256;
+                    if(next != 0) last = next;
+                }
+            }
+        }
+        break;
+    }
+
+    reader.ue();  // log2_max_frame_num_minus4
+    unsigned int pocType = reader.ue();
+    if(pocType == 0) {
+        reader.ue();  // log2_max_pic_order_cnt_lsb_minus4
+    } else if(pocType == 1) {
+        reader.skip(1);  // delta_pic_order_always_zero_flag
+        reader.se();     // offset_for_non_ref_pic
+        reader.se();     // offset_for_top_to_bottom_field
+        unsigned int cycle = reader.ue();
+        for(unsigned int i = 0; i < cycle; i++) reader.se();
+    }
+    reader.ue();     // max_num_ref_frames
+    reader.skip(1);  // gaps_in_frame_num_value_allowed_flag
+    unsigned int widthInMbs = reader.ue() + 1;
+    unsigned int heightInMapUnits = reader.ue() + 1;
+    unsigned int frameMbsOnly = reader.bits(1);
+    if(!frameMbsOnly) reader.skip(1);  // mb_adaptive_frame_field_flag
+    reader.skip(1);                    // direct_8x8_inference_flag
+
+    VideoSize size;
+    size.width = widthInMbs * 16;
+    size.height = (2 - frameMbsOnly) * heightInMapUnits * 16;
+    if(reader.bits(1)) {
+        // Cropping, in chroma sample units
+        unsigned int cropX = chromaFormat == 1 || chromaFormat == 2 ? 2 : 1;
+        unsigned int cropY = (chromaFormat == 1 ? 2 : 1) * (2 - frameMbsOnly);
+        unsigned int left = reader.ue(), right = reader.ue(), top = reader.ue(), bottom = reader.ue();
+        size.width -= cropX * (left + right);
+        size.height -= cropY * (top + bottom);
+    }
+    return size;
+}
+
+// Skips profile_tier_level, after the general profile/level part
+void skipSubLayers(BitReader& reader, unsigned int maxSubLayersMinus1) {
+    std::vector<bool> profilePresent(maxSubLayersMinus1), levelPresent(maxSubLayersMinus1);
+    for(unsigned int i = 0; i < maxSubLayersMinus1; i++) {
+        profilePresent[i] = reader.bits(1) != 0;
+        levelPresent[i] = reader.bits(1) != 0;
+    }
+    if(maxSubLayersMinus1 > 0) reader.skip(2 * (8 - maxSubLayersMinus1));
+    for(unsigned int i = 0; i < maxSubLayersMinus1; i++) {
+        if(profilePresent[i]) reader.skip(88);
+        if(levelPresent[i]) reader.skip(8);
+    }
+}
+
+struct H265SpsInfo {
+    VideoSize size;
+    unsigned int maxSubLayersMinus1 = 0;
+    unsigned int temporalIdNesting = 0;
+    unsigned int chromaFormat = 1;
+    unsigned int bitDepthLumaMinus8 = 0;
+    unsigned int bitDepthChromaMinus8 = 0;
+    // general_profile_space .. general_level_idc, 12 bytes
+    std::vector<std::uint8_t> profileTierLevel;
+};
+
+H265SpsInfo parseH265SpsInfo(const NalUnit& sps) {
+    if(sps.size < 3) throw std::runtime_error("Parameter set is truncated");
+    BitReader reader(sps.data + 2, sps.size - 2);
+    H265SpsInfo info;
+    reader.skip(4);  // sps_video_parameter_set_id
+    info.maxSubLayersMinus1 = reader.bits(3);
+    info.temporalIdNesting = reader.bits(1);
+    if(reader.getRbsp().size() < 13) throw std::runtime_error("Parameter set is truncated");
+    info.profileTierLevel.assign(reader.getRbsp().begin() + 1, reader.getRbsp().begin() + 13);
+    reader.skip(96);
+    skipSubLayers(reader, info.maxSubLayersMinus1);
+
+    reader.ue();  // sps_seq_parameter_set_id
+    info.chromaFormat = reader.ue();
+    if(info.chromaFormat == 3) reader.skip(1);  // separate_colour_plane_flag
+    info.size.width = reader.ue();
+    info.size.height = reader.ue();
+    if(reader.bits(1)) {
+        // Conformance window, in chroma sample units
+        unsigned int cropX = info.chromaFormat == 1 || info.chromaFormat == 2 ? 2 : 1;
+        unsigned int cropY = info.chromaFormat == 1 ? 2 : 1;
+        unsigned int left = reader.ue(), right = reader.ue(), top = reader.ue(), bottom = reader.ue();
+        info.size.width -= cropX * (left + right);
+        info.size.height -= cropY * (top + bottom);
+    }
+    info.bitDepthLumaMinus8 = reader.ue();
+    info.bitDepthChromaMinus8 = reader.ue();
+    return info;
+}
+
+void appendU16(std::vector<std::uint8_t>& out, unsigned int value) {
+    out.push_back(static_cast<std::uint8_t>(value >> 8));
+    out.push_back(static_cast<std::uint8_t>(value));
+}
+
+}  // namespace
+
+std::vector<NalUnit> splitNalUnits(Codec codec, const std::uint8_t* data, std::size_t size) {
+    std::vector<NalUnit> units;
+    if(codec == Codec::MJPEG) return units;
+
+    // Finds next 00 00 01 start code, returns position after it
+    auto findStart = [data, size](std::size_t from) -> std::size_t {
+        for(std::size_t i = from; i + 3 <= size; i++) {
+            if(data[i] == 0 && data[i + 1] == 0 && data[i + 2] == 1) return i + 3;
+        }
+        return size;
+    };
+
+    std::size_t start = findStart(0);
+    while(start < size) {
+        std::size_t next = findStart(start);
+        // Trailing zeros belong to the next start code (4 byte form) or are padding
+        std::size_t end = next < size ? next - 3 : size;
+        while(end > start && data[end - 1] == 0) end--;
+        if(end > start) {
+            NalUnit nal;
+            nal.data = data + start;
+            nal.size = end - start;
+            nal.type = codec == Codec::H264 ? (data[start] & 0x1F) : ((data[start] >> 1) & 0x3F);
+            units.push_back(nal);
+        }
+        start = next;
+    }
+    return units;
+}
+
+bool isParameterSet(Codec codec, unsigned int type) {
+    if(codec == Codec::H264) return type == H264_SPS || type == H264_PPS;
+    if(codec == Codec::H265) return type == H265_VPS || type == H265_SPS || type == H265_PPS;
+    return false;
+}
+
+bool isKeyframe(Codec codec, unsigned int type) {
+    if(codec == Codec::H264) return type == 5;
+    if(codec == Codec::H265) return type >= 16 && type <= 23;
+    return true;
+}
+
+bool isKeyframe(Codec codec, const std::uint8_t* data, std::size_t size) {
+    if(codec == Codec::MJPEG) return true;
+    for(const auto& nal : splitNalUnits(codec, data, size)) {
+        if(isKeyframe(codec, nal.type)) return true;
+    }
+    return false;
+}
+
+bool isDiscardable(Codec codec, unsigned int type) {
+    if(codec == Codec::H264) return type == 9 || type == 12;
+    if(codec == Codec::H265) return type == 35 || type == 38;
+    return false;
+}
+
+VideoSize parseSps(Codec codec, const NalUnit& sps) {
+    if(sps.size < 2) throw std::runtime_error("Parameter set is truncated");
+    if(codec == Codec::H264) return parseH264Sps(sps);
+    if(codec == Codec::H265) return parseH265SpsInfo(sps).size;
+    throw std::invalid_argument("Codec has no parameter sets");
+}
+
+VideoSize parseJpeg(const std::uint8_t* data, std::size_t size) {
+    if(size < 4 || data[0] != 0xFF || data[1] != 0xD8) throw std::runtime_error("Frame isn't a JPEG image");
+    std::size_t i = 2;
+    while(i + 4 <= size) {
+        if(data[i] != 0xFF) throw std::runtime_error("Malformed JPEG marker");
+        std::uint8_t marker = data[i + 1];
+        if(marker == 0xFF) {
+            // Fill byte
+            i++;
+            continue;
+        }
+        std::size_t length = (static_cast<std::size_t>(data[i + 2]) << 8) | data[i + 3];
+        // Start of frame markers, except DHT, JPG and DAC
+        if(marker >= 0xC0 && marker <= 0xCF && marker != 0xC4 && marker != 0xC8 && marker != 0xCC) {
+            if(i + 9 > size) break;
+            VideoSize result;
+            result.height = (static_cast<unsigned int>(data[i + 5]) << 8) | data[i + 6];
+            result.width = (static_cast<unsigned int>(data[i + 7]) << 8) | data[i + 8];
+            return result;
+        }
+        if(marker == 0xDA) break;
+        i += 2 + length;
+    }
+    throw std::runtime_error("JPEG image has no frame header");
+}
+
+std::vector<std::uint8_t> makeAvcConfig(const NalUnit& sps, const NalUnit& pps) {
+    if(sps.size < 4) throw std::runtime_error("Parameter set is truncated");
+    std::vector<std::uint8_t> config;
+    config.push_back(1);            // configurationVersion
+    config.push_back(sps.data[1]);  // AVCProfileIndication
+    config.push_back(sps.data[2]);  // profile_compatibility
+    config.push_back(sps.data[3]);  // AVCLevelIndication
+    config.push_back(0xFF);         // lengthSizeMinusOne = 3
+    config.push_back(0xE1);         // numOfSequenceParameterSets = 1
+    appendU16(config, static_cast<unsigned int>(sps.size));
+    config.insert(config.end(), sps.data, sps.data + sps.size);
+    config.push_back(1);  // numOfPictureParameterSets
+    appendU16(config, static_cast<unsigned int>(pps.size));
+    config.insert(config.end(), pps.data, pps.data + pps.size);
+    return config;
+}
+
+std::vector<std::uint8_t> makeHevcConfig(const NalUnit& vps, const NalUnit& sps, const NalUnit& pps) {
+    auto info = parseH265SpsInfo(sps);
+    std::vector<std::uint8_t> config;
+    config.push_back(1);  // configurationVersion
+    config.insert(config.end(), info.profileTierLevel.begin(), info.profileTierLevel.end());
+    appendU16(config, 0xF000);  // min_spatial_segmentation_idc
+    config.push_back(0xFC);     // parallelismType
+    config.push_back(static_cast<std::uint8_t>(0xFC | info.chromaFormat));
+    config.push_back(static_cast<std::uint8_t>(0xF8 | info.bitDepthLumaMinus8));
+    config.push_back(static_cast<std::uint8_t>(0xF8 | info.bitDepthChromaMinus8));
+    appendU16(config, 0);  // avgFrameRate
+    // constantFrameRate 0, numTemporalLayers, temporalIdNested, lengthSizeMinusOne 3
+    config.push_back(static_cast<std::uint8_t>(((info.maxSubLayersMinus1 + 1) << 3) | (info.temporalIdNesting << 2) | 3));
+    config.push_back(3);  // numOfArrays
+    for(const auto* nal : {&vps, &sps, &pps}) {
+        config.push_back(static_cast<std::uint8_t>(0x80 | nal->type));  // array_completeness
+        appendU16(config, 1);
+        appendU16(config, static_cast<unsigned int>(nal->size));
+        config.insert(config.end(), nal->data, nal->data + nal->size);
+    }
+    return config;
+}
+
+void appendLengthPrefixed(std::vector<std::uint8_t>& out, const NalUnit& nal) {
+    auto size = static_cast<std::uint32_t>(nal.size);
+    out.push_back(static_cast<std::uint8_t>(size >> 24));
+    out.push_back(static_cast<std::uint8_t>(size >> 16));
+    out.push_back(static_cast<std::uint8_t>(size >> 8));
+    out.push_back(static_cast<std::uint8_t>(size));
+    out.insert(out.end(), nal.data, nal.data + nal.size);
+}
+
+}  // namespace bitstream
@@ -0,0 +1,67 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// shared
+#include "depthai-shared/properties/VideoEncoderProperties.hpp"
+
+/**
+ * Parsing of encoded video (VideoEncoder bitstream output), as needed to mux it into containers.
+ * H.264 and H.265 are Annex B byte streams, MJPEG frames are complete JPEG images.
+ */
+namespace bitstream {
+
+enum class Codec { H264, H265, MJPEG };
+
+/// Codec produced by a VideoEncoder profile
+Codec toCodec(dai::VideoEncoderProperties::Profile profile);
+
+/// NAL unit of an Annex B stream, without start code
+struct NalUnit {
+    const std::uint8_t* data = nullptr;
+    std::size_t size = 0;
+    unsigned int type = 0;
+};
+
+/// Dimensions of coded pictures
+struct VideoSize {
+    unsigned int width = 0;
+    unsigned int height = 0;
+};
+
+/// Splits an Annex B byte stream into NAL units
+std::vector<NalUnit> splitNalUnits(Codec codec, const std::uint8_t* data, std::size_t size);
+
+/// NAL unit types needed for muxing
+bool isParameterSet(Codec codec, unsigned int type);
+/// @returns True for IDR (H.264) and IRAP (H.265) pictures, which decoding can start at
+bool isKeyframe(Codec codec, unsigned int type);
+/// @returns True if an encoded frame is a keyframe, MJPEG frames always are
+bool isKeyframe(Codec codec, const std::uint8_t* data, std::size_t size);
+/// @returns True for access unit delimiters and filler data, which containers don't carry
+bool isDiscardable(Codec codec, unsigned int type);
+
+/// H.264 SPS, H.265 VPS / SPS / PPS types
+constexpr unsigned int H264_SPS = 7;
+constexpr unsigned int H264_PPS = 8;
+constexpr unsigned int H265_VPS = 32;
+constexpr unsigned int H265_SPS = 33;
+constexpr unsigned int H265_PPS = 34;
+
+/// Parses picture size from a sequence parameter set, throws if it's malformed
+VideoSize parseSps(Codec codec, const NalUnit& sps);
+/// Parses picture size from the frame header of a JPEG image, throws if none is found
+VideoSize parseJpeg(const std::uint8_t* data, std::size_t size);
+
+/// Builds AVCDecoderConfigurationRecord (avcC), with 4 byte NAL unit lengths
+std::vector<std::uint8_t> makeAvcConfig(const NalUnit& sps, const NalUnit& pps);
+/// Builds HEVCDecoderConfigurationRecord (hvcC), with 4 byte NAL unit lengths
+std::vector<std::uint8_t> makeHevcConfig(const NalUnit& vps, const NalUnit& sps, const NalUnit& pps);
+
+/// Appends a NAL unit prefixed with its 4 byte big endian length, as stored in containers
+void appendLengthPrefixed(std::vector<std::uint8_t>& out, const NalUnit& nal);
+
+}  // namespace bitstream
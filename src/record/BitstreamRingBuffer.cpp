@@ -0,0 +1,215 @@
+#include "BitstreamRingBuffer.hpp"
+
+// std
+#include <stdexcept>
+
+BitstreamRingBuffer::BitstreamRingBuffer(dai::VideoEncoderProperties::Profile profile) : profile(profile), codec(bitstream::toCodec(profile)) {
+    closer = std::thread(&BitstreamRingBuffer::runCloser, this);
+}
+
+BitstreamRingBuffer::~BitstreamRingBuffer() {
+    try {
+        close();
+    } catch(const std::exception&) {
+    }
+}
+
+void BitstreamRingBuffer::addQueue(const QueueSource& queue) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(closed) throw std::logic_error("Ring buffer is closed");
+    }
+    auto unsubscribe = queue.subscribe([this](std::shared_ptr<dai::ADatatype> msg) { add(std::dynamic_pointer_cast<dai::ImgFrame>(msg)); });
+    std::lock_guard<std::mutex> lock(mtx);
+    unsubscribers.push_back(std::move(unsubscribe));
+}
+
+bool BitstreamRingBuffer::add(const std::shared_ptr<dai::ImgFrame>& frame) {
+    if(frame == nullptr) return false;
+    const auto& data = frame->getData();
+    // Parsed before locking, buffer operations themselves are cheap
+    bool keyframe = bitstream::isKeyframe(codec, data.data(), data.size());
+    Frame entry{frame, frame->getTimestamp(), data.size()};
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(closed) return false;
+
+    if(keyframe) gops.emplace_back();
+    if(gops.empty()) {
+        // Decoding can't start before the first keyframe
+        stats.numEvicted++;
+    } else {
+        gops.back().push_back(entry);
+        numBytes += entry.size;
+        numFrames++;
+        evict();
+    }
+
+    for(auto it = clips.begin(); it != clips.end();) {
+        if(!it->hasEnd) {
+            it->end = entry.timestamp + it->post;
+            it->hasEnd = true;
+        }
+        if(entry.timestamp <= it->end) it->muxer->add(frame);
+        if(entry.timestamp >= it->end) {
+            finishClip(std::move(it->muxer));
+            it = clips.erase(it);
+        } else {
+            ++it;
+        }
+    }
+    return true;
+}
+
+void BitstreamRingBuffer::setWindow(std::chrono::milliseconds window) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->window = window;
+    evict();
+}
+
+std::chrono::milliseconds BitstreamRingBuffer::getWindow() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return window;
+}
+
+void BitstreamRingBuffer::setMaxBytes(std::size_t maxBytes) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->maxBytes = maxBytes;
+    evict();
+}
+
+std::size_t BitstreamRingBuffer::getMaxBytes() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return maxBytes;
+}
+
+void BitstreamRingBuffer::trigger(const std::string& path, std::chrono::milliseconds post, VideoMuxer::Format format) {
+    if(post.count() < 0) throw std::invalid_argument("Duration after trigger can't be negative");
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(closed) throw std::logic_error("Ring buffer is closed");
+    }
+
+    // Creating the file may take a while, it is done before the buffer is locked
+    std::unique_ptr<VideoMuxer> muxer(new VideoMuxer(path, profile, format));
+    muxer->start();
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(closed) {
+        finishClip(std::move(muxer));
+        throw std::logic_error("Ring buffer is closed");
+    }
+    // Whole buffer is queued at once, so it must fit into the clip writer's queue
+    muxer->setMaxPending(static_cast<unsigned int>(numFrames) + VideoMuxer::DEFAULT_MAX_PENDING);
+    for(const auto& gop : gops) {
+        for(const auto& entry : gop) muxer->add(entry.frame);
+    }
+    stats.numClips++;
+
+    Clip clip{std::move(muxer), {}, post, false};
+    if(!gops.empty()) {
+        clip.end = gops.back().back().timestamp + post;
+        clip.hasEnd = true;
+    }
+    if(clip.hasEnd && post.count() == 0) {
+        finishClip(std::move(clip.muxer));
+    } else {
+        clips.push_back(std::move(clip));
+    }
+}
+
+bool BitstreamRingBuffer::wait(std::chrono::milliseconds timeout) {
+    std::unique_lock<std::mutex> lock(mtx);
+    return signalFinished.wait_for(lock, timeout, [this]() { return clips.empty() && numClosing == 0; });
+}
+
+void BitstreamRingBuffer::clear() {
+    std::lock_guard<std::mutex> lock(mtx);
+    gops.clear();
+    numBytes = 0;
+    numFrames = 0;
+}
+
+void BitstreamRingBuffer::close() {
+    std::vector<std::function<void()>> toUnsubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toUnsubscribe = std::move(unsubscribers);
+        unsubscribers.clear();
+    }
+    for(auto& unsubscribe : toUnsubscribe) unsubscribe();
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        closed = true;
+        for(auto& clip : clips) finishClip(std::move(clip.muxer));
+        clips.clear();
+        gops.clear();
+        numBytes = 0;
+        numFrames = 0;
+        signalClosing.notify_all();
+    }
+    if(closer.joinable()) closer.join();
+}
+
+BitstreamRingBufferStats BitstreamRingBuffer::getStats() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    BitstreamRingBufferStats result = stats;
+    result.numFrames = numFrames;
+    result.numGops = gops.size();
+    result.numBytes = numBytes;
+    if(!gops.empty()) {
+        auto span = gops.back().back().timestamp - gops.front().front().timestamp;
+        result.duration = std::chrono::duration<double>(span).count();
+    }
+    result.numActiveClips = clips.size() + numClosing;
+    return result;
+}
+
+void BitstreamRingBuffer::evict() {
+    if(gops.empty()) return;
+    auto newest = gops.back().back().timestamp;
+    // Oldest GOP is only dropped if the rest still covers the window
+    while(gops.size() > 1) {
+        bool covered = newest - gops[1].front().timestamp >= window;
+        bool tooLarge = maxBytes > 0 && numBytes > maxBytes;
+        if(!covered && !tooLarge) break;
+        for(const auto& entry : gops.front()) numBytes -= entry.size;
+        numFrames -= gops.front().size();
+        stats.numEvicted += gops.front().size();
+        gops.pop_front();
+    }
+}
+
+void BitstreamRingBuffer::finishClip(std::unique_ptr<VideoMuxer> muxer) {
+    closing.push_back(std::move(muxer));
+    numClosing++;
+    signalClosing.notify_one();
+}
+
+void BitstreamRingBuffer::runCloser() {
+    std::unique_lock<std::mutex> lock(mtx);
+    while(true) {
+        signalClosing.wait(lock, [this]() { return !closing.empty() || closed; });
+        if(closing.empty()) break;
+
+        auto muxer = std::move(closing.front());
+        closing.pop_front();
+        lock.unlock();
+        std::string error;
+        try {
+            muxer->close();
+        } catch(const std::exception& ex) {
+            error = ex.what();
+        }
+        muxer.reset();
+        lock.lock();
+
+        if(!error.empty()) {
+            stats.numFailedClips++;
+            stats.lastError = error;
+        }
+        numClosing--;
+        signalFinished.notify_all();
+    }
+}
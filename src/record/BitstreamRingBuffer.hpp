@@ -0,0 +1,147 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+// shared
+#include "depthai-shared/properties/VideoEncoderProperties.hpp"
+
+// project
+#include "Bitstream.hpp"
+#include "QueueSource.hpp"
+#include "VideoMuxer.hpp"
+
+/// Counters of a bitstream ring buffer
+struct BitstreamRingBufferStats {
+    /// Number of buffered frames
+    std::size_t numFrames = 0;
+    /// Number of buffered GOPs (keyframe and the frames following it)
+    std::size_t numGops = 0;
+    /// Size of buffered frames, in bytes
+    std::size_t numBytes = 0;
+    /// Time span of buffered frames, in seconds
+    double duration = 0.0;
+    /// Number of frames evicted from the buffer, or skipped before the first keyframe
+    std::uint64_t numEvicted = 0;
+    /// Number of clips triggered
+    std::uint64_t numClips = 0;
+    /// Number of clips still being written
+    std::size_t numActiveClips = 0;
+    /// Number of clips which couldn't be written
+    std::uint64_t numFailedClips = 0;
+    /// Error of the last failed clip
+    std::string lastError;
+};
+
+/**
+ * @brief Keeps the last seconds of an encoded stream, to save clips starting before an event.
+ *
+ * Frames of a VideoEncoder bitstream are buffered as they arrive, grouped into GOPs starting at
+ * keyframes. Whole GOPs are evicted, so the buffer always starts at a keyframe and covers at least
+ * the window. On trigger the buffer is written into a clip, together with frames following the
+ * trigger, without re-encoding. Buffering and writing happen on native threads, without the GIL.
+ */
+class BitstreamRingBuffer {
+   public:
+    /**
+     * Creates an empty buffer
+     * @param profile Encoding profile of the VideoEncoder producing the frames
+     */
+    explicit BitstreamRingBuffer(dai::VideoEncoderProperties::Profile profile);
+    /// Finishes active clips
+    ~BitstreamRingBuffer();
+
+    BitstreamRingBuffer(const BitstreamRingBuffer&) = delete;
+    BitstreamRingBuffer& operator=(const BitstreamRingBuffer&) = delete;
+
+    /// Buffers all frames of a device output queue or a host queue (eg. ReconnectingDevice output queue). Device output queues are made non-blocking
+    void addQueue(const QueueSource& queue);
+    /**
+     * Buffers an encoded frame, and passes it to active clips. Can be called from any thread
+     * @returns False if buffer is closed
+     */
+    bool add(const std::shared_ptr<dai::ImgFrame>& frame);
+
+    /// Sets minimum time span kept before a trigger, default 10 seconds
+    void setWindow(std::chrono::milliseconds window);
+    std::chrono::milliseconds getWindow() const;
+    /// Sets maximum size of buffered frames, 0 for no limit (default). The newest GOP is always kept
+    void setMaxBytes(std::size_t maxBytes);
+    std::size_t getMaxBytes() const;
+
+    /**
+     * Writes buffered frames into a clip, followed by frames arriving until 'post' after the newest
+     * buffered frame (by device timestamps). Clips are written on writer threads, overlapping triggers
+     * write separate clips. Throws if the file can't be created
+     * @param path Path of the clip
+     * @param post Duration recorded after the trigger
+     * @param format Container format
+     */
+    void trigger(const std::string& path, std::chrono::milliseconds post, VideoMuxer::Format format = VideoMuxer::Format::AUTO);
+    /**
+     * Waits until all triggered clips are written
+     * @returns False on timeout
+     */
+    bool wait(std::chrono::milliseconds timeout);
+    /// Drops buffered frames, active clips continue
+    void clear();
+
+    /// Stops buffering and finishes active clips, cut short at the last received frame
+    void close();
+
+    /// @returns Counters
+    BitstreamRingBufferStats getStats() const;
+
+   private:
+    struct Frame {
+        std::shared_ptr<dai::ImgFrame> frame;
+        std::chrono::steady_clock::time_point timestamp;
+        std::size_t size;
+    };
+    struct Clip {
+        std::unique_ptr<VideoMuxer> muxer;
+        // Frames up to and including this timestamp are part of the clip, unset until first frame
+        std::chrono::steady_clock::time_point end;
+        std::chrono::milliseconds post;
+        bool hasEnd;
+    };
+
+    void evict();
+    void finishClip(std::unique_ptr<VideoMuxer> muxer);
+    void runCloser();
+
+    const dai::VideoEncoderProperties::Profile profile;
+    const bitstream::Codec codec;
+    mutable std::mutex mtx;
+    std::condition_variable signalClosing;
+    std::condition_variable signalFinished;
+    // GOPs, each starting with a keyframe
+    std::deque<std::deque<Frame>> gops;
+    std::chrono::milliseconds window{10000};
+    std::size_t maxBytes = 0;
+    std::size_t numBytes = 0;
+    std::size_t numFrames = 0;
+    std::vector<Clip> clips;
+    std::vector<std::function<void()>> unsubscribers;
+    bool closed = false;
+    BitstreamRingBufferStats stats;
+
+    // Finished clips are closed on a separate thread, so the stream isn't stalled by flushing
+    std::deque<std::unique_ptr<VideoMuxer>> closing;
+    std::size_t numClosing = 0;
+    std::thread closer;
+};
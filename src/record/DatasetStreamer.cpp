@@ -0,0 +1,794 @@
+#include "DatasetStreamer.hpp"
+
+// std
+#include <algorithm>
+#include <cctype>
+#include <cstdint>
+#include <fstream>
+#include <stdexcept>
+#include <unordered_map>
+
+#if defined(_WIN32)
+    #ifndef WIN32_LEAN_AND_MEAN
+        #define WIN32_LEAN_AND_MEAN
+    #endif
+    #include <windows.h>
+#else
+    #include <dirent.h>
+    #include <sys/stat.h>
+#endif
+
+constexpr std::size_t DatasetStreamer::FPS_WINDOW;
+constexpr std::chrono::milliseconds DatasetStreamer::DEFAULT_SYNC_TOLERANCE;
+
+namespace {
+
+using Type = dai::RawImgFrame::Type;
+
+bool isDirectory(const std::string& path) {
+#if defined(_WIN32)
+    DWORD attributes = GetFileAttributesA(path.c_str());
+    return attributes != INVALID_FILE_ATTRIBUTES && (attributes & FILE_ATTRIBUTE_DIRECTORY) != 0;
+#else
+    struct stat info;
+    return stat(path.c_str(), &info) == 0 && S_ISDIR(info.st_mode);
+#endif
+}
+
+bool isFile(const std::string& path) {
+#if defined(_WIN32)
+    DWORD attributes = GetFileAttributesA(path.c_str());
+    return attributes != INVALID_FILE_ATTRIBUTES && (attributes & FILE_ATTRIBUTE_DIRECTORY) == 0;
+#else
+    struct stat info;
+    return stat(path.c_str(), &info) == 0 && S_ISREG(info.st_mode);
+#endif
+}
+
+std::vector<std::string> listDirectory(const std::string& path) {
+    std::vector<std::string> names;
+#if defined(_WIN32)
+    WIN32_FIND_DATAA data;
+    HANDLE handle = FindFirstFileA((path + "\\*").c_str(), &data);
+    if(handle == INVALID_HANDLE_VALUE) return names;
+    do {
+        std::string name = data.cFileName;
+        if(name != "." && name != "..") names.push_back(name);
+    } while(FindNextFileA(handle, &data));
+    FindClose(handle);
+#else
+    DIR* dir = opendir(path.c_str());
+    if(dir == nullptr) return names;
+    while(auto* entry = readdir(dir)) {
+        std::string name = entry->d_name;
+        if(name != "." && name != "..") names.push_back(name);
+    }
+    closedir(dir);
+#endif
+    return names;
+}
+
+bool hasWildcard(const std::string& pattern) {
+    return pattern.find_first_of("*?") != std::string::npos;
+}
+
+// Matches 'name' against a pattern of '*' (any characters) and '?' (single character)
+bool matchWildcard(const std::string& pattern, const std::string& name) {
+    std::size_t p = 0, n = 0;
+    std::size_t star = std::string::npos, starName = 0;
+    while(n < name.size()) {
+        if(p < pattern.size() && (pattern[p] == '?' || pattern[p] == name[n])) {
+            p++;
+            n++;
+        } else if(p < pattern.size() && pattern[p] == '*') {
+            star = p++;
+            starName = n;
+        } else if(star != std::string::npos) {
+            // Let the last '*' consume one more character
+            p = star + 1;
+            n = ++starName;
+        } else {
+            return false;
+        }
+    }
+    while(p < pattern.size() && pattern[p] == '*') p++;
+    return p == pattern.size();
+}
+
+// Orders runs of digits by their value, so "9.png" comes before "10.png"
+bool naturalLess(const std::string& a, const std::string& b) {
+    std::size_t i = 0, j = 0;
+    while(i < a.size() && j < b.size()) {
+        if(std::isdigit(static_cast<unsigned char>(a[i])) && std::isdigit(static_cast<unsigned char>(b[j]))) {
+            std::size_t endA = i, endB = j;
+            while(endA < a.size() && std::isdigit(static_cast<unsigned char>(a[endA]))) endA++;
+            while(endB < b.size() && std::isdigit(static_cast<unsigned char>(b[endB]))) endB++;
+            // Compare without leading zeros, longer number is greater
+            std::size_t startA = i, startB = j;
+            while(startA + 1 < endA && a[startA] == '0') startA++;
+            while(startB + 1 < endB && b[startB] == '0') startB++;
+            if(endA - startA != endB - startB) return endA - startA < endB - startB;
+            int cmp = a.compare(startA, endA - startA, b, startB, endB - startB);
+            if(cmp != 0) return cmp < 0;
+            i = endA;
+            j = endB;
+        } else {
+            if(a[i] != b[j]) return a[i] < b[j];
+            i++;
+            j++;
+        }
+    }
+    return a.size() - i < b.size() - j;
+}
+
+// Files under 'root' matching a relative path pattern, with wildcards allowed in any component
+std::vector<std::string> findFiles(const std::string& root, const std::string& pattern) {
+    std::vector<std::string> components;
+    std::size_t begin = 0;
+    while(begin <= pattern.size()) {
+        std::size_t end = pattern.find_first_of("/\\", begin);
+        if(end == std::string::npos) end = pattern.size();
+        if(end > begin) components.push_back(pattern.substr(begin, end - begin));
+        begin = end + 1;
+    }
+
+    std::vector<std::string> matches{""};
+    for(std::size_t c = 0; c < components.size(); c++) {
+        bool last = c + 1 == components.size();
+        std::vector<std::string> next;
+        for(const auto& match : matches) {
+            std::string directory = match.empty() ? root : root + "/" + match;
+            std::vector<std::string> names;
+            if(hasWildcard(components[c])) {
+                for(const auto& name : listDirectory(directory)) {
+                    if(matchWildcard(components[c], name)) names.push_back(name);
+                }
+            } else {
+                names.push_back(components[c]);
+            }
+            for(const auto& name : names) {
+                std::string relative = match.empty() ? name : match + "/" + name;
+                std::string full = root + "/" + relative;
+                if(last ? isFile(full) : isDirectory(full)) next.push_back(relative);
+            }
+        }
+        matches = std::move(next);
+    }
+    if(components.empty()) matches.clear();
+
+    std::sort(matches.begin(), matches.end(), naturalLess);
+    for(auto& match : matches) match = root + "/" + match;
+    return matches;
+}
+
+// Skips whitespace and comments of a PNM header, then reads a number
+unsigned int readPnmValue(std::istream& file) {
+    while(true) {
+        int c = file.peek();
+        if(c == '#') {
+            std::string comment;
+            std::getline(file, comment);
+        } else if(std::isspace(c)) {
+            file.get();
+        } else {
+            break;
+        }
+    }
+    unsigned int value = 0;
+    file >> value;
+    return value;
+}
+
+// Reads binary PGM (P5) and PPM (P6) images, as BGR
+DecodedImage readPnm(const std::string& path) {
+    std::ifstream file(path, std::ios::binary);
+    if(!file) throw std::runtime_error("Couldn't open file: " + path);
+    char magic[2] = {};
+    file.read(magic, 2);
+    DecodedImage image;
+    if(magic[0] == 'P' && magic[1] == '5') {
+        image.channels = 1;
+    } else if(magic[0] == 'P' && magic[1] == '6') {
+        image.channels = 3;
+    } else {
+        throw std::runtime_error("Image isn't a binary PGM or PPM file, a decoder has to be set to read it: " + path);
+    }
+    image.width = readPnmValue(file);
+    image.height = readPnmValue(file);
+    unsigned int maxValue = readPnmValue(file);
+    if(!file || image.width == 0 || image.height == 0 || maxValue == 0 || maxValue > 255) {
+        throw std::runtime_error("Unsupported or corrupted PNM header: " + path);
+    }
+    // Single whitespace separates header and pixels
+    file.get();
+    image.data.resize(static_cast<std::size_t>(image.width) * image.height * image.channels);
+    file.read(reinterpret_cast<char*>(image.data.data()), image.data.size());
+    if(static_cast<std::size_t>(file.gcount()) != image.data.size()) throw std::runtime_error("Truncated image file: " + path);
+    if(image.channels == 3) {
+        for(std::size_t i = 0; i < image.data.size(); i += 3) std::swap(image.data[i], image.data[i + 2]);
+    }
+    return image;
+}
+
+bool isGrayType(Type type) {
+    return type == Type::RAW8 || type == Type::GRAY8 || type == Type::YUV400p;
+}
+
+bool isSupportedType(Type type) {
+    switch(type) {
+        case Type::RAW8:
+        case Type::GRAY8:
+        case Type::YUV400p:
+        case Type::BGR888i:
+        case Type::RGB888i:
+        case Type::BGR888p:
+        case Type::RGB888p:
+        case Type::NV12:
+        case Type::YUV420p:
+            return true;
+        default:
+            return false;
+    }
+}
+
+std::uint8_t clampByte(int value) {
+    return static_cast<std::uint8_t>(std::min(255, std::max(0, value)));
+}
+
+// Converts a decoded image to frame data of 'type'. Luma and chroma use full range BT.601
+std::vector<std::uint8_t> convert(const DecodedImage& image, Type type) {
+    const std::size_t numPixels = static_cast<std::size_t>(image.width) * image.height;
+    if(image.channels != 1 && image.channels != 3 && image.channels != 4) throw std::runtime_error("Decoded image has unsupported number of channels");
+    if(image.data.size() != numPixels * image.channels) throw std::runtime_error("Decoded image size doesn't match its dimensions");
+
+    const std::uint8_t* src = image.data.data();
+    const unsigned int step = image.channels;
+    // Channel offsets of blue, green and red
+    const unsigned int b = 0, g = image.channels == 1 ? 0 : 1, r = image.channels == 1 ? 0 : 2;
+    auto luma = [&](std::size_t i) {
+        const std::uint8_t* p = src + i * step;
+        if(step == 1) return p[0];
+        return static_cast<std::uint8_t>((29 * p[b] + 150 * p[g] + 77 * p[r] + 128) >> 8);
+    };
+
+    std::vector<std::uint8_t> out;
+    switch(type) {
+        case Type::RAW8:
+        case Type::GRAY8:
+        case Type::YUV400p:
+            out.resize(numPixels);
+            for(std::size_t i = 0; i < numPixels; i++) out[i] = luma(i);
+            break;
+
+        case Type::BGR888i:
+        case Type::RGB888i: {
+            out.resize(numPixels * 3);
+            const unsigned int first = type == Type::BGR888i ? b : r, last = type == Type::BGR888i ? r : b;
+            for(std::size_t i = 0; i < numPixels; i++) {
+                const std::uint8_t* p = src + i * step;
+                out[i * 3] = p[first];
+                out[i * 3 + 1] = p[g];
+                out[i * 3 + 2] = p[last];
+            }
+            break;
+        }
+
+        case Type::BGR888p:
+        case Type::RGB888p: {
+            out.resize(numPixels * 3);
+            const unsigned int first = type == Type::BGR888p ? b : r, last = type == Type::BGR888p ? r : b;
+            for(std::size_t i = 0; i < numPixels; i++) {
+                const std::uint8_t* p = src + i * step;
+                out[i] = p[first];
+                out[numPixels + i] = p[g];
+                out[2 * numPixels + i] = p[last];
+            }
+            break;
+        }
+
+        case Type::NV12:
+        case Type::YUV420p: {
+            if(image.width % 2 != 0 || image.height % 2 != 0) throw std::runtime_error("Conversion to 4:2:0 frame types requires even image dimensions");
+            const std::size_t chromaSize = numPixels / 4;
+            out.resize(numPixels + 2 * chromaSize);
+            for(std::size_t i = 0; i < numPixels; i++) out[i] = luma(i);
+            std::uint8_t* u = out.data() + numPixels;
+            std::uint8_t* v = type == Type::NV12 ? u + 1 : u + chromaSize;
+            const std::size_t chromaStep = type == Type::NV12 ? 2 : 1;
+            for(unsigned int y = 0; y < image.height; y += 2) {
+                for(unsigned int x = 0; x < image.width; x += 2) {
+                    // Average of 2x2 block
+                    int sumB = 0, sumG = 0, sumR = 0;
+                    for(unsigned int dy = 0; dy < 2; dy++) {
+                        for(unsigned int dx = 0; dx < 2; dx++) {
+                            const std::uint8_t* p = src + ((y + dy) * static_cast<std::size_t>(image.width) + x + dx) * step;
+                            sumB += p[b];
+                            sumG += p[g];
+                            sumR += p[r];
+                        }
+                    }
+                    *u = clampByte((-43 * sumR - 85 * sumG + 128 * sumB + 4 * 32896) >> 10);
+                    *v = clampByte((128 * sumR - 107 * sumG - 21 * sumB + 4 * 32896) >> 10);
+                    u += chromaStep;
+                    v += chromaStep;
+                }
+            }
+            break;
+        }
+
+        default:
+            throw std::runtime_error("Conversion to frame type " + std::to_string(static_cast<int>(type)) + " isn't supported");
+    }
+    return out;
+}
+
+// Interprets data of a recorded frame as a decoded image, to be converted to 'target' type
+DecodedImage toImage(dai::ImgFrame& frame, Type target) {
+    DecodedImage image;
+    image.width = frame.getWidth();
+    image.height = frame.getHeight();
+    const std::size_t numPixels = static_cast<std::size_t>(image.width) * image.height;
+    const auto& data = frame.getData();
+    auto type = frame.getType();
+    switch(type) {
+        case Type::NV12:
+        case Type::YUV420p:
+            if(!isGrayType(target)) throw std::runtime_error("Recorded 4:2:0 frames can only be converted to grayscale types");
+            // Luma plane only
+            image.channels = 1;
+            if(data.size() < numPixels) break;
+            image.data.assign(data.begin(), data.begin() + numPixels);
+            return image;
+        case Type::RAW8:
+        case Type::GRAY8:
+        case Type::YUV400p:
+            image.channels = 1;
+            if(data.size() < numPixels) break;
+            image.data.assign(data.begin(), data.begin() + numPixels);
+            return image;
+        case Type::BGR888i:
+        case Type::RGB888i:
+            image.channels = 3;
+            if(data.size() < numPixels * 3) break;
+            image.data.assign(data.begin(), data.begin() + numPixels * 3);
+            if(type == Type::RGB888i) {
+                for(std::size_t i = 0; i < image.data.size(); i += 3) std::swap(image.data[i], image.data[i + 2]);
+            }
+            return image;
+        case Type::BGR888p:
+        case Type::RGB888p: {
+            image.channels = 3;
+            if(data.size() < numPixels * 3) break;
+            image.data.resize(numPixels * 3);
+            const std::size_t blue = type == Type::BGR888p ? 0 : 2, red = type == Type::BGR888p ? 2 : 0;
+            for(std::size_t i = 0; i < numPixels; i++) {
+                image.data[i * 3] = data[blue * numPixels + i];
+                image.data[i * 3 + 1] = data[numPixels + i];
+                image.data[i * 3 + 2] = data[red * numPixels + i];
+            }
+            return image;
+        }
+        default:
+            throw std::runtime_error("Conversion from recorded frame type " + std::to_string(static_cast<int>(type)) + " isn't supported");
+    }
+    throw std::runtime_error("Recorded frame data is smaller than its dimensions");
+}
+
+}  // namespace
+
+DatasetStreamer::DatasetStreamer(const std::string& path, std::size_t numThreads) : path(path) {
+    if(!isDirectory(path)) reader.reset(new RecordingReader(path));
+    pool.reset(new ThreadPool(numThreads));
+}
+
+DatasetStreamer::~DatasetStreamer() {
+    stop();
+}
+
+void DatasetStreamer::addStream(const std::string& pattern, std::shared_ptr<dai::DataInputQueue> queue, dai::RawImgFrame::Type type, dai::CameraBoardSocket socket) {
+    if(queue == nullptr) throw std::invalid_argument("Queue can't be null");
+    addStream(
+        pattern,
+        [queue](const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) { return queue->send(msg, timeout); },
+        type,
+        socket);
+}
+
+void DatasetStreamer::addStream(const std::string& pattern, std::shared_ptr<MessageQueue> queue, dai::RawImgFrame::Type type, dai::CameraBoardSocket socket) {
+    if(queue == nullptr) throw std::invalid_argument("Queue can't be null");
+    addStream(
+        pattern,
+        [queue](const std::shared_ptr<dai::ADatatype>& msg, std::chrono::milliseconds timeout) {
+            if(queue->send(msg, timeout)) return true;
+            if(queue->isClosed()) throw std::runtime_error("Queue '" + queue->getName() + "' was closed");
+            return false;
+        },
+        type,
+        socket);
+}
+
+void DatasetStreamer::addStream(const std::string& pattern, Sender send, dai::RawImgFrame::Type type, dai::CameraBoardSocket socket) {
+    if(!isSupportedType(type)) throw std::invalid_argument("Conversion to frame type " + std::to_string(static_cast<int>(type)) + " isn't supported");
+
+    Stream stream;
+    stream.name = pattern;
+    stream.send = std::move(send);
+    stream.type = type;
+    stream.socket = socket;
+    if(reader != nullptr) {
+        const auto& names = reader->getStreams();
+        if(std::find(names.begin(), names.end(), pattern) == names.end()) throw std::invalid_argument("Recording has no stream named: " + pattern);
+        stream.entries = reader->getIndex(pattern);
+    } else {
+        stream.files = findFiles(path, pattern);
+        if(stream.files.empty()) throw std::invalid_argument("Pattern '" + pattern + "' matches no files in: " + path);
+    }
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Streams can't be added after streaming was started");
+    streams.push_back(std::move(stream));
+}
+
+std::size_t DatasetStreamer::getNumGroups() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return countGroups();
+}
+
+void DatasetStreamer::setDecoder(Decoder decoder) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Decoder can't be changed after streaming was started");
+    this->decoder = std::move(decoder);
+}
+
+void DatasetStreamer::setFps(float fps) {
+    if(fps < 0) throw std::invalid_argument("Fps can't be negative");
+    {
+        // Under the lock, so a sender checking fps in waitUntil can't miss the notification
+        std::lock_guard<std::mutex> lock(mtx);
+        this->fps = fps;
+    }
+    cv.notify_all();
+}
+
+float DatasetStreamer::getFps() const {
+    return fps;
+}
+
+void DatasetStreamer::setLoop(bool loop) {
+    this->loop = loop;
+}
+
+bool DatasetStreamer::getLoop() const {
+    return loop;
+}
+
+void DatasetStreamer::setReadAhead(std::size_t numGroups) {
+    readAhead = std::max<std::size_t>(numGroups, 1);
+}
+
+void DatasetStreamer::setSyncTolerance(std::chrono::milliseconds tolerance) {
+    if(tolerance.count() < 0) throw std::invalid_argument("Sync tolerance can't be negative");
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Sync tolerance can't be changed after streaming was started");
+    syncTolerance = tolerance;
+}
+
+std::chrono::milliseconds DatasetStreamer::getSyncTolerance() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return syncTolerance;
+}
+
+std::size_t DatasetStreamer::getReadAhead() const {
+    return readAhead;
+}
+
+std::size_t DatasetStreamer::getNumThreads() const {
+    return pool->getNumThreads();
+}
+
+void DatasetStreamer::start() {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(stopping) throw std::runtime_error("DatasetStreamer was stopped and can't be restarted");
+    if(started) return;
+    if(streams.empty()) throw std::logic_error("No stream was added");
+    started = true;
+    running = true;
+    if(reader != nullptr) {
+        groupEntries = matchEntries();
+        numGroups = groupEntries.size();
+        std::uint64_t numEntries = 0;
+        for(const auto& stream : streams) numEntries += stream.entries.size();
+        std::lock_guard<std::mutex> statsLock(statsMtx);
+        stats.numUnmatched = numEntries - numGroups * streams.size();
+    } else {
+        numGroups = countGroups();
+    }
+    sendThread = std::thread(&DatasetStreamer::run, this);
+}
+
+void DatasetStreamer::stop() {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        stopping = true;
+    }
+    cv.notify_all();
+    if(sendThread.joinable()) sendThread.join();
+    // Decoding tasks still queued return right away
+    pool->wait();
+}
+
+bool DatasetStreamer::isRunning() const {
+    return running;
+}
+
+bool DatasetStreamer::isFinished() const {
+    return finished;
+}
+
+bool DatasetStreamer::wait(std::chrono::milliseconds timeout) {
+    std::unique_lock<std::mutex> lock(mtx);
+    return cv.wait_for(lock, timeout, [this]() { return !running; });
+}
+
+DatasetStreamerStats DatasetStreamer::getStats() const {
+    std::size_t numReady = 0;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        for(const auto& group : pending) {
+            if(group->remaining == 0) numReady++;
+        }
+    }
+    std::lock_guard<std::mutex> lock(statsMtx);
+    DatasetStreamerStats result = stats;
+    result.numReady = numReady;
+    if(numDecoded > 0) result.averageDecodeTime = totalDecodeTime / numDecoded;
+    return result;
+}
+
+void DatasetStreamer::run() {
+    using namespace std::chrono;
+
+    // Position of next group to decode, counting over all passes
+    std::size_t next = 0;
+    auto fill = [this, &next]() {
+        while(pending.size() < readAhead && (loop || next < numGroups)) submit(next++);
+    };
+
+    std::uint32_t sequenceNum = 0;
+    steady_clock::time_point start;
+    nanoseconds firstTimestamp{0};
+    std::size_t numPaced = 0;
+    float currentFps = 0;
+    bool rebase = true;
+
+    for(std::size_t i = 0; numGroups > 0 && !stopping && (loop || i < numGroups); i++) {
+        std::shared_ptr<Group> group;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            fill();
+            group = pending.front();
+            if(group->remaining > 0) {
+                {
+                    std::lock_guard<std::mutex> statsLock(statsMtx);
+                    stats.numStalls++;
+                }
+                cv.wait(lock, [this, &group]() { return stopping || group->remaining == 0; });
+            }
+            if(stopping) break;
+            pending.pop_front();
+            fill();
+        }
+
+        if(!group->error.empty()) {
+            std::lock_guard<std::mutex> lock(statsMtx);
+            stats.numErrors++;
+            stats.lastError = group->error;
+            continue;
+        }
+
+        // Timing is rebased at start of each pass and when fps changes
+        float targetFps = fps;
+        if(group->index == 0 || targetFps != currentFps) rebase = true;
+        if(targetFps > 0 || reader != nullptr) {
+            nanoseconds timestamp = reader != nullptr ? getTimestamp(group->index) : nanoseconds(0);
+            if(rebase) {
+                start = steady_clock::now();
+                firstTimestamp = timestamp;
+                numPaced = 0;
+                currentFps = targetFps;
+                rebase = false;
+            }
+            steady_clock::time_point time;
+            if(targetFps > 0) {
+                time = start + duration_cast<steady_clock::duration>(duration<double>(numPaced / targetFps));
+            } else {
+                time = start + duration_cast<steady_clock::duration>(timestamp - firstTimestamp);
+            }
+            if(!waitUntil(time)) break;
+            numPaced++;
+            // After a stall, keep the interval instead of sending a burst to catch up
+            if(targetFps > 0 && steady_clock::now() - time > duration<double>(1.0 / targetFps)) rebase = true;
+        }
+
+        auto timestamp = steady_clock::now();
+        std::uint64_t numBytes = 0;
+        try {
+            for(std::size_t s = 0; s < streams.size(); s++) {
+                const auto& frame = group->frames[s];
+                frame->setSequenceNum(sequenceNum);
+                frame->setTimestamp(timestamp);
+                numBytes += frame->getData().size();
+                while(!streams[s].send(frame, milliseconds(100))) {
+                    if(stopping) break;
+                }
+                if(stopping) break;
+            }
+        } catch(const std::exception& ex) {
+            std::lock_guard<std::mutex> lock(statsMtx);
+            stats.numErrors++;
+            stats.lastError = ex.what();
+            break;
+        }
+        if(stopping) break;
+        sequenceNum++;
+
+        auto now = steady_clock::now();
+        std::lock_guard<std::mutex> lock(statsMtx);
+        stats.numGroups++;
+        stats.numFrames += streams.size();
+        stats.numBytes += numBytes;
+        recentGroups.emplace_back(now, numBytes);
+        if(recentGroups.size() > FPS_WINDOW) recentGroups.pop_front();
+        if(recentGroups.size() > 1) {
+            double seconds = duration<double>(recentGroups.back().first - recentGroups.front().first).count();
+            std::uint64_t windowBytes = 0;
+            for(std::size_t g = 1; g < recentGroups.size(); g++) windowBytes += recentGroups[g].second;
+            if(seconds > 0) {
+                stats.fps = (recentGroups.size() - 1) / seconds;
+                stats.bytesPerSecond = windowBytes / seconds;
+            }
+        }
+    }
+
+    std::lock_guard<std::mutex> lock(mtx);
+    finished = !stopping;
+    running = false;
+    cv.notify_all();
+}
+
+void DatasetStreamer::submit(std::size_t index) {
+    auto group = std::make_shared<Group>();
+    group->index = index % numGroups;
+    group->frames.resize(streams.size());
+    group->remaining = streams.size();
+    pending.push_back(group);
+    for(std::size_t s = 0; s < streams.size(); s++) {
+        pool->submit([this, group, s]() { decode(group, s); });
+    }
+}
+
+void DatasetStreamer::decode(const std::shared_ptr<Group>& group, std::size_t stream) {
+    using namespace std::chrono;
+
+    std::shared_ptr<dai::ImgFrame> frame;
+    std::string error;
+    if(!stopping) {
+        auto start = steady_clock::now();
+        try {
+            frame = read(stream, group->index);
+        } catch(const std::exception& ex) {
+            error = ex.what();
+            if(error.empty()) error = "Unknown error";
+        }
+        auto elapsed = duration_cast<microseconds>(steady_clock::now() - start);
+        std::lock_guard<std::mutex> lock(statsMtx);
+        numDecoded++;
+        totalDecodeTime += elapsed;
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        group->frames[stream] = std::move(frame);
+        if(!error.empty()) group->error = streams[stream].name + ": " + error;
+        group->remaining--;
+    }
+    cv.notify_all();
+}
+
+std::shared_ptr<dai::ImgFrame> DatasetStreamer::read(std::size_t s, std::size_t index) const {
+    const auto& stream = streams[s];
+    std::shared_ptr<dai::ImgFrame> frame;
+    if(reader != nullptr) {
+        frame = std::dynamic_pointer_cast<dai::ImgFrame>(reader->read(stream.entries[groupEntries[index][s]]));
+        if(frame == nullptr) throw std::runtime_error("Recorded message isn't an ImgFrame");
+        if(frame->getType() != stream.type) {
+            frame->setData(convert(toImage(*frame, stream.type), stream.type));
+            frame->setType(stream.type);
+        }
+    } else {
+        const auto& file = stream.files[index];
+        DecodedImage image = decoder ? decoder(file) : readPnm(file);
+        frame = std::make_shared<dai::ImgFrame>();
+        frame->setData(convert(image, stream.type));
+        frame->setType(stream.type);
+        frame->setWidth(image.width);
+        frame->setHeight(image.height);
+    }
+    if(stream.socket != dai::CameraBoardSocket::AUTO) frame->setInstanceNum(static_cast<unsigned int>(stream.socket));
+    return frame;
+}
+
+std::size_t DatasetStreamer::countGroups() const {
+    if(streams.empty()) return 0;
+    if(reader != nullptr) return matchEntries().size();
+    std::size_t count = SIZE_MAX;
+    for(const auto& stream : streams) count = std::min(count, stream.files.size());
+    return count;
+}
+
+std::vector<std::vector<std::size_t>> DatasetStreamer::matchEntries() const {
+    using namespace std::chrono;
+
+    // Frames of other streams by sequence number, and ordered by timestamp
+    std::vector<std::unordered_map<std::int64_t, std::size_t>> bySequenceNum(streams.size());
+    std::vector<std::vector<std::size_t>> byTimestamp(streams.size());
+    for(std::size_t s = 1; s < streams.size(); s++) {
+        const auto& entries = streams[s].entries;
+        for(std::size_t e = 0; e < entries.size(); e++) {
+            bySequenceNum[s].emplace(entries[e].sequenceNum, e);
+            byTimestamp[s].push_back(e);
+        }
+        std::stable_sort(byTimestamp[s].begin(), byTimestamp[s].end(), [&entries](std::size_t a, std::size_t b) {
+            return entries[a].timestamp < entries[b].timestamp;
+        });
+    }
+
+    std::vector<std::vector<std::size_t>> groups;
+    // First entry of each stream which isn't in a group yet, keeps groups in recorded order
+    std::vector<std::size_t> next(streams.size(), 0);
+    const auto& reference = streams.front().entries;
+    for(std::size_t e = 0; e < reference.size(); e++) {
+        const auto timestamp = reference[e].timestamp;
+        std::vector<std::size_t> group{e};
+        for(std::size_t s = 1; s < streams.size() && group.size() == s; s++) {
+            const auto& entries = streams[s].entries;
+            auto matches = [&](std::size_t i) {
+                auto difference = entries[i].timestamp - timestamp;
+                return i >= next[s] && difference <= syncTolerance && difference >= -syncTolerance;
+            };
+            auto it = bySequenceNum[s].find(reference[e].sequenceNum);
+            if(it != bySequenceNum[s].end() && matches(it->second)) {
+                group.push_back(it->second);
+                continue;
+            }
+            // Cameras which don't share sequence numbers, take the nearest frame in time
+            const auto& order = byTimestamp[s];
+            auto pos = std::lower_bound(order.begin(), order.end(), timestamp, [&entries](std::size_t i, nanoseconds t) { return entries[i].timestamp < t; });
+            std::size_t nearest = SIZE_MAX;
+            nanoseconds nearestDifference = nanoseconds::max();
+            if(pos != order.end()) {
+                nearest = *pos;
+                nearestDifference = entries[*pos].timestamp - timestamp;
+            }
+            if(pos != order.begin() && timestamp - entries[*(pos - 1)].timestamp < nearestDifference) nearest = *(pos - 1);
+            if(nearest != SIZE_MAX && matches(nearest)) group.push_back(nearest);
+        }
+        // Frame is missing in some stream, skip the incomplete group
+        if(group.size() != streams.size()) continue;
+        for(std::size_t s = 1; s < streams.size(); s++) next[s] = group[s] + 1;
+        groups.push_back(std::move(group));
+    }
+    return groups;
+}
+
+std::chrono::nanoseconds DatasetStreamer::getTimestamp(std::size_t index) const {
+    // Groups are paced by frames of first stream
+    return streams.front().entries[groupEntries[index].front()].timestamp;
+}
+
+bool DatasetStreamer::waitUntil(std::chrono::steady_clock::time_point time) {
+    std::unique_lock<std::mutex> lock(mtx);
+    float current = fps;
+    cv.wait_until(lock, time, [this, current]() { return stopping || fps != current; });
+    return !stopping;
+}
@@ -0,0 +1,211 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <utility>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+// shared
+#include "depthai-shared/common/CameraBoardSocket.hpp"
+
+// project
+#include "RecordingReader.hpp"
+#include "device/MessageQueue.hpp"
+#include "utility/ThreadPool.hpp"
+
+/// Decoded image, 8 bits per channel, interleaved, grayscale (1 channel) or BGR (3 channels)
+struct DecodedImage {
+    unsigned int width = 0;
+    unsigned int height = 0;
+    unsigned int channels = 0;
+    std::vector<std::uint8_t> data;
+};
+
+/// Throughput counters of a DatasetStreamer
+struct DatasetStreamerStats {
+    /// Number of sent groups (one frame of each stream)
+    std::uint64_t numGroups = 0;
+    /// Number of sent frames
+    std::uint64_t numFrames = 0;
+    /// Number of sent bytes
+    std::uint64_t numBytes = 0;
+    /// Number of times sending had to wait for decoding to catch up
+    std::uint64_t numStalls = 0;
+    /// Number of groups skipped because a frame couldn't be read or converted
+    std::uint64_t numErrors = 0;
+    /// Number of recorded frames skipped because other streams have no matching frame
+    std::uint64_t numUnmatched = 0;
+    /// Message of last error
+    std::string lastError;
+    /// Number of decoded groups waiting to be sent
+    std::size_t numReady = 0;
+    /// Groups per second, over recently sent groups
+    double fps = 0;
+    /// Bytes per second, over recently sent groups
+    double bytesPerSecond = 0;
+    /// Time spent decoding and converting a frame, on worker threads
+    std::chrono::microseconds averageDecodeTime{0};
+};
+
+/**
+ * @brief Streams a dataset (directory of images or recording) into device input queues.
+ *
+ * Frames are read, decoded and converted to the target ImgFrame type on a thread pool, a bounded
+ * number of groups ahead of sending, so disk latency and decoding don't stall the device.
+ * A group consists of one frame of each stream (eg. left and right image of a stereo pair) and is
+ * sent with the same sequence number and timestamp on all frames, paced to a target fps or
+ * to the recorded timestamps. Recorded frames are grouped by sequence number, or by nearest
+ * timestamp within the sync tolerance, and frames without a match in every stream are skipped.
+ */
+class DatasetStreamer {
+   public:
+    /// Reads and decodes an image file
+    using Decoder = std::function<DecodedImage(const std::string& path)>;
+
+    /// Number of recent groups fps is computed over
+    static constexpr std::size_t FPS_WINDOW{32};
+    /// Default maximum timestamp difference of recorded frames grouped together
+    static constexpr std::chrono::milliseconds DEFAULT_SYNC_TOLERANCE{10};
+
+    /**
+     * @param path Directory of images, or a recording written by Recorder
+     * @param numThreads Number of decoding threads, 0 for number of hardware threads
+     */
+    explicit DatasetStreamer(const std::string& path, std::size_t numThreads = 0);
+    /// Stops streaming
+    ~DatasetStreamer();
+
+    DatasetStreamer(const DatasetStreamer&) = delete;
+    DatasetStreamer& operator=(const DatasetStreamer&) = delete;
+
+    /**
+     * Adds a stream. Frames are converted to 'type', and stamped with 'socket' as instance number
+     * unless it is AUTO. Throws if pattern matches nothing or streaming was started
+     * @param pattern Path relative to dataset directory, where '*' and '?' match within a path component, so they
+     * can select directories too. Files are ordered naturally ("9" before "10"). For recordings, name of recorded stream
+     * @param queue Input queue frames are sent to
+     * @param type Type frames are converted to
+     * @param socket Camera socket set as instance number
+     */
+    void addStream(const std::string& pattern,
+                   std::shared_ptr<dai::DataInputQueue> queue,
+                   dai::RawImgFrame::Type type = dai::RawImgFrame::Type::RAW8,
+                   dai::CameraBoardSocket socket = dai::CameraBoardSocket::AUTO);
+    /// Adds a stream sent into a host queue (eg. ReconnectingDevice input queue)
+    void addStream(const std::string& pattern,
+                   std::shared_ptr<MessageQueue> queue,
+                   dai::RawImgFrame::Type type = dai::RawImgFrame::Type::RAW8,
+                   dai::CameraBoardSocket socket = dai::CameraBoardSocket::AUTO);
+    /// @returns Number of groups, limited by stream with least frames, or number of matched frames for recordings
+    std::size_t getNumGroups() const;
+
+    /// Sets decoder of image files. Without one, only binary PGM and PPM files can be read
+    void setDecoder(Decoder decoder);
+    /// Sets target number of groups per second, 0 to follow recorded timestamps (directories are then sent as fast as queues accept)
+    void setFps(float fps);
+    float getFps() const;
+    /// Sets whether to restart after last group
+    void setLoop(bool loop);
+    bool getLoop() const;
+    /// Sets maximum timestamp difference of recorded frames grouped together. Throws if streaming was started
+    void setSyncTolerance(std::chrono::milliseconds tolerance);
+    std::chrono::milliseconds getSyncTolerance() const;
+    /// Sets number of groups decoded ahead of sending
+    void setReadAhead(std::size_t numGroups);
+    std::size_t getReadAhead() const;
+    /// @returns Number of decoding threads
+    std::size_t getNumThreads() const;
+
+    /// Starts streaming, throws if no stream was added
+    void start();
+    /// Stops streaming and waits for decoding threads. Streamer can't be restarted
+    void stop();
+    /// @returns True if streaming
+    bool isRunning() const;
+    /// @returns True if last group was sent and streamer isn't looping
+    bool isFinished() const;
+    /**
+     * Waits until streaming finishes or is stopped, up to 'timeout'
+     * @returns True if streaming isn't running anymore
+     */
+    bool wait(std::chrono::milliseconds timeout);
+
+    /// @returns Throughput counters
+    DatasetStreamerStats getStats() const;
+
+   private:
+    using Sender = std::function<bool(const std::shared_ptr<dai::ADatatype>&, std::chrono::milliseconds)>;
+
+    struct Stream {
+        std::string name;
+        Sender send;
+        dai::RawImgFrame::Type type;
+        dai::CameraBoardSocket socket;
+        // Matched files, or recorded messages
+        std::vector<std::string> files;
+        std::vector<RecordIndexEntry> entries;
+    };
+
+    struct Group {
+        std::size_t index = 0;
+        std::vector<std::shared_ptr<dai::ImgFrame>> frames;
+        std::size_t remaining = 0;
+        std::string error;
+    };
+
+    void addStream(const std::string& pattern, Sender send, dai::RawImgFrame::Type type, dai::CameraBoardSocket socket);
+    void run();
+    void submit(std::size_t index);
+    void decode(const std::shared_ptr<Group>& group, std::size_t stream);
+    std::shared_ptr<dai::ImgFrame> read(std::size_t stream, std::size_t index) const;
+    std::size_t countGroups() const;
+    // Entry of each stream for every group of recorded frames
+    std::vector<std::vector<std::size_t>> matchEntries() const;
+    std::chrono::nanoseconds getTimestamp(std::size_t index) const;
+    bool waitUntil(std::chrono::steady_clock::time_point time);
+
+    std::string path;
+    std::unique_ptr<RecordingReader> reader;
+    std::vector<Stream> streams;
+    // Number of groups, set on start
+    std::size_t numGroups = 0;
+    // Entries of each group for recordings, set on start
+    std::vector<std::vector<std::size_t>> groupEntries;
+    std::chrono::milliseconds syncTolerance{DEFAULT_SYNC_TOLERANCE};
+    Decoder decoder;
+    std::atomic<float> fps{0};
+    std::atomic<bool> loop{false};
+    std::atomic<std::size_t> readAhead{8};
+
+    mutable std::mutex mtx;
+    std::condition_variable cv;
+    // Groups being decoded or waiting to be sent, in sending order
+    std::deque<std::shared_ptr<Group>> pending;
+    std::atomic<bool> started{false};
+    std::atomic<bool> running{false};
+    std::atomic<bool> finished{false};
+    std::atomic<bool> stopping{false};
+
+    mutable std::mutex statsMtx;
+    DatasetStreamerStats stats;
+    std::uint64_t numDecoded = 0;
+    std::chrono::microseconds totalDecodeTime{0};
+    std::deque<std::pair<std::chrono::steady_clock::time_point, std::uint64_t>> recentGroups;
+
+    std::unique_ptr<ThreadPool> pool;
+    std::thread sendThread;
+};
@@ -0,0 +1,298 @@
+#include "FrameArchiver.hpp"
+
+// std
+#include <cctype>
+#include <stdexcept>
+
+// project
+#include "Png.hpp"
+#include "utility/CacheDirectory.hpp"
+#include "utility/Deflate.hpp"
+
+constexpr std::size_t FrameArchiver::DEFAULT_MAX_PENDING;
+constexpr int FrameArchiver::DEFAULT_COMPRESSION_LEVEL;
+
+namespace {
+
+using Type = dai::RawImgFrame::Type;
+
+// Name and bit depth of supported types, 0 depth if unsupported
+const char* getTypeName(Type type, unsigned int& bitDepth) {
+    switch(type) {
+        case Type::GRAY8:
+            bitDepth = 8;
+            return "GRAY8";
+        case Type::RAW8:
+            bitDepth = 8;
+            return "RAW8";
+        case Type::RAW16:
+            bitDepth = 16;
+            return "RAW16";
+        default:
+            bitDepth = 0;
+            return "";
+    }
+}
+
+std::string padNumber(std::uint64_t value, std::size_t width) {
+    auto text = std::to_string(value);
+    if(text.size() < width) text.insert(0, width - text.size(), '0');
+    return text;
+}
+
+// Stream names come from queue names, keep only characters safe in file names. '-' is left to mark restarts
+std::string toFileName(std::string stream) {
+    for(auto& c : stream) {
+        if(!std::isalnum(static_cast<unsigned char>(c))) c = '_';
+    }
+    return stream;
+}
+
+}  // namespace
+
+FrameArchiver::FrameArchiver(std::string directory, Format format, std::size_t numThreads)
+    : directory(std::move(directory)), format(format), pool(numThreads) {
+    std::string indexPath = this->directory + "/index.csv";
+    createParentDirectories(indexPath);
+    indexFile = std::fopen(indexPath.c_str(), "w");
+    if(indexFile == nullptr) throw std::runtime_error("Couldn't create file: " + indexPath);
+    std::fputs("sequenceNum,timestampUs,width,height,type,encoding,file,offset,size\n", indexFile);
+    if(format == Format::RAW) {
+        std::string dataPath = this->directory + "/frames.bin";
+        dataFile = std::fopen(dataPath.c_str(), "wb");
+        if(dataFile == nullptr) {
+            std::fclose(indexFile);
+            throw std::runtime_error("Couldn't create file: " + dataPath);
+        }
+    }
+}
+
+FrameArchiver::~FrameArchiver() {
+    try {
+        close();
+    } catch(const std::exception&) {
+    }
+}
+
+void FrameArchiver::addQueue(const QueueSource& queue) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(closed) throw std::logic_error("Frame archiver is closed");
+    }
+    auto stream = queue.getName();
+    auto unsubscribe = queue.subscribe([this, stream](std::shared_ptr<dai::ADatatype> msg) { add(std::dynamic_pointer_cast<dai::ImgFrame>(msg), stream); });
+    std::lock_guard<std::mutex> lock(mtx);
+    unsubscribers.push_back(std::move(unsubscribe));
+}
+
+bool FrameArchiver::add(const std::shared_ptr<dai::ImgFrame>& frame, const std::string& stream) {
+    if(frame == nullptr) return false;
+    unsigned int bitDepth = 0;
+    getTypeName(frame->getType(), bitDepth);
+    std::size_t expectedSize = static_cast<std::size_t>(frame->getWidth()) * frame->getHeight() * bitDepth / 8;
+
+    std::unique_lock<std::mutex> lock(mtx);
+    if(closed) return false;
+    if(bitDepth == 0 || expectedSize == 0 || frame->getData().size() < expectedSize) {
+        stats.numFailed++;
+        stats.lastError = "Unsupported frame, only GRAY8, RAW8 and RAW16 frames with complete data can be archived";
+        return false;
+    }
+    if(stats.numPending >= maxPending) {
+        if(!blocking) {
+            stats.numDropped++;
+            return false;
+        }
+        signalSpace.wait(lock, [this]() { return stats.numPending < maxPending || closed; });
+        if(closed) return false;
+    }
+
+    stats.numPending++;
+    // Submitted under lock, so indices are submitted in order and close can't miss one
+    pool.submit([this, frame, stream, index = index++, level = level]() { encode(frame, stream, index, level); });
+    return true;
+}
+
+void FrameArchiver::setCompressionLevel(int level) {
+    if(level < 0 || level > 9) throw std::invalid_argument("Compression level must be between 0 and 9");
+    std::lock_guard<std::mutex> lock(mtx);
+    this->level = level;
+}
+
+int FrameArchiver::getCompressionLevel() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return level;
+}
+
+void FrameArchiver::setMaxPending(std::size_t maxPending) {
+    if(maxPending == 0) throw std::invalid_argument("Maximum number of pending frames must be positive");
+    std::lock_guard<std::mutex> lock(mtx);
+    this->maxPending = maxPending;
+    signalSpace.notify_all();
+}
+
+std::size_t FrameArchiver::getMaxPending() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return maxPending;
+}
+
+void FrameArchiver::setBlocking(bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->blocking = blocking;
+    signalSpace.notify_all();
+}
+
+bool FrameArchiver::getBlocking() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return blocking;
+}
+
+bool FrameArchiver::wait(std::chrono::milliseconds timeout) {
+    std::unique_lock<std::mutex> lock(mtx);
+    return signalDone.wait_for(lock, timeout, [this]() { return stats.numPending == 0; });
+}
+
+void FrameArchiver::close() {
+    std::vector<std::function<void()>> toUnsubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toUnsubscribe = std::move(unsubscribers);
+        unsubscribers.clear();
+        closed = true;
+        signalSpace.notify_all();
+    }
+    for(auto& unsubscribe : toUnsubscribe) unsubscribe();
+
+    pool.wait();
+    std::lock_guard<std::mutex> writeLock(writeMtx);
+    if(indexFile != nullptr) std::fclose(indexFile);
+    if(dataFile != nullptr) std::fclose(dataFile);
+    indexFile = nullptr;
+    dataFile = nullptr;
+}
+
+std::string FrameArchiver::getDirectory() const {
+    return directory;
+}
+
+FrameArchiver::Format FrameArchiver::getFormat() const {
+    return format;
+}
+
+FrameArchiverStats FrameArchiver::getStats() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    FrameArchiverStats result = stats;
+    if(numEncoded > 0) result.averageCompressTime = totalCompressTime / numEncoded;
+    return result;
+}
+
+void FrameArchiver::encode(std::shared_ptr<dai::ImgFrame> frame, std::string stream, std::uint64_t index, int level) {
+    auto start = std::chrono::steady_clock::now();
+    unsigned int bitDepth = 0;
+    const char* typeName = getTypeName(frame->getType(), bitDepth);
+    unsigned int width = frame->getWidth();
+    unsigned int height = frame->getHeight();
+    const auto& data = frame->getData();
+
+    Encoded result;
+    result.inputSize = static_cast<std::size_t>(width) * height * bitDepth / 8;
+    const char* encoding = "png";
+    try {
+        if(format == Format::PNG) {
+            // Named when written, as restarts of sequence numbers are only known in order
+            result.stream = stream.empty() ? std::to_string(frame->getInstanceNum()) : toFileName(stream);
+            result.sequenceNum = frame->getSequenceNum();
+            result.data = png::encodeGray(data.data(), width, height, bitDepth, level);
+        } else if(level > 0) {
+            encoding = "zlib";
+            result.data = zlibCompress(data.data(), result.inputSize, level);
+        } else {
+            encoding = "raw";
+            result.data.assign(data.begin(), data.begin() + result.inputSize);
+        }
+    } catch(const std::exception& ex) {
+        result.error = ex.what();
+    }
+    // Offset of raw data is only known when written
+    auto timestamp = std::chrono::duration_cast<std::chrono::microseconds>(frame->getTimestamp().time_since_epoch()).count();
+    result.line = std::to_string(frame->getSequenceNum()) + "," + std::to_string(timestamp) + "," + std::to_string(width) + "," + std::to_string(height) + ","
+                  + typeName + "," + encoding + ",";
+    frame.reset();
+    auto elapsed = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::steady_clock::now() - start);
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        totalCompressTime += elapsed;
+        numEncoded++;
+        encoded.emplace(index, std::move(result));
+    }
+    commit();
+}
+
+void FrameArchiver::commit() {
+    // Whichever worker completes the next frame in order writes it and any following ones already compressed
+    std::lock_guard<std::mutex> writeLock(writeMtx);
+    while(true) {
+        Encoded item;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            auto it = encoded.find(nextIndex);
+            if(it == encoded.end()) break;
+            item = std::move(it->second);
+            encoded.erase(it);
+            nextIndex++;
+        }
+
+        std::string error = item.error;
+        std::uint64_t written = 0;
+        if(error.empty()) {
+            std::string file;
+            std::uint64_t offset = 0;
+            if(format == Format::PNG) {
+                file = getPngName(item);
+                std::string path = directory + "/" + file;
+                std::FILE* out = std::fopen(path.c_str(), "wb");
+                bool ok = out != nullptr && std::fwrite(item.data.data(), 1, item.data.size(), out) == item.data.size();
+                if(out != nullptr) ok = std::fclose(out) == 0 && ok;
+                if(!ok) error = "Couldn't write to file: " + path;
+            } else {
+                file = "frames.bin";
+                offset = dataOffset;
+                if(std::fwrite(item.data.data(), 1, item.data.size(), dataFile) != item.data.size()) {
+                    error = "Couldn't write to file: " + directory + "/frames.bin";
+                }
+                dataOffset += item.data.size();
+            }
+            if(error.empty()) {
+                item.line += file + "," + std::to_string(offset) + "," + std::to_string(item.data.size()) + "\n";
+                std::fputs(item.line.c_str(), indexFile);
+                std::fflush(indexFile);
+                written = item.data.size();
+            }
+        }
+
+        std::lock_guard<std::mutex> lock(mtx);
+        if(error.empty()) {
+            stats.numArchived++;
+            stats.numBytesIn += item.inputSize;
+            stats.numBytesOut += written;
+        } else {
+            stats.numFailed++;
+            stats.lastError = error;
+        }
+        stats.numPending--;
+        signalSpace.notify_all();
+        if(stats.numPending == 0) signalDone.notify_all();
+    }
+}
+
+std::string FrameArchiver::getPngName(const Encoded& item) {
+    auto inserted = pngStreams.emplace(item.stream, PngStream());
+    auto& stream = inserted.first->second;
+    if(!inserted.second && item.sequenceNum <= stream.lastSequenceNum) stream.numRestarts++;
+    stream.lastSequenceNum = item.sequenceNum;
+
+    std::string name = item.stream;
+    if(stream.numRestarts > 0) name += "-" + std::to_string(stream.numRestarts);
+    return name + "_" + padNumber(item.sequenceNum, 8) + ".png";
+}
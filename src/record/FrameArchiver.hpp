@@ -0,0 +1,159 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+// project
+#include "QueueSource.hpp"
+#include "utility/ThreadPool.hpp"
+
+/// Counters of a frame archiver
+struct FrameArchiverStats {
+    /// Number of frames archived
+    std::uint64_t numArchived = 0;
+    /// Number of frames discarded because too many were in flight
+    std::uint64_t numDropped = 0;
+    /// Number of frames which couldn't be archived (unsupported type, write error)
+    std::uint64_t numFailed = 0;
+    /// Message of last error
+    std::string lastError;
+    /// Size of archived frame data
+    std::uint64_t numBytesIn = 0;
+    /// Number of bytes written
+    std::uint64_t numBytesOut = 0;
+    /// Number of frames queued, being compressed or waiting for preceding frames
+    std::size_t numPending = 0;
+    /// Average time a worker spends compressing a frame
+    std::chrono::microseconds averageCompressTime{0};
+};
+
+/**
+ * @brief Losslessly archives GRAY8, RAW8 and RAW16 frames, compressed in parallel on a pool of worker threads.
+ *
+ * Frames are compressed concurrently but written in the order they were added, so files and the index
+ * follow the sequence numbers of the stream. The directory gets an 'index.csv' with a line per frame:
+ * sequenceNum, timestampUs, width, height, type, encoding, file, offset, size.
+ *  - PNG - each frame is written as '<stream>_<sequenceNum>.png' (8 or 16 bit grayscale). Stream is the name of the queue
+ *    the frame came from, or the frame's instance number if added directly. If sequence numbers of a stream restart
+ *    (eg. device reconnected), '-<n>' is appended to the stream, so earlier files aren't overwritten
+ *  - RAW - frames are appended to 'frames.bin', as zlib streams of frame data ('zlib' encoding)
+ *    or as is with compression level 0 ('raw' encoding)
+ */
+class FrameArchiver {
+   public:
+    enum class Format { PNG, RAW };
+
+    static constexpr std::size_t DEFAULT_MAX_PENDING = 32;
+    static constexpr int DEFAULT_COMPRESSION_LEVEL = 6;
+
+    /**
+     * Creates the directory and index and starts the workers. Throws if index can't be created
+     * @param directory Directory to archive into
+     * @param format Format of archived frames
+     * @param numThreads Number of worker threads, 0 for number of hardware threads
+     */
+    explicit FrameArchiver(std::string directory, Format format = Format::PNG, std::size_t numThreads = 0);
+    /// Archives queued frames and closes the archiver
+    ~FrameArchiver();
+
+    FrameArchiver(const FrameArchiver&) = delete;
+    FrameArchiver& operator=(const FrameArchiver&) = delete;
+
+    /// Archives all frames of a device output queue or a host queue (eg. ReconnectingDevice output queue). Device output queues are made non-blocking
+    void addQueue(const QueueSource& queue);
+
+    /**
+     * Queues a frame for archiving, can be called from any thread
+     * @param stream Name of the stream in PNG file names, frame's instance number if empty
+     * @returns False if frame was dropped or unsupported, or archiver is closed
+     */
+    bool add(const std::shared_ptr<dai::ImgFrame>& frame, const std::string& stream = "");
+
+    /// Sets compression level of subsequently added frames, 0 (none) to 9 (smallest). Default is 6
+    void setCompressionLevel(int level);
+    int getCompressionLevel() const;
+    /// Sets maximum number of frames in flight
+    void setMaxPending(std::size_t maxPending);
+    std::size_t getMaxPending() const;
+    /**
+     * Sets behavior when too many frames are in flight
+     * @param blocking True - 'add' waits for space (backpressure to the stream), false - new frames are dropped
+     */
+    void setBlocking(bool blocking);
+    bool getBlocking() const;
+
+    /**
+     * Waits until all queued frames are archived
+     * @returns False on timeout
+     */
+    bool wait(std::chrono::milliseconds timeout);
+    /// Stops accepting frames, archives queued frames and closes files
+    void close();
+
+    std::string getDirectory() const;
+    Format getFormat() const;
+    /// @returns Counters
+    FrameArchiverStats getStats() const;
+
+   private:
+    // Compressed frame, waiting for its turn to be written
+    struct Encoded {
+        std::string line;
+        std::string stream;
+        unsigned int sequenceNum = 0;
+        std::vector<std::uint8_t> data;
+        std::size_t inputSize = 0;
+        std::string error;
+    };
+
+    // Sequence numbers of a stream written as PNG, to detect restarts
+    struct PngStream {
+        unsigned int lastSequenceNum = 0;
+        unsigned int numRestarts = 0;
+    };
+
+    void encode(std::shared_ptr<dai::ImgFrame> frame, std::string stream, std::uint64_t index, int level);
+    void commit();
+    std::string getPngName(const Encoded& item);
+
+    const std::string directory;
+    const Format format;
+
+    mutable std::mutex mtx;
+    std::condition_variable signalSpace;
+    std::condition_variable signalDone;
+    int level = DEFAULT_COMPRESSION_LEVEL;
+    std::size_t maxPending = DEFAULT_MAX_PENDING;
+    bool blocking = false;
+    std::vector<std::function<void()>> unsubscribers;
+    std::uint64_t index = 0;
+    bool closed = false;
+    std::map<std::uint64_t, Encoded> encoded;
+    std::chrono::microseconds totalCompressTime{0};
+    std::uint64_t numEncoded = 0;
+    FrameArchiverStats stats;
+
+    // Held while writing, files are only touched by the committing worker
+    std::mutex writeMtx;
+    std::uint64_t nextIndex = 0;
+    std::FILE* indexFile = nullptr;
+    std::FILE* dataFile = nullptr;
+    std::uint64_t dataOffset = 0;
+    std::map<std::string, PngStream> pngStreams;
+
+    ThreadPool pool;
+};
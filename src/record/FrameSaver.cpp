@@ -0,0 +1,342 @@
+#include "FrameSaver.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+// project
+#include "utility/CacheDirectory.hpp"
+
+#if defined(_WIN32)
+    #include <io.h>
+#else
+    #include <unistd.h>
+#endif
+
+constexpr std::size_t FrameSaver::DEFAULT_MAX_PENDING_BYTES;
+constexpr std::size_t FrameSaver::MAX_SYNC_BATCH;
+
+namespace {
+
+using Type = dai::RawImgFrame::Type;
+
+const std::vector<std::string> FIELD_NAMES = {"timestamp", "timestampUs", "hostTime", "sequenceNum", "instanceNum", "index", "ext"};
+
+bool isJpeg(const std::vector<std::uint8_t>& data) {
+    return data.size() >= 2 && data[0] == 0xFF && data[1] == 0xD8;
+}
+
+// Channels of a frame written as PGM (1) or PPM (3), 0 if written as raw data
+unsigned int getNetpbmChannels(dai::ImgFrame& frame) {
+    auto width = static_cast<std::size_t>(frame.getWidth());
+    auto height = static_cast<std::size_t>(frame.getHeight());
+    unsigned int channels = 0;
+    switch(frame.getType()) {
+        case Type::GRAY8:
+        case Type::RAW8:
+            channels = 1;
+            break;
+        case Type::RGB888i:
+        case Type::BGR888i:
+        case Type::RGB888p:
+        case Type::BGR888p:
+            channels = 3;
+            break;
+        default:
+            return 0;
+    }
+    return width > 0 && height > 0 && frame.getData().size() >= width * height * channels ? channels : 0;
+}
+
+std::string getExtension(dai::ImgFrame& frame) {
+    if(frame.getType() == Type::BITSTREAM) return isJpeg(frame.getData()) ? "jpeg" : "raw";
+    switch(getNetpbmChannels(frame)) {
+        case 1:
+            return "pgm";
+        case 3:
+            return "ppm";
+        default:
+            return "raw";
+    }
+}
+
+}  // namespace
+
+FrameSaver::FrameSaver(std::string pathTemplate, std::size_t numThreads) : pathTemplate(std::move(pathTemplate)), pool(numThreads) {
+    std::size_t position = 0;
+    while(true) {
+        auto begin = this->pathTemplate.find('{', position);
+        if(begin == std::string::npos) break;
+        auto end = this->pathTemplate.find('}', begin);
+        if(end == std::string::npos) throw std::invalid_argument("Unterminated field in path template: " + this->pathTemplate);
+
+        Field field;
+        field.prefix = this->pathTemplate.substr(position, begin - position);
+        field.name = this->pathTemplate.substr(begin + 1, end - begin - 1);
+        field.width = 0;
+        auto colon = field.name.find(':');
+        if(colon != std::string::npos) {
+            auto width = field.name.substr(colon + 1);
+            field.name = field.name.substr(0, colon);
+            if(width.empty() || width.size() > 2 || !std::all_of(width.begin(), width.end(), [](char c) { return c >= '0' && c <= '9'; })) {
+                throw std::invalid_argument("Invalid width of field '" + field.name + "' in path template");
+            }
+            field.width = static_cast<unsigned int>(std::stoul(width));
+        }
+        if(std::find(FIELD_NAMES.begin(), FIELD_NAMES.end(), field.name) == FIELD_NAMES.end()) {
+            throw std::invalid_argument("Unknown field '" + field.name + "' in path template");
+        }
+        fields.push_back(field);
+        position = end + 1;
+    }
+    suffix = this->pathTemplate.substr(position);
+}
+
+FrameSaver::~FrameSaver() {
+    try {
+        close();
+    } catch(const std::exception&) {
+    }
+}
+
+void FrameSaver::addQueue(const QueueSource& queue) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(closed) throw std::logic_error("Frame saver is closed");
+    }
+    auto unsubscribe = queue.subscribe([this](std::shared_ptr<dai::ADatatype> msg) { add(std::dynamic_pointer_cast<dai::ImgFrame>(msg)); });
+    std::lock_guard<std::mutex> lock(mtx);
+    unsubscribers.push_back(std::move(unsubscribe));
+}
+
+bool FrameSaver::add(const std::shared_ptr<dai::ImgFrame>& frame) {
+    if(frame == nullptr) return false;
+    std::size_t size = frame->getData().size();
+    auto hostTime = std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::system_clock::now().time_since_epoch());
+    auto queued = std::chrono::steady_clock::now();
+
+    std::unique_lock<std::mutex> lock(mtx);
+    if(closed) return false;
+    auto fits = [this, size]() { return stats.pendingBytes == 0 || stats.pendingBytes + size <= maxPendingBytes; };
+    if(!fits()) {
+        if(!blocking) {
+            stats.numDropped++;
+            return false;
+        }
+        signalSpace.wait(lock, [this, &fits]() { return fits() || closed; });
+        if(closed) return false;
+    }
+
+    auto path = formatPath(*frame, index++, hostTime);
+    stats.pendingBytes += size;
+    stats.numPending++;
+    // Submitted under lock, so close can't miss it
+    pool.submit([this, frame, path, queued]() { save(frame, path, queued); });
+    return true;
+}
+
+void FrameSaver::setMaxPendingBytes(std::size_t maxPendingBytes) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->maxPendingBytes = maxPendingBytes;
+    signalSpace.notify_all();
+}
+
+std::size_t FrameSaver::getMaxPendingBytes() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return maxPendingBytes;
+}
+
+void FrameSaver::setBlocking(bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->blocking = blocking;
+    signalSpace.notify_all();
+}
+
+bool FrameSaver::getBlocking() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return blocking;
+}
+
+void FrameSaver::setSyncBatch(std::size_t batchSize) {
+    std::vector<OpenFile> toSync;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        syncBatch = std::min(batchSize, MAX_SYNC_BATCH);
+        if(unsynced.size() >= syncBatch) toSync.swap(unsynced);
+    }
+    syncFiles(std::move(toSync));
+}
+
+std::size_t FrameSaver::getSyncBatch() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return syncBatch;
+}
+
+std::string FrameSaver::formatPath(const std::shared_ptr<dai::ImgFrame>& frame, std::uint64_t index) const {
+    if(frame == nullptr) throw std::invalid_argument("Frame is null");
+    return formatPath(*frame, index, std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::system_clock::now().time_since_epoch()));
+}
+
+std::string FrameSaver::formatPath(dai::ImgFrame& frame, std::uint64_t index, std::chrono::milliseconds hostTime) const {
+    using namespace std::chrono;
+    std::string path;
+    path.reserve(pathTemplate.size() + 32);
+    for(const auto& field : fields) {
+        path += field.prefix;
+        std::string value;
+        if(field.name == "timestamp") {
+            value = std::to_string(duration_cast<milliseconds>(frame.getTimestamp().time_since_epoch()).count());
+        } else if(field.name == "timestampUs") {
+            value = std::to_string(duration_cast<microseconds>(frame.getTimestamp().time_since_epoch()).count());
+        } else if(field.name == "hostTime") {
+            value = std::to_string(hostTime.count());
+        } else if(field.name == "sequenceNum") {
+            value = std::to_string(frame.getSequenceNum());
+        } else if(field.name == "instanceNum") {
+            value = std::to_string(frame.getInstanceNum());
+        } else if(field.name == "index") {
+            value = std::to_string(index);
+        } else {
+            value = getExtension(frame);
+        }
+        if(value.size() < field.width) path.append(field.width - value.size(), '0');
+        path += value;
+    }
+    path += suffix;
+    return path;
+}
+
+bool FrameSaver::wait(std::chrono::milliseconds timeout) {
+    std::unique_lock<std::mutex> lock(mtx);
+    return signalDone.wait_for(lock, timeout, [this]() { return stats.numPending == 0; });
+}
+
+void FrameSaver::close() {
+    std::vector<std::function<void()>> toUnsubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toUnsubscribe = std::move(unsubscribers);
+        unsubscribers.clear();
+        closed = true;
+        signalSpace.notify_all();
+    }
+    for(auto& unsubscribe : toUnsubscribe) unsubscribe();
+
+    pool.wait();
+    std::vector<OpenFile> toSync;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        toSync.swap(unsynced);
+    }
+    syncFiles(std::move(toSync));
+}
+
+FrameSaverStats FrameSaver::getStats() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    FrameSaverStats result = stats;
+    std::uint64_t numWritten = stats.numSaved + stats.numFailed;
+    if(numWritten > 0) result.averageLatency = totalLatency / numWritten;
+    return result;
+}
+
+void FrameSaver::save(const std::shared_ptr<dai::ImgFrame>& frame, const std::string& path, std::chrono::steady_clock::time_point queued) {
+    const auto& data = frame->getData();
+    std::string header;
+    const std::uint8_t* body = data.data();
+    std::size_t bodySize = data.size();
+
+    // Netpbm frames are written in RGB order, others straight from frame data
+    std::vector<std::uint8_t> converted;
+    unsigned int channels = getNetpbmChannels(*frame);
+    if(channels > 0) {
+        std::size_t width = frame->getWidth();
+        std::size_t height = frame->getHeight();
+        std::size_t numPixels = width * height;
+        header = (channels == 1 ? "P5\n" : "P6\n") + std::to_string(width) + " " + std::to_string(height) + "\n255\n";
+        bodySize = numPixels * channels;
+        auto type = frame->getType();
+        if(type == Type::BGR888i) {
+            converted.resize(bodySize);
+            for(std::size_t i = 0; i < numPixels; i++) {
+                converted[3 * i] = data[3 * i + 2];
+                converted[3 * i + 1] = data[3 * i + 1];
+                converted[3 * i + 2] = data[3 * i];
+            }
+        } else if(type == Type::RGB888p || type == Type::BGR888p) {
+            converted.resize(bodySize);
+            bool bgr = type == Type::BGR888p;
+            for(std::size_t i = 0; i < numPixels; i++) {
+                converted[3 * i] = data[(bgr ? 2 : 0) * numPixels + i];
+                converted[3 * i + 1] = data[numPixels + i];
+                converted[3 * i + 2] = data[(bgr ? 0 : 2) * numPixels + i];
+            }
+        }
+        if(!converted.empty()) body = converted.data();
+    }
+
+    std::string error;
+    std::FILE* file = nullptr;
+    try {
+        file = std::fopen(path.c_str(), "wb");
+        if(file == nullptr) {
+            createParentDirectories(path);
+            file = std::fopen(path.c_str(), "wb");
+        }
+        if(file == nullptr) throw std::runtime_error("Couldn't create file: " + path);
+        // Written with at most two writes, stdio buffering would only add a copy
+        std::setvbuf(file, nullptr, _IONBF, 0);
+        bool ok = std::fwrite(header.data(), 1, header.size(), file) == header.size();
+        ok = ok && std::fwrite(body, 1, bodySize, file) == bodySize;
+        if(!ok) throw std::runtime_error("Couldn't write to file: " + path);
+    } catch(const std::exception& ex) {
+        error = ex.what();
+        if(file != nullptr) std::fclose(file);
+        file = nullptr;
+    }
+
+    std::vector<OpenFile> toSync;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(file != nullptr && syncBatch > 0) {
+            unsynced.push_back({file, path});
+            if(unsynced.size() >= syncBatch) toSync.swap(unsynced);
+            file = nullptr;
+        }
+    }
+    if(file != nullptr && std::fclose(file) != 0) error = "Couldn't write to file: " + path;
+    syncFiles(std::move(toSync));
+
+    auto latency = std::chrono::duration_cast<std::chrono::microseconds>(std::chrono::steady_clock::now() - queued);
+    std::lock_guard<std::mutex> lock(mtx);
+    if(error.empty()) {
+        stats.numSaved++;
+        stats.numBytes += header.size() + bodySize;
+        stats.lastPath = path;
+    } else {
+        stats.numFailed++;
+        stats.lastError = error;
+    }
+    totalLatency += latency;
+    stats.maxLatency = std::max(stats.maxLatency, latency);
+    stats.pendingBytes -= data.size();
+    stats.numPending--;
+    signalSpace.notify_all();
+    signalDone.notify_all();
+}
+
+void FrameSaver::syncFiles(std::vector<OpenFile> files) {
+    std::string error;
+    for(auto& openFile : files) {
+#if defined(_WIN32)
+        bool ok = _commit(_fileno(openFile.file)) == 0;
+#else
+        bool ok = fsync(fileno(openFile.file)) == 0;
+#endif
+        ok = std::fclose(openFile.file) == 0 && ok;
+        if(!ok) error = "Couldn't sync file: " + openFile.path;
+    }
+    if(!error.empty()) {
+        std::lock_guard<std::mutex> lock(mtx);
+        stats.lastError = error;
+    }
+}
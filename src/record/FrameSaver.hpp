@@ -0,0 +1,154 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+// project
+#include "QueueSource.hpp"
+#include "utility/ThreadPool.hpp"
+
+/// Counters of a frame saver
+struct FrameSaverStats {
+    /// Number of files written
+    std::uint64_t numSaved = 0;
+    /// Number of frames discarded because too many bytes were in flight
+    std::uint64_t numDropped = 0;
+    /// Number of frames which couldn't be written
+    std::uint64_t numFailed = 0;
+    /// Message of last error
+    std::string lastError;
+    /// Number of bytes written
+    std::uint64_t numBytes = 0;
+    /// Number of frames queued or being written
+    std::size_t numPending = 0;
+    /// Size of frames queued or being written
+    std::size_t pendingBytes = 0;
+    /// Time from queuing a frame until its file is written
+    std::chrono::microseconds averageLatency{0};
+    /// Longest time from queuing a frame until its file is written
+    std::chrono::microseconds maxLatency{0};
+    /// Path of last written file
+    std::string lastPath;
+};
+
+/**
+ * @brief Saves frames to files from a pool of writer threads.
+ *
+ * BITSTREAM frames (eg. MJPEG stills) are written as they are, directly from frame data.
+ * Raw GRAY8 / RAW8 frames are written as PGM and RGB / BGR frames as PPM, other types as raw data.
+ * Paths are formatted from a template with fields of the frame:
+ *  - {timestamp} - device timestamp in milliseconds, {timestampUs} in microseconds
+ *  - {hostTime} - host wall clock time at queuing, in milliseconds since epoch
+ *  - {sequenceNum}, {instanceNum} - sequence and instance number of the frame
+ *  - {index} - number of frames queued before this one
+ *  - {ext} - 'jpeg' for JPEG images, 'pgm' / 'ppm' for converted frames, 'raw' otherwise
+ *
+ * Numeric fields can be zero padded, eg. {sequenceNum:06}. Missing directories are created.
+ * Frames in flight are bounded by their total size, so a slow disk can't exhaust memory.
+ */
+class FrameSaver {
+   public:
+    static constexpr std::size_t DEFAULT_MAX_PENDING_BYTES = 512 * 1024 * 1024;
+    /// Largest sync batch, files of a batch are kept open until it is synced
+    static constexpr std::size_t MAX_SYNC_BATCH = 64;
+
+    /**
+     * Starts the writer threads. Throws if template has unknown fields
+     * @param pathTemplate Template of file paths, eg. "stills/{timestamp}.{ext}"
+     * @param numThreads Number of writer threads, 0 for number of hardware threads
+     */
+    explicit FrameSaver(std::string pathTemplate, std::size_t numThreads = 0);
+    /// Writes queued frames and closes the saver
+    ~FrameSaver();
+
+    FrameSaver(const FrameSaver&) = delete;
+    FrameSaver& operator=(const FrameSaver&) = delete;
+
+    /// Saves all frames of a device output queue or a host queue (eg. ReconnectingDevice output queue). Device output queues are made non-blocking
+    void addQueue(const QueueSource& queue);
+
+    /**
+     * Queues a frame for writing, can be called from any thread
+     * @returns False if frame was dropped or saver is closed
+     */
+    bool add(const std::shared_ptr<dai::ImgFrame>& frame);
+
+    /// Sets maximum size of frames queued or being written. A single larger frame is accepted when nothing is in flight
+    void setMaxPendingBytes(std::size_t maxPendingBytes);
+    std::size_t getMaxPendingBytes() const;
+    /**
+     * Sets behavior when too many bytes are in flight
+     * @param blocking True - 'add' waits for space (backpressure to the stream), false - new frames are dropped
+     */
+    void setBlocking(bool blocking);
+    bool getBlocking() const;
+    /**
+     * Sets how many written files are synced to disk (fsync) together, 0 disables syncing (default).
+     * Files are kept open until their batch is complete, remaining ones are synced on close.
+     * Batch size is capped at MAX_SYNC_BATCH, so open files stay well below descriptor limits
+     */
+    void setSyncBatch(std::size_t batchSize);
+    std::size_t getSyncBatch() const;
+
+    /// @returns Path a frame would be saved to, as the 'index'-th frame
+    std::string formatPath(const std::shared_ptr<dai::ImgFrame>& frame, std::uint64_t index) const;
+
+    /**
+     * Waits until all queued frames are written
+     * @returns False on timeout
+     */
+    bool wait(std::chrono::milliseconds timeout);
+    /// Stops accepting frames, writes queued frames and syncs remaining files
+    void close();
+
+    /// @returns Counters
+    FrameSaverStats getStats() const;
+
+   private:
+    struct Field {
+        // Literal text preceding the field
+        std::string prefix;
+        std::string name;
+        unsigned int width;
+    };
+    struct OpenFile {
+        std::FILE* file;
+        std::string path;
+    };
+
+    std::string formatPath(dai::ImgFrame& frame, std::uint64_t index, std::chrono::milliseconds hostTime) const;
+    void save(const std::shared_ptr<dai::ImgFrame>& frame, const std::string& path, std::chrono::steady_clock::time_point queued);
+    void syncFiles(std::vector<OpenFile> files);
+
+    const std::string pathTemplate;
+    std::vector<Field> fields;
+    std::string suffix;
+
+    mutable std::mutex mtx;
+    std::condition_variable signalSpace;
+    std::condition_variable signalDone;
+    std::size_t maxPendingBytes = DEFAULT_MAX_PENDING_BYTES;
+    bool blocking = false;
+    std::size_t syncBatch = 0;
+    std::vector<OpenFile> unsynced;
+    std::vector<std::function<void()>> unsubscribers;
+    std::uint64_t index = 0;
+    bool closed = false;
+    std::chrono::microseconds totalLatency{0};
+    FrameSaverStats stats;
+
+    ThreadPool pool;
+};
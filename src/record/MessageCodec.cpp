@@ -0,0 +1,106 @@
+#include "MessageCodec.hpp"
+
+// std
+#include <stdexcept>
+#include <string>
+
+// libraries
+#include "nlohmann/json.hpp"
+
+// depthai
+#include "depthai/pipeline/datatype/Buffer.hpp"
+#include "depthai/pipeline/datatype/CameraControl.hpp"
+#include "depthai/pipeline/datatype/EdgeDetectorConfig.hpp"
+#include "depthai/pipeline/datatype/IMUData.hpp"
+#include "depthai/pipeline/datatype/ImageManipConfig.hpp"
+#include "depthai/pipeline/datatype/ImgDetections.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+#include "depthai/pipeline/datatype/NNData.hpp"
+#include "depthai/pipeline/datatype/SpatialImgDetections.hpp"
+#include "depthai/pipeline/datatype/SpatialLocationCalculatorConfig.hpp"
+#include "depthai/pipeline/datatype/SpatialLocationCalculatorData.hpp"
+#include "depthai/pipeline/datatype/StereoDepthConfig.hpp"
+#include "depthai/pipeline/datatype/SystemInformation.hpp"
+#include "depthai/pipeline/datatype/Tracklets.hpp"
+
+namespace {
+
+std::chrono::nanoseconds toDuration(const dai::Timestamp& ts) {
+    return std::chrono::seconds(ts.sec) + std::chrono::nanoseconds(ts.nsec);
+}
+
+template <typename T, typename R>
+std::shared_ptr<dai::ADatatype> decode(const std::uint8_t* metadata, std::size_t metadataSize, const std::uint8_t* data, std::size_t dataSize) {
+    auto raw = std::make_shared<R>();
+    nlohmann::json json = nlohmann::json::from_msgpack(metadata, metadata + metadataSize);
+    nlohmann::from_json(json, *raw);
+    raw->data.assign(data, data + dataSize);
+    return std::make_shared<T>(raw);
+}
+
+}  // namespace
+
+MessageInfo getMessageInfo(const dai::RawBuffer& raw) {
+    MessageInfo info;
+    raw.serialize(info.metadata, info.datatype);
+
+    if(info.datatype == dai::DatatypeEnum::ImgFrame) {
+        const auto& frame = static_cast<const dai::RawImgFrame&>(raw);
+        info.hasTimestamp = true;
+        info.timestamp = toDuration(frame.ts);
+        info.sequenceNum = frame.sequenceNum;
+        info.width = frame.fb.width;
+        info.height = frame.fb.height;
+    } else if(info.datatype == dai::DatatypeEnum::IMUData) {
+        // Latest report of the batch
+        const auto& imu = static_cast<const dai::RawIMUData&>(raw);
+        if(!imu.packets.empty()) {
+            const auto& packet = imu.packets.back();
+            auto ts = toDuration(packet.acceleroMeter.timestamp);
+            if(ts.count() == 0) ts = toDuration(packet.gyroscope.timestamp);
+            info.hasTimestamp = ts.count() != 0;
+            info.timestamp = ts;
+        }
+    }
+    return info;
+}
+
+std::shared_ptr<dai::ADatatype> decodeMessage(
+    dai::DatatypeEnum datatype, const std::uint8_t* metadata, std::size_t metadataSize, const std::uint8_t* data, std::size_t dataSize) {
+    using namespace dai;
+    switch(datatype) {
+        case DatatypeEnum::Buffer: {
+            // No metadata is serialized for Buffer
+            auto raw = std::make_shared<RawBuffer>();
+            raw->data.assign(data, data + dataSize);
+            return std::make_shared<Buffer>(raw);
+        }
+        case DatatypeEnum::ImgFrame:
+            return decode<ImgFrame, RawImgFrame>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::NNData:
+            return decode<NNData, RawNNData>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::ImageManipConfig:
+            return decode<ImageManipConfig, RawImageManipConfig>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::CameraControl:
+            return decode<CameraControl, RawCameraControl>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::ImgDetections:
+            return decode<ImgDetections, RawImgDetections>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::SpatialImgDetections:
+            return decode<SpatialImgDetections, RawSpatialImgDetections>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::SystemInformation:
+            return decode<SystemInformation, RawSystemInformation>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::SpatialLocationCalculatorConfig:
+            return decode<SpatialLocationCalculatorConfig, RawSpatialLocationCalculatorConfig>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::SpatialLocationCalculatorData:
+            return decode<SpatialLocationCalculatorData, RawSpatialLocations>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::EdgeDetectorConfig:
+            return decode<EdgeDetectorConfig, RawEdgeDetectorConfig>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::Tracklets:
+            return decode<Tracklets, RawTracklets>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::IMUData:
+            return decode<IMUData, RawIMUData>(metadata, metadataSize, data, dataSize);
+        case DatatypeEnum::StereoDepthConfig:
+            return decode<StereoDepthConfig, RawStereoDepthConfig>(metadata, metadataSize, data, dataSize);
+    }
+    throw std::invalid_argument("Unknown message datatype: " + std::to_string(static_cast<int>(datatype)));
+}
@@ -0,0 +1,44 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+// shared
+#include "depthai-shared/datatype/DatatypeEnum.hpp"
+
+/// Metadata of a message, as needed to store and index it
+struct MessageInfo {
+    /// Type of the message
+    dai::DatatypeEnum datatype = dai::DatatypeEnum::Buffer;
+    /// Serialized metadata (msgpack), same as sent over XLink. Empty for Buffer
+    std::vector<std::uint8_t> metadata;
+    /// Whether message carries a device timestamp (ImgFrame, IMUData)
+    bool hasTimestamp = false;
+    /// Device timestamp, synced to host steady clock
+    std::chrono::nanoseconds timestamp{0};
+    /// Sequence number of ImgFrame messages, -1 otherwise
+    std::int64_t sequenceNum = -1;
+    /// Dimensions of ImgFrame messages, 0 otherwise
+    std::uint32_t width = 0;
+    std::uint32_t height = 0;
+};
+
+/// Serializes metadata of a message (ADatatype::getRaw) and extracts its timestamp, sequence number and dimensions
+MessageInfo getMessageInfo(const dai::RawBuffer& raw);
+
+/**
+ * Creates a message from its serialized metadata and data, inverse of getMessageInfo.
+ * Throws if datatype is unknown or metadata can't be parsed
+ */
+std::shared_ptr<dai::ADatatype> decodeMessage(dai::DatatypeEnum datatype,
+                                              const std::uint8_t* metadata,
+                                              std::size_t metadataSize,
+                                              const std::uint8_t* data,
+                                              std::size_t dataSize);
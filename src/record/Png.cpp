@@ -0,0 +1,131 @@
+#include "Png.hpp"
+
+// std
+#include <algorithm>
+#include <cstdlib>
+#include <stdexcept>
+
+// project
+#include "utility/Deflate.hpp"
+
+namespace png {
+
+namespace {
+
+enum Filter : std::uint8_t { NONE = 0, SUB = 1, UP = 2, AVERAGE = 3, PAETH = 4 };
+
+std::uint8_t paeth(int a, int b, int c) {
+    int p = a + b - c;
+    int pa = std::abs(p - a);
+    int pb = std::abs(p - b);
+    int pc = std::abs(p - c);
+    if(pa <= pb && pa <= pc) return static_cast<std::uint8_t>(a);
+    return static_cast<std::uint8_t>(pb <= pc ? b : c);
+}
+
+// Filters a row into 'out', 'previous' is null for the first row
+void filterRow(Filter filter, const std::uint8_t* row, const std::uint8_t* previous, std::size_t size, std::size_t bpp, std::uint8_t* out) {
+    for(std::size_t i = 0; i < size; i++) {
+        int a = i >= bpp ? row[i - bpp] : 0;
+        int b = previous != nullptr ? previous[i] : 0;
+        int c = previous != nullptr && i >= bpp ? previous[i - bpp] : 0;
+        int predicted = 0;
+        switch(filter) {
+            case NONE:
+                break;
+            case SUB:
+                predicted = a;
+                break;
+            case UP:
+                predicted = b;
+                break;
+            case AVERAGE:
+                predicted = (a + b) / 2;
+                break;
+            case PAETH:
+                predicted = paeth(a, b, c);
+                break;
+        }
+        out[i] = static_cast<std::uint8_t>(row[i] - predicted);
+    }
+}
+
+// Heuristic cost of a filtered row, residuals taken as signed bytes
+std::uint64_t cost(const std::uint8_t* data, std::size_t size) {
+    std::uint64_t sum = 0;
+    for(std::size_t i = 0; i < size; i++) sum += static_cast<std::uint64_t>(std::abs(static_cast<int>(static_cast<std::int8_t>(data[i]))));
+    return sum;
+}
+
+void appendUint32(std::vector<std::uint8_t>& out, std::uint32_t value) {
+    for(int shift = 24; shift >= 0; shift -= 8) out.push_back(static_cast<std::uint8_t>(value >> shift));
+}
+
+void appendChunk(std::vector<std::uint8_t>& out, const char* type, const std::uint8_t* data, std::size_t size) {
+    appendUint32(out, static_cast<std::uint32_t>(size));
+    std::size_t start = out.size();
+    out.insert(out.end(), type, type + 4);
+    out.insert(out.end(), data, data + size);
+    appendUint32(out, crc32(out.data() + start, out.size() - start));
+}
+
+}  // namespace
+
+std::vector<std::uint8_t> encodeGray(const std::uint8_t* pixels, unsigned int width, unsigned int height, unsigned int bitDepth, int level) {
+    if(width == 0 || height == 0) throw std::invalid_argument("Image must not be empty");
+    if(bitDepth != 8 && bitDepth != 16) throw std::invalid_argument("Bit depth must be 8 or 16");
+
+    std::size_t bpp = bitDepth / 8;
+    std::size_t rowSize = static_cast<std::size_t>(width) * bpp;
+
+    // PNG samples are big endian
+    std::vector<std::uint8_t> swapped;
+    if(bpp == 2) {
+        swapped.resize(rowSize * height);
+        for(std::size_t i = 0; i < swapped.size(); i += 2) {
+            swapped[i] = pixels[i + 1];
+            swapped[i + 1] = pixels[i];
+        }
+        pixels = swapped.data();
+    }
+
+    // Each row is prefixed by its filter type
+    std::vector<std::uint8_t> filtered((rowSize + 1) * height);
+    std::vector<std::uint8_t> candidate(rowSize);
+    for(std::size_t y = 0; y < height; y++) {
+        const std::uint8_t* row = pixels + y * rowSize;
+        const std::uint8_t* previous = y > 0 ? row - rowSize : nullptr;
+        std::uint8_t* out = filtered.data() + y * (rowSize + 1);
+        Filter best = NONE;
+        std::uint64_t bestCost = 0;
+        if(level == 0) {
+            filterRow(NONE, row, previous, rowSize, bpp, out + 1);
+        } else {
+            for(auto filter : {NONE, SUB, UP, AVERAGE, PAETH}) {
+                filterRow(filter, row, previous, rowSize, bpp, candidate.data());
+                std::uint64_t filterCost = cost(candidate.data(), rowSize);
+                if(filter == NONE || filterCost < bestCost) {
+                    best = filter;
+                    bestCost = filterCost;
+                    std::copy(candidate.begin(), candidate.end(), out + 1);
+                }
+            }
+        }
+        out[0] = best;
+    }
+    auto compressed = zlibCompress(filtered.data(), filtered.size(), level);
+
+    std::vector<std::uint8_t> png = {0x89, 'P', 'N', 'G', '\r', '\n', 0x1A, '\n'};
+    png.reserve(png.size() + compressed.size() + 64);
+    std::vector<std::uint8_t> header;
+    appendUint32(header, width);
+    appendUint32(header, height);
+    // Bit depth, grayscale, deflate, adaptive filtering, no interlace
+    header.insert(header.end(), {static_cast<std::uint8_t>(bitDepth), 0, 0, 0, 0});
+    appendChunk(png, "IHDR", header.data(), header.size());
+    appendChunk(png, "IDAT", compressed.data(), compressed.size());
+    appendChunk(png, "IEND", nullptr, 0);
+    return png;
+}
+
+}  // namespace png
@@ -0,0 +1,24 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+/**
+ * Encoding of grayscale PNG images (8 or 16 bit), as used to archive mono camera frames losslessly.
+ */
+namespace png {
+
+/**
+ * Encodes a grayscale image. Each row gets the filter with smallest sum of absolute differences
+ * @param pixels Rows of pixels without padding, 16 bit samples in native (little endian) byte order
+ * @param width Width in pixels
+ * @param height Height in pixels
+ * @param bitDepth 8 or 16
+ * @param level Compression level, 0 (none) to 9 (smallest)
+ * @returns PNG file contents
+ */
+std::vector<std::uint8_t> encodeGray(const std::uint8_t* pixels, unsigned int width, unsigned int height, unsigned int bitDepth, int level);
+
+}  // namespace png
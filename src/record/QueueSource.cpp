@@ -0,0 +1,24 @@
+#include "QueueSource.hpp"
+
+QueueSource::QueueSource(std::shared_ptr<dai::DataOutputQueue> queue) : name(queue->getName()) {
+    subscriber = [queue](Callback callback) -> std::function<void()> {
+        queue->setBlocking(false);
+        int id = queue->addCallback(std::move(callback));
+        return [queue, id]() { queue->removeCallback(id); };
+    };
+}
+
+QueueSource::QueueSource(std::shared_ptr<MessageQueue> queue) : name(queue->getName()) {
+    subscriber = [queue](Callback callback) -> std::function<void()> {
+        int id = queue->addCallback(std::move(callback));
+        return [queue, id]() { queue->removeCallback(id); };
+    };
+}
+
+std::string QueueSource::getName() const {
+    return name;
+}
+
+std::function<void()> QueueSource::subscribe(Callback callback) const {
+    return subscriber(std::move(callback));
+}
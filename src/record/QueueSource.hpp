@@ -0,0 +1,40 @@
+#pragma once
+
+// std
+#include <functional>
+#include <memory>
+#include <string>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// project
+#include "device/MessageQueue.hpp"
+
+/**
+ * @brief Queue feeding a host side consumer (recorder, muxer, frame saver, ...), either a device output queue or a host queue.
+ *
+ * Consumers accept both kinds of queues through it. Device output queues are made non-blocking once subscribed to,
+ * so a slow consumer drops messages instead of stalling the device
+ */
+class QueueSource {
+   public:
+    using Callback = std::function<void(std::shared_ptr<dai::ADatatype>)>;
+
+    // Implicit, so consumers take either kind of queue
+    QueueSource(std::shared_ptr<dai::DataOutputQueue> queue);
+    QueueSource(std::shared_ptr<MessageQueue> queue);
+
+    /// @returns Name of the queue
+    std::string getName() const;
+
+    /**
+     * Adds a callback called with each message of the queue
+     * @returns Function removing the callback again
+     */
+    std::function<void()> subscribe(Callback callback) const;
+
+   private:
+    std::string name;
+    std::function<std::function<void()>(Callback)> subscriber;
+};
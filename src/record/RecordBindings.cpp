@@ -0,0 +1,545 @@
+#include "RecordBindings.hpp"
+
+// std
+#include <algorithm>
+#include <chrono>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+
+// project
+#include "BitstreamRingBuffer.hpp"
+#include "DatasetStreamer.hpp"
+#include "FrameArchiver.hpp"
+#include "FrameSaver.hpp"
+#include "Recorder.hpp"
+#include "RecordingReader.hpp"
+#include "ReplayDevice.hpp"
+#include "VideoMuxer.hpp"
+
+// Same as Device.getQueueEvents, waits in steps so python interrupts are handled
+static std::vector<std::string> replayGetQueueEventsHelper(ReplayDevice& d, const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout){
+    using namespace std::chrono;
+
+    bool unlimitedTimeout = timeout < microseconds(0);
+    auto startTime = steady_clock::now();
+    do {
+        {
+            // releases python GIL
+            py::gil_scoped_release release;
+            // block for 100ms
+            auto events = d.getQueueEvents(queueNames, maxNumEvents, std::chrono::milliseconds(100));
+            if(!events.empty() || d.isClosed()) return events;
+        }
+        // reacquires python GIL for PyErr_CheckSignals call
+        // check if interrupt triggered in between
+        if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+    } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+
+    return std::vector<std::string>();
+}
+
+// Wraps a python decoder returning a HxW or HxWxC uint8 array in BGR order (eg. cv2.imread), called on decoding threads
+static DatasetStreamer::Decoder wrapDecoder(py::function decoder){
+    // Python reference is released with the GIL held, whichever thread drops the last copy
+    std::shared_ptr<py::function> function(new py::function(std::move(decoder)), [](py::function* f) {
+        py::gil_scoped_acquire gil;
+        delete f;
+    });
+    return [function](const std::string& path) {
+        py::gil_scoped_acquire gil;
+        try {
+            py::object result = (*function)(path);
+            if(result.is_none()) throw std::runtime_error("Decoder couldn't read: " + path);
+            auto array = py::array_t<std::uint8_t, py::array::c_style | py::array::forcecast>::ensure(result);
+            if(!array || (array.ndim() != 2 && array.ndim() != 3)) throw std::runtime_error("Decoder must return a HxW or HxWxC uint8 array");
+            DecodedImage image;
+            image.height = static_cast<unsigned int>(array.shape(0));
+            image.width = static_cast<unsigned int>(array.shape(1));
+            image.channels = array.ndim() == 3 ? static_cast<unsigned int>(array.shape(2)) : 1;
+            image.data.assign(array.data(), array.data() + array.size());
+            return image;
+        } catch(const py::error_already_set& ex) {
+            // Python error state is cleared here, while GIL is held
+            throw std::runtime_error(ex.what());
+        }
+    };
+}
+
+void RecordBindings::bind(pybind11::module& m){
+
+    using namespace dai;
+    using namespace std::chrono;
+
+    py::class_<RecordIndexEntry>(m, "RecordIndexEntry", "Index entry of a recorded message")
+        .def(py::init<>())
+        .def_readonly("stream", &RecordIndexEntry::stream, "Index of stream the message was recorded from")
+        .def_readonly("datatype", &RecordIndexEntry::datatype, "Type of the message")
+        .def_readonly("sequenceNum", &RecordIndexEntry::sequenceNum, "Sequence number of the frame, or number of message within its stream for other types")
+        .def_readonly("timestamp", &RecordIndexEntry::timestamp, "Device timestamp if message carries one, host arrival time otherwise")
+        .def_readonly("hostTimestamp", &RecordIndexEntry::hostTimestamp, "Host arrival time")
+        .def_readonly("width", &RecordIndexEntry::width, "Width of frames, 0 for other types")
+        .def_readonly("height", &RecordIndexEntry::height, "Height of frames, 0 for other types")
+        .def_readonly("offset", &RecordIndexEntry::offset, "Offset of the record in the file")
+        .def_readonly("size", &RecordIndexEntry::size, "Size of the record in the file")
+        ;
+
+    py::class_<RecorderStats>(m, "RecorderStats", "Counters of a recorder")
+        .def(py::init<>())
+        .def_readonly("numRecorded", &RecorderStats::numRecorded, "Number of messages written")
+        .def_readonly("numDropped", &RecorderStats::numDropped, "Number of messages discarded because writer couldn't keep up")
+        .def_readonly("numBytes", &RecorderStats::numBytes, "Number of bytes written to file")
+        .def_readonly("numChunks", &RecorderStats::numChunks, "Number of chunks written to file")
+        .def_readonly("numPending", &RecorderStats::numPending, "Number of messages waiting for writer")
+        ;
+
+    py::class_<Recorder, std::shared_ptr<Recorder>>(m, "Recorder", "Records messages of multiple streams into a single indexed file, on a writer thread. On a crash at most one chunk (chunk size or flush interval worth of messages) is lost")
+        .def(py::init([](const std::string& path){
+            // Closing detaches queue callbacks and joins the writer thread, which may wait for a callback needing the GIL
+            return std::shared_ptr<Recorder>(new Recorder(path), [](Recorder* r) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete r;
+                } else {
+                    delete r;
+                }
+            });
+        }), py::arg("path"))
+        .def("addStream", &Recorder::addStream, py::arg("name"), "Adds a stream, messages are added to it with 'add'. Streams must be added before start. Returns index of the stream")
+        .def("addQueue", [](Recorder& r, std::shared_ptr<DataOutputQueue> queue, const std::string& name) { return r.addQueue(queue, name); }, py::arg("queue"), py::arg("name") = "", py::call_guard<py::gil_scoped_release>(), "Records all messages of a device output queue, which is made non-blocking. Stream is named after the queue if name is empty")
+        .def("addQueue", [](Recorder& r, std::shared_ptr<MessageQueue> queue, const std::string& name) { return r.addQueue(queue, name); }, py::arg("queue"), py::arg("name") = "", py::call_guard<py::gil_scoped_release>(), "Records all messages of a host queue")
+        .def("getStreams", &Recorder::getStreams, "Get names of streams, by stream index")
+        .def("add", py::overload_cast<const std::string&, const std::shared_ptr<ADatatype>&>(&Recorder::add), py::arg("stream"), py::arg("msg"), py::call_guard<py::gil_scoped_release>(), "Queues a message for writing. Returns False if message was dropped or recorder isn't running")
+        .def("add", py::overload_cast<std::uint32_t, const std::shared_ptr<ADatatype>&>(&Recorder::add), py::arg("stream"), py::arg("msg"), py::call_guard<py::gil_scoped_release>(), "Queues a message for writing. Returns False if message was dropped or recorder isn't running")
+        .def("setChunkSize", &Recorder::setChunkSize, py::arg("size"), "Sets size after which a chunk is written")
+        .def("getChunkSize", &Recorder::getChunkSize, "Get size after which a chunk is written")
+        .def("setFlushInterval", &Recorder::setFlushInterval, py::arg("interval"), "Sets maximum time messages wait in a chunk before it is written")
+        .def("getFlushInterval", &Recorder::getFlushInterval, "Get maximum time messages wait in a chunk before it is written")
+        .def("setSync", &Recorder::setSync, py::arg("sync"), "Sets whether each chunk is synced to disk after writing")
+        .def("getSync", &Recorder::getSync, "Get whether each chunk is synced to disk after writing")
+        .def("setMaxPending", &Recorder::setMaxPending, py::arg("maxPending"), "Sets maximum number of messages waiting for writer")
+        .def("getMaxPending", &Recorder::getMaxPending, "Get maximum number of messages waiting for writer")
+        .def("setBlocking", &Recorder::setBlocking, py::arg("blocking"), "Sets behavior when writer can't keep up. True - 'add' waits for space, false - new messages are dropped")
+        .def("getBlocking", &Recorder::getBlocking, "Get behavior when writer can't keep up")
+        .def("start", &Recorder::start, py::call_guard<py::gil_scoped_release>(), "Creates the file and starts recording")
+        .def("close", &Recorder::close, py::call_guard<py::gil_scoped_release>(), "Writes pending messages and index and closes the file")
+        .def("isRunning", &Recorder::isRunning, "Check whether recording")
+        .def("getStats", &Recorder::getStats, "Get counters")
+        .def("getPath", &Recorder::getPath, "Get path of the recording")
+        .def("__enter__", [](Recorder& r) -> Recorder& {
+            r.start();
+            return r;
+        }, py::return_value_policy::reference_internal, py::call_guard<py::gil_scoped_release>())
+        .def("__exit__", [](Recorder& r, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            r.close();
+        })
+        ;
+
+    py::class_<RecordingReader>(m, "RecordingReader", "Random access to a memory mapped recording. Recordings which weren't closed are recovered up to the last completely written chunk")
+        .def(py::init<std::string>(), py::arg("path"))
+        .def("getStreams", &RecordingReader::getStreams, "Get names of recorded streams, by stream index")
+        .def("isComplete", &RecordingReader::isComplete, "Check whether recording was closed. False if it was recovered from its chunks")
+        .def("getNumMessages", &RecordingReader::getNumMessages, "Get number of recorded messages")
+        .def("__len__", &RecordingReader::getNumMessages)
+        .def("getIndex", py::overload_cast<>(&RecordingReader::getIndex, py::const_), "Get index of all messages, in recording order")
+        .def("getIndex", py::overload_cast<const std::string&>(&RecordingReader::getIndex, py::const_), py::arg("stream"), "Get index of messages of a stream, ordered by timestamp")
+        .def("read", &RecordingReader::read, py::arg("entry"), py::call_guard<py::gil_scoped_release>(), "Reads a message")
+        .def("getData", [](py::object& obj, const RecordIndexEntry& entry){
+            auto& reader = obj.cast<RecordingReader&>();
+            std::size_t size = 0;
+            const auto* data = reader.getData(entry, size);
+            // Read-only view of the mapped file, keeps the reader alive
+            py::array_t<std::uint8_t> array(size, data, obj);
+            array.attr("setflags")(py::arg("write") = false);
+            return array;
+        }, py::arg("entry"), "Gets data of a message as a read-only array viewing the mapped file, without copying")
+        .def("get", &RecordingReader::get, py::arg("i"), py::call_guard<py::gil_scoped_release>(), "Reads i-th message, in recording order")
+        .def("__getitem__", &RecordingReader::get, py::call_guard<py::gil_scoped_release>())
+        .def("getNearest", &RecordingReader::getNearest, py::arg("stream"), py::arg("timestamp"), py::call_guard<py::gil_scoped_release>(), "Reads message of a stream with timestamp closest to 'timestamp', None if stream has no messages")
+        .def("getRange", &RecordingReader::getRange, py::arg("stream"), py::arg("begin"), py::arg("end"), "Get index of messages of a stream with timestamps in [begin, end)")
+        .def("getPath", &RecordingReader::getPath, "Get path of the recording")
+        ;
+
+    py::class_<ReplayDevice, std::shared_ptr<ReplayDevice>>(m, "ReplayDevice", "Plays back a recording through queues with the same API as device output queues. Only streams whose output queues were requested before startPipeline are played")
+        .def(py::init([](const std::string& path, float speed, bool loop){
+            // Closing joins the playback thread, which may be blocked in a queue callback needing the GIL
+            return std::shared_ptr<ReplayDevice>(new ReplayDevice(path, speed, loop), [](ReplayDevice* d) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete d;
+                } else {
+                    delete d;
+                }
+            });
+        }), py::arg("path"), py::arg("speed") = 1.0f, py::arg("loop") = false, "Opens a recording. 'speed' - playback speed relative to original timing, 0 to play as fast as queues are consumed")
+        .def("getOutputQueue", &ReplayDevice::getOutputQueue, py::arg("name"), py::arg("maxSize") = 16, py::arg("blocking") = true, "Gets output queue of a recorded stream")
+        .def("getInputQueue", &ReplayDevice::getInputQueue, py::arg("name"), py::arg("maxSize") = 16, py::arg("blocking") = false, "Gets an input queue, which keeps sent messages so they can be inspected")
+        .def("getOutputQueueNames", &ReplayDevice::getOutputQueueNames, "Get names of recorded streams")
+        .def("getInputQueueNames", &ReplayDevice::getInputQueueNames, "Get names of requested input queues")
+        .def("getQueueEvents", [](ReplayDevice& d, const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout) {
+            return replayGetQueueEventsHelper(d, queueNames, maxNumEvents, timeout);
+        }, py::arg("queueNames"), py::arg("maxNumEvents") = std::numeric_limits<std::size_t>::max(), py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until any of specified queues has received a message")
+        .def("getQueueEvents", [](ReplayDevice& d, std::string queueName, std::size_t maxNumEvents, std::chrono::microseconds timeout) {
+            return replayGetQueueEventsHelper(d, std::vector<std::string>{queueName}, maxNumEvents, timeout);
+        }, py::arg("queueName"), py::arg("maxNumEvents") = std::numeric_limits<std::size_t>::max(), py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until specified queue has received a message")
+        .def("getQueueEvents", [](ReplayDevice& d, std::size_t maxNumEvents, std::chrono::microseconds timeout) {
+            return replayGetQueueEventsHelper(d, d.getOutputQueueNames(), maxNumEvents, timeout);
+        }, py::arg("maxNumEvents") = std::numeric_limits<std::size_t>::max(), py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until any output queue has received a message")
+        .def("getQueueEvent", [](ReplayDevice& d, const std::vector<std::string>& queueNames, std::chrono::microseconds timeout) {
+            auto events = replayGetQueueEventsHelper(d, queueNames, 1, timeout);
+            if(events.empty()) return std::string("");
+            return events[0];
+        }, py::arg("queueNames"), py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until any of specified queues has received a message. Returns empty string on timeout")
+        .def("getQueueEvent", [](ReplayDevice& d, std::string queueName, std::chrono::microseconds timeout) {
+            auto events = replayGetQueueEventsHelper(d, std::vector<std::string>{queueName}, 1, timeout);
+            if(events.empty()) return std::string("");
+            return events[0];
+        }, py::arg("queueName"), py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until specified queue has received a message. Returns empty string on timeout")
+        .def("getQueueEvent", [](ReplayDevice& d, std::chrono::microseconds timeout) {
+            auto events = replayGetQueueEventsHelper(d, d.getOutputQueueNames(), 1, timeout);
+            if(events.empty()) return std::string("");
+            return events[0];
+        }, py::arg("timeout") = std::chrono::microseconds(-1), "Gets or waits until any output queue has received a message. Returns empty string on timeout")
+        .def("startPipeline", &ReplayDevice::startPipeline, "Starts playback of streams with requested output queues")
+        .def("isPipelineRunning", &ReplayDevice::isPipelineRunning, "Check whether playback was started")
+        .def("isFinished", &ReplayDevice::isFinished, "Check whether last message was played and playback isn't looping")
+        .def("setSpeed", &ReplayDevice::setSpeed, py::arg("speed"), "Sets playback speed relative to original timing, 0 to play as fast as queues are consumed")
+        .def("getSpeed", &ReplayDevice::getSpeed, "Get playback speed")
+        .def("setLoop", &ReplayDevice::setLoop, py::arg("loop"), "Sets whether to restart playback after last message")
+        .def("getLoop", &ReplayDevice::getLoop, "Get whether playback loops")
+        .def("getNumReplayed", &ReplayDevice::getNumReplayed, "Get number of messages played")
+        .def("getNumLoops", &ReplayDevice::getNumLoops, "Get number of completed passes over the recording")
+        .def("getReader", &ReplayDevice::getReader, py::return_value_policy::reference_internal, "Get reader of the recording")
+        .def("close", &ReplayDevice::close, py::call_guard<py::gil_scoped_release>(), "Stops playback and closes all queues")
+        .def("isClosed", &ReplayDevice::isClosed, "Check whether device was closed")
+        .def("__enter__", [](py::object obj){ return obj; })
+        .def("__exit__", [](ReplayDevice& d, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            d.close();
+        })
+        ;
+
+    py::class_<DatasetStreamerStats>(m, "DatasetStreamerStats", "Throughput counters of a dataset streamer")
+        .def(py::init<>())
+        .def_readonly("numGroups", &DatasetStreamerStats::numGroups, "Number of sent groups (one frame of each stream)")
+        .def_readonly("numFrames", &DatasetStreamerStats::numFrames, "Number of sent frames")
+        .def_readonly("numBytes", &DatasetStreamerStats::numBytes, "Number of sent bytes")
+        .def_readonly("numStalls", &DatasetStreamerStats::numStalls, "Number of times sending had to wait for decoding to catch up")
+        .def_readonly("numErrors", &DatasetStreamerStats::numErrors, "Number of groups skipped because a frame couldn't be read or converted")
+        .def_readonly("numUnmatched", &DatasetStreamerStats::numUnmatched, "Number of recorded frames skipped because other streams have no matching frame")
+        .def_readonly("lastError", &DatasetStreamerStats::lastError, "Message of last error")
+        .def_readonly("numReady", &DatasetStreamerStats::numReady, "Number of decoded groups waiting to be sent")
+        .def_readonly("fps", &DatasetStreamerStats::fps, "Groups per second, over recently sent groups")
+        .def_readonly("bytesPerSecond", &DatasetStreamerStats::bytesPerSecond, "Bytes per second, over recently sent groups")
+        .def_readonly("averageDecodeTime", &DatasetStreamerStats::averageDecodeTime, "Average time of decoding and converting a frame")
+        ;
+
+    py::class_<DatasetStreamer, std::shared_ptr<DatasetStreamer>>(m, "DatasetStreamer", "Streams a directory of images or a recording into input queues. Frames are decoded and converted on a thread pool ahead of sending, and sent in groups (one frame of each stream) with consistent sequence numbers, paced to a target fps or recorded timestamps")
+        .def(py::init([](const std::string& path, std::size_t numThreads){
+            // Stopping waits for decoding tasks, which may need the GIL
+            return std::shared_ptr<DatasetStreamer>(new DatasetStreamer(path, numThreads), [](DatasetStreamer* s) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete s;
+                } else {
+                    delete s;
+                }
+            });
+        }), py::arg("path"), py::arg("numThreads") = 0, "Opens a directory of images or a recording. 'numThreads' - number of decoding threads, 0 for number of hardware threads")
+        .def("addStream", py::overload_cast<const std::string&, std::shared_ptr<DataInputQueue>, RawImgFrame::Type, CameraBoardSocket>(&DatasetStreamer::addStream),
+            py::arg("pattern"), py::arg("queue"), py::arg("type") = RawImgFrame::Type::RAW8, py::arg("socket") = CameraBoardSocket::AUTO,
+            "Adds a stream. 'pattern' - path relative to dataset directory where '*' and '?' match within a path component (eg. '*/left.png'), or name of recorded stream. Frames are converted to 'type' and 'socket' is set as instance number unless AUTO")
+        .def("addStream", py::overload_cast<const std::string&, std::shared_ptr<MessageQueue>, RawImgFrame::Type, CameraBoardSocket>(&DatasetStreamer::addStream),
+            py::arg("pattern"), py::arg("queue"), py::arg("type") = RawImgFrame::Type::RAW8, py::arg("socket") = CameraBoardSocket::AUTO,
+            "Adds a stream sent into a host queue (eg. ReconnectingDevice input queue)")
+        .def("getNumGroups", &DatasetStreamer::getNumGroups, "Get number of groups, limited by stream with least frames, or number of matched frames for recordings")
+        .def("setDecoder", [](DatasetStreamer& s, py::function decoder) {
+            s.setDecoder(wrapDecoder(std::move(decoder)));
+        }, py::arg("decoder"), "Sets decoder of image files, called with a path on decoding threads and returning a HxW or HxWxC uint8 array in BGR order (eg. cv2.imread). Without one, only binary PGM and PPM files can be read")
+        .def("setFps", &DatasetStreamer::setFps, py::arg("fps"), "Sets target number of groups per second, 0 to follow recorded timestamps (directories are then sent as fast as queues accept)")
+        .def("getFps", &DatasetStreamer::getFps, "Get target number of groups per second")
+        .def("setLoop", &DatasetStreamer::setLoop, py::arg("loop"), "Sets whether to restart after last group")
+        .def("getLoop", &DatasetStreamer::getLoop, "Get whether streaming loops")
+        .def("setSyncTolerance", &DatasetStreamer::setSyncTolerance, py::arg("tolerance"), "Sets maximum timestamp difference of recorded frames grouped together. Frames are grouped by sequence number, or by nearest timestamp for streams without shared sequence numbers")
+        .def("getSyncTolerance", &DatasetStreamer::getSyncTolerance, "Get maximum timestamp difference of recorded frames grouped together")
+        .def("setReadAhead", &DatasetStreamer::setReadAhead, py::arg("numGroups"), "Sets number of groups decoded ahead of sending")
+        .def("getReadAhead", &DatasetStreamer::getReadAhead, "Get number of groups decoded ahead of sending")
+        .def("getNumThreads", &DatasetStreamer::getNumThreads, "Get number of decoding threads")
+        .def("start", &DatasetStreamer::start, "Starts streaming")
+        .def("stop", &DatasetStreamer::stop, py::call_guard<py::gil_scoped_release>(), "Stops streaming and waits for decoding threads. Streamer can't be restarted")
+        .def("isRunning", &DatasetStreamer::isRunning, "Check whether streaming")
+        .def("isFinished", &DatasetStreamer::isFinished, "Check whether last group was sent and streamer isn't looping")
+        .def("wait", [](DatasetStreamer& s, std::chrono::milliseconds timeout) {
+            using namespace std::chrono;
+            bool unlimitedTimeout = timeout < milliseconds(0);
+            auto startTime = steady_clock::now();
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+                    auto step = milliseconds(100);
+                    if(!unlimitedTimeout) step = std::min(step, std::max(milliseconds(0), timeout - duration_cast<milliseconds>(steady_clock::now() - startTime)));
+                    if(s.wait(step)) return true;
+                }
+                // reacquires python GIL for PyErr_CheckSignals call
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+            } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+            return false;
+        }, py::arg("timeout") = std::chrono::milliseconds(-1), "Waits until streaming finishes or is stopped. Returns False on timeout")
+        .def("getStats", &DatasetStreamer::getStats, "Get throughput counters")
+        .def("__enter__", [](py::object obj){
+            obj.cast<DatasetStreamer&>().start();
+            return obj;
+        })
+        .def("__exit__", [](DatasetStreamer& s, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            s.stop();
+        })
+        ;
+
+    py::class_<VideoMuxerStats>(m, "VideoMuxerStats", "Counters of a video muxer")
+        .def(py::init<>())
+        .def_readonly("numFrames", &VideoMuxerStats::numFrames, "Number of frames written")
+        .def_readonly("numDropped", &VideoMuxerStats::numDropped, "Number of frames discarded because writer couldn't keep up")
+        .def_readonly("numSkipped", &VideoMuxerStats::numSkipped, "Number of frames skipped while waiting for a keyframe (at start and after dropped frames)")
+        .def_readonly("numBytes", &VideoMuxerStats::numBytes, "Number of bytes written to file")
+        .def_readonly("numFragments", &VideoMuxerStats::numFragments, "Number of fragments (MP4) or clusters (MKV) written")
+        .def_readonly("duration", &VideoMuxerStats::duration, "Duration of written video, in seconds")
+        .def_readonly("numPending", &VideoMuxerStats::numPending, "Number of frames waiting for writer")
+        ;
+
+    py::class_<VideoMuxer, std::shared_ptr<VideoMuxer>> videoMuxer(m, "VideoMuxer", "Muxes VideoEncoder bitstream frames (H.264, H.265 or MJPEG) into a playable MP4 or MKV file on a writer thread, timed by device timestamps. Written in fragments starting at keyframes, so a file cut off by a crash stays playable");
+
+    py::enum_<VideoMuxer::Format>(videoMuxer, "Format", "Container format")
+        .value("AUTO", VideoMuxer::Format::AUTO, "MKV for '.mkv' paths and MJPEG, MP4 otherwise")
+        .value("MP4", VideoMuxer::Format::MP4, "Fragmented MP4, H.264 and H.265 only")
+        .value("MKV", VideoMuxer::Format::MKV, "Matroska")
+        ;
+
+    videoMuxer
+        .def(py::init([](const std::string& path, VideoEncoderProperties::Profile profile, VideoMuxer::Format format){
+            // Closing detaches queue callbacks and joins the writer thread, which may wait for a callback needing the GIL
+            return std::shared_ptr<VideoMuxer>(new VideoMuxer(path, profile, format), [](VideoMuxer* v) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete v;
+                } else {
+                    delete v;
+                }
+            });
+        }), py::arg("path"), py::arg("profile"), py::arg("format") = VideoMuxer::Format::AUTO)
+        .def("addQueue", [](VideoMuxer& m, std::shared_ptr<DataOutputQueue> queue) { m.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Muxes all frames of a device output queue, which is made non-blocking. Must be called before start")
+        .def("addQueue", [](VideoMuxer& m, std::shared_ptr<MessageQueue> queue) { m.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Muxes all frames of a host queue")
+        .def("add", &VideoMuxer::add, py::arg("frame"), py::call_guard<py::gil_scoped_release>(), "Queues an encoded frame for writing. Returns False if frame was dropped or muxer isn't running")
+        .def("setFragmentDuration", &VideoMuxer::setFragmentDuration, py::arg("duration"), "Sets minimum duration of a fragment, a new fragment starts at first keyframe after it")
+        .def("getFragmentDuration", &VideoMuxer::getFragmentDuration, "Get minimum duration of a fragment")
+        .def("setMaxPending", &VideoMuxer::setMaxPending, py::arg("maxPending"), "Sets maximum number of frames waiting for writer")
+        .def("getMaxPending", &VideoMuxer::getMaxPending, "Get maximum number of frames waiting for writer")
+        .def("setBlocking", &VideoMuxer::setBlocking, py::arg("blocking"), "Sets behavior when writer can't keep up. True - 'add' waits for space, false - new frames are dropped")
+        .def("getBlocking", &VideoMuxer::getBlocking, "Get behavior when writer can't keep up")
+        .def("start", &VideoMuxer::start, py::call_guard<py::gil_scoped_release>(), "Creates the file and starts muxing")
+        .def("close", &VideoMuxer::close, py::call_guard<py::gil_scoped_release>(), "Writes pending frames and index and closes the file")
+        .def("isRunning", &VideoMuxer::isRunning, "Check whether muxing")
+        .def("getFormat", &VideoMuxer::getFormat, "Get container format")
+        .def("getStats", &VideoMuxer::getStats, "Get counters")
+        .def("getPath", &VideoMuxer::getPath, "Get path of the video file")
+        .def("__enter__", [](VideoMuxer& v) -> VideoMuxer& {
+            v.start();
+            return v;
+        }, py::return_value_policy::reference_internal, py::call_guard<py::gil_scoped_release>())
+        .def("__exit__", [](VideoMuxer& v, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            v.close();
+        })
+        ;
+
+    py::class_<BitstreamRingBufferStats>(m, "BitstreamRingBufferStats", "Counters of a bitstream ring buffer")
+        .def(py::init<>())
+        .def_readonly("numFrames", &BitstreamRingBufferStats::numFrames, "Number of buffered frames")
+        .def_readonly("numGops", &BitstreamRingBufferStats::numGops, "Number of buffered GOPs (keyframe and the frames following it)")
+        .def_readonly("numBytes", &BitstreamRingBufferStats::numBytes, "Size of buffered frames, in bytes")
+        .def_readonly("duration", &BitstreamRingBufferStats::duration, "Time span of buffered frames, in seconds")
+        .def_readonly("numEvicted", &BitstreamRingBufferStats::numEvicted, "Number of frames evicted from the buffer, or skipped before the first keyframe")
+        .def_readonly("numClips", &BitstreamRingBufferStats::numClips, "Number of clips triggered")
+        .def_readonly("numActiveClips", &BitstreamRingBufferStats::numActiveClips, "Number of clips still being written")
+        .def_readonly("numFailedClips", &BitstreamRingBufferStats::numFailedClips, "Number of clips which couldn't be written")
+        .def_readonly("lastError", &BitstreamRingBufferStats::lastError, "Error of the last failed clip")
+        ;
+
+    py::class_<BitstreamRingBuffer, std::shared_ptr<BitstreamRingBuffer>>(m, "BitstreamRingBuffer", "Keeps the last seconds of a VideoEncoder bitstream in whole GOPs, so it always starts at a keyframe. On trigger the buffer and the following frames are written into a clip without re-encoding, off the GIL")
+        .def(py::init([](VideoEncoderProperties::Profile profile){
+            // Closing detaches queue callbacks and finishes active clips, which may wait for a callback needing the GIL
+            return std::shared_ptr<BitstreamRingBuffer>(new BitstreamRingBuffer(profile), [](BitstreamRingBuffer* b) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete b;
+                } else {
+                    delete b;
+                }
+            });
+        }), py::arg("profile"))
+        .def("addQueue", [](BitstreamRingBuffer& b, std::shared_ptr<DataOutputQueue> queue) { b.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Buffers all frames of a device output queue, which is made non-blocking")
+        .def("addQueue", [](BitstreamRingBuffer& b, std::shared_ptr<MessageQueue> queue) { b.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Buffers all frames of a host queue")
+        .def("add", &BitstreamRingBuffer::add, py::arg("frame"), py::call_guard<py::gil_scoped_release>(), "Buffers an encoded frame and passes it to active clips. Returns False if buffer is closed")
+        .def("setWindow", &BitstreamRingBuffer::setWindow, py::arg("window"), "Sets minimum time span kept before a trigger")
+        .def("getWindow", &BitstreamRingBuffer::getWindow, "Get minimum time span kept before a trigger")
+        .def("setMaxBytes", &BitstreamRingBuffer::setMaxBytes, py::arg("maxBytes"), "Sets maximum size of buffered frames, 0 for no limit. The newest GOP is always kept")
+        .def("getMaxBytes", &BitstreamRingBuffer::getMaxBytes, "Get maximum size of buffered frames")
+        .def("trigger", &BitstreamRingBuffer::trigger, py::arg("path"), py::arg("post"), py::arg("format") = VideoMuxer::Format::AUTO, py::call_guard<py::gil_scoped_release>(),
+             "Writes buffered frames into a clip, followed by frames arriving until 'post' after the newest buffered frame (by device timestamps)")
+        .def("wait", [](BitstreamRingBuffer& b, std::chrono::milliseconds timeout) {
+            using namespace std::chrono;
+            bool unlimitedTimeout = timeout < milliseconds(0);
+            auto startTime = steady_clock::now();
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+                    auto step = milliseconds(100);
+                    if(!unlimitedTimeout) step = std::min(step, std::max(milliseconds(0), timeout - duration_cast<milliseconds>(steady_clock::now() - startTime)));
+                    if(b.wait(step)) return true;
+                }
+                // reacquires python GIL for PyErr_CheckSignals call
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+            } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+            return false;
+        }, py::arg("timeout") = std::chrono::milliseconds(-1), "Waits until all triggered clips are written. Returns False on timeout")
+        .def("clear", &BitstreamRingBuffer::clear, "Drops buffered frames, active clips continue")
+        .def("close", &BitstreamRingBuffer::close, py::call_guard<py::gil_scoped_release>(), "Stops buffering and finishes active clips")
+        .def("getStats", &BitstreamRingBuffer::getStats, "Get counters")
+        ;
+
+    py::class_<FrameSaverStats>(m, "FrameSaverStats", "Counters of a frame saver")
+        .def(py::init<>())
+        .def_readonly("numSaved", &FrameSaverStats::numSaved, "Number of files written")
+        .def_readonly("numDropped", &FrameSaverStats::numDropped, "Number of frames discarded because too many bytes were in flight")
+        .def_readonly("numFailed", &FrameSaverStats::numFailed, "Number of frames which couldn't be written")
+        .def_readonly("lastError", &FrameSaverStats::lastError, "Message of last error")
+        .def_readonly("numBytes", &FrameSaverStats::numBytes, "Number of bytes written")
+        .def_readonly("numPending", &FrameSaverStats::numPending, "Number of frames queued or being written")
+        .def_readonly("pendingBytes", &FrameSaverStats::pendingBytes, "Size of frames queued or being written")
+        .def_readonly("averageLatency", &FrameSaverStats::averageLatency, "Average time from queuing a frame until its file is written")
+        .def_readonly("maxLatency", &FrameSaverStats::maxLatency, "Longest time from queuing a frame until its file is written")
+        .def_readonly("lastPath", &FrameSaverStats::lastPath, "Path of last written file")
+        ;
+
+    py::class_<FrameSaver, std::shared_ptr<FrameSaver>>(m, "FrameSaver", "Saves frames to files from a pool of writer threads, with bounded bytes in flight. BITSTREAM frames are written as they are, GRAY8 / RAW8 frames as PGM, RGB / BGR frames as PPM. "
+                                            "Paths are formatted from a template with fields {timestamp}, {timestampUs}, {hostTime}, {sequenceNum}, {instanceNum}, {index} and {ext}, numeric fields can be zero padded, eg. {sequenceNum:06}")
+        .def(py::init([](const std::string& pathTemplate, std::size_t numThreads){
+            // Closing detaches queue callbacks and waits for writer threads, which may wait for a callback needing the GIL
+            return std::shared_ptr<FrameSaver>(new FrameSaver(pathTemplate, numThreads), [](FrameSaver* s) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete s;
+                } else {
+                    delete s;
+                }
+            });
+        }), py::arg("pathTemplate"), py::arg("numThreads") = 0)
+        .def("addQueue", [](FrameSaver& s, std::shared_ptr<DataOutputQueue> queue) { s.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Saves all frames of a device output queue, which is made non-blocking")
+        .def("addQueue", [](FrameSaver& s, std::shared_ptr<MessageQueue> queue) { s.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Saves all frames of a host queue")
+        .def("add", &FrameSaver::add, py::arg("frame"), py::call_guard<py::gil_scoped_release>(), "Queues a frame for writing. Returns False if frame was dropped or saver is closed")
+        .def("setMaxPendingBytes", &FrameSaver::setMaxPendingBytes, py::arg("maxPendingBytes"), "Sets maximum size of frames queued or being written")
+        .def("getMaxPendingBytes", &FrameSaver::getMaxPendingBytes, "Get maximum size of frames queued or being written")
+        .def("setBlocking", &FrameSaver::setBlocking, py::arg("blocking"), "Sets behavior when too many bytes are in flight. True - 'add' waits for space, false - new frames are dropped")
+        .def("getBlocking", &FrameSaver::getBlocking, "Get behavior when too many bytes are in flight")
+        .def("setSyncBatch", &FrameSaver::setSyncBatch, py::arg("batchSize"), "Sets how many written files are synced to disk together, 0 disables syncing. Capped at 64, as files of a batch are kept open")
+        .def("getSyncBatch", &FrameSaver::getSyncBatch, "Get how many written files are synced to disk together")
+        .def("formatPath", py::overload_cast<const std::shared_ptr<ImgFrame>&, std::uint64_t>(&FrameSaver::formatPath, py::const_), py::arg("frame"), py::arg("index") = 0, "Get path a frame would be saved to, as the 'index'-th frame")
+        .def("wait", [](FrameSaver& s, std::chrono::milliseconds timeout) {
+            using namespace std::chrono;
+            bool unlimitedTimeout = timeout < milliseconds(0);
+            auto startTime = steady_clock::now();
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+                    auto step = milliseconds(100);
+                    if(!unlimitedTimeout) step = std::min(step, std::max(milliseconds(0), timeout - duration_cast<milliseconds>(steady_clock::now() - startTime)));
+                    if(s.wait(step)) return true;
+                }
+                // reacquires python GIL for PyErr_CheckSignals call
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+            } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+            return false;
+        }, py::arg("timeout") = std::chrono::milliseconds(-1), "Waits until all queued frames are written. Returns False on timeout")
+        .def("close", &FrameSaver::close, py::call_guard<py::gil_scoped_release>(), "Stops accepting frames, writes queued frames and syncs remaining files")
+        .def("getStats", &FrameSaver::getStats, "Get counters")
+        .def("__enter__", [](FrameSaver& s) -> FrameSaver& { return s; }, py::return_value_policy::reference_internal, py::call_guard<py::gil_scoped_release>())
+        .def("__exit__", [](FrameSaver& s, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            s.close();
+        })
+        ;
+
+    py::class_<FrameArchiverStats>(m, "FrameArchiverStats", "Counters of a frame archiver")
+        .def(py::init<>())
+        .def_readonly("numArchived", &FrameArchiverStats::numArchived, "Number of frames archived")
+        .def_readonly("numDropped", &FrameArchiverStats::numDropped, "Number of frames discarded because too many were in flight")
+        .def_readonly("numFailed", &FrameArchiverStats::numFailed, "Number of frames which couldn't be archived (unsupported type, write error)")
+        .def_readonly("lastError", &FrameArchiverStats::lastError, "Message of last error")
+        .def_readonly("numBytesIn", &FrameArchiverStats::numBytesIn, "Size of archived frame data")
+        .def_readonly("numBytesOut", &FrameArchiverStats::numBytesOut, "Number of bytes written")
+        .def_readonly("numPending", &FrameArchiverStats::numPending, "Number of frames queued, being compressed or waiting for preceding frames")
+        .def_readonly("averageCompressTime", &FrameArchiverStats::averageCompressTime, "Average time a worker spends compressing a frame")
+        ;
+
+    py::class_<FrameArchiver, std::shared_ptr<FrameArchiver>> frameArchiver(m, "FrameArchiver", "Losslessly archives GRAY8, RAW8 and RAW16 frames, compressed in parallel on a pool of worker threads. "
+                                                               "Frames are written in the order they were added, with a line per frame in 'index.csv' of the directory");
+
+    py::enum_<FrameArchiver::Format>(frameArchiver, "Format", "Archive format")
+        .value("PNG", FrameArchiver::Format::PNG, "Each frame as '<stream>_<sequenceNum>.png', 8 or 16 bit grayscale. Stream is the queue name, or the instance number of frames added directly")
+        .value("RAW", FrameArchiver::Format::RAW, "Frames appended to 'frames.bin', as zlib streams of frame data or as is with compression level 0")
+        ;
+
+    frameArchiver
+        .def(py::init([](const std::string& directory, FrameArchiver::Format format, std::size_t numThreads){
+            // Closing detaches queue callbacks and waits for worker threads, which may wait for a callback needing the GIL
+            return std::shared_ptr<FrameArchiver>(new FrameArchiver(directory, format, numThreads), [](FrameArchiver* a) {
+                if(PyGILState_Check()) {
+                    py::gil_scoped_release release;
+                    delete a;
+                } else {
+                    delete a;
+                }
+            });
+        }), py::arg("directory"), py::arg("format") = FrameArchiver::Format::PNG, py::arg("numThreads") = 0)
+        .def("addQueue", [](FrameArchiver& a, std::shared_ptr<DataOutputQueue> queue) { a.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Archives all frames of a device output queue, which is made non-blocking")
+        .def("addQueue", [](FrameArchiver& a, std::shared_ptr<MessageQueue> queue) { a.addQueue(queue); }, py::arg("queue"), py::call_guard<py::gil_scoped_release>(), "Archives all frames of a host queue")
+        .def("add", &FrameArchiver::add, py::arg("frame"), py::arg("stream") = "", py::call_guard<py::gil_scoped_release>(), "Queues a frame for archiving, stream names PNG files (instance number if empty). Returns False if frame was dropped or unsupported, or archiver is closed")
+        .def("setCompressionLevel", &FrameArchiver::setCompressionLevel, py::arg("level"), "Sets compression level of subsequently added frames, 0 (none) to 9 (smallest)")
+        .def("getCompressionLevel", &FrameArchiver::getCompressionLevel, "Get compression level")
+        .def("setMaxPending", &FrameArchiver::setMaxPending, py::arg("maxPending"), "Sets maximum number of frames in flight")
+        .def("getMaxPending", &FrameArchiver::getMaxPending, "Get maximum number of frames in flight")
+        .def("setBlocking", &FrameArchiver::setBlocking, py::arg("blocking"), "Sets behavior when too many frames are in flight. True - 'add' waits for space, false - new frames are dropped")
+        .def("getBlocking", &FrameArchiver::getBlocking, "Get behavior when too many frames are in flight")
+        .def("wait", [](FrameArchiver& a, std::chrono::milliseconds timeout) {
+            using namespace std::chrono;
+            bool unlimitedTimeout = timeout < milliseconds(0);
+            auto startTime = steady_clock::now();
+            do {
+                {
+                    // releases python GIL
+                    py::gil_scoped_release release;
+                    auto step = milliseconds(100);
+                    if(!unlimitedTimeout) step = std::min(step, std::max(milliseconds(0), timeout - duration_cast<milliseconds>(steady_clock::now() - startTime)));
+                    if(a.wait(step)) return true;
+                }
+                // reacquires python GIL for PyErr_CheckSignals call
+                if (PyErr_CheckSignals() != 0) throw py::error_already_set();
+            } while(unlimitedTimeout || steady_clock::now() - startTime < timeout);
+            return false;
+        }, py::arg("timeout") = std::chrono::milliseconds(-1), "Waits until all queued frames are archived. Returns False on timeout")
+        .def("close", &FrameArchiver::close, py::call_guard<py::gil_scoped_release>(), "Stops accepting frames, archives queued frames and closes files")
+        .def("getDirectory", &FrameArchiver::getDirectory, "Get archive directory")
+        .def("getFormat", &FrameArchiver::getFormat, "Get archive format")
+        .def("getStats", &FrameArchiver::getStats, "Get counters")
+        .def("__enter__", [](FrameArchiver& a) -> FrameArchiver& { return a; }, py::return_value_policy::reference_internal, py::call_guard<py::gil_scoped_release>())
+        .def("__exit__", [](FrameArchiver& a, py::object, py::object, py::object) {
+            py::gil_scoped_release release;
+            a.close();
+        })
+        ;
+
+}
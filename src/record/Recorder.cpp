@@ -0,0 +1,368 @@
+#include "Recorder.hpp"
+
+// std
+#include <algorithm>
+#include <cstring>
+#include <stdexcept>
+
+#if defined(_WIN32)
+    #include <io.h>
+#else
+    #include <unistd.h>
+#endif
+
+// libraries
+#include "nlohmann/json.hpp"
+
+// project
+#include "MessageCodec.hpp"
+#include "utility/Hash.hpp"
+
+constexpr std::size_t Recorder::DEFAULT_CHUNK_SIZE;
+constexpr unsigned int Recorder::DEFAULT_MAX_PENDING;
+
+Recorder::Recorder(std::string path) : path(std::move(path)) {}
+
+Recorder::~Recorder() {
+    try {
+        close();
+    } catch(const std::exception&) {
+    }
+}
+
+std::uint32_t Recorder::addStream(const std::string& name) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Streams can't be added after recording started");
+    if(std::find(streams.begin(), streams.end(), name) != streams.end()) throw std::invalid_argument("Stream '" + name + "' already exists");
+    streams.push_back(name);
+    return static_cast<std::uint32_t>(streams.size() - 1);
+}
+
+std::uint32_t Recorder::addQueue(const QueueSource& queue, const std::string& name) {
+    auto stream = addStream(name.empty() ? queue.getName() : name);
+    std::lock_guard<std::mutex> lock(mtx);
+    sources.push_back([this, queue, stream]() { return queue.subscribe([this, stream](std::shared_ptr<dai::ADatatype> msg) { add(stream, msg); }); });
+    return stream;
+}
+
+std::vector<std::string> Recorder::getStreams() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return streams;
+}
+
+bool Recorder::add(std::uint32_t stream, const std::shared_ptr<dai::ADatatype>& msg) {
+    if(msg == nullptr) return false;
+    auto hostTimestamp = std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch());
+
+    std::unique_lock<std::mutex> lock(mtx);
+    if(stream >= streams.size()) throw std::invalid_argument("Stream " + std::to_string(stream) + " doesn't exist");
+    if(!running) return false;
+    if(pending.size() >= maxPending) {
+        if(!blocking) {
+            stats.numDropped++;
+            return false;
+        }
+        signalSpace.wait(lock, [this]() { return pending.size() < maxPending || !running; });
+        if(!running) return false;
+    }
+    pending.push_back({stream, hostTimestamp, msg});
+    signalPending.notify_one();
+    return true;
+}
+
+bool Recorder::add(const std::string& stream, const std::shared_ptr<dai::ADatatype>& msg) {
+    std::uint32_t index = 0;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        auto it = std::find(streams.begin(), streams.end(), stream);
+        if(it == streams.end()) throw std::invalid_argument("Stream '" + stream + "' doesn't exist");
+        index = static_cast<std::uint32_t>(it - streams.begin());
+    }
+    return add(index, msg);
+}
+
+void Recorder::setChunkSize(std::size_t size) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Chunk size can't be changed after recording started");
+    chunkSize = size;
+}
+
+std::size_t Recorder::getChunkSize() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return chunkSize;
+}
+
+void Recorder::setFlushInterval(std::chrono::milliseconds interval) {
+    std::lock_guard<std::mutex> lock(mtx);
+    flushInterval = interval;
+}
+
+std::chrono::milliseconds Recorder::getFlushInterval() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return flushInterval;
+}
+
+void Recorder::setSync(bool sync) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->sync = sync;
+}
+
+bool Recorder::getSync() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return sync;
+}
+
+void Recorder::setMaxPending(unsigned int maxPending) {
+    if(maxPending == 0) throw std::invalid_argument("Maximum number of pending messages can't be 0");
+    std::lock_guard<std::mutex> lock(mtx);
+    this->maxPending = maxPending;
+    signalSpace.notify_all();
+}
+
+unsigned int Recorder::getMaxPending() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return maxPending;
+}
+
+void Recorder::setBlocking(bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->blocking = blocking;
+    signalSpace.notify_all();
+}
+
+bool Recorder::getBlocking() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return blocking;
+}
+
+void Recorder::start() {
+    std::vector<std::function<std::function<void()>()>> toSubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(started) throw std::logic_error("Recording can't be restarted");
+
+        file = std::fopen(path.c_str(), "wb");
+        if(file == nullptr) throw std::runtime_error("Couldn't create recording: " + path);
+        // Chunks are written with single large writes, stdio buffering would only add a copy
+        std::setvbuf(file, nullptr, _IONBF, 0);
+
+        nlohmann::json info = {{"version", recording::VERSION},
+                               {"streams", streams},
+                               {"createdAt", std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::system_clock::now().time_since_epoch()).count()}};
+        auto infoData = nlohmann::json::to_msgpack(info);
+        std::vector<std::uint8_t> header(recording::alignUp(recording::FILE_HEADER_SIZE + infoData.size(), recording::ALIGNMENT), 0);
+        std::memcpy(header.data(), recording::FILE_MAGIC, sizeof(recording::FILE_MAGIC));
+        recording::writeU32(header.data() + 8, recording::VERSION);
+        recording::writeU32(header.data() + 12, static_cast<std::uint32_t>(header.size()));
+        recording::writeU64(header.data() + 16, infoData.size());
+        std::memcpy(header.data() + recording::FILE_HEADER_SIZE, infoData.data(), infoData.size());
+        try {
+            write(header.data(), header.size());
+        } catch(...) {
+            std::fclose(file);
+            file = nullptr;
+            throw;
+        }
+        fileOffset = header.size();
+        stats.numBytes = header.size();
+
+        chunk.reserve(chunkSize + recording::ALIGNMENT);
+        chunk.assign(recording::CHUNK_HEADER_SIZE, 0);
+        streamCounters.assign(streams.size(), 0);
+        started = true;
+        running = true;
+        toSubscribe = sources;
+        writer = std::thread(&Recorder::run, this);
+    }
+
+    for(auto& subscribe : toSubscribe) {
+        auto unsubscribe = subscribe();
+        std::lock_guard<std::mutex> lock(mtx);
+        unsubscribers.push_back(std::move(unsubscribe));
+    }
+}
+
+void Recorder::close() {
+    std::vector<std::function<void()>> toUnsubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(!started) return;
+        toUnsubscribe = std::move(unsubscribers);
+        unsubscribers.clear();
+    }
+    for(auto& unsubscribe : toUnsubscribe) unsubscribe();
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        running = false;
+        closing = true;
+        signalPending.notify_all();
+        signalSpace.notify_all();
+    }
+    if(writer.joinable()) writer.join();
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(!error.empty()) throw std::runtime_error("Recording to '" + path + "' failed: " + error);
+}
+
+bool Recorder::isRunning() const {
+    return running;
+}
+
+RecorderStats Recorder::getStats() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    RecorderStats result = stats;
+    result.numPending = pending.size();
+    return result;
+}
+
+std::string Recorder::getPath() const {
+    return path;
+}
+
+void Recorder::run() {
+    std::unique_lock<std::mutex> lock(mtx);
+    try {
+        while(true) {
+            auto ready = [this]() { return !pending.empty() || closing; };
+            if(chunkEntries.empty()) {
+                signalPending.wait(lock, ready);
+            } else {
+                signalPending.wait_until(lock, chunkStarted + flushInterval, ready);
+            }
+
+            std::deque<Pending> batch;
+            batch.swap(pending);
+            signalSpace.notify_all();
+            bool last = closing && batch.empty();
+            auto interval = flushInterval;
+            lock.unlock();
+
+            for(const auto& p : batch) {
+                writeRecord(p);
+                if(chunk.size() >= chunkSize) writeChunk();
+            }
+            if(last || (!chunkEntries.empty() && std::chrono::steady_clock::now() >= chunkStarted + interval)) writeChunk();
+            if(last) writeIndex();
+
+            lock.lock();
+            stats.numRecorded += batch.size();
+            if(last) break;
+        }
+    } catch(const std::exception& ex) {
+        if(!lock.owns_lock()) lock.lock();
+        error = ex.what();
+        running = false;
+        pending.clear();
+        signalSpace.notify_all();
+    }
+    if(lock.owns_lock()) lock.unlock();
+    std::fclose(file);
+    file = nullptr;
+}
+
+void Recorder::writeRecord(const Pending& p) {
+    using namespace recording;
+
+    auto raw = p.msg->getRaw();
+    auto info = getMessageInfo(*raw);
+    const auto& data = raw->data;
+
+    if(chunkEntries.empty()) chunkStarted = std::chrono::steady_clock::now();
+
+    RecordIndexEntry entry;
+    entry.stream = p.stream;
+    entry.datatype = info.datatype;
+    entry.sequenceNum = info.sequenceNum >= 0 ? info.sequenceNum : streamCounters[p.stream];
+    entry.timestamp = info.hasTimestamp ? info.timestamp : p.hostTimestamp;
+    entry.hostTimestamp = p.hostTimestamp;
+    entry.width = info.width;
+    entry.height = info.height;
+    entry.offset = fileOffset + chunk.size();
+    streamCounters[p.stream]++;
+
+    std::uint8_t header[RECORD_HEADER_SIZE];
+    writeU32(header, p.stream);
+    writeU32(header + 4, static_cast<std::uint32_t>(info.datatype));
+    writeU64(header + 8, info.metadata.size());
+    writeU64(header + 16, data.size());
+
+    // Data is aligned, so it can be viewed in place once mapped
+    std::size_t start = chunk.size();
+    chunk.insert(chunk.end(), header, header + RECORD_HEADER_SIZE);
+    chunk.insert(chunk.end(), info.metadata.begin(), info.metadata.end());
+    chunk.resize(start + alignUp(chunk.size() - start, DATA_ALIGNMENT), 0);
+    chunk.insert(chunk.end(), data.begin(), data.end());
+    chunk.resize(start + alignUp(chunk.size() - start, DATA_ALIGNMENT), 0);
+
+    entry.size = chunk.size() - start;
+    chunkEntries.push_back(entry);
+}
+
+void Recorder::writeChunk() {
+    using namespace recording;
+    if(chunkEntries.empty()) return;
+
+    ChunkHeader header;
+    header.numRecords = static_cast<std::uint32_t>(chunkEntries.size());
+    header.indexOffset = chunk.size();
+    header.firstTimestamp = chunkEntries.front().timestamp;
+    header.lastTimestamp = chunkEntries.front().timestamp;
+    for(const auto& entry : chunkEntries) {
+        header.firstTimestamp = std::min(header.firstTimestamp, entry.timestamp);
+        header.lastTimestamp = std::max(header.lastTimestamp, entry.timestamp);
+        std::uint8_t buffer[INDEX_ENTRY_SIZE];
+        writeIndexEntry(buffer, entry);
+        chunk.insert(chunk.end(), buffer, buffer + INDEX_ENTRY_SIZE);
+    }
+    header.checksum = hash64(chunk.data() + CHUNK_HEADER_SIZE, chunk.size() - CHUNK_HEADER_SIZE);
+    chunk.resize(alignUp(chunk.size(), ALIGNMENT), 0);
+    header.size = chunk.size();
+    writeChunkHeader(chunk.data(), header);
+
+    write(chunk.data(), chunk.size());
+    bool syncChunk;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        syncChunk = sync;
+    }
+    if(syncChunk) {
+#if defined(_WIN32)
+        _commit(_fileno(file));
+#else
+        fsync(fileno(file));
+#endif
+    }
+
+    fileOffset += chunk.size();
+    entries.insert(entries.end(), chunkEntries.begin(), chunkEntries.end());
+    chunkEntries.clear();
+    chunk.assign(CHUNK_HEADER_SIZE, 0);
+
+    std::lock_guard<std::mutex> lock(mtx);
+    stats.numChunks++;
+    stats.numBytes = fileOffset;
+}
+
+void Recorder::writeIndex() {
+    using namespace recording;
+
+    std::vector<std::uint8_t> index(INDEX_ENTRY_SIZE + entries.size() * INDEX_ENTRY_SIZE + TRAILER_SIZE, 0);
+    std::memcpy(index.data(), INDEX_MAGIC, sizeof(INDEX_MAGIC));
+    writeU64(index.data() + 8, entries.size());
+    for(std::size_t i = 0; i < entries.size(); i++) writeIndexEntry(index.data() + INDEX_ENTRY_SIZE * (i + 1), entries[i]);
+    std::uint8_t* trailer = index.data() + index.size() - TRAILER_SIZE;
+    std::memcpy(trailer, TRAILER_MAGIC, sizeof(TRAILER_MAGIC));
+    writeU64(trailer + 8, fileOffset);
+    writeU64(trailer + 16, entries.size());
+    writeU64(trailer + 24, hash64(index.data() + INDEX_ENTRY_SIZE, entries.size() * INDEX_ENTRY_SIZE));
+    write(index.data(), index.size());
+    std::fflush(file);
+
+    std::lock_guard<std::mutex> lock(mtx);
+    stats.numBytes = fileOffset + index.size();
+}
+
+void Recorder::write(const std::uint8_t* data, std::size_t size) {
+    if(std::fwrite(data, 1, size, file) != size) throw std::runtime_error("Couldn't write to recording: " + path);
+}
@@ -0,0 +1,158 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+// project
+#include "QueueSource.hpp"
+#include "RecordingFormat.hpp"
+
+/// Counters of a recorder
+struct RecorderStats {
+    /// Number of messages written
+    std::uint64_t numRecorded = 0;
+    /// Number of messages discarded because writer couldn't keep up
+    std::uint64_t numDropped = 0;
+    /// Number of bytes written to file
+    std::uint64_t numBytes = 0;
+    /// Number of chunks written to file
+    std::uint64_t numChunks = 0;
+    /// Number of messages waiting for writer
+    std::size_t numPending = 0;
+};
+
+/**
+ * @brief Records messages of multiple streams into a single indexed file.
+ *
+ * Messages are stored with their full metadata, as sent over XLink, and indexed by stream,
+ * timestamp and sequence number. Serialization and writing happen on a writer thread, which appends
+ * messages into chunks and writes each chunk with a single aligned write once it reaches chunk size
+ * or flush interval. On a crash at most one chunk (chunk size or flush interval worth of messages)
+ * is lost, the rest is recovered by RecordingReader.
+ */
+class Recorder {
+   public:
+    static constexpr std::size_t DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024;
+    static constexpr unsigned int DEFAULT_MAX_PENDING = 32;
+
+    /// Creates a recorder writing to 'path' once started
+    explicit Recorder(std::string path);
+    /// Closes the recording
+    ~Recorder();
+
+    Recorder(const Recorder&) = delete;
+    Recorder& operator=(const Recorder&) = delete;
+
+    /**
+     * Adds a stream, messages are added to it with 'add'. Streams must be added before start
+     * @returns Index of the stream
+     */
+    std::uint32_t addStream(const std::string& name);
+    /**
+     * Records all messages of a device output queue or a host queue (eg. ReconnectingDevice output queue).
+     * Device output queues are made non-blocking, so an unread queue doesn't stall the stream
+     * @param name Name of the stream, queue name if empty
+     * @returns Index of the stream
+     */
+    std::uint32_t addQueue(const QueueSource& queue, const std::string& name = "");
+    /// @returns Names of streams, by stream index
+    std::vector<std::string> getStreams() const;
+
+    /**
+     * Queues a message for writing, can be called from any thread
+     * @returns False if message was dropped or recorder isn't running
+     */
+    bool add(std::uint32_t stream, const std::shared_ptr<dai::ADatatype>& msg);
+    /// @overload
+    bool add(const std::string& stream, const std::shared_ptr<dai::ADatatype>& msg);
+
+    /// Sets size after which a chunk is written
+    void setChunkSize(std::size_t size);
+    std::size_t getChunkSize() const;
+    /// Sets maximum time messages wait in a chunk before it is written
+    void setFlushInterval(std::chrono::milliseconds interval);
+    std::chrono::milliseconds getFlushInterval() const;
+    /// Sets whether each chunk is synced to disk (fsync) after writing, default false
+    void setSync(bool sync);
+    bool getSync() const;
+    /// Sets maximum number of messages waiting for writer
+    void setMaxPending(unsigned int maxPending);
+    unsigned int getMaxPending() const;
+    /**
+     * Sets behavior when writer can't keep up
+     * @param blocking True - 'add' waits for space (backpressure to the stream), false - new messages are dropped
+     */
+    void setBlocking(bool blocking);
+    bool getBlocking() const;
+
+    /// Creates the file and starts recording. Throws if file can't be created
+    void start();
+    /// Writes pending messages and index and closes the file. Throws if writing failed
+    void close();
+    /// @returns True if recording
+    bool isRunning() const;
+
+    /// @returns Counters
+    RecorderStats getStats() const;
+    /// @returns Path of the recording
+    std::string getPath() const;
+
+   private:
+    struct Pending {
+        std::uint32_t stream;
+        std::chrono::nanoseconds hostTimestamp;
+        std::shared_ptr<dai::ADatatype> msg;
+    };
+
+    void run();
+    void writeRecord(const Pending& pending);
+    void writeChunk();
+    void writeIndex();
+    void write(const std::uint8_t* data, std::size_t size);
+
+    const std::string path;
+    mutable std::mutex mtx;
+    std::condition_variable signalPending;
+    std::condition_variable signalSpace;
+    std::deque<Pending> pending;
+    std::vector<std::string> streams;
+    // Subscribe to a queue on start, returning a function which unsubscribes
+    std::vector<std::function<std::function<void()>()>> sources;
+    std::vector<std::function<void()>> unsubscribers;
+    std::size_t chunkSize = DEFAULT_CHUNK_SIZE;
+    std::chrono::milliseconds flushInterval{1000};
+    bool sync = false;
+    unsigned int maxPending = DEFAULT_MAX_PENDING;
+    bool blocking = false;
+    bool started = false;
+    bool closing = false;
+    std::atomic<bool> running{false};
+    std::string error;
+    RecorderStats stats;
+
+    // Writer thread state
+    std::thread writer;
+    std::FILE* file = nullptr;
+    std::uint64_t fileOffset = 0;
+    std::vector<std::uint8_t> chunk;
+    std::vector<RecordIndexEntry> chunkEntries;
+    std::chrono::steady_clock::time_point chunkStarted;
+    std::vector<RecordIndexEntry> entries;
+    std::vector<std::int64_t> streamCounters;
+};
@@ -0,0 +1,82 @@
+#include "RecordingFormat.hpp"
+
+// std
+#include <cstring>
+
+namespace recording {
+
+const char FILE_MAGIC[8] = {'D', 'A', 'I', 'R', 'E', 'C', '\0', '\1'};
+const char CHUNK_MAGIC[8] = {'D', 'A', 'I', 'C', 'H', 'U', 'N', 'K'};
+const char INDEX_MAGIC[8] = {'D', 'A', 'I', 'I', 'N', 'D', 'E', 'X'};
+const char TRAILER_MAGIC[8] = {'D', 'A', 'I', 'R', 'T', 'A', 'I', 'L'};
+
+void writeU32(std::uint8_t* dst, std::uint32_t value) {
+    for(int i = 0; i < 4; i++) dst[i] = static_cast<std::uint8_t>(value >> (8 * i));
+}
+
+void writeU64(std::uint8_t* dst, std::uint64_t value) {
+    for(int i = 0; i < 8; i++) dst[i] = static_cast<std::uint8_t>(value >> (8 * i));
+}
+
+std::uint32_t readU32(const std::uint8_t* src) {
+    std::uint32_t value = 0;
+    for(int i = 0; i < 4; i++) value |= static_cast<std::uint32_t>(src[i]) << (8 * i);
+    return value;
+}
+
+std::uint64_t readU64(const std::uint8_t* src) {
+    std::uint64_t value = 0;
+    for(int i = 0; i < 8; i++) value |= static_cast<std::uint64_t>(src[i]) << (8 * i);
+    return value;
+}
+
+void writeChunkHeader(std::uint8_t* dst, const ChunkHeader& header) {
+    std::memset(dst, 0, CHUNK_HEADER_SIZE);
+    std::memcpy(dst, CHUNK_MAGIC, sizeof(CHUNK_MAGIC));
+    writeU64(dst + 8, header.size);
+    writeU32(dst + 16, header.numRecords);
+    writeU64(dst + 24, header.indexOffset);
+    writeU64(dst + 32, header.checksum);
+    writeU64(dst + 40, static_cast<std::uint64_t>(header.firstTimestamp.count()));
+    writeU64(dst + 48, static_cast<std::uint64_t>(header.lastTimestamp.count()));
+}
+
+bool readChunkHeader(const std::uint8_t* src, ChunkHeader& header) {
+    if(std::memcmp(src, CHUNK_MAGIC, sizeof(CHUNK_MAGIC)) != 0) return false;
+    header.size = readU64(src + 8);
+    header.numRecords = readU32(src + 16);
+    header.indexOffset = readU64(src + 24);
+    header.checksum = readU64(src + 32);
+    header.firstTimestamp = std::chrono::nanoseconds(static_cast<std::int64_t>(readU64(src + 40)));
+    header.lastTimestamp = std::chrono::nanoseconds(static_cast<std::int64_t>(readU64(src + 48)));
+    return true;
+}
+
+void writeIndexEntry(std::uint8_t* dst, const RecordIndexEntry& entry) {
+    std::memset(dst, 0, INDEX_ENTRY_SIZE);
+    writeU32(dst, entry.stream);
+    writeU32(dst + 4, static_cast<std::uint32_t>(entry.datatype));
+    writeU64(dst + 8, static_cast<std::uint64_t>(entry.sequenceNum));
+    writeU64(dst + 16, static_cast<std::uint64_t>(entry.timestamp.count()));
+    writeU64(dst + 24, static_cast<std::uint64_t>(entry.hostTimestamp.count()));
+    writeU32(dst + 32, entry.width);
+    writeU32(dst + 36, entry.height);
+    writeU64(dst + 40, entry.offset);
+    writeU64(dst + 48, entry.size);
+}
+
+RecordIndexEntry readIndexEntry(const std::uint8_t* src) {
+    RecordIndexEntry entry;
+    entry.stream = readU32(src);
+    entry.datatype = static_cast<dai::DatatypeEnum>(readU32(src + 4));
+    entry.sequenceNum = static_cast<std::int64_t>(readU64(src + 8));
+    entry.timestamp = std::chrono::nanoseconds(static_cast<std::int64_t>(readU64(src + 16)));
+    entry.hostTimestamp = std::chrono::nanoseconds(static_cast<std::int64_t>(readU64(src + 24)));
+    entry.width = readU32(src + 32);
+    entry.height = readU32(src + 36);
+    entry.offset = readU64(src + 40);
+    entry.size = readU64(src + 48);
+    return entry;
+}
+
+}  // namespace recording
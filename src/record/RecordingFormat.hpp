@@ -0,0 +1,88 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+
+// shared
+#include "depthai-shared/datatype/DatatypeEnum.hpp"
+
+/// Index entry of a recorded message
+struct RecordIndexEntry {
+    /// Index of stream the message was recorded from
+    std::uint32_t stream = 0;
+    /// Type of the message
+    dai::DatatypeEnum datatype = dai::DatatypeEnum::Buffer;
+    /// Sequence number of the frame, or number of message within its stream for other types
+    std::int64_t sequenceNum = 0;
+    /// Device timestamp if message carries one, host arrival time otherwise (host steady clock)
+    std::chrono::nanoseconds timestamp{0};
+    /// Host arrival time (host steady clock)
+    std::chrono::nanoseconds hostTimestamp{0};
+    /// Dimensions of frames, 0 for other types
+    std::uint32_t width = 0;
+    std::uint32_t height = 0;
+    /// Offset of the record in the file
+    std::uint64_t offset = 0;
+    /// Size of the record in the file, including padding
+    std::uint64_t size = 0;
+};
+
+/**
+ * Layout of recording files. All values are little endian.
+ *
+ * File:    header | chunk... | index | trailer
+ * Header:  magic "DAIREC\0\1", u32 version, u32 header size, u64 info size, info (msgpack), padding to ALIGNMENT
+ * Chunk:   chunk header | record... | index entry..., padding to ALIGNMENT
+ * Record:  u32 stream, u32 datatype, u64 metadata size, u64 data size, metadata, padding to DATA_ALIGNMENT, data, padding to DATA_ALIGNMENT
+ *
+ * Chunks are self contained, so a recording which wasn't closed (crash, power loss) is recovered
+ * by scanning chunks, up to the last completely written one. The index and trailer are written on close.
+ */
+namespace recording {
+
+constexpr std::uint32_t VERSION = 1;
+/// Alignment of chunks in the file, all writes are multiples of it
+constexpr std::size_t ALIGNMENT = 4096;
+/// Alignment of record data within chunk
+constexpr std::size_t DATA_ALIGNMENT = 64;
+
+constexpr std::size_t FILE_HEADER_SIZE = 24;
+constexpr std::size_t CHUNK_HEADER_SIZE = 64;
+constexpr std::size_t RECORD_HEADER_SIZE = 24;
+constexpr std::size_t INDEX_ENTRY_SIZE = 64;
+constexpr std::size_t TRAILER_SIZE = 32;
+
+extern const char FILE_MAGIC[8];
+extern const char CHUNK_MAGIC[8];
+extern const char INDEX_MAGIC[8];
+extern const char TRAILER_MAGIC[8];
+
+/// Chunk header fields
+struct ChunkHeader {
+    std::uint64_t size = 0;
+    std::uint32_t numRecords = 0;
+    std::uint64_t indexOffset = 0;
+    std::uint64_t checksum = 0;
+    std::chrono::nanoseconds firstTimestamp{0};
+    std::chrono::nanoseconds lastTimestamp{0};
+};
+
+inline std::size_t alignUp(std::size_t value, std::size_t alignment) {
+    return (value + alignment - 1) / alignment * alignment;
+}
+
+void writeU32(std::uint8_t* dst, std::uint32_t value);
+void writeU64(std::uint8_t* dst, std::uint64_t value);
+std::uint32_t readU32(const std::uint8_t* src);
+std::uint64_t readU64(const std::uint8_t* src);
+
+void writeChunkHeader(std::uint8_t* dst, const ChunkHeader& header);
+/// Returns false if magic doesn't match
+bool readChunkHeader(const std::uint8_t* src, ChunkHeader& header);
+
+void writeIndexEntry(std::uint8_t* dst, const RecordIndexEntry& entry);
+RecordIndexEntry readIndexEntry(const std::uint8_t* src);
+
+}  // namespace recording
@@ -0,0 +1,173 @@
+#include "RecordingReader.hpp"
+
+// std
+#include <algorithm>
+#include <cstring>
+#include <stdexcept>
+
+// libraries
+#include "nlohmann/json.hpp"
+
+// project
+#include "MessageCodec.hpp"
+#include "utility/Hash.hpp"
+
+RecordingReader::RecordingReader(const std::string& path) : file(path) {
+    using namespace recording;
+
+    const auto* data = file.data();
+    if(file.size() < FILE_HEADER_SIZE || std::memcmp(data, FILE_MAGIC, sizeof(FILE_MAGIC)) != 0) {
+        throw std::runtime_error("Not a recording: " + path);
+    }
+    if(readU32(data + 8) != VERSION) throw std::runtime_error("Unsupported recording version " + std::to_string(readU32(data + 8)) + ": " + path);
+    headerSize = readU32(data + 12);
+    auto infoSize = readU64(data + 16);
+    if(headerSize > file.size() || FILE_HEADER_SIZE + infoSize > headerSize) throw std::runtime_error("Corrupted recording header: " + path);
+    try {
+        auto info = nlohmann::json::from_msgpack(data + FILE_HEADER_SIZE, data + FILE_HEADER_SIZE + infoSize);
+        streams = info.at("streams").get<std::vector<std::string>>();
+    } catch(const nlohmann::json::exception&) {
+        throw std::runtime_error("Corrupted recording header: " + path);
+    }
+
+    complete = readIndex();
+    if(!complete) scanChunks();
+
+    byTimestamp.resize(streams.size());
+    for(std::size_t i = 0; i < index.size(); i++) {
+        if(index[i].stream >= streams.size()) throw std::runtime_error("Corrupted recording index: " + path);
+        byTimestamp[index[i].stream].push_back(i);
+    }
+    for(auto& positions : byTimestamp) {
+        std::stable_sort(positions.begin(), positions.end(), [this](std::size_t a, std::size_t b) { return index[a].timestamp < index[b].timestamp; });
+    }
+}
+
+bool RecordingReader::readIndex() {
+    using namespace recording;
+
+    const auto* data = file.data();
+    std::size_t size = file.size();
+    if(size < headerSize + INDEX_ENTRY_SIZE + TRAILER_SIZE) return false;
+    const auto* trailer = data + size - TRAILER_SIZE;
+    if(std::memcmp(trailer, TRAILER_MAGIC, sizeof(TRAILER_MAGIC)) != 0) return false;
+    auto indexOffset = readU64(trailer + 8);
+    auto numEntries = readU64(trailer + 16);
+    if(indexOffset < headerSize || indexOffset > size || numEntries > (size - indexOffset) / INDEX_ENTRY_SIZE) return false;
+    if(indexOffset + INDEX_ENTRY_SIZE * (numEntries + 1) + TRAILER_SIZE != size) return false;
+    const auto* entries = data + indexOffset + INDEX_ENTRY_SIZE;
+    if(std::memcmp(data + indexOffset, INDEX_MAGIC, sizeof(INDEX_MAGIC)) != 0) return false;
+    if(hash64(entries, numEntries * INDEX_ENTRY_SIZE) != readU64(trailer + 24)) return false;
+
+    index.reserve(numEntries);
+    for(std::uint64_t i = 0; i < numEntries; i++) index.push_back(readIndexEntry(entries + i * INDEX_ENTRY_SIZE));
+    return true;
+}
+
+void RecordingReader::scanChunks() {
+    using namespace recording;
+
+    const auto* data = file.data();
+    std::size_t size = file.size();
+    std::size_t offset = headerSize;
+    ChunkHeader header;
+    // Stop at first incomplete or corrupted chunk
+    while(offset + CHUNK_HEADER_SIZE <= size && readChunkHeader(data + offset, header)) {
+        if(header.size < CHUNK_HEADER_SIZE || header.size > size - offset) break;
+        if(header.indexOffset < CHUNK_HEADER_SIZE || header.indexOffset > header.size) break;
+        if(header.numRecords > (header.size - header.indexOffset) / INDEX_ENTRY_SIZE) break;
+        std::size_t checkedSize = header.indexOffset + header.numRecords * INDEX_ENTRY_SIZE - CHUNK_HEADER_SIZE;
+        if(hash64(data + offset + CHUNK_HEADER_SIZE, checkedSize) != header.checksum) break;
+
+        for(std::uint32_t i = 0; i < header.numRecords; i++) {
+            index.push_back(readIndexEntry(data + offset + header.indexOffset + i * INDEX_ENTRY_SIZE));
+        }
+        offset += header.size;
+    }
+}
+
+const std::vector<std::string>& RecordingReader::getStreams() const {
+    return streams;
+}
+
+bool RecordingReader::isComplete() const {
+    return complete;
+}
+
+std::size_t RecordingReader::getNumMessages() const {
+    return index.size();
+}
+
+const std::vector<RecordIndexEntry>& RecordingReader::getIndex() const {
+    return index;
+}
+
+std::vector<RecordIndexEntry> RecordingReader::getIndex(const std::string& stream) const {
+    std::vector<RecordIndexEntry> result;
+    for(auto i : byTimestamp[getStreamIndex(stream)]) result.push_back(index[i]);
+    return result;
+}
+
+std::shared_ptr<dai::ADatatype> RecordingReader::read(const RecordIndexEntry& entry) const {
+    auto record = view(entry);
+    return decodeMessage(record.datatype, record.metadata, record.metadataSize, record.data, record.dataSize);
+}
+
+const std::uint8_t* RecordingReader::getData(const RecordIndexEntry& entry, std::size_t& size) const {
+    auto record = view(entry);
+    size = record.dataSize;
+    return record.data;
+}
+
+std::shared_ptr<dai::ADatatype> RecordingReader::get(std::size_t i) const {
+    if(i >= index.size()) throw std::out_of_range("Message " + std::to_string(i) + " doesn't exist, recording has " + std::to_string(index.size()));
+    return read(index[i]);
+}
+
+std::shared_ptr<dai::ADatatype> RecordingReader::getNearest(const std::string& stream, std::chrono::nanoseconds timestamp) const {
+    const auto& positions = byTimestamp[getStreamIndex(stream)];
+    if(positions.empty()) return nullptr;
+    auto it = std::lower_bound(
+        positions.begin(), positions.end(), timestamp, [this](std::size_t i, std::chrono::nanoseconds ts) { return index[i].timestamp < ts; });
+    if(it == positions.end()) return read(index[positions.back()]);
+    if(it != positions.begin() && timestamp - index[*(it - 1)].timestamp <= index[*it].timestamp - timestamp) --it;
+    return read(index[*it]);
+}
+
+std::vector<RecordIndexEntry> RecordingReader::getRange(const std::string& stream, std::chrono::nanoseconds begin, std::chrono::nanoseconds end) const {
+    const auto& positions = byTimestamp[getStreamIndex(stream)];
+    auto it = std::lower_bound(
+        positions.begin(), positions.end(), begin, [this](std::size_t i, std::chrono::nanoseconds ts) { return index[i].timestamp < ts; });
+    std::vector<RecordIndexEntry> result;
+    for(; it != positions.end() && index[*it].timestamp < end; ++it) result.push_back(index[*it]);
+    return result;
+}
+
+RecordingReader::RecordView RecordingReader::view(const RecordIndexEntry& entry) const {
+    using namespace recording;
+
+    if(entry.offset < headerSize || entry.size < RECORD_HEADER_SIZE || entry.offset > file.size() || entry.size > file.size() - entry.offset) {
+        throw std::out_of_range("Record at offset " + std::to_string(entry.offset) + " is outside of the recording");
+    }
+    const auto* record = file.data() + entry.offset;
+    RecordView result;
+    result.datatype = static_cast<dai::DatatypeEnum>(readU32(record + 4));
+    result.metadataSize = readU64(record + 8);
+    result.dataSize = readU64(record + 16);
+    if(result.metadataSize > entry.size || result.dataSize > entry.size) throw std::runtime_error("Corrupted record at offset " + std::to_string(entry.offset));
+    auto dataOffset = alignUp(RECORD_HEADER_SIZE + result.metadataSize, DATA_ALIGNMENT);
+    if(dataOffset + result.dataSize > entry.size) throw std::runtime_error("Corrupted record at offset " + std::to_string(entry.offset));
+    result.metadata = record + RECORD_HEADER_SIZE;
+    result.data = record + dataOffset;
+    return result;
+}
+
+const std::string& RecordingReader::getPath() const {
+    return file.getPath();
+}
+
+std::uint32_t RecordingReader::getStreamIndex(const std::string& stream) const {
+    auto it = std::find(streams.begin(), streams.end(), stream);
+    if(it == streams.end()) throw std::invalid_argument("Recording has no stream named: " + stream);
+    return static_cast<std::uint32_t>(it - streams.begin());
+}
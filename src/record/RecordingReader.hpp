@@ -0,0 +1,80 @@
+#pragma once
+
+// std
+#include <chrono>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <vector>
+
+// depthai
+#include "depthai/pipeline/datatype/ADatatype.hpp"
+
+// project
+#include "RecordingFormat.hpp"
+#include "utility/MappedFile.hpp"
+
+/**
+ * @brief Random access to a recording written by Recorder.
+ *
+ * The file is memory mapped, so only accessed messages are read from disk. Recordings which
+ * weren't closed are recovered up to the last completely written chunk.
+ */
+class RecordingReader {
+   public:
+    /// Opens a recording, throws if it can't be read
+    explicit RecordingReader(const std::string& path);
+
+    /// @returns Names of recorded streams, by stream index
+    const std::vector<std::string>& getStreams() const;
+    /// @returns False if recording wasn't closed and was recovered from its chunks
+    bool isComplete() const;
+    /// @returns Number of recorded messages
+    std::size_t getNumMessages() const;
+    /// @returns Index of all messages, in recording order
+    const std::vector<RecordIndexEntry>& getIndex() const;
+    /// @returns Index of messages of a stream, ordered by timestamp
+    std::vector<RecordIndexEntry> getIndex(const std::string& stream) const;
+
+    /// Reads a message. Throws if the entry points outside of the recording
+    std::shared_ptr<dai::ADatatype> read(const RecordIndexEntry& entry) const;
+    /**
+     * Gets data of a message without copying it, valid while reader exists
+     * @param entry Index entry of the message
+     * @param[out] size Size of data in bytes
+     * @returns Pointer to data in the mapped file, aligned to 64 bytes
+     */
+    const std::uint8_t* getData(const RecordIndexEntry& entry, std::size_t& size) const;
+    /// Reads i-th message, in recording order
+    std::shared_ptr<dai::ADatatype> get(std::size_t i) const;
+    /// Reads message of a stream with timestamp closest to 'timestamp', nullptr if stream has no messages
+    std::shared_ptr<dai::ADatatype> getNearest(const std::string& stream, std::chrono::nanoseconds timestamp) const;
+    /// @returns Index of messages of a stream with timestamps in [begin, end), ordered by timestamp
+    std::vector<RecordIndexEntry> getRange(const std::string& stream, std::chrono::nanoseconds begin, std::chrono::nanoseconds end) const;
+
+    /// @returns Path of the recording
+    const std::string& getPath() const;
+
+   private:
+    struct RecordView {
+        dai::DatatypeEnum datatype;
+        const std::uint8_t* metadata;
+        std::size_t metadataSize;
+        const std::uint8_t* data;
+        std::size_t dataSize;
+    };
+
+    RecordView view(const RecordIndexEntry& entry) const;
+    bool readIndex();
+    void scanChunks();
+    std::uint32_t getStreamIndex(const std::string& stream) const;
+
+    MappedFile file;
+    std::size_t headerSize = 0;
+    bool complete = false;
+    std::vector<std::string> streams;
+    std::vector<RecordIndexEntry> index;
+    // Positions in index of each stream's messages, ordered by timestamp
+    std::vector<std::vector<std::size_t>> byTimestamp;
+};
@@ -0,0 +1,226 @@
+#include "ReplayDevice.hpp"
+
+// std
+#include <algorithm>
+#include <stdexcept>
+
+constexpr std::size_t ReplayDevice::EVENT_QUEUE_MAXIMUM_SIZE;
+
+ReplayDevice::ReplayDevice(const std::string& path, float speed, bool loop) : reader(path), speed(speed), loop(loop) {
+    outputQueues.resize(reader.getStreams().size());
+}
+
+ReplayDevice::~ReplayDevice() {
+    close();
+}
+
+std::shared_ptr<MessageQueue> ReplayDevice::getOutputQueue(const std::string& name, unsigned int maxSize, bool blocking) {
+    const auto& streams = reader.getStreams();
+    auto it = std::find(streams.begin(), streams.end(), name);
+    if(it == streams.end()) throw std::runtime_error("Queue for stream name '" + name + "' doesn't exist");
+
+    std::lock_guard<std::mutex> lock(mtx);
+    auto& queue = outputQueues[it - streams.begin()];
+    if(queue == nullptr) {
+        queue = std::make_shared<MessageQueue>(name, maxSize, blocking);
+        queue->addCallback([this](std::string name, std::shared_ptr<dai::ADatatype>) { pushEvent(name); });
+    } else {
+        queue->setMaxSize(maxSize);
+        queue->setBlocking(blocking);
+    }
+    return queue;
+}
+
+std::shared_ptr<MessageQueue> ReplayDevice::getInputQueue(const std::string& name, unsigned int maxSize, bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    auto& queue = inputQueues[name];
+    if(queue == nullptr) {
+        queue = std::make_shared<MessageQueue>(name, maxSize, blocking);
+    } else {
+        queue->setMaxSize(maxSize);
+        queue->setBlocking(blocking);
+    }
+    return queue;
+}
+
+std::vector<std::string> ReplayDevice::getOutputQueueNames() const {
+    return reader.getStreams();
+}
+
+std::vector<std::string> ReplayDevice::getInputQueueNames() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    std::vector<std::string> names;
+    for(const auto& kv : inputQueues) names.push_back(kv.first);
+    return names;
+}
+
+std::vector<std::string> ReplayDevice::getQueueEvents(const std::vector<std::string>& queueNames, std::size_t maxNumEvents, std::chrono::microseconds timeout) {
+    const auto& streams = reader.getStreams();
+    for(const auto& name : queueNames) {
+        if(std::find(streams.begin(), streams.end(), name) == streams.end()) throw std::runtime_error("Queue with name '" + name + "' doesn't exist");
+    }
+
+    std::unique_lock<std::mutex> lock(eventMtx);
+    std::vector<std::string> events;
+    auto predicate = [this, &queueNames, &events, maxNumEvents]() {
+        for(auto it = eventQueue.begin(); it != eventQueue.end() && events.size() < maxNumEvents;) {
+            if(std::find(queueNames.begin(), queueNames.end(), *it) != queueNames.end()) {
+                events.push_back(*it);
+                it = eventQueue.erase(it);
+            } else {
+                ++it;
+            }
+        }
+        return !events.empty() || closed;
+    };
+    if(timeout < std::chrono::microseconds(0)) {
+        eventCv.wait(lock, predicate);
+    } else {
+        eventCv.wait_for(lock, timeout, predicate);
+    }
+    return events;
+}
+
+std::vector<std::string> ReplayDevice::getQueueEvents(std::size_t maxNumEvents, std::chrono::microseconds timeout) {
+    return getQueueEvents(getOutputQueueNames(), maxNumEvents, timeout);
+}
+
+std::string ReplayDevice::getQueueEvent(const std::vector<std::string>& queueNames, std::chrono::microseconds timeout) {
+    auto events = getQueueEvents(queueNames, 1, timeout);
+    if(events.empty()) return "";
+    return events[0];
+}
+
+std::string ReplayDevice::getQueueEvent(std::chrono::microseconds timeout) {
+    return getQueueEvent(getOutputQueueNames(), timeout);
+}
+
+void ReplayDevice::startPipeline() {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(closed) throw std::runtime_error("ReplayDevice already closed");
+    if(started) return;
+    started = true;
+    playbackThread = std::thread(&ReplayDevice::run, this);
+}
+
+bool ReplayDevice::isPipelineRunning() const {
+    return started && !closed;
+}
+
+bool ReplayDevice::isFinished() const {
+    return finished;
+}
+
+void ReplayDevice::setSpeed(float speed) {
+    // Under lock, so playback can't miss the change between reading the speed and waiting
+    std::lock_guard<std::mutex> lock(mtx);
+    this->speed = speed;
+    cv.notify_all();
+}
+
+float ReplayDevice::getSpeed() const {
+    return speed;
+}
+
+void ReplayDevice::setLoop(bool loop) {
+    this->loop = loop;
+}
+
+bool ReplayDevice::getLoop() const {
+    return loop;
+}
+
+std::uint64_t ReplayDevice::getNumReplayed() const {
+    return numReplayed;
+}
+
+std::uint64_t ReplayDevice::getNumLoops() const {
+    return numLoops;
+}
+
+const RecordingReader& ReplayDevice::getReader() const {
+    return reader;
+}
+
+void ReplayDevice::close() {
+    std::vector<std::shared_ptr<MessageQueue>> queues;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(closed) return;
+        closed = true;
+        queues = outputQueues;
+        for(const auto& kv : inputQueues) queues.push_back(kv.second);
+    }
+    cv.notify_all();
+    {
+        std::lock_guard<std::mutex> lock(eventMtx);
+        eventCv.notify_all();
+    }
+    // Wakes up playback blocked on a full queue
+    for(const auto& queue : queues) {
+        if(queue != nullptr) queue->close("ReplayDevice closed");
+    }
+    if(playbackThread.joinable()) playbackThread.join();
+}
+
+bool ReplayDevice::isClosed() const {
+    return closed;
+}
+
+void ReplayDevice::run() {
+    using namespace std::chrono;
+
+    const auto& index = reader.getIndex();
+    std::vector<std::shared_ptr<MessageQueue>> queues;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        queues = outputQueues;
+    }
+    bool anyQueue = std::any_of(queues.begin(), queues.end(), [](const std::shared_ptr<MessageQueue>& q) { return q != nullptr; });
+
+    while(!closed && anyQueue && !index.empty()) {
+        // Paced by original timestamps, messages which are late (eg. timestamps of different streams interleave) are played right away
+        auto start = steady_clock::now();
+        nanoseconds firstTimestamp{0};
+        bool first = true;
+        float currentSpeed = speed;
+        for(const auto& entry : index) {
+            if(closed) return;
+            const auto& queue = queues[entry.stream];
+            if(queue == nullptr) continue;
+
+            if(first || speed != currentSpeed) {
+                // Rebase timing on first played message, and on speed change so it applies from current message on
+                currentSpeed = speed;
+                start = steady_clock::now();
+                firstTimestamp = entry.timestamp;
+                first = false;
+            }
+            if(currentSpeed > 0) {
+                auto offset = duration_cast<steady_clock::duration>(duration<double>(entry.timestamp - firstTimestamp) / currentSpeed);
+                if(!waitUntil(start + offset)) return;
+            }
+            if(!queue->send(reader.read(entry))) return;
+            numReplayed++;
+        }
+        numLoops++;
+        if(!loop) break;
+    }
+    finished = true;
+}
+
+bool ReplayDevice::waitUntil(std::chrono::steady_clock::time_point time) {
+    std::unique_lock<std::mutex> lock(mtx);
+    float current = speed;
+    cv.wait_until(lock, time, [this, current]() { return closed || speed != current; });
+    return !closed;
+}
+
+void ReplayDevice::pushEvent(const std::string& name) {
+    {
+        std::lock_guard<std::mutex> lock(eventMtx);
+        eventQueue.push_back(name);
+        if(eventQueue.size() > EVENT_QUEUE_MAXIMUM_SIZE) eventQueue.pop_front();
+    }
+    eventCv.notify_all();
+}
@@ -0,0 +1,130 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <limits>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <unordered_map>
+#include <vector>
+
+// project
+#include "RecordingReader.hpp"
+#include "device/MessageQueue.hpp"
+
+/**
+ * @brief Plays back a recording through queues with the same API as device output queues.
+ *
+ * Host code written against Device (output queues, callbacks, queue events) runs against captured
+ * traffic without hardware. Messages are read from the memory mapped recording as they are played.
+ * Only streams whose output queues were requested before startPipeline are played.
+ */
+class ReplayDevice {
+   public:
+    /// Maximum number of queue events kept, oldest are discarded
+    static constexpr std::size_t EVENT_QUEUE_MAXIMUM_SIZE{2048};
+
+    /**
+     * Opens a recording, throws if it can't be read
+     * @param path Path of recording written by Recorder
+     * @param speed Playback speed relative to original timing, 0 to play as fast as queues are consumed
+     * @param loop Whether to restart playback after last message
+     */
+    explicit ReplayDevice(const std::string& path, float speed = 1.0f, bool loop = false);
+    /// Stops playback
+    ~ReplayDevice();
+
+    ReplayDevice(const ReplayDevice&) = delete;
+    ReplayDevice& operator=(const ReplayDevice&) = delete;
+
+    /**
+     * Gets output queue of a recorded stream, throws if recording has no such stream.
+     * If the queue already exists, its maxSize and blocking behavior are updated.
+     */
+    std::shared_ptr<MessageQueue> getOutputQueue(const std::string& name, unsigned int maxSize = 16, bool blocking = true);
+    /**
+     * Gets an input queue. Messages sent to it are kept (up to maxSize) instead of being sent
+     * to a device, so they can be inspected
+     */
+    std::shared_ptr<MessageQueue> getInputQueue(const std::string& name, unsigned int maxSize = 16, bool blocking = false);
+    /// @returns Names of recorded streams
+    std::vector<std::string> getOutputQueueNames() const;
+    /// @returns Names of requested input queues
+    std::vector<std::string> getInputQueueNames() const;
+
+    /**
+     * Gets or waits for queue events, same as Device::getQueueEvents
+     * @param queueNames Names of queues to wait for
+     * @param maxNumEvents Maximum number of events to retrieve
+     * @param timeout Timeout after which an empty vector is returned, negative for no timeout
+     * @returns Names of queues which received a message, in order of arrival
+     */
+    std::vector<std::string> getQueueEvents(const std::vector<std::string>& queueNames,
+                                            std::size_t maxNumEvents = std::numeric_limits<std::size_t>::max(),
+                                            std::chrono::microseconds timeout = std::chrono::microseconds(-1));
+    /// Gets or waits for events of all output queues
+    std::vector<std::string> getQueueEvents(std::size_t maxNumEvents = std::numeric_limits<std::size_t>::max(),
+                                            std::chrono::microseconds timeout = std::chrono::microseconds(-1));
+    /// Gets or waits for a single event, empty string on timeout
+    std::string getQueueEvent(const std::vector<std::string>& queueNames, std::chrono::microseconds timeout = std::chrono::microseconds(-1));
+    /// Gets or waits for a single event of any output queue, empty string on timeout
+    std::string getQueueEvent(std::chrono::microseconds timeout = std::chrono::microseconds(-1));
+
+    /// Starts playback of streams with requested output queues
+    void startPipeline();
+    /// @returns True if playback was started
+    bool isPipelineRunning() const;
+    /// @returns True if last message was played and playback isn't looping
+    bool isFinished() const;
+
+    /// Sets playback speed relative to original timing, 0 to play as fast as queues are consumed
+    void setSpeed(float speed);
+    float getSpeed() const;
+    /// Sets whether to restart playback after last message
+    void setLoop(bool loop);
+    bool getLoop() const;
+
+    /// @returns Number of messages played
+    std::uint64_t getNumReplayed() const;
+    /// @returns Number of completed passes over the recording
+    std::uint64_t getNumLoops() const;
+    /// @returns Reader of the recording
+    const RecordingReader& getReader() const;
+
+    /// Stops playback and closes all queues
+    void close();
+    /// @returns True if device was closed
+    bool isClosed() const;
+
+   private:
+    void run();
+    // Waits until 'time', returns false if device was closed in between
+    bool waitUntil(std::chrono::steady_clock::time_point time);
+    void pushEvent(const std::string& name);
+
+    RecordingReader reader;
+
+    mutable std::mutex mtx;
+    std::condition_variable cv;
+    std::vector<std::shared_ptr<MessageQueue>> outputQueues;
+    std::unordered_map<std::string, std::shared_ptr<MessageQueue>> inputQueues;
+    std::atomic<float> speed;
+    std::atomic<bool> loop;
+    std::atomic<bool> started{false};
+    std::atomic<bool> finished{false};
+    std::atomic<bool> closed{false};
+    std::atomic<std::uint64_t> numReplayed{0};
+    std::atomic<std::uint64_t> numLoops{0};
+    std::thread playbackThread;
+
+    std::mutex eventMtx;
+    std::condition_variable eventCv;
+    std::deque<std::string> eventQueue;
+};
@@ -0,0 +1,511 @@
+#include "VideoContainer.hpp"
+
+// std
+#include <cstring>
+#include <stdexcept>
+
+constexpr std::uint32_t Mp4Writer::TIMESCALE;
+constexpr std::uint64_t MkvWriter::TIMESTAMP_SCALE;
+
+namespace {
+
+void appendBe(std::vector<std::uint8_t>& out, std::uint64_t value, unsigned int numBytes) {
+    for(unsigned int i = numBytes; i > 0; i--) out.push_back(static_cast<std::uint8_t>(value >> (8 * (i - 1))));
+}
+
+// ISO BMFF box, size is filled in by build
+class Box {
+   public:
+    explicit Box(const char* type) {
+        u32(0);
+        fourcc(type);
+    }
+    // Full box
+    Box(const char* type, std::uint8_t version, std::uint32_t flags) : Box(type) {
+        u8(version);
+        appendBe(data, flags, 3);
+    }
+
+    Box& u8(std::uint64_t value) {
+        appendBe(data, value, 1);
+        return *this;
+    }
+    Box& u16(std::uint64_t value) {
+        appendBe(data, value, 2);
+        return *this;
+    }
+    Box& u32(std::uint64_t value) {
+        appendBe(data, value, 4);
+        return *this;
+    }
+    Box& u64(std::uint64_t value) {
+        appendBe(data, value, 8);
+        return *this;
+    }
+    Box& zeros(std::size_t count) {
+        data.insert(data.end(), count, 0);
+        return *this;
+    }
+    Box& fourcc(const char* type) {
+        data.insert(data.end(), type, type + 4);
+        return *this;
+    }
+    Box& bytes(const std::vector<std::uint8_t>& bytes) {
+        data.insert(data.end(), bytes.begin(), bytes.end());
+        return *this;
+    }
+    Box& add(const Box& child) {
+        return bytes(child.build());
+    }
+    // Unity transformation matrix
+    Box& matrix() {
+        for(std::uint32_t value : {0x00010000u, 0u, 0u, 0u, 0x00010000u, 0u, 0u, 0u, 0x40000000u}) u32(value);
+        return *this;
+    }
+
+    std::vector<std::uint8_t> build() const {
+        auto result = data;
+        auto size = static_cast<std::uint32_t>(result.size());
+        result[0] = static_cast<std::uint8_t>(size >> 24);
+        result[1] = static_cast<std::uint8_t>(size >> 16);
+        result[2] = static_cast<std::uint8_t>(size >> 8);
+        result[3] = static_cast<std::uint8_t>(size);
+        return result;
+    }
+    std::size_t size() const {
+        return data.size();
+    }
+
+   private:
+    std::vector<std::uint8_t> data;
+};
+
+std::uint64_t toTicks(std::int64_t microseconds) {
+    return static_cast<std::uint64_t>(microseconds) * Mp4Writer::TIMESCALE / 1000000;
+}
+
+// Sample flags of keyframes (depends on no other sample) and other frames (non sync sample)
+constexpr std::uint32_t KEYFRAME_FLAGS = 0x02000000;
+constexpr std::uint32_t FRAME_FLAGS = 0x01010000;
+
+// EBML
+
+unsigned int vintLength(std::uint64_t value) {
+    unsigned int length = 1;
+    // All ones value of a length is reserved for unknown size
+    while(length < 8 && value >= (1ull << (7 * length)) - 1) length++;
+    return length;
+}
+
+void appendId(std::vector<std::uint8_t>& out, std::uint32_t id) {
+    unsigned int numBytes = id > 0xFFFFFF ? 4 : id > 0xFFFF ? 3 : id > 0xFF ? 2 : 1;
+    appendBe(out, id, numBytes);
+}
+
+void appendSize(std::vector<std::uint8_t>& out, std::uint64_t size, unsigned int length = 0) {
+    if(length == 0) length = vintLength(size);
+    appendBe(out, size | (1ull << (7 * length)), length);
+}
+
+std::vector<std::uint8_t> element(std::uint32_t id, const std::vector<std::uint8_t>& payload) {
+    std::vector<std::uint8_t> out;
+    appendId(out, id);
+    appendSize(out, payload.size());
+    out.insert(out.end(), payload.begin(), payload.end());
+    return out;
+}
+
+std::vector<std::uint8_t> uintElement(std::uint32_t id, std::uint64_t value, unsigned int numBytes = 0) {
+    if(numBytes == 0) {
+        numBytes = 1;
+        while(numBytes < 8 && (value >> (8 * numBytes)) != 0) numBytes++;
+    }
+    std::vector<std::uint8_t> payload;
+    appendBe(payload, value, numBytes);
+    return element(id, payload);
+}
+
+std::vector<std::uint8_t> floatElement(std::uint32_t id, double value) {
+    std::uint64_t bits;
+    std::memcpy(&bits, &value, sizeof(bits));
+    std::vector<std::uint8_t> payload;
+    appendBe(payload, bits, 8);
+    return element(id, payload);
+}
+
+std::vector<std::uint8_t> stringElement(std::uint32_t id, const std::string& value) {
+    return element(id, std::vector<std::uint8_t>(value.begin(), value.end()));
+}
+
+void append(std::vector<std::uint8_t>& out, const std::vector<std::uint8_t>& data) {
+    out.insert(out.end(), data.begin(), data.end());
+}
+
+namespace ebml {
+constexpr std::uint32_t EBML = 0x1A45DFA3;
+constexpr std::uint32_t EBML_VERSION = 0x4286;
+constexpr std::uint32_t EBML_READ_VERSION = 0x42F7;
+constexpr std::uint32_t EBML_MAX_ID_LENGTH = 0x42F2;
+constexpr std::uint32_t EBML_MAX_SIZE_LENGTH = 0x42F3;
+constexpr std::uint32_t DOC_TYPE = 0x4282;
+constexpr std::uint32_t DOC_TYPE_VERSION = 0x4287;
+constexpr std::uint32_t DOC_TYPE_READ_VERSION = 0x4285;
+constexpr std::uint32_t SEGMENT = 0x18538067;
+constexpr std::uint32_t SEEK_HEAD = 0x114D9B74;
+constexpr std::uint32_t SEEK = 0x4DBB;
+constexpr std::uint32_t SEEK_ID = 0x53AB;
+constexpr std::uint32_t SEEK_POSITION = 0x53AC;
+constexpr std::uint32_t INFO = 0x1549A966;
+constexpr std::uint32_t TIMESTAMP_SCALE = 0x2AD7B1;
+constexpr std::uint32_t DURATION = 0x4489;
+constexpr std::uint32_t MUXING_APP = 0x4D80;
+constexpr std::uint32_t WRITING_APP = 0x5741;
+constexpr std::uint32_t TRACKS = 0x1654AE6B;
+constexpr std::uint32_t TRACK_ENTRY = 0xAE;
+constexpr std::uint32_t TRACK_NUMBER = 0xD7;
+constexpr std::uint32_t TRACK_UID = 0x73C5;
+constexpr std::uint32_t TRACK_TYPE = 0x83;
+constexpr std::uint32_t FLAG_LACING = 0x9C;
+constexpr std::uint32_t CODEC_ID = 0x86;
+constexpr std::uint32_t CODEC_PRIVATE = 0x63A2;
+constexpr std::uint32_t VIDEO = 0xE0;
+constexpr std::uint32_t PIXEL_WIDTH = 0xB0;
+constexpr std::uint32_t PIXEL_HEIGHT = 0xBA;
+constexpr std::uint32_t CLUSTER = 0x1F43B675;
+constexpr std::uint32_t TIMESTAMP = 0xE7;
+constexpr std::uint32_t SIMPLE_BLOCK = 0xA3;
+constexpr std::uint32_t CUES = 0x1C53BB6B;
+constexpr std::uint32_t CUE_POINT = 0xBB;
+constexpr std::uint32_t CUE_TIME = 0xB3;
+constexpr std::uint32_t CUE_TRACK_POSITIONS = 0xB7;
+constexpr std::uint32_t CUE_TRACK = 0xF7;
+constexpr std::uint32_t CUE_CLUSTER_POSITION = 0xF1;
+constexpr std::uint32_t VOID = 0xEC;
+}  // namespace ebml
+
+// Space reserved for seek head, written on finish
+constexpr std::size_t SEEK_HEAD_RESERVED = 96;
+// Simple block timestamps are 16 bit, relative to cluster
+constexpr std::int64_t MAX_BLOCK_OFFSET = 32767;
+
+std::vector<std::uint8_t> voidElement(std::size_t totalSize) {
+    // Id and 1 byte size
+    std::vector<std::uint8_t> out;
+    appendId(out, ebml::VOID);
+    appendSize(out, totalSize - 2, 1);
+    out.resize(totalSize, 0);
+    return out;
+}
+
+}  // namespace
+
+// VideoContainerWriter
+
+VideoContainerWriter::VideoContainerWriter(std::FILE* file, std::string path) : file(file), path(std::move(path)) {}
+
+std::uint64_t VideoContainerWriter::getSize() const {
+    return offset;
+}
+
+void VideoContainerWriter::write(const std::vector<std::uint8_t>& data) {
+    write(data.data(), data.size());
+}
+
+void VideoContainerWriter::write(const std::uint8_t* data, std::size_t size) {
+    if(std::fwrite(data, 1, size, file) != size) throw std::runtime_error("Couldn't write to video file: " + path);
+    offset += size;
+}
+
+void VideoContainerWriter::writeAt(std::uint64_t position, const std::vector<std::uint8_t>& data) {
+#if defined(_WIN32)
+    bool ok = _fseeki64(file, static_cast<__int64>(position), SEEK_SET) == 0;
+#else
+    bool ok = fseeko(file, static_cast<off_t>(position), SEEK_SET) == 0;
+#endif
+    ok = ok && std::fwrite(data.data(), 1, data.size(), file) == data.size();
+    ok = std::fseek(file, 0, SEEK_END) == 0 && ok;
+    if(!ok) throw std::runtime_error("Couldn't update header of video file: " + path);
+}
+
+// Mp4Writer
+
+Mp4Writer::Mp4Writer(std::FILE* file, std::string path) : VideoContainerWriter(file, std::move(path)) {}
+
+void Mp4Writer::writeHeader(const VideoTrack& track) {
+    bool hevc = track.codec == bitstream::Codec::H265;
+    if(track.codec == bitstream::Codec::MJPEG) throw std::invalid_argument("MJPEG can't be muxed into MP4, use MKV");
+
+    Box ftyp("ftyp");
+    ftyp.fourcc("isom").u32(0x200).fourcc("isom").fourcc("iso6").fourcc(hevc ? "hvc1" : "avc1").fourcc("mp41");
+
+    Box mvhd("mvhd", 0, 0);
+    mvhd.u32(0).u32(0).u32(1000).u32(0);  // creation, modification, timescale, duration
+    mvhd.u32(0x00010000).u16(0x0100).zeros(10).matrix().zeros(24).u32(2);
+
+    Box tkhd("tkhd", 0, 3);  // enabled, in movie
+    tkhd.u32(0).u32(0).u32(1).u32(0).u32(0).zeros(8);
+    tkhd.u16(0).u16(0).u16(0).u16(0).matrix();
+    tkhd.u32(static_cast<std::uint64_t>(track.size.width) << 16).u32(static_cast<std::uint64_t>(track.size.height) << 16);
+
+    Box mdhd("mdhd", 0, 0);
+    mdhd.u32(0).u32(0).u32(TIMESCALE).u32(0).u16(0x55C4).u16(0);  // language 'und'
+
+    Box hdlr("hdlr", 0, 0);
+    hdlr.u32(0).fourcc("vide").zeros(12);
+    const char name[] = "VideoHandler";
+    hdlr.bytes(std::vector<std::uint8_t>(name, name + sizeof(name)));
+
+    Box vmhd("vmhd", 0, 1);
+    vmhd.u16(0).zeros(6);
+    Box url("url ", 0, 1);  // media in same file
+    Box dref("dref", 0, 0);
+    dref.u32(1).add(url);
+    Box dinf("dinf");
+    dinf.add(dref);
+
+    Box config(hevc ? "hvcC" : "avcC");
+    config.bytes(track.codecConfig);
+    Box sampleEntry(hevc ? "hvc1" : "avc1");
+    sampleEntry.zeros(6).u16(1);  // data_reference_index
+    sampleEntry.zeros(16).u16(track.size.width).u16(track.size.height);
+    sampleEntry.u32(0x00480000).u32(0x00480000).u32(0).u16(1);  // 72 dpi, frame_count
+    sampleEntry.zeros(32).u16(0x0018).u16(0xFFFF);              // compressorname, depth, pre_defined
+    sampleEntry.add(config);
+    Box stsd("stsd", 0, 0);
+    stsd.u32(1).add(sampleEntry);
+
+    // Samples are described by fragments, sample tables are empty
+    Box stbl("stbl");
+    stbl.add(stsd);
+    stbl.add(Box("stts", 0, 0).u32(0));
+    stbl.add(Box("stsc", 0, 0).u32(0));
+    stbl.add(Box("stsz", 0, 0).u32(0).u32(0));
+    stbl.add(Box("stco", 0, 0).u32(0));
+
+    Box minf("minf");
+    minf.add(vmhd).add(dinf).add(stbl);
+    Box mdia("mdia");
+    mdia.add(mdhd).add(hdlr).add(minf);
+    Box trak("trak");
+    trak.add(tkhd).add(mdia);
+
+    Box mehd("mehd", 1, 0);
+    mehd.u64(0);
+    Box trex("trex", 0, 0);
+    trex.u32(1).u32(1).u32(0).u32(0).u32(0);
+    Box mvex("mvex");
+    mvex.add(mehd).add(trex);
+
+    Box moov("moov");
+    moov.add(mvhd).add(trak).add(mvex);
+
+    write(ftyp.build());
+    // mehd follows mvhd and trak, fragment_duration follows its full box header
+    fragmentDurationOffset = offset + 8 + mvhd.size() + trak.size() + 8 + 12;
+    write(moov.build());
+}
+
+void Mp4Writer::writeFragment(const std::vector<VideoSample>& samples) {
+    if(samples.empty()) return;
+
+    Box mfhd("mfhd", 0, 0);
+    mfhd.u32(++sequenceNumber);
+    Box tfhd("tfhd", 0, 0x020000);  // default-base-is-moof
+    tfhd.u32(1);
+    Box tfdt("tfdt", 1, 0);
+    std::uint64_t baseTime = toTicks(samples.front().timestamp);
+    tfdt.u64(baseTime);
+
+    // data-offset, sample duration, size and flags present
+    Box trun("trun", 0, 0x000001 | 0x000100 | 0x000200 | 0x000400);
+    trun.u32(samples.size());
+    std::size_t dataOffsetPosition = trun.size();
+    trun.u32(0);
+    std::uint64_t dataSize = 0;
+    for(const auto& sample : samples) {
+        trun.u32(toTicks(sample.timestamp + sample.duration) - toTicks(sample.timestamp));
+        trun.u32(sample.data.size());
+        trun.u32(sample.keyframe ? KEYFRAME_FLAGS : FRAME_FLAGS);
+        dataSize += sample.data.size();
+    }
+
+    Box traf("traf");
+    traf.add(tfhd).add(tfdt);
+    std::size_t trunPosition = traf.size();
+    traf.add(trun);
+    Box moof("moof");
+    moof.add(mfhd);
+    std::size_t trafPosition = moof.size();
+    moof.add(traf);
+
+    // Data of first sample follows moof and mdat header
+    auto moofData = moof.build();
+    auto dataOffset = static_cast<std::uint32_t>(moofData.size() + 8);
+    std::size_t position = trafPosition + trunPosition + dataOffsetPosition;
+    for(unsigned int i = 0; i < 4; i++) moofData[position + i] = static_cast<std::uint8_t>(dataOffset >> (8 * (3 - i)));
+
+    fragments.push_back({baseTime, offset});
+    write(moofData);
+    if(dataSize + 8 > UINT32_MAX) throw std::runtime_error("Fragment is too large");
+    std::vector<std::uint8_t> mdatHeader;
+    appendBe(mdatHeader, dataSize + 8, 4);
+    mdatHeader.insert(mdatHeader.end(), {'m', 'd', 'a', 't'});
+    write(mdatHeader);
+    for(const auto& sample : samples) write(sample.data);
+}
+
+void Mp4Writer::finish(std::int64_t duration) {
+    // Random access index, one entry per fragment, each starting with a keyframe
+    Box tfra("tfra", 1, 0);
+    tfra.u32(1).u32(0).u32(fragments.size());  // track, 1 byte traf/trun/sample numbers
+    for(const auto& fragment : fragments) tfra.u64(fragment.time).u64(fragment.moofOffset).u8(1).u8(1).u8(1);
+    Box mfro("mfro", 0, 0);
+    mfro.u32(8 + tfra.size() + 16);
+    Box mfra("mfra");
+    mfra.add(tfra).add(mfro);
+    write(mfra.build());
+
+    std::vector<std::uint8_t> fragmentDuration;
+    appendBe(fragmentDuration, toTicks(duration), 8);
+    writeAt(fragmentDurationOffset, fragmentDuration);
+    std::fflush(file);
+}
+
+// MkvWriter
+
+MkvWriter::MkvWriter(std::FILE* file, std::string path) : VideoContainerWriter(file, std::move(path)) {}
+
+void MkvWriter::writeHeader(const VideoTrack& track) {
+    std::vector<std::uint8_t> header;
+    append(header, uintElement(ebml::EBML_VERSION, 1));
+    append(header, uintElement(ebml::EBML_READ_VERSION, 1));
+    append(header, uintElement(ebml::EBML_MAX_ID_LENGTH, 4));
+    append(header, uintElement(ebml::EBML_MAX_SIZE_LENGTH, 8));
+    append(header, stringElement(ebml::DOC_TYPE, "matroska"));
+    append(header, uintElement(ebml::DOC_TYPE_VERSION, 4));
+    append(header, uintElement(ebml::DOC_TYPE_READ_VERSION, 2));
+    write(element(ebml::EBML, header));
+
+    // Segment size is unknown until finish
+    std::vector<std::uint8_t> segment;
+    appendId(segment, ebml::SEGMENT);
+    write(segment);
+    segmentSizeOffset = offset;
+    write(std::vector<std::uint8_t>{0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF});
+    segmentDataOffset = offset;
+
+    seekHeadOffset = offset;
+    write(voidElement(SEEK_HEAD_RESERVED));
+
+    std::vector<std::uint8_t> info;
+    append(info, uintElement(ebml::TIMESTAMP_SCALE, TIMESTAMP_SCALE));
+    append(info, stringElement(ebml::MUXING_APP, "depthai"));
+    append(info, stringElement(ebml::WRITING_APP, "depthai"));
+    append(info, floatElement(ebml::DURATION, 0));
+    auto infoElement = element(ebml::INFO, info);
+    infoPosition = offset - segmentDataOffset;
+    durationOffset = offset + infoElement.size() - 8;
+    write(infoElement);
+
+    const char* codecId = track.codec == bitstream::Codec::H264 ? "V_MPEG4/ISO/AVC" : track.codec == bitstream::Codec::H265 ? "V_MPEGH/ISO/HEVC" : "V_MJPEG";
+    std::vector<std::uint8_t> video;
+    append(video, uintElement(ebml::PIXEL_WIDTH, track.size.width));
+    append(video, uintElement(ebml::PIXEL_HEIGHT, track.size.height));
+    std::vector<std::uint8_t> entry;
+    append(entry, uintElement(ebml::TRACK_NUMBER, 1));
+    append(entry, uintElement(ebml::TRACK_UID, 1));
+    append(entry, uintElement(ebml::TRACK_TYPE, 1));  // video
+    append(entry, uintElement(ebml::FLAG_LACING, 0));
+    append(entry, stringElement(ebml::CODEC_ID, codecId));
+    if(!track.codecConfig.empty()) append(entry, element(ebml::CODEC_PRIVATE, track.codecConfig));
+    append(entry, element(ebml::VIDEO, video));
+    tracksPosition = offset - segmentDataOffset;
+    write(element(ebml::TRACKS, element(ebml::TRACK_ENTRY, entry)));
+}
+
+void MkvWriter::writeFragment(const std::vector<VideoSample>& samples) {
+    // Split where block timestamps wouldn't fit relative to cluster timestamp
+    std::size_t begin = 0;
+    while(begin < samples.size()) {
+        std::size_t end = begin + 1;
+        while(end < samples.size() && (samples[end].timestamp - samples[begin].timestamp) / 1000 <= MAX_BLOCK_OFFSET) end++;
+        writeCluster(samples, begin, end);
+        begin = end;
+    }
+}
+
+void MkvWriter::writeCluster(const std::vector<VideoSample>& samples, std::size_t begin, std::size_t end) {
+    const std::uint64_t clusterTime = samples[begin].timestamp / 1000;
+    auto timestamp = uintElement(ebml::TIMESTAMP, clusterTime);
+
+    // Block headers are written separately, so frame data isn't copied into the cluster
+    std::vector<std::vector<std::uint8_t>> blockHeaders;
+    std::uint64_t payloadSize = timestamp.size();
+    for(std::size_t i = begin; i < end; i++) {
+        const auto& sample = samples[i];
+        auto relative = static_cast<std::int16_t>(sample.timestamp / 1000 - static_cast<std::int64_t>(clusterTime));
+        std::vector<std::uint8_t> header;
+        appendId(header, ebml::SIMPLE_BLOCK);
+        appendSize(header, sample.data.size() + 4);
+        header.push_back(0x81);  // track 1
+        appendBe(header, static_cast<std::uint16_t>(relative), 2);
+        header.push_back(sample.keyframe ? 0x80 : 0x00);
+        payloadSize += header.size() + sample.data.size();
+        blockHeaders.push_back(std::move(header));
+    }
+
+    if(samples[begin].keyframe) cues.push_back({clusterTime, offset - segmentDataOffset});
+    std::vector<std::uint8_t> clusterHeader;
+    appendId(clusterHeader, ebml::CLUSTER);
+    appendSize(clusterHeader, payloadSize);
+    write(clusterHeader);
+    write(timestamp);
+    for(std::size_t i = begin; i < end; i++) {
+        write(blockHeaders[i - begin]);
+        write(samples[i].data);
+    }
+}
+
+void MkvWriter::finish(std::int64_t duration) {
+    std::uint64_t cuesPosition = offset - segmentDataOffset;
+    std::vector<std::uint8_t> points;
+    for(const auto& cue : cues) {
+        std::vector<std::uint8_t> positions;
+        append(positions, uintElement(ebml::CUE_TRACK, 1));
+        append(positions, uintElement(ebml::CUE_CLUSTER_POSITION, cue.clusterPosition));
+        std::vector<std::uint8_t> point;
+        append(point, uintElement(ebml::CUE_TIME, cue.time));
+        append(point, element(ebml::CUE_TRACK_POSITIONS, positions));
+        append(points, element(ebml::CUE_POINT, point));
+    }
+    if(!cues.empty()) write(element(ebml::CUES, points));
+
+    // Seek head, padded to reserved space
+    std::vector<std::uint8_t> seeks;
+    auto addSeek = [&seeks](std::uint32_t id, std::uint64_t position) {
+        std::vector<std::uint8_t> seekId;
+        appendId(seekId, id);
+        std::vector<std::uint8_t> seek;
+        append(seek, element(ebml::SEEK_ID, seekId));
+        append(seek, uintElement(ebml::SEEK_POSITION, position, 8));
+        append(seeks, element(ebml::SEEK, seek));
+    };
+    addSeek(ebml::INFO, infoPosition);
+    addSeek(ebml::TRACKS, tracksPosition);
+    if(!cues.empty()) addSeek(ebml::CUES, cuesPosition);
+    auto seekHead = element(ebml::SEEK_HEAD, seeks);
+    append(seekHead, voidElement(SEEK_HEAD_RESERVED - seekHead.size()));
+    writeAt(seekHeadOffset, seekHead);
+
+    std::vector<std::uint8_t> durationData;
+    double durationValue = static_cast<double>(duration) * 1000.0 / TIMESTAMP_SCALE;
+    std::uint64_t bits;
+    std::memcpy(&bits, &durationValue, sizeof(bits));
+    appendBe(durationData, bits, 8);
+    writeAt(durationOffset, durationData);
+
+    std::vector<std::uint8_t> segmentSize;
+    appendSize(segmentSize, offset - segmentDataOffset, 8);
+    writeAt(segmentSizeOffset, segmentSize);
+    std::fflush(file);
+}
@@ -0,0 +1,115 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <string>
+#include <vector>
+
+// project
+#include "Bitstream.hpp"
+
+/// Video track of a container
+struct VideoTrack {
+    bitstream::Codec codec = bitstream::Codec::H264;
+    bitstream::VideoSize size;
+    /// avcC / hvcC record, empty for MJPEG
+    std::vector<std::uint8_t> codecConfig;
+};
+
+/// Encoded frame, as stored in a container (length prefixed NAL units, or a JPEG image)
+struct VideoSample {
+    std::vector<std::uint8_t> data;
+    /// Presentation time from start of the video, in microseconds
+    std::int64_t timestamp = 0;
+    /// Time until next sample, in microseconds
+    std::int64_t duration = 0;
+    bool keyframe = false;
+};
+
+/**
+ * @brief Writes a single video track into a container file.
+ *
+ * Samples are written in fragments, each starting with a keyframe, so a file cut off by a crash
+ * stays playable up to the last complete fragment. Index and duration are written by finish.
+ */
+class VideoContainerWriter {
+   public:
+    virtual ~VideoContainerWriter() = default;
+
+    /// Writes file header describing the track
+    virtual void writeHeader(const VideoTrack& track) = 0;
+    /// Writes a fragment of consecutive samples
+    virtual void writeFragment(const std::vector<VideoSample>& samples) = 0;
+    /// Writes index, patches duration in header
+    virtual void finish(std::int64_t duration) = 0;
+
+    /// @returns Number of bytes written
+    std::uint64_t getSize() const;
+
+   protected:
+    VideoContainerWriter(std::FILE* file, std::string path);
+
+    void write(const std::vector<std::uint8_t>& data);
+    void write(const std::uint8_t* data, std::size_t size);
+    // Overwrites already written bytes, then returns to end of file
+    void writeAt(std::uint64_t offset, const std::vector<std::uint8_t>& data);
+
+    std::FILE* file;
+    const std::string path;
+    std::uint64_t offset = 0;
+};
+
+/// Fragmented MP4 (ISO BMFF) with H.264 or H.265, indexed by a movie fragment random access box
+class Mp4Writer : public VideoContainerWriter {
+   public:
+    /// Media timescale, ticks per second
+    static constexpr std::uint32_t TIMESCALE = 90000;
+
+    Mp4Writer(std::FILE* file, std::string path);
+
+    void writeHeader(const VideoTrack& track) override;
+    void writeFragment(const std::vector<VideoSample>& samples) override;
+    void finish(std::int64_t duration) override;
+
+   private:
+    struct FragmentEntry {
+        std::uint64_t time;
+        std::uint64_t moofOffset;
+    };
+
+    std::uint32_t sequenceNumber = 0;
+    // Offset of fragment_duration in mehd box
+    std::uint64_t fragmentDurationOffset = 0;
+    std::vector<FragmentEntry> fragments;
+};
+
+/// Matroska with H.264, H.265 or MJPEG, clusters indexed by cues
+class MkvWriter : public VideoContainerWriter {
+   public:
+    /// Nanoseconds per timestamp unit
+    static constexpr std::uint64_t TIMESTAMP_SCALE = 1000000;
+
+    MkvWriter(std::FILE* file, std::string path);
+
+    void writeHeader(const VideoTrack& track) override;
+    void writeFragment(const std::vector<VideoSample>& samples) override;
+    void finish(std::int64_t duration) override;
+
+   private:
+    struct CueEntry {
+        std::uint64_t time;
+        std::uint64_t clusterPosition;
+    };
+
+    void writeCluster(const std::vector<VideoSample>& samples, std::size_t begin, std::size_t end);
+
+    std::uint64_t segmentSizeOffset = 0;
+    std::uint64_t segmentDataOffset = 0;
+    std::uint64_t seekHeadOffset = 0;
+    std::uint64_t durationOffset = 0;
+    std::uint64_t infoPosition = 0;
+    std::uint64_t tracksPosition = 0;
+    std::vector<CueEntry> cues;
+};
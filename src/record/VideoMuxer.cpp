@@ -0,0 +1,281 @@
+#include "VideoMuxer.hpp"
+
+// std
+#include <algorithm>
+#include <cctype>
+#include <stdexcept>
+
+constexpr unsigned int VideoMuxer::DEFAULT_MAX_PENDING;
+
+namespace {
+
+VideoMuxer::Format resolveFormat(const std::string& path, bitstream::Codec codec, VideoMuxer::Format format) {
+    if(format == VideoMuxer::Format::MP4 && codec == bitstream::Codec::MJPEG) {
+        throw std::invalid_argument("MJPEG can't be muxed into MP4, use MKV");
+    }
+    if(format != VideoMuxer::Format::AUTO) return format;
+
+    std::string extension = path.size() >= 4 ? path.substr(path.size() - 4) : "";
+    std::transform(extension.begin(), extension.end(), extension.begin(), [](unsigned char c) { return static_cast<char>(std::tolower(c)); });
+    if(extension == ".mkv" || codec == bitstream::Codec::MJPEG) return VideoMuxer::Format::MKV;
+    return VideoMuxer::Format::MP4;
+}
+
+// Frame duration assumed when a video consists of a single frame
+constexpr std::int64_t DEFAULT_FRAME_DURATION = 33333;
+
+}  // namespace
+
+VideoMuxer::VideoMuxer(std::string path, dai::VideoEncoderProperties::Profile profile, Format format)
+    : path(std::move(path)), codec(bitstream::toCodec(profile)), format(resolveFormat(this->path, codec, format)) {}
+
+VideoMuxer::~VideoMuxer() {
+    try {
+        close();
+    } catch(const std::exception&) {
+    }
+}
+
+void VideoMuxer::addQueue(const QueueSource& queue) {
+    std::lock_guard<std::mutex> lock(mtx);
+    if(started) throw std::logic_error("Queue can't be added after muxing started");
+    if(source) throw std::logic_error("Muxer already has a queue");
+    source = [this, queue]() { return queue.subscribe([this](std::shared_ptr<dai::ADatatype> msg) { add(std::dynamic_pointer_cast<dai::ImgFrame>(msg)); }); };
+}
+
+bool VideoMuxer::add(const std::shared_ptr<dai::ImgFrame>& frame) {
+    if(frame == nullptr) return false;
+
+    std::unique_lock<std::mutex> lock(mtx);
+    if(!running) return false;
+    if(pending.size() >= maxPending) {
+        if(!blocking) {
+            stats.numDropped++;
+            dropped = true;
+            return false;
+        }
+        signalSpace.wait(lock, [this]() { return pending.size() < maxPending || !running; });
+        if(!running) return false;
+    }
+    pending.push_back({frame, dropped});
+    dropped = false;
+    signalPending.notify_one();
+    return true;
+}
+
+void VideoMuxer::setFragmentDuration(std::chrono::milliseconds duration) {
+    std::lock_guard<std::mutex> lock(mtx);
+    fragmentDuration = duration;
+}
+
+std::chrono::milliseconds VideoMuxer::getFragmentDuration() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return fragmentDuration;
+}
+
+void VideoMuxer::setMaxPending(unsigned int maxPending) {
+    if(maxPending == 0) throw std::invalid_argument("Maximum number of pending frames can't be 0");
+    std::lock_guard<std::mutex> lock(mtx);
+    this->maxPending = maxPending;
+    signalSpace.notify_all();
+}
+
+unsigned int VideoMuxer::getMaxPending() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return maxPending;
+}
+
+void VideoMuxer::setBlocking(bool blocking) {
+    std::lock_guard<std::mutex> lock(mtx);
+    this->blocking = blocking;
+    signalSpace.notify_all();
+}
+
+bool VideoMuxer::getBlocking() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return blocking;
+}
+
+void VideoMuxer::start() {
+    std::function<std::function<void()>()> toSubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(started) throw std::logic_error("Muxing can't be restarted");
+
+        file = std::fopen(path.c_str(), "wb");
+        if(file == nullptr) throw std::runtime_error("Couldn't create video file: " + path);
+        // Frame data is written directly from frames, in large writes
+        std::setvbuf(file, nullptr, _IONBF, 0);
+        if(format == Format::MP4) {
+            container.reset(new Mp4Writer(file, path));
+        } else {
+            container.reset(new MkvWriter(file, path));
+        }
+
+        started = true;
+        running = true;
+        toSubscribe = source;
+        writer = std::thread(&VideoMuxer::run, this);
+    }
+
+    if(toSubscribe) {
+        auto unsubscriber = toSubscribe();
+        std::lock_guard<std::mutex> lock(mtx);
+        unsubscribe = std::move(unsubscriber);
+    }
+}
+
+void VideoMuxer::close() {
+    std::function<void()> toUnsubscribe;
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        if(!started) return;
+        toUnsubscribe = std::move(unsubscribe);
+        unsubscribe = nullptr;
+    }
+    if(toUnsubscribe) toUnsubscribe();
+
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        running = false;
+        closing = true;
+        signalPending.notify_all();
+        signalSpace.notify_all();
+    }
+    if(writer.joinable()) writer.join();
+
+    std::lock_guard<std::mutex> lock(mtx);
+    if(!error.empty()) throw std::runtime_error("Muxing to '" + path + "' failed: " + error);
+}
+
+bool VideoMuxer::isRunning() const {
+    return running;
+}
+
+VideoMuxer::Format VideoMuxer::getFormat() const {
+    return format;
+}
+
+VideoMuxerStats VideoMuxer::getStats() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    VideoMuxerStats result = stats;
+    result.numPending = pending.size();
+    return result;
+}
+
+std::string VideoMuxer::getPath() const {
+    return path;
+}
+
+void VideoMuxer::run() {
+    std::unique_lock<std::mutex> lock(mtx);
+    try {
+        while(true) {
+            signalPending.wait(lock, [this]() { return !pending.empty() || closing; });
+
+            std::deque<Pending> batch;
+            batch.swap(pending);
+            signalSpace.notify_all();
+            bool last = closing && batch.empty();
+            lock.unlock();
+
+            for(const auto& p : batch) writeFrame(p);
+            if(last && headerWritten) {
+                // Last frame lasts as long as the one before it
+                if(!fragment.empty()) fragment.back().duration = lastDuration > 0 ? lastDuration : DEFAULT_FRAME_DURATION;
+                std::int64_t duration = fragment.empty() ? 0 : fragment.back().timestamp + fragment.back().duration;
+                writeFragment();
+                container->finish(duration);
+            }
+
+            lock.lock();
+            stats.numBytes = container->getSize();
+            if(last) break;
+        }
+    } catch(const std::exception& ex) {
+        if(!lock.owns_lock()) lock.lock();
+        error = ex.what();
+        running = false;
+        pending.clear();
+        signalSpace.notify_all();
+    }
+    if(lock.owns_lock()) lock.unlock();
+    std::fclose(file);
+    file = nullptr;
+}
+
+void VideoMuxer::writeFrame(const Pending& p) {
+    const auto& data = p.frame->getData();
+    if(p.afterDrop) waitKeyframe = true;
+
+    VideoSample sample;
+    VideoTrack track;
+    track.codec = codec;
+    if(codec == bitstream::Codec::MJPEG) {
+        sample.keyframe = true;
+        if(!headerWritten) track.size = bitstream::parseJpeg(data.data(), data.size());
+        sample.data = data;
+    } else {
+        bitstream::NalUnit vps, sps, pps;
+        sample.data.reserve(data.size() + 16);
+        for(const auto& nal : bitstream::splitNalUnits(codec, data.data(), data.size())) {
+            if(bitstream::isKeyframe(codec, nal.type)) sample.keyframe = true;
+            if(nal.type == (codec == bitstream::Codec::H264 ? bitstream::H264_SPS : bitstream::H265_SPS)) sps = nal;
+            if(nal.type == (codec == bitstream::Codec::H264 ? bitstream::H264_PPS : bitstream::H265_PPS)) pps = nal;
+            if(codec == bitstream::Codec::H265 && nal.type == bitstream::H265_VPS) vps = nal;
+            // Parameter sets are carried by the codec configuration
+            if(bitstream::isParameterSet(codec, nal.type) || bitstream::isDiscardable(codec, nal.type)) continue;
+            bitstream::appendLengthPrefixed(sample.data, nal);
+        }
+        if(!headerWritten && sample.keyframe && sps.data != nullptr && pps.data != nullptr) {
+            if(codec == bitstream::Codec::H264) {
+                track.codecConfig = bitstream::makeAvcConfig(sps, pps);
+            } else if(vps.data != nullptr) {
+                track.codecConfig = bitstream::makeHevcConfig(vps, sps, pps);
+            }
+            if(!track.codecConfig.empty()) track.size = bitstream::parseSps(codec, sps);
+        }
+    }
+
+    // Decoding can only start at a keyframe, video starts at the first one with parameter sets
+    bool canStart = sample.keyframe && (headerWritten || codec == bitstream::Codec::MJPEG || !track.codecConfig.empty());
+    if((!headerWritten || waitKeyframe) && !canStart) {
+        std::lock_guard<std::mutex> lock(mtx);
+        stats.numSkipped++;
+        return;
+    }
+    waitKeyframe = false;
+    if(!headerWritten) {
+        container->writeHeader(track);
+        headerWritten = true;
+        firstTimestamp = p.frame->getTimestamp();
+    }
+
+    sample.timestamp = std::chrono::duration_cast<std::chrono::microseconds>(p.frame->getTimestamp() - firstTimestamp).count();
+    if(!fragment.empty()) {
+        // Timestamps must increase, even if device clock misbehaves
+        sample.timestamp = std::max(sample.timestamp, fragment.back().timestamp + 1);
+        lastDuration = sample.timestamp - fragment.back().timestamp;
+        fragment.back().duration = lastDuration;
+
+        std::chrono::milliseconds minDuration;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            minDuration = fragmentDuration;
+        }
+        if(sample.keyframe && std::chrono::microseconds(sample.timestamp - fragment.front().timestamp) >= minDuration) writeFragment();
+    }
+    fragment.push_back(std::move(sample));
+}
+
+void VideoMuxer::writeFragment() {
+    if(fragment.empty()) return;
+    container->writeFragment(fragment);
+
+    std::lock_guard<std::mutex> lock(mtx);
+    stats.numFrames += fragment.size();
+    stats.numFragments++;
+    stats.numBytes = container->getSize();
+    stats.duration = static_cast<double>(fragment.back().timestamp + fragment.back().duration) / 1e6;
+    fragment.clear();
+}
@@ -0,0 +1,161 @@
+#pragma once
+
+// std
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <thread>
+#include <vector>
+
+// depthai
+#include "depthai/device/DataQueue.hpp"
+#include "depthai/pipeline/datatype/ImgFrame.hpp"
+
+// shared
+#include "depthai-shared/properties/VideoEncoderProperties.hpp"
+
+// project
+#include "Bitstream.hpp"
+#include "QueueSource.hpp"
+#include "VideoContainer.hpp"
+
+/// Counters of a video muxer
+struct VideoMuxerStats {
+    /// Number of frames written
+    std::uint64_t numFrames = 0;
+    /// Number of frames discarded because writer couldn't keep up
+    std::uint64_t numDropped = 0;
+    /// Number of frames skipped while waiting for a keyframe (at start and after dropped frames)
+    std::uint64_t numSkipped = 0;
+    /// Number of bytes written to file
+    std::uint64_t numBytes = 0;
+    /// Number of fragments (MP4) or clusters (MKV) written
+    std::uint64_t numFragments = 0;
+    /// Duration of written video, in seconds
+    double duration = 0.0;
+    /// Number of frames waiting for writer
+    std::size_t numPending = 0;
+};
+
+/**
+ * @brief Muxes VideoEncoder bitstream frames into a playable MP4 or MKV file.
+ *
+ * Frames are written as they are, without decoding. H.264 / H.265 streams are parsed into NAL units
+ * to find parameter sets and keyframes, MJPEG frames are all keyframes. Samples are timed with
+ * device timestamps of the frames, so dropped frames or a varying frame rate don't change playback
+ * speed. Writing happens on a writer thread, in fragments starting at keyframes, so a file cut off by
+ * a crash stays playable up to the last complete fragment.
+ */
+class VideoMuxer {
+   public:
+    /// Container format
+    enum class Format {
+        /// MKV for '.mkv' paths and MJPEG, MP4 otherwise
+        AUTO,
+        /// Fragmented MP4, H.264 and H.265 only
+        MP4,
+        /// Matroska
+        MKV
+    };
+
+    static constexpr unsigned int DEFAULT_MAX_PENDING = 64;
+
+    /**
+     * Creates a muxer writing to 'path' once started
+     * @param profile Encoding profile of the VideoEncoder producing the frames
+     * @param format Container format
+     */
+    VideoMuxer(std::string path, dai::VideoEncoderProperties::Profile profile, Format format = Format::AUTO);
+    /// Closes the file
+    ~VideoMuxer();
+
+    VideoMuxer(const VideoMuxer&) = delete;
+    VideoMuxer& operator=(const VideoMuxer&) = delete;
+
+    /**
+     * Muxes all frames of a device output queue or a host queue (eg. ReconnectingDevice output queue).
+     * Device output queues are made non-blocking, so an unread queue doesn't stall the stream. Must be called before start
+     */
+    void addQueue(const QueueSource& queue);
+
+    /**
+     * Queues an encoded frame for writing, can be called from any thread
+     * @returns False if frame was dropped or muxer isn't running
+     */
+    bool add(const std::shared_ptr<dai::ImgFrame>& frame);
+
+    /// Sets minimum duration of a fragment, a new fragment starts at first keyframe after it
+    void setFragmentDuration(std::chrono::milliseconds duration);
+    std::chrono::milliseconds getFragmentDuration() const;
+    /// Sets maximum number of frames waiting for writer
+    void setMaxPending(unsigned int maxPending);
+    unsigned int getMaxPending() const;
+    /**
+     * Sets behavior when writer can't keep up
+     * @param blocking True - 'add' waits for space (backpressure to the stream), false - new frames are dropped
+     */
+    void setBlocking(bool blocking);
+    bool getBlocking() const;
+
+    /// Creates the file and starts muxing. Throws if file can't be created
+    void start();
+    /// Writes pending frames and index and closes the file. Throws if writing failed
+    void close();
+    /// @returns True if muxing
+    bool isRunning() const;
+
+    /// @returns Container format, resolved if created with AUTO
+    Format getFormat() const;
+    /// @returns Counters
+    VideoMuxerStats getStats() const;
+    /// @returns Path of the video file
+    std::string getPath() const;
+
+   private:
+    struct Pending {
+        std::shared_ptr<dai::ImgFrame> frame;
+        // Frames were dropped right before this one
+        bool afterDrop;
+    };
+
+    void run();
+    void writeFrame(const Pending& pending);
+    void writeFragment();
+
+    const std::string path;
+    const bitstream::Codec codec;
+    const Format format;
+    mutable std::mutex mtx;
+    std::condition_variable signalPending;
+    std::condition_variable signalSpace;
+    std::deque<Pending> pending;
+    // Subscribes to the queue on start, returning a function which unsubscribes
+    std::function<std::function<void()>()> source;
+    std::function<void()> unsubscribe;
+    std::chrono::milliseconds fragmentDuration{1000};
+    unsigned int maxPending = DEFAULT_MAX_PENDING;
+    bool blocking = false;
+    bool dropped = false;
+    bool started = false;
+    bool closing = false;
+    std::atomic<bool> running{false};
+    std::string error;
+    VideoMuxerStats stats;
+
+    // Writer thread state
+    std::thread writer;
+    std::FILE* file = nullptr;
+    std::unique_ptr<VideoContainerWriter> container;
+    bool headerWritten = false;
+    bool waitKeyframe = false;
+    std::chrono::steady_clock::time_point firstTimestamp;
+    std::vector<VideoSample> fragment;
+    std::int64_t lastDuration = 0;
+};
@@ -0,0 +1,144 @@
+#include "CacheDirectory.hpp"
+
+// std
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <functional>
+#include <thread>
+
+// project
+#include "Hash.hpp"
+
+#if defined(_WIN32)
+    #include <direct.h>
+    #include <process.h>
+#else
+    #include <sys/stat.h>
+    #include <unistd.h>
+#endif
+
+namespace {
+
+constexpr char MAGIC[4] = {'D', 'A', 'I', 'C'};
+constexpr std::uint32_t FORMAT_VERSION = 1;
+
+// Header of cache files, native byte order
+struct CacheFileHeader {
+    char magic[sizeof(MAGIC)];
+    std::uint32_t version;
+    std::uint64_t key;
+    std::uint64_t size;
+    std::uint64_t hash;
+};
+
+std::string getEnvironment(const char* name) {
+    const char* value = std::getenv(name);
+    return value != nullptr ? value : "";
+}
+
+int getProcessId() {
+#if defined(_WIN32)
+    return _getpid();
+#else
+    return getpid();
+#endif
+}
+
+}  // namespace
+
+std::string getCacheDirectory() {
+    auto directory = getEnvironment("DEPTHAI_CACHE_DIR");
+    if(!directory.empty()) return directory;
+#if defined(_WIN32)
+    directory = getEnvironment("LOCALAPPDATA");
+    if(!directory.empty()) return directory + "\\depthai";
+    for(const char* var : {"TEMP", "TMP"}) {
+        directory = getEnvironment(var);
+        if(!directory.empty()) return directory + "\\depthai";
+    }
+    return "depthai";
+#else
+    directory = getEnvironment("XDG_CACHE_HOME");
+    if(!directory.empty()) return directory + "/depthai";
+    directory = getEnvironment("HOME");
+    if(!directory.empty()) return directory + "/.cache/depthai";
+    directory = getEnvironment("TMPDIR");
+    return (directory.empty() ? "/tmp" : directory) + "/depthai";
+#endif
+}
+
+void createDirectories(const std::string& directory) {
+    std::size_t position = directory.find_first_of("/\\", 1);
+    while(true) {
+        std::string parent = directory.substr(0, position);
+#if defined(_WIN32)
+        _mkdir(parent.c_str());
+#else
+        mkdir(parent.c_str(), 0777);
+#endif
+        if(position == std::string::npos) break;
+        position = directory.find_first_of("/\\", position + 1);
+    }
+}
+
+void createParentDirectories(const std::string& path) {
+    auto separator = path.find_last_of("/\\");
+    if(separator != std::string::npos && separator > 0) createDirectories(path.substr(0, separator));
+}
+
+bool writeFileAtomically(const std::string& path, const std::uint8_t* data, std::size_t size) {
+    createParentDirectories(path);
+
+    // Unique per process and thread, so concurrent writers of the same file don't clobber each other's temporary file
+    std::string tmpPath = path + "." + std::to_string(getProcessId()) + "_" + std::to_string(std::hash<std::thread::id>()(std::this_thread::get_id())) + ".tmp";
+    {
+        std::ofstream file(tmpPath, std::ios::binary | std::ios::trunc);
+        file.write(reinterpret_cast<const char*>(data), static_cast<std::streamsize>(size));
+        if(!file) {
+            file.close();
+            std::remove(tmpPath.c_str());
+            return false;
+        }
+    }
+#if defined(_WIN32)
+    std::remove(path.c_str());
+#endif
+    if(std::rename(tmpPath.c_str(), path.c_str()) != 0) {
+        std::remove(tmpPath.c_str());
+        return false;
+    }
+    return true;
+}
+
+bool storeCacheFile(const std::string& path, std::uint64_t key, const std::vector<std::uint8_t>& data) {
+    CacheFileHeader header{};
+    std::memcpy(header.magic, MAGIC, sizeof(MAGIC));
+    header.version = FORMAT_VERSION;
+    header.key = key;
+    header.size = data.size();
+    header.hash = hash64(data.data(), data.size(), key);
+    std::vector<std::uint8_t> file(sizeof(header) + data.size());
+    std::memcpy(file.data(), &header, sizeof(header));
+    if(!data.empty()) std::memcpy(file.data() + sizeof(header), data.data(), data.size());
+    return writeFileAtomically(path, file.data(), file.size());
+}
+
+bool loadCacheFile(const std::string& path, std::uint64_t key, std::vector<std::uint8_t>& data) {
+    std::ifstream file(path, std::ios::binary);
+    if(!file.is_open()) return false;
+    CacheFileHeader header{};
+    file.read(reinterpret_cast<char*>(&header), sizeof(header));
+    if(!file || std::memcmp(header.magic, MAGIC, sizeof(MAGIC)) != 0 || header.version != FORMAT_VERSION || header.key != key) return false;
+
+    // Size is checked against the file before allocating, in case the header is damaged
+    auto start = file.tellg();
+    file.seekg(0, std::ios::end);
+    auto available = static_cast<std::uint64_t>(file.tellg() - start);
+    if(header.size != available) return false;
+    file.seekg(start);
+    data.resize(static_cast<std::size_t>(header.size));
+    file.read(reinterpret_cast<char*>(data.data()), static_cast<std::streamsize>(data.size()));
+    return file && header.hash == hash64(data.data(), data.size(), key);
+}
@@ -0,0 +1,39 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+/**
+ * @returns Directory for host side caches of derived data (eg. rectification maps).
+ * DEPTHAI_CACHE_DIR if set, otherwise 'depthai' in the user's cache directory
+ * (XDG_CACHE_HOME or ~/.cache, %LOCALAPPDATA% on Windows), or in the temporary directory
+ */
+std::string getCacheDirectory();
+
+/// Creates the directory and its missing parents, existing ones are left as they are
+void createDirectories(const std::string& directory);
+
+/// Creates missing directories of a file path, so the file can be created
+void createParentDirectories(const std::string& path);
+
+/**
+ * Writes a file to a temporary path and renames it, so concurrent readers never see a partially written file.
+ * Missing directories are created
+ * @returns False if the file couldn't be written
+ */
+bool writeFileAtomically(const std::string& path, const std::uint8_t* data, std::size_t size);
+
+/**
+ * Stores data in a cache file, after a header with the entry's key and a hash of the data. Written atomically
+ * @returns False if the file couldn't be written
+ */
+bool storeCacheFile(const std::string& path, std::uint64_t key, const std::vector<std::uint8_t>& data);
+
+/**
+ * Loads data stored by storeCacheFile
+ * @returns False if the file is missing, belongs to another key or is corrupted
+ */
+bool loadCacheFile(const std::string& path, std::uint64_t key, std::vector<std::uint8_t>& data);
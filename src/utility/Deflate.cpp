@@ -0,0 +1,461 @@
+#include "Deflate.hpp"
+
+// std
+#include <algorithm>
+#include <array>
+#include <queue>
+#include <stdexcept>
+
+namespace {
+
+constexpr std::size_t WINDOW_SIZE = 32768;
+constexpr std::size_t WINDOW_MASK = WINDOW_SIZE - 1;
+constexpr unsigned int HASH_BITS = 15;
+constexpr std::size_t HASH_SIZE = 1 << HASH_BITS;
+constexpr std::size_t MIN_MATCH = 3;
+constexpr std::size_t MAX_MATCH = 258;
+// Symbols per block, each block gets its own Huffman code
+constexpr std::size_t BLOCK_SYMBOLS = 1 << 16;
+constexpr std::size_t MAX_STORED = 65535;
+
+constexpr unsigned int NUM_LITLEN = 286;
+constexpr unsigned int NUM_DIST = 30;
+constexpr unsigned int NUM_CODELEN = 19;
+constexpr unsigned int END_OF_BLOCK = 256;
+
+constexpr std::array<std::uint16_t, 29> LENGTH_BASE = {3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31, 35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258};
+constexpr std::array<std::uint8_t, 29> LENGTH_EXTRA = {0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0};
+constexpr std::array<std::uint16_t, 30> DIST_BASE = {1,   2,   3,   4,   5,   7,    9,    13,   17,   25,   33,   49,   65,    97,    129,
+                                                     193, 257, 385, 513, 769, 1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577};
+constexpr std::array<std::uint8_t, 30> DIST_EXTRA = {0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11, 12, 12, 13, 13};
+constexpr std::array<std::uint8_t, 19> CODELEN_ORDER = {16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15};
+
+// Match search effort by level, same trade-offs as zlib
+struct Config {
+    // Search chain is shortened to a quarter when previous match is at least this long
+    unsigned int goodLength;
+    // Lazy levels don't look for a better match after one this long, others insert shorter matches into hash chains
+    unsigned int lazyLength;
+    // Search stops at a match this long
+    unsigned int niceLength;
+    unsigned int maxChain;
+};
+constexpr std::array<Config, 10> CONFIGS = {{{0, 0, 0, 0},
+                                             {4, 4, 8, 4},
+                                             {4, 5, 16, 8},
+                                             {4, 6, 32, 32},
+                                             {4, 4, 16, 16},
+                                             {8, 16, 32, 32},
+                                             {8, 16, 128, 128},
+                                             {8, 32, 128, 256},
+                                             {32, 128, 258, 1024},
+                                             {32, 258, 258, 4096}}};
+constexpr int MIN_LAZY_LEVEL = 4;
+
+// Literal (length 0) or a match
+struct Symbol {
+    std::uint16_t length;
+    std::uint16_t value;
+};
+
+unsigned int lengthCode(unsigned int length) {
+    return static_cast<unsigned int>(std::upper_bound(LENGTH_BASE.begin(), LENGTH_BASE.end(), length) - LENGTH_BASE.begin() - 1);
+}
+
+unsigned int distCode(unsigned int dist) {
+    return static_cast<unsigned int>(std::upper_bound(DIST_BASE.begin(), DIST_BASE.end(), dist) - DIST_BASE.begin() - 1);
+}
+
+class BitWriter {
+   public:
+    explicit BitWriter(std::vector<std::uint8_t>& out) : out(out) {}
+
+    void put(std::uint32_t value, unsigned int count) {
+        buffer |= static_cast<std::uint64_t>(value) << numBits;
+        numBits += count;
+        while(numBits >= 8) {
+            out.push_back(static_cast<std::uint8_t>(buffer));
+            buffer >>= 8;
+            numBits -= 8;
+        }
+    }
+
+    void alignToByte() {
+        if(numBits > 0) put(0, 8 - numBits);
+    }
+
+   private:
+    std::vector<std::uint8_t>& out;
+    std::uint64_t buffer = 0;
+    unsigned int numBits = 0;
+};
+
+// Huffman code lengths, limited to 'limit' bits and forming a complete code (as required by inflate)
+std::vector<std::uint8_t> buildLengths(const std::vector<std::uint32_t>& freqs, unsigned int limit) {
+    std::vector<std::uint8_t> lengths(freqs.size(), 0);
+    std::vector<unsigned int> used;
+    for(unsigned int i = 0; i < freqs.size(); i++) {
+        if(freqs[i] > 0) used.push_back(i);
+    }
+    if(used.empty()) return lengths;
+    if(used.size() == 1) {
+        // A single code of length 1 is the only allowed incomplete code
+        lengths[used[0]] = 1;
+        return lengths;
+    }
+
+    // Huffman tree, leaves first
+    struct Node {
+        std::uint64_t weight;
+        int parent;
+    };
+    std::vector<Node> nodes;
+    using Entry = std::pair<std::uint64_t, int>;
+    std::priority_queue<Entry, std::vector<Entry>, std::greater<Entry>> heap;
+    for(auto symbol : used) {
+        heap.push({freqs[symbol], static_cast<int>(nodes.size())});
+        nodes.push_back({freqs[symbol], -1});
+    }
+    while(heap.size() > 1) {
+        auto a = heap.top();
+        heap.pop();
+        auto b = heap.top();
+        heap.pop();
+        int parent = static_cast<int>(nodes.size());
+        nodes.push_back({a.first + b.first, -1});
+        nodes[a.second].parent = parent;
+        nodes[b.second].parent = parent;
+        heap.push({a.first + b.first, parent});
+    }
+    for(std::size_t i = 0; i < used.size(); i++) {
+        unsigned int depth = 0;
+        for(int node = static_cast<int>(i); nodes[node].parent >= 0; node = nodes[node].parent) depth++;
+        lengths[used[i]] = static_cast<std::uint8_t>(std::min(depth, limit));
+    }
+
+    // Clamping may overfill the code, lengthen the least frequent short codes until it fits
+    const std::uint64_t capacity = 1ull << limit;
+    std::uint64_t kraft = 0;
+    for(auto symbol : used) kraft += 1ull << (limit - lengths[symbol]);
+    std::vector<unsigned int> byFrequency = used;
+    std::sort(byFrequency.begin(), byFrequency.end(), [&freqs](unsigned int a, unsigned int b) { return freqs[a] < freqs[b]; });
+    while(kraft > capacity) {
+        for(auto symbol : byFrequency) {
+            if(lengths[symbol] < limit) {
+                lengths[symbol]++;
+                kraft -= 1ull << (limit - lengths[symbol]);
+                break;
+            }
+        }
+    }
+    // Then shorten the longest codes while the code is incomplete
+    while(kraft < capacity) {
+        unsigned int longest = used[0];
+        for(auto symbol : used) {
+            if(lengths[symbol] > lengths[longest]) longest = symbol;
+        }
+        kraft += 1ull << (limit - lengths[longest]);
+        lengths[longest]--;
+    }
+    return lengths;
+}
+
+// Canonical codes, bit reversed for LSB first output
+std::vector<std::uint16_t> buildCodes(const std::vector<std::uint8_t>& lengths) {
+    std::array<std::uint16_t, 16> count{};
+    for(auto length : lengths) count[length]++;
+    count[0] = 0;
+    std::array<std::uint16_t, 16> next{};
+    std::uint16_t code = 0;
+    for(unsigned int bits = 1; bits < 16; bits++) {
+        code = static_cast<std::uint16_t>((code + count[bits - 1]) << 1);
+        next[bits] = code;
+    }
+    std::vector<std::uint16_t> codes(lengths.size(), 0);
+    for(std::size_t i = 0; i < lengths.size(); i++) {
+        unsigned int length = lengths[i];
+        if(length == 0) continue;
+        std::uint16_t value = next[length]++;
+        std::uint16_t reversed = 0;
+        for(unsigned int bit = 0; bit < length; bit++) reversed = static_cast<std::uint16_t>(reversed | (((value >> bit) & 1) << (length - 1 - bit)));
+        codes[i] = reversed;
+    }
+    return codes;
+}
+
+class Deflater {
+   public:
+    Deflater(const std::uint8_t* data, std::size_t size, int level, std::vector<std::uint8_t>& out)
+        : data(data), size(size), level(level), config(CONFIGS[level]), writer(out), head(HASH_SIZE, -1), prev(WINDOW_SIZE, -1) {
+        symbols.reserve(BLOCK_SYMBOLS);
+    }
+
+    void run() {
+        if(level == 0) {
+            writeStored(0, size, true);
+            return;
+        }
+
+        std::size_t position = 0;
+        std::size_t blockStart = 0;
+        while(position < size) {
+            std::size_t distance = 0;
+            std::size_t length = findMatch(position, config.maxChain, distance);
+            if(length >= MIN_MATCH && level >= MIN_LAZY_LEVEL && length < config.lazyLength && position + 1 < size) {
+                // Lazy matching, a longer match at next position wins over this one
+                insert(position);
+                std::size_t nextDistance = 0;
+                std::size_t nextLength = findMatch(position + 1, length >= config.goodLength ? config.maxChain / 4 : config.maxChain, nextDistance);
+                if(nextLength > length) {
+                    symbols.push_back({0, data[position]});
+                    position++;
+                    length = nextLength;
+                    distance = nextDistance;
+                } else {
+                    // Position was inserted already
+                    position++;
+                    symbols.push_back({static_cast<std::uint16_t>(length), static_cast<std::uint16_t>(distance)});
+                    for(std::size_t i = 1; i < length; i++) insert(position++);
+                    if(symbols.size() >= BLOCK_SYMBOLS) flushBlock(blockStart, position, false);
+                    continue;
+                }
+            }
+
+            if(length >= MIN_MATCH) {
+                symbols.push_back({static_cast<std::uint16_t>(length), static_cast<std::uint16_t>(distance)});
+                // Fast levels skip inserting the positions of long matches
+                std::size_t numInserted = level >= MIN_LAZY_LEVEL || length <= config.lazyLength ? length : 1;
+                for(std::size_t i = 0; i < numInserted; i++) insert(position + i);
+                position += length;
+            } else {
+                symbols.push_back({0, data[position]});
+                insert(position++);
+            }
+            if(symbols.size() >= BLOCK_SYMBOLS) flushBlock(blockStart, position, false);
+        }
+        flushBlock(blockStart, position, true);
+        writer.alignToByte();
+    }
+
+   private:
+    std::uint32_t hash(std::size_t position) const {
+        std::uint32_t value = (static_cast<std::uint32_t>(data[position]) << 16) | (static_cast<std::uint32_t>(data[position + 1]) << 8) | data[position + 2];
+        return (value * 2654435761u) >> (32 - HASH_BITS);
+    }
+
+    void insert(std::size_t position) {
+        if(position + MIN_MATCH > size) return;
+        auto h = hash(position);
+        prev[position & WINDOW_MASK] = head[h];
+        head[h] = static_cast<std::int64_t>(position);
+    }
+
+    std::size_t findMatch(std::size_t position, unsigned int chain, std::size_t& distance) const {
+        if(position + MIN_MATCH > size) return 0;
+        std::size_t maxLength = std::min(MAX_MATCH, size - position);
+        std::size_t best = 0;
+        for(std::int64_t candidate = head[hash(position)]; candidate >= 0 && chain > 0; chain--) {
+            auto start = static_cast<std::size_t>(candidate);
+            if(start >= position || position - start > WINDOW_SIZE) break;
+            // Quick reject on the bytes which would extend the best match, then on hash collisions
+            const std::uint8_t* a = data + start;
+            const std::uint8_t* b = data + position;
+            if(a[best] == b[best] && (best == 0 || a[best - 1] == b[best - 1]) && a[0] == b[0] && a[1] == b[1]) {
+                std::size_t length = 2;
+                while(length < maxLength && a[length] == b[length]) length++;
+                if(length > best) {
+                    best = length;
+                    distance = position - start;
+                    if(length >= config.niceLength || length == maxLength) break;
+                }
+            }
+            std::int64_t next = prev[start & WINDOW_MASK];
+            if(next >= candidate) break;
+            candidate = next;
+        }
+        return best >= MIN_MATCH ? best : 0;
+    }
+
+    void flushBlock(std::size_t& blockStart, std::size_t blockEnd, bool final) {
+        std::vector<std::uint32_t> litlenFreqs(NUM_LITLEN, 0);
+        std::vector<std::uint32_t> distFreqs(NUM_DIST, 0);
+        for(const auto& symbol : symbols) {
+            if(symbol.length == 0) {
+                litlenFreqs[symbol.value]++;
+            } else {
+                litlenFreqs[257 + lengthCode(symbol.length)]++;
+                distFreqs[distCode(symbol.value)]++;
+            }
+        }
+        litlenFreqs[END_OF_BLOCK]++;
+
+        auto litlenLengths = buildLengths(litlenFreqs, 15);
+        auto distLengths = buildLengths(distFreqs, 15);
+        // At least one distance code must be present
+        if(std::all_of(distLengths.begin(), distLengths.end(), [](std::uint8_t length) { return length == 0; })) distLengths[0] = 1;
+
+        unsigned int numLitlen = NUM_LITLEN;
+        while(numLitlen > 257 && litlenLengths[numLitlen - 1] == 0) numLitlen--;
+        unsigned int numDist = NUM_DIST;
+        while(numDist > 1 && distLengths[numDist - 1] == 0) numDist--;
+
+        // Code lengths of both codes, run length encoded
+        std::vector<std::uint8_t> allLengths(litlenLengths.begin(), litlenLengths.begin() + numLitlen);
+        allLengths.insert(allLengths.end(), distLengths.begin(), distLengths.begin() + numDist);
+        std::vector<std::pair<std::uint8_t, std::uint8_t>> runs;
+        for(std::size_t i = 0; i < allLengths.size();) {
+            std::uint8_t length = allLengths[i];
+            std::size_t run = 1;
+            while(i + run < allLengths.size() && allLengths[i + run] == length) run++;
+            i += run;
+            if(length == 0) {
+                while(run >= 11) {
+                    std::size_t count = std::min<std::size_t>(run, 138);
+                    runs.push_back({18, static_cast<std::uint8_t>(count - 11)});
+                    run -= count;
+                }
+                if(run >= 3) {
+                    runs.push_back({17, static_cast<std::uint8_t>(run - 3)});
+                    run = 0;
+                }
+            } else {
+                runs.push_back({length, 0});
+                run--;
+                while(run >= 3) {
+                    std::size_t count = std::min<std::size_t>(run, 6);
+                    runs.push_back({16, static_cast<std::uint8_t>(count - 3)});
+                    run -= count;
+                }
+            }
+            for(; run > 0; run--) runs.push_back({length, 0});
+        }
+        std::vector<std::uint32_t> codelenFreqs(NUM_CODELEN, 0);
+        for(const auto& run : runs) codelenFreqs[run.first]++;
+        auto codelenLengths = buildLengths(codelenFreqs, 7);
+        unsigned int numCodelen = NUM_CODELEN;
+        while(numCodelen > 4 && codelenLengths[CODELEN_ORDER[numCodelen - 1]] == 0) numCodelen--;
+
+        // Blocks which don't compress are stored
+        std::uint64_t dynamicBits = 3 + 14 + 3 * numCodelen;
+        for(const auto& run : runs) dynamicBits += codelenLengths[run.first] + (run.first == 16 ? 2 : run.first == 17 ? 3 : run.first == 18 ? 7 : 0);
+        for(unsigned int i = 0; i < NUM_LITLEN; i++) dynamicBits += static_cast<std::uint64_t>(litlenFreqs[i]) * litlenLengths[i];
+        for(unsigned int i = 0; i < NUM_DIST; i++) dynamicBits += static_cast<std::uint64_t>(distFreqs[i]) * (distLengths[i] + DIST_EXTRA[i]);
+        for(unsigned int i = 0; i < 29; i++) dynamicBits += static_cast<std::uint64_t>(litlenFreqs[257 + i]) * LENGTH_EXTRA[i];
+        std::size_t blockSize = blockEnd - blockStart;
+        std::uint64_t storedBits = (blockSize + 5 * (blockSize / MAX_STORED + 1)) * 8 + 8;
+
+        if(storedBits < dynamicBits) {
+            writeStored(blockStart, blockEnd, final);
+        } else {
+            auto litlenCodes = buildCodes(litlenLengths);
+            auto distCodes = buildCodes(distLengths);
+            auto codelenCodes = buildCodes(codelenLengths);
+
+            writer.put(final ? 1 : 0, 1);
+            writer.put(2, 2);
+            writer.put(numLitlen - 257, 5);
+            writer.put(numDist - 1, 5);
+            writer.put(numCodelen - 4, 4);
+            for(unsigned int i = 0; i < numCodelen; i++) writer.put(codelenLengths[CODELEN_ORDER[i]], 3);
+            for(const auto& run : runs) {
+                writer.put(codelenCodes[run.first], codelenLengths[run.first]);
+                if(run.first == 16) writer.put(run.second, 2);
+                if(run.first == 17) writer.put(run.second, 3);
+                if(run.first == 18) writer.put(run.second, 7);
+            }
+            for(const auto& symbol : symbols) {
+                if(symbol.length == 0) {
+                    writer.put(litlenCodes[symbol.value], litlenLengths[symbol.value]);
+                } else {
+                    auto lcode = lengthCode(symbol.length);
+                    writer.put(litlenCodes[257 + lcode], litlenLengths[257 + lcode]);
+                    writer.put(symbol.length - LENGTH_BASE[lcode], LENGTH_EXTRA[lcode]);
+                    auto dcode = distCode(symbol.value);
+                    writer.put(distCodes[dcode], distLengths[dcode]);
+                    writer.put(symbol.value - DIST_BASE[dcode], DIST_EXTRA[dcode]);
+                }
+            }
+            writer.put(litlenCodes[END_OF_BLOCK], litlenLengths[END_OF_BLOCK]);
+        }
+        symbols.clear();
+        blockStart = blockEnd;
+    }
+
+    void writeStored(std::size_t begin, std::size_t end, bool final) {
+        do {
+            std::size_t length = std::min(MAX_STORED, end - begin);
+            bool last = final && begin + length == end;
+            writer.put(last ? 1 : 0, 1);
+            writer.put(0, 2);
+            writer.alignToByte();
+            writer.put(static_cast<std::uint32_t>(length), 16);
+            writer.put(static_cast<std::uint32_t>(~length & 0xFFFF), 16);
+            for(std::size_t i = begin; i < begin + length; i++) writer.put(data[i], 8);
+            begin += length;
+        } while(begin < end);
+    }
+
+    const std::uint8_t* data;
+    const std::size_t size;
+    const int level;
+    const Config config;
+    BitWriter writer;
+    std::vector<std::int64_t> head;
+    std::vector<std::int64_t> prev;
+    std::vector<Symbol> symbols;
+};
+
+std::array<std::uint32_t, 256> makeCrcTable() {
+    std::array<std::uint32_t, 256> table{};
+    for(std::uint32_t i = 0; i < 256; i++) {
+        std::uint32_t c = i;
+        for(int k = 0; k < 8; k++) c = (c & 1) ? 0xEDB88320u ^ (c >> 1) : c >> 1;
+        table[i] = c;
+    }
+    return table;
+}
+
+}  // namespace
+
+std::vector<std::uint8_t> zlibCompress(const std::uint8_t* data, std::size_t size, int level) {
+    if(level < 0 || level > 9) throw std::invalid_argument("Compression level must be between 0 and 9");
+
+    std::vector<std::uint8_t> out;
+    out.reserve(level == 0 ? size + size / MAX_STORED * 5 + 16 : size / 2 + 64);
+    // Deflate with 32K window, level hint, check bits
+    std::uint8_t flags = level == 0 ? 0x01 : level < 6 ? 0x5E : level == 6 ? 0x9C : 0xDA;
+    out.push_back(0x78);
+    out.push_back(flags);
+    Deflater(data, size, level, out).run();
+
+    std::uint32_t adler = adler32(data, size);
+    for(int shift = 24; shift >= 0; shift -= 8) out.push_back(static_cast<std::uint8_t>(adler >> shift));
+    return out;
+}
+
+std::uint32_t crc32(const std::uint8_t* data, std::size_t size, std::uint32_t crc) {
+    static const auto table = makeCrcTable();
+    crc = ~crc;
+    for(std::size_t i = 0; i < size; i++) crc = table[(crc ^ data[i]) & 0xFF] ^ (crc >> 8);
+    return ~crc;
+}
+
+std::uint32_t adler32(const std::uint8_t* data, std::size_t size, std::uint32_t adler) {
+    constexpr std::uint32_t MOD = 65521;
+    // Largest block before sums could overflow
+    constexpr std::size_t NMAX = 5552;
+    std::uint32_t a = adler & 0xFFFF;
+    std::uint32_t b = adler >> 16;
+    while(size > 0) {
+        std::size_t count = std::min(size, NMAX);
+        size -= count;
+        for(std::size_t i = 0; i < count; i++) {
+            a += data[i];
+            b += a;
+        }
+        data += count;
+        a %= MOD;
+        b %= MOD;
+    }
+    return (b << 16) | a;
+}
@@ -0,0 +1,23 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+/**
+ * Compresses data into a zlib stream (RFC 1950 / 1951), as used by PNG.
+ * Uses LZ77 with hash chains and a dynamic Huffman code per block; blocks which don't compress are stored.
+ *
+ * @param data Pointer to data
+ * @param size Size of data in bytes
+ * @param level 0 stores data uncompressed, 1 (fastest) to 9 (smallest) bound the match search
+ * @returns zlib stream
+ */
+std::vector<std::uint8_t> zlibCompress(const std::uint8_t* data, std::size_t size, int level = 6);
+
+/// @returns CRC-32 (ISO 3309) of the data, 'crc' continues a previous checksum
+std::uint32_t crc32(const std::uint8_t* data, std::size_t size, std::uint32_t crc = 0);
+
+/// @returns Adler-32 of the data, 'adler' continues a previous checksum
+std::uint32_t adler32(const std::uint8_t* data, std::size_t size, std::uint32_t adler = 1);
@@ -0,0 +1,109 @@
+#include "Hash.hpp"
+
+// std
+#include <cstring>
+
+namespace {
+
+constexpr std::uint64_t PRIME64_1 = 11400714785074694791ULL;
+constexpr std::uint64_t PRIME64_2 = 14029467366897019727ULL;
+constexpr std::uint64_t PRIME64_3 = 1609587929392839161ULL;
+constexpr std::uint64_t PRIME64_4 = 9650029242287828579ULL;
+constexpr std::uint64_t PRIME64_5 = 2870177450012600261ULL;
+
+inline std::uint64_t rotl(std::uint64_t x, int r) {
+    return (x << r) | (x >> (64 - r));
+}
+
+inline std::uint64_t read64(const std::uint8_t* p) {
+    std::uint64_t v;
+    std::memcpy(&v, p, sizeof(v));
+    return v;
+}
+
+inline std::uint32_t read32(const std::uint8_t* p) {
+    std::uint32_t v;
+    std::memcpy(&v, p, sizeof(v));
+    return v;
+}
+
+inline std::uint64_t round(std::uint64_t acc, std::uint64_t input) {
+    acc += input * PRIME64_2;
+    acc = rotl(acc, 31);
+    acc *= PRIME64_1;
+    return acc;
+}
+
+inline std::uint64_t mergeRound(std::uint64_t acc, std::uint64_t val) {
+    val = round(0, val);
+    acc ^= val;
+    acc = acc * PRIME64_1 + PRIME64_4;
+    return acc;
+}
+
+}  // namespace
+
+std::uint64_t hash64(const void* data, std::size_t size, std::uint64_t seed) {
+    const auto* p = static_cast<const std::uint8_t*>(data);
+    const std::uint8_t* const end = p + size;
+    std::uint64_t h;
+
+    if(size >= 32) {
+        const std::uint8_t* const limit = end - 32;
+        std::uint64_t v1 = seed + PRIME64_1 + PRIME64_2;
+        std::uint64_t v2 = seed + PRIME64_2;
+        std::uint64_t v3 = seed;
+        std::uint64_t v4 = seed - PRIME64_1;
+        do {
+            v1 = round(v1, read64(p));
+            v2 = round(v2, read64(p + 8));
+            v3 = round(v3, read64(p + 16));
+            v4 = round(v4, read64(p + 24));
+            p += 32;
+        } while(p <= limit);
+
+        h = rotl(v1, 1) + rotl(v2, 7) + rotl(v3, 12) + rotl(v4, 18);
+        h = mergeRound(h, v1);
+        h = mergeRound(h, v2);
+        h = mergeRound(h, v3);
+        h = mergeRound(h, v4);
+    } else {
+        h = seed + PRIME64_5;
+    }
+
+    h += static_cast<std::uint64_t>(size);
+
+    while(p + 8 <= end) {
+        h ^= round(0, read64(p));
+        h = rotl(h, 27) * PRIME64_1 + PRIME64_4;
+        p += 8;
+    }
+    if(p + 4 <= end) {
+        h ^= static_cast<std::uint64_t>(read32(p)) * PRIME64_1;
+        h = rotl(h, 23) * PRIME64_2 + PRIME64_3;
+        p += 4;
+    }
+    while(p < end) {
+        h ^= (*p) * PRIME64_5;
+        h = rotl(h, 11) * PRIME64_1;
+        p++;
+    }
+
+    // Avalanche
+    h ^= h >> 33;
+    h *= PRIME64_2;
+    h ^= h >> 29;
+    h *= PRIME64_3;
+    h ^= h >> 32;
+    return h;
+}
+
+std::string hashToHex(std::uint64_t hash) {
+    static const char* digits = "0123456789abcdef";
+    std::string hex(16, '0');
+    for(int i = 15; i >= 0; i--) {
+        hex[i] = digits[hash & 0xF];
+        hash >>= 4;
+    }
+    return hex;
+}
@@ -0,0 +1,20 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+/**
+ * Computes a 64bit non-cryptographic hash (XXH64) of the data.
+ * Fast enough to be used on large blobs, not suitable against malicious inputs.
+ *
+ * @param data Pointer to data
+ * @param size Size of data in bytes
+ * @param seed Seed, can be used to chain hashes of multiple buffers
+ * @returns 64bit hash
+ */
+std::uint64_t hash64(const void* data, std::size_t size, std::uint64_t seed = 0);
+
+/// @returns Hash formatted as 16 lowercase hexadecimal characters
+std::string hashToHex(std::uint64_t hash);
@@ -0,0 +1,79 @@
+#include "MappedFile.hpp"
+
+// std
+#include <stdexcept>
+
+#if defined(_WIN32)
+    #ifndef WIN32_LEAN_AND_MEAN
+        #define WIN32_LEAN_AND_MEAN
+    #endif
+    #include <windows.h>
+#else
+    #include <fcntl.h>
+    #include <sys/mman.h>
+    #include <sys/stat.h>
+    #include <unistd.h>
+#endif
+
+MappedFile::MappedFile(const std::string& p) : path(p) {
+#if defined(_WIN32)
+    HANDLE file = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, nullptr, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, nullptr);
+    if(file == INVALID_HANDLE_VALUE) throw std::runtime_error("Couldn't open file: " + path);
+    LARGE_INTEGER fileSize;
+    if(!GetFileSizeEx(file, &fileSize)) {
+        CloseHandle(file);
+        throw std::runtime_error("Couldn't get size of file: " + path);
+    }
+    length = static_cast<std::size_t>(fileSize.QuadPart);
+    if(length > 0) {
+        mapping = CreateFileMappingA(file, nullptr, PAGE_READONLY, 0, 0, nullptr);
+        if(mapping != nullptr) ptr = static_cast<const std::uint8_t*>(MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0));
+    }
+    // Mapping keeps its own reference to the file
+    CloseHandle(file);
+    if(length > 0 && ptr == nullptr) {
+        if(mapping != nullptr) CloseHandle(mapping);
+        throw std::runtime_error("Couldn't map file: " + path);
+    }
+#else
+    int fd = open(path.c_str(), O_RDONLY);
+    if(fd < 0) throw std::runtime_error("Couldn't open file: " + path);
+    struct stat info;
+    if(fstat(fd, &info) != 0) {
+        close(fd);
+        throw std::runtime_error("Couldn't get size of file: " + path);
+    }
+    length = static_cast<std::size_t>(info.st_size);
+    if(length > 0) {
+        void* addr = mmap(nullptr, length, PROT_READ, MAP_SHARED, fd, 0);
+        if(addr == MAP_FAILED) {
+            close(fd);
+            throw std::runtime_error("Couldn't map file: " + path);
+        }
+        ptr = static_cast<const std::uint8_t*>(addr);
+    }
+    // Mapping stays valid after the descriptor is closed
+    close(fd);
+#endif
+}
+
+MappedFile::~MappedFile() {
+#if defined(_WIN32)
+    if(ptr != nullptr) UnmapViewOfFile(ptr);
+    if(mapping != nullptr) CloseHandle(mapping);
+#else
+    if(ptr != nullptr) munmap(const_cast<std::uint8_t*>(ptr), length);
+#endif
+}
+
+const std::uint8_t* MappedFile::data() const {
+    return ptr;
+}
+
+std::size_t MappedFile::size() const {
+    return length;
+}
+
+const std::string& MappedFile::getPath() const {
+    return path;
+}
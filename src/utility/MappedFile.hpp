@@ -0,0 +1,37 @@
+#pragma once
+
+// std
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+/**
+ * @brief Read-only memory mapped file.
+ *
+ * Contents are paged in on access and backed by the page cache, so processes mapping
+ * the same file share a single copy in RAM.
+ */
+class MappedFile {
+   public:
+    /// Maps the whole file, throws if it can't be opened or mapped
+    explicit MappedFile(const std::string& path);
+    ~MappedFile();
+
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+
+    /// @returns Pointer to mapped contents, nullptr for an empty file
+    const std::uint8_t* data() const;
+    /// @returns Size of the file in bytes
+    std::size_t size() const;
+    /// @returns Path of the mapped file
+    const std::string& getPath() const;
+
+   private:
+    std::string path;
+    const std::uint8_t* ptr = nullptr;
+    std::size_t length = 0;
+#if defined(_WIN32)
+    void* mapping = nullptr;
+#endif
+};
@@ -0,0 +1,72 @@
+#include "ThreadPool.hpp"
+
+// std
+#include <exception>
+
+ThreadPool::ThreadPool(std::size_t numThreads) {
+    if(numThreads == 0) numThreads = std::thread::hardware_concurrency();
+    if(numThreads == 0) numThreads = 1;
+    workers.reserve(numThreads);
+    for(std::size_t i = 0; i < numThreads; i++) {
+        workers.emplace_back(&ThreadPool::work, this);
+    }
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        running = false;
+    }
+    signalTask.notify_all();
+    for(auto& worker : workers) {
+        if(worker.joinable()) worker.join();
+    }
+}
+
+void ThreadPool::submit(std::function<void()> task) {
+    {
+        std::lock_guard<std::mutex> lock(mtx);
+        tasks.push_back(std::move(task));
+    }
+    signalTask.notify_one();
+}
+
+void ThreadPool::wait() {
+    std::unique_lock<std::mutex> lock(mtx);
+    signalIdle.wait(lock, [this]() { return tasks.empty() && numActive == 0; });
+}
+
+std::size_t ThreadPool::getNumThreads() const {
+    return workers.size();
+}
+
+std::size_t ThreadPool::getNumPending() const {
+    std::lock_guard<std::mutex> lock(mtx);
+    return tasks.size();
+}
+
+void ThreadPool::work() {
+    while(true) {
+        std::function<void()> task;
+        {
+            std::unique_lock<std::mutex> lock(mtx);
+            signalTask.wait(lock, [this]() { return !tasks.empty() || !running; });
+            // Drain remaining tasks before exiting
+            if(tasks.empty()) return;
+            task = std::move(tasks.front());
+            tasks.pop_front();
+            numActive++;
+        }
+
+        try {
+            task();
+        } catch(const std::exception&) {
+        }
+
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            numActive--;
+        }
+        signalIdle.notify_all();
+    }
+}
@@ -0,0 +1,49 @@
+#pragma once
+
+// std
+#include <condition_variable>
+#include <cstddef>
+#include <deque>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+/**
+ * @brief Fixed size pool of worker threads executing tasks in submission order
+ */
+class ThreadPool {
+   public:
+    /**
+     * Starts the worker threads
+     * @param numThreads Number of worker threads, 0 for number of hardware threads
+     */
+    explicit ThreadPool(std::size_t numThreads = 0);
+    /// Finishes already submitted tasks and joins the worker threads
+    ~ThreadPool();
+
+    ThreadPool(const ThreadPool&) = delete;
+    ThreadPool& operator=(const ThreadPool&) = delete;
+
+    /// Queues a task for execution. Exceptions thrown by tasks are ignored
+    void submit(std::function<void()> task);
+
+    /// Blocks until all submitted tasks have finished
+    void wait();
+
+    /// @returns Number of worker threads
+    std::size_t getNumThreads() const;
+    /// @returns Number of tasks waiting for a free worker
+    std::size_t getNumPending() const;
+
+   private:
+    void work();
+
+    mutable std::mutex mtx;
+    std::condition_variable signalTask;
+    std::condition_variable signalIdle;
+    std::deque<std::function<void()>> tasks;
+    std::size_t numActive = 0;
+    bool running = true;
+    std::vector<std::thread> workers;
+};
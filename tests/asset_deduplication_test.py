@@ -0,0 +1,86 @@
+import struct
+import unittest
+
+import numpy as np
+import depthai as dai
+
+
+ELF_HEADER_SIZE = 52
+
+
+def createBlob(size=4096):
+    # Blob header of version 5.0 without inputs and outputs
+    blob = bytearray(size)
+    struct.pack_into("<4I", blob, ELF_HEADER_SIZE, 9709, len(blob), 5, 0)
+    return bytes(blob)
+
+
+def createSharedBlobPipeline():
+    pipeline = dai.Pipeline()
+    for _ in range(2):
+        pipeline.createNeuralNetwork().setBlob(createBlob())
+    return pipeline
+
+
+def createAsset(data, alignment=1):
+    asset = dai.Asset()
+    asset.data = np.array(data, dtype=np.uint8)
+    asset.alignment = alignment
+    return asset
+
+
+class TestAssetDeduplication(unittest.TestCase):
+    def test_stats(self):
+        manager = dai.AssetManager()
+        manager.set("a", createAsset([1, 2, 3, 4]))
+        manager.set("b", createAsset([1, 2, 3, 4], 64))
+        manager.set("c", createAsset([5, 6]))
+
+        stats = manager.getStats()
+        self.assertEqual(stats.numAssets, 3)
+        self.assertEqual(stats.numUnique, 2)
+        self.assertEqual(stats.totalSize, 10)
+        self.assertEqual(stats.deduplicatedSize, 6)
+        self.assertEqual([sorted(keys) for keys in stats.duplicates], [["a", "b"]])
+
+    def test_serialized_pipeline_stores_duplicates_once(self):
+        pipeline = dai.Pipeline()
+        blob = list(range(256)) * 64
+        pipeline.getAssetManager().set("first", createAsset(blob))
+        single = len(pipeline.serialize())
+        pipeline.getAssetManager().set("second", createAsset(blob))
+        self.assertLess(len(pipeline.serialize()), single + len(blob))
+
+        restored = dai.Pipeline.deserialize(pipeline.serialize())
+        assets = restored.getAssetManager()
+        self.assertTrue(np.array_equal(assets.get("first").data, assets.get("second").data))
+        self.assertEqual(restored.getAssetStats().deduplicatedSize, len(blob))
+
+    def test_deduplicate_pipeline_blobs(self):
+        pipeline = createSharedBlobPipeline()
+        self.assertEqual(pipeline.getAllAssets().size(), 2)
+
+        stats = pipeline.deduplicateAssets()
+        self.assertEqual((stats.numAssets, stats.numUnique), (1, 1))
+        self.assertEqual(stats.totalSize, len(createBlob()))
+        assets = pipeline.getAllAssets().getAll()
+        self.assertEqual(len(assets), 1)
+        self.assertEqual(bytes(assets[0].data), createBlob())
+        for node in pipeline.getAllNodes():
+            self.assertEqual(node.getAssets(), [])
+        # Both nodes refer to the shared copy
+        infos = pipeline.getBlobInfos()
+        self.assertEqual(sorted(infos.keys()), sorted(node.id for node in pipeline.getAllNodes()))
+
+    def test_deserialized_blobs_are_shared(self):
+        pipeline = createSharedBlobPipeline()
+        restored = dai.Pipeline.deserialize(pipeline.serialize())
+        assets = restored.getAllAssets().getAll()
+        self.assertEqual(len(assets), 1)
+        self.assertEqual(bytes(assets[0].data), createBlob())
+        self.assertEqual(len(restored.getBlobInfos()), 2)
+        self.assertEqual(dai.Pipeline.deserialize(restored.serialize()).getAllAssets().size(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import depthai as dai
+
+
+def createPipeline():
+    pipeline = dai.Pipeline()
+    cam = pipeline.createColorCamera()
+    cam.setResolution(dai.ColorCameraProperties.SensorResolution.THE_4_K)
+    cam.setFps(30)
+
+    xoutVideo = pipeline.createXLinkOut()
+    xoutVideo.setStreamName("video")
+    cam.video.link(xoutVideo.input)
+
+    xoutPreview = pipeline.createXLinkOut()
+    xoutPreview.setStreamName("preview")
+    xoutPreview.setFpsLimit(10)
+    cam.preview.link(xoutPreview.input)
+    return pipeline
+
+
+class TestBandwidthAnalyzer(unittest.TestCase):
+    def test_links(self):
+        report = createPipeline().analyzeBandwidth(dai.UsbSpeed.SUPER)
+        links = {link.streamName: link for link in report.links}
+
+        video = links["video"]
+        self.assertEqual(video.direction, dai.LinkReport.Direction.DEVICE_TO_HOST)
+        self.assertEqual((video.rate.width, video.rate.height), (3840, 2160))
+        self.assertAlmostEqual(video.rate.bytesPerFrame, 3840 * 2160 * 1.5)
+        self.assertAlmostEqual(video.rate.fps, 30)
+
+        preview = links["preview"]
+        self.assertAlmostEqual(preview.rate.bytesPerFrame, 300 * 300 * 3)
+        self.assertAlmostEqual(preview.rate.fps, 10)
+        self.assertTrue(report.withinBudget)
+
+    def test_over_budget(self):
+        report = createPipeline().analyzeBandwidth(dai.UsbSpeed.HIGH)
+        self.assertFalse(report.withinBudget)
+        self.assertGreater(report.utilization, 1.0)
+        self.assertIn("digraph", report.toDot())
+        self.assertIn("OVER BUDGET", str(report))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+# Parameter sets of a 320x240 H.264 stream
+SPS = bytes.fromhex("67f4000d919640507ec044000003000400000300f03c50a920")
+PPS = bytes.fromhex("68ebc3c44844")
+START_CODE = b"\x00\x00\x00\x01"
+
+
+def makeFrame(i, gop=10):
+    # Parameter sets with each IDR picture, then a slice (payload isn't parsed)
+    if i % gop == 0:
+        data = START_CODE + SPS + START_CODE + PPS + START_CODE + b"\x65" + bytes([i % 256 or 1]) * 64
+    else:
+        data = START_CODE + b"\x41" + bytes([i % 256 or 1]) * 32
+    frame = dai.ImgFrame()
+    frame.setType(dai.RawImgFrame.Type.BITSTREAM)
+    frame.setTimestamp(timedelta(seconds=10, milliseconds=100 * i))
+    frame.setData(np.frombuffer(data, dtype=np.uint8))
+    return frame
+
+
+class TestBitstreamRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.buffer = dai.BitstreamRingBuffer(dai.VideoEncoderProperties.Profile.H264_MAIN)
+        self.buffer.setWindow(timedelta(seconds=1.5))
+
+    def tearDown(self):
+        self.buffer.close()
+        self.directory.cleanup()
+
+    def test_window(self):
+        # Starts at first keyframe
+        for i in range(5, 10):
+            self.buffer.add(makeFrame(i))
+        self.assertEqual(self.buffer.getStats().numFrames, 0)
+        self.assertEqual(self.buffer.getStats().numEvicted, 5)
+
+        # Whole GOPs are evicted, once the rest covers the window
+        for i in range(10, 36):
+            self.buffer.add(makeFrame(i))
+        stats = self.buffer.getStats()
+        self.assertEqual(stats.numGops, 2)
+        self.assertEqual(stats.numFrames, 16)
+        self.assertAlmostEqual(stats.duration, 1.5)
+
+        self.buffer.setMaxBytes(1)
+        self.assertEqual(self.buffer.getStats().numFrames, 6)
+
+    def test_trigger(self):
+        for i in range(30):
+            self.buffer.add(makeFrame(i))
+        path = os.path.join(self.directory.name, "clip.mp4")
+        self.buffer.trigger(path, timedelta(milliseconds=500))
+        self.assertEqual(self.buffer.getStats().numActiveClips, 1)
+        for i in range(30, 40):
+            self.buffer.add(makeFrame(i))
+        self.assertTrue(self.buffer.wait(timedelta(seconds=5)))
+
+        stats = self.buffer.getStats()
+        self.assertEqual(stats.numClips, 1)
+        self.assertEqual(stats.numFailedClips, 0)
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data[4:8], b"ftyp")
+        # Buffered GOPs (frames 10 - 29) and frames until 500ms after the trigger
+        self.assertEqual(data.count(b"\x00\x00\x00\x21\x41"), 18 + 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import struct
+import unittest
+
+import depthai as dai
+
+ELF_HEADER_SIZE = 52
+
+
+def createBlob(versionMajor=5, versionMinor=0):
+    # ELF header, blob header, input and output sections, constants with dims
+    blob = bytearray(512)
+    inputOffset, outputOffset, constOffset = 200, 300, 400
+    struct.pack_into("<4I", blob, ELF_HEADER_SIZE, 9709, len(blob), versionMajor, versionMinor)
+    struct.pack_into("<2I", blob, ELF_HEADER_SIZE + 16, 1, 1)
+    struct.pack_into("<4I", blob, ELF_HEADER_SIZE + 64, inputOffset, outputOffset, 0, constOffset)
+
+    def tensor(offset, name, dataType, order, numDims, dimsOffset):
+        struct.pack_into("<Ii I8s IIIiI II", blob, offset, 0, 0, 8, name, dataType, order, numDims, 3, dimsOffset, 0, 0)
+
+    # NCHW U8 input, dims stored innermost first
+    tensor(inputOffset, b"data", 1, 0x4321, 4, 0)
+    struct.pack_into("<4I", blob, constOffset, 300, 300, 3, 1)
+    # NC FP16 output
+    tensor(outputOffset, b"out", 0, 0x43, 2, 16)
+    struct.pack_into("<2I", blob, constOffset + 16, 100, 1)
+    return bytes(blob)
+
+
+class TestBlobInfo(unittest.TestCase):
+    def test_parse(self):
+        info = dai.BlobInfo(createBlob())
+        self.assertEqual((info.versionMajor, info.versionMinor), (5, 0))
+        self.assertEqual(info.getOpenVINOVersion(), dai.OpenVINO.VERSION_2020_3)
+
+        data = info.getInput("data")
+        self.assertEqual(data.order, "NCHW")
+        self.assertEqual(data.dims, [1, 3, 300, 300])
+        self.assertEqual(data.dataType, dai.TensorInfo.DataType.U8F)
+        self.assertEqual(data.getSize(), 3 * 300 * 300)
+
+        out = info.outputs[0]
+        self.assertEqual((out.name, out.order, out.dims), ("out", "NC", [1, 100]))
+        self.assertEqual(out.getSize(), 200)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            dai.BlobInfo(bytes(256))
+        with self.assertRaises(ValueError):
+            dai.BlobInfo(createBlob()[:350])
+
+    def test_pipeline_version(self):
+        pipeline = dai.Pipeline()
+        nn = pipeline.createNeuralNetwork()
+        nn.setBlob(createBlob())
+
+        self.assertEqual(list(pipeline.getBlobInfos().keys()), [nn.id])
+        pipeline.validateOpenVINOVersion()
+        with self.assertRaises(RuntimeError):
+            pipeline.validateOpenVINOVersion(dai.OpenVINO.VERSION_2021_3)
+
+        pipeline.setOpenVINOVersion(dai.OpenVINO.VERSION_2020_1)
+        self.assertEqual(pipeline.resolveOpenVINOVersion(), dai.OpenVINO.VERSION_2020_3)
+        self.assertEqual(pipeline.getOpenVINOVersion(), dai.OpenVINO.VERSION_2020_3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+ROTATION = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+MX_ID = "14442C10D13EABCE00"
+
+
+def createCalibration():
+    calibration = dai.CalibrationHandler()
+    calibration.setBoardInfo("BW1098OBC", "R0M0E0")
+    for camera in (dai.CameraBoardSocket.RGB, dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT):
+        calibration.setCameraIntrinsics(camera, INTRINSICS, 1280, 800)
+        calibration.setDistortionCoefficients(camera, [0.1, 0.01] + [0.0] * 12)
+        calibration.setFov(camera, 71.9)
+    calibration.setLensPosition(dai.CameraBoardSocket.RGB, 135)
+    calibration.setCameraExtrinsics(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT, ROTATION, [-7.5, 0.0, 0.0], [-7.5, 0.0, 0.0])
+    calibration.setCameraExtrinsics(dai.CameraBoardSocket.RIGHT, dai.CameraBoardSocket.RGB, ROTATION, [3.75, 0.0, 0.0])
+    calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, ROTATION)
+    calibration.setStereoRight(dai.CameraBoardSocket.RIGHT, ROTATION)
+    return calibration
+
+
+def toJson(calibration):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calibration.json")
+        calibration.eepromToJsonFile(path)
+        with open(path) as file:
+            data = json.load(file)
+    data["cameraData"].sort(key=lambda camera: camera[0])
+    return data
+
+
+class TestCalibrationBinary(unittest.TestCase):
+    def test_round_trip(self):
+        calibration = createCalibration()
+        data = calibration.toBinary()
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(data[:4], b"DAIB")
+        self.assertEqual(toJson(dai.CalibrationHandler.fromBinary(data)), toJson(calibration))
+        self.assertEqual(toJson(dai.CalibrationHandler.fromBinary(bytearray(data))), toJson(calibration))
+        self.assertEqual(dai.CalibrationHandler.fromBinary(memoryview(data)).toBinary(), data)
+        self.assertEqual(toJson(dai.CalibrationHandler.fromBinary(dai.CalibrationHandler().toBinary())), toJson(dai.CalibrationHandler()))
+
+    def test_invalid(self):
+        data = createCalibration().toBinary()
+        for invalid in (b"", data[:-1], data + b"\0", b"DAIC" + data[4:], data[:4] + b"\2" + data[5:], data[:40] + bytes([data[40] ^ 1]) + data[41:]):
+            with self.assertRaises(RuntimeError):
+                dai.CalibrationHandler.fromBinary(invalid)
+        with self.assertRaises(TypeError):
+            dai.CalibrationHandler.fromBinary("calibration")
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = dai.CalibrationStore(os.path.join(directory, "store"))
+            self.assertIsNone(store.load(MX_ID))
+            self.assertNotIn(MX_ID, store)
+
+            calibration = createCalibration()
+            store.store(MX_ID, calibration)
+            self.assertIn(MX_ID, store)
+            self.assertEqual(toJson(store.load(MX_ID)), toJson(calibration))
+
+            # Stored again once recalibrated
+            calibration.setLensPosition(dai.CameraBoardSocket.RGB, 140)
+            store.store(MX_ID, calibration)
+            self.assertEqual(store.load(MX_ID).getLensPosition(dai.CameraBoardSocket.RGB), 140)
+            self.assertEqual(os.listdir(os.path.join(directory, "store")), [MX_ID + ".bin"])
+
+            with open(os.path.join(directory, "store", MX_ID + ".bin"), "r+b") as file:
+                file.truncate(100)
+            with self.assertRaises(RuntimeError):
+                store.load(MX_ID)
+            self.assertTrue(store.remove(MX_ID))
+            self.assertFalse(store.remove(MX_ID))
+            with self.assertRaises(ValueError):
+                store.load("../" + MX_ID)
+
+
+if __name__ == "__main__":
+    unittest.main()
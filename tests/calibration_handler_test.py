@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+ROTATION = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+
+class TestCalibrationHandler(unittest.TestCase):
+    def setUp(self):
+        self.calibration = dai.CalibrationHandler()
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, INTRINSICS, 1280, 800)
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.RIGHT, INTRINSICS, 1280, 800)
+        self.calibration.setDistortionCoefficients(dai.CameraBoardSocket.LEFT, [0.1, 0.01] + [0.0] * 12)
+        self.calibration.setCameraExtrinsics(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT, ROTATION, [-7.5, 0.0, 0.0])
+        self.calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, ROTATION)
+
+    def test_arrays(self):
+        intrinsics = self.calibration.getCameraIntrinsicsArray(dai.CameraBoardSocket.LEFT, 640, 400)
+        self.assertEqual(intrinsics.shape, (3, 3))
+        self.assertEqual(intrinsics.dtype, np.float32)
+        np.testing.assert_allclose(intrinsics, self.calibration.getCameraIntrinsics(dai.CameraBoardSocket.LEFT, 640, 400))
+        np.testing.assert_allclose(intrinsics[0], [400, 0, 320])
+
+        extrinsics = self.calibration.getCameraExtrinsicsArray(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT)
+        self.assertEqual(extrinsics.shape, (4, 4))
+        np.testing.assert_allclose(extrinsics[:3, 3], [-7.5, 0, 0])
+        distortion = self.calibration.getDistortionCoefficientsArray(dai.CameraBoardSocket.LEFT)
+        self.assertEqual(distortion.shape, (14,))
+        np.testing.assert_allclose(self.calibration.getStereoLeftRectificationRotationArray(), ROTATION)
+
+    def test_cache(self):
+        # Returned arrays are copies, so modifying one doesn't affect later calls
+        first = self.calibration.getCameraIntrinsicsArray(dai.CameraBoardSocket.LEFT, (640, 400))
+        first[0, 0] = 0
+        self.assertEqual(self.calibration.getCameraIntrinsicsArray(dai.CameraBoardSocket.LEFT, (640, 400))[0, 0], 400)
+
+        # Setters drop memoized results
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, [[1000.0, 0.0, 640.0], [0.0, 1000.0, 400.0], [0.0, 0.0, 1.0]], 1280, 800)
+        self.assertEqual(self.calibration.getCameraIntrinsics(dai.CameraBoardSocket.LEFT, 640, 400)[0][0], 500)
+        self.calibration.setCameraExtrinsics(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT, ROTATION, [-5.0, 0.0, 0.0])
+        self.assertEqual(self.calibration.getCameraExtrinsics(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT)[0][3], -5)
+
+        with self.assertRaises(RuntimeError):
+            self.calibration.getCameraIntrinsicsArray(dai.CameraBoardSocket.RGB)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+
+def writePgm(path, value, width=32, height=24):
+    with open(path, "wb") as f:
+        f.write(f"P5\n{width} {height}\n255\n".encode())
+        f.write(bytes([value]) * (width * height))
+
+
+def makeFrame(seq, value, offset=timedelta(0)):
+    frame = dai.ImgFrame()
+    frame.setType(dai.RawImgFrame.Type.GRAY8)
+    frame.setWidth(16)
+    frame.setHeight(8)
+    frame.setSequenceNum(seq)
+    frame.setTimestamp(timedelta(milliseconds=33 * seq) + offset)
+    frame.setData(np.full(16 * 8, value, dtype=np.uint8))
+    return frame
+
+
+class TestDatasetStreamer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        # Natural ordering puts "10" after "9"
+        for i in range(12):
+            os.makedirs(os.path.join(self.path, str(i)))
+            writePgm(os.path.join(self.path, str(i), "left.pgm"), i)
+            writePgm(os.path.join(self.path, str(i), "right.pgm"), 100 + i)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_grouped(self):
+        left = dai.MessageQueue("left", 4, True)
+        right = dai.MessageQueue("right", 4, True)
+        streamer = dai.DatasetStreamer(self.path, numThreads=2)
+        streamer.addStream("*/left.pgm", left, dai.ImgFrame.Type.RAW8, dai.CameraBoardSocket.LEFT)
+        streamer.addStream("*/right.pgm", right, dai.ImgFrame.Type.RAW8, dai.CameraBoardSocket.RIGHT)
+        self.assertEqual(streamer.getNumGroups(), 12)
+        streamer.setFps(200)
+        with streamer:
+            for i in range(12):
+                l, r = left.get(), right.get()
+                self.assertEqual(l.getSequenceNum(), i)
+                self.assertEqual(r.getSequenceNum(), i)
+                self.assertEqual(l.getTimestamp(), r.getTimestamp())
+                self.assertEqual(l.getData()[0], i)
+                self.assertEqual(r.getData()[0], 100 + i)
+                self.assertEqual(l.getInstanceNum(), int(dai.CameraBoardSocket.LEFT))
+                self.assertEqual((l.getWidth(), l.getHeight()), (32, 24))
+            self.assertTrue(streamer.wait(timeout=2000))
+            self.assertTrue(streamer.isFinished())
+            stats = streamer.getStats()
+        self.assertEqual(stats.numGroups, 12)
+        self.assertEqual(stats.numFrames, 24)
+        self.assertEqual(stats.numBytes, 24 * 32 * 24)
+        self.assertGreater(stats.fps, 0)
+
+    def test_decoder_and_conversion(self):
+        np.save(os.path.join(self.path, "0", "color.npy"), np.dstack([np.full((4, 6), c, np.uint8) for c in (10, 20, 30)]))
+        queue = dai.MessageQueue("color", 4, True)
+        streamer = dai.DatasetStreamer(self.path)
+        streamer.setDecoder(np.load)
+        streamer.addStream("0/color.npy", queue, dai.ImgFrame.Type.RGB888p)
+        with streamer:
+            frame = queue.get()
+        self.assertEqual(frame.getType(), dai.ImgFrame.Type.RGB888p)
+        self.assertEqual(list(frame.getData()[::24]), [30, 20, 10])
+
+    def test_errors(self):
+        streamer = dai.DatasetStreamer(self.path)
+        with self.assertRaises(ValueError):
+            streamer.addStream("*/missing.png", dai.MessageQueue("q"))
+        with self.assertRaises(RuntimeError):
+            streamer.start()
+
+    def record(self, dropped, rightSequenceOffset=0):
+        path = os.path.join(self.path, "session.rec")
+        recorder = dai.Recorder(path)
+        recorder.addStream("left")
+        recorder.addStream("right")
+        recorder.setBlocking(True)
+        recorder.start()
+        for i in range(8):
+            self.assertTrue(recorder.add("left", makeFrame(i, i)))
+            if i != dropped:
+                # Right camera is slightly late
+                right = makeFrame(i, 100 + i, timedelta(milliseconds=2))
+                right.setSequenceNum(i + rightSequenceOffset)
+                self.assertTrue(recorder.add("right", right))
+        recorder.close()
+        return path
+
+    def streamRecorded(self, path):
+        left = dai.MessageQueue("left", 16, True)
+        right = dai.MessageQueue("right", 16, True)
+        streamer = dai.DatasetStreamer(path)
+        streamer.addStream("left", left)
+        streamer.addStream("right", right)
+        streamer.setFps(200)
+        with streamer:
+            self.assertTrue(streamer.wait(timeout=2000))
+            stats = streamer.getStats()
+        pairs = []
+        while left.has():
+            pairs.append((left.get().getData()[0], right.get().getData()[0]))
+        self.assertFalse(right.has())
+        return pairs, stats
+
+    def test_recorded_dropped_frame(self):
+        path = self.record(dropped=3)
+        pairs, stats = self.streamRecorded(path)
+        # Left frame without a right counterpart is skipped, rest stay paired
+        self.assertEqual(pairs, [(i, 100 + i) for i in range(8) if i != 3])
+        self.assertEqual(stats.numGroups, 7)
+        self.assertEqual(stats.numUnmatched, 1)
+
+    def test_recorded_unsynced_sequence_numbers(self):
+        # Independent cameras, paired by nearest timestamp
+        path = self.record(dropped=5, rightSequenceOffset=1000)
+        pairs, stats = self.streamRecorded(path)
+        self.assertEqual(pairs, [(i, 100 + i) for i in range(8) if i != 5])
+        self.assertEqual(stats.numUnmatched, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+ROTATION = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+
+def rotationY(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return [[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]]
+
+
+class TestDepthAligner(unittest.TestCase):
+    def createCalibration(self, rectification=ROTATION, extrinsics=ROTATION, distortion=0.0):
+        calibration = dai.CalibrationHandler()
+        for camera in [dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT, dai.CameraBoardSocket.RGB]:
+            calibration.setCameraIntrinsics(camera, INTRINSICS, 1280, 800)
+            calibration.setDistortionCoefficients(camera, [0.0] * 14)
+        calibration.setDistortionCoefficients(dai.CameraBoardSocket.RGB, [distortion] + [0.0] * 13)
+        calibration.setCameraExtrinsics(dai.CameraBoardSocket.RIGHT, dai.CameraBoardSocket.RGB, extrinsics, [3.75, 0.0, 0.0])
+        calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, ROTATION)
+        calibration.setStereoRight(dai.CameraBoardSocket.RIGHT, rectification)
+        return calibration
+
+    def test_translation(self):
+        aligner = dai.DepthAligner(self.createCalibration(), dai.CameraBoardSocket.RIGHT, (640, 400), dai.CameraBoardSocket.RGB, (640, 400))
+        self.assertEqual(aligner.getDepthSize(), (640, 400))
+        self.assertEqual(aligner.getTargetSize(), (640, 400))
+
+        # 3.75cm baseline at 1m and 400px focal length shifts by 15px
+        depth = np.full((400, 640), 1000, dtype=np.uint16)
+        aligned = aligner.align(depth)
+        self.assertEqual(aligned.shape, (400, 640))
+        self.assertEqual(aligned.dtype, np.uint16)
+        self.assertTrue((aligned[:, 15:] == 1000).all())
+        self.assertTrue((aligned[:, :15] == 0).all())
+
+        # Nearer surfaces occlude farther ones and leave a hole behind
+        depth[:, 300:340] = 500
+        out = np.full((400, 640), 7, dtype=np.uint16)
+        self.assertIs(aligner.align(depth, out), out)
+        self.assertTrue((out[:, 330:370] == 500).all())
+        self.assertTrue((out[:, 315:330] == 0).all())
+        self.assertTrue((out[:, 370:] == 1000).all())
+
+        with self.assertRaises(ValueError):
+            aligner.align(depth[:200])
+        with self.assertRaises(ValueError):
+            aligner.align(depth, np.zeros((400, 640), dtype=np.float32))
+
+    def test_reference(self):
+        rectification = rotationY(0.01)
+        extrinsics = rotationY(-0.02)
+        calibration = self.createCalibration(rectification, extrinsics, 0.05)
+        aligner = dai.DepthAligner(calibration, dai.CameraBoardSocket.RIGHT, (640, 400), dai.CameraBoardSocket.RGB, (320, 200))
+        depth = np.random.default_rng(0).integers(400, 3000, (400, 640), dtype=np.uint16)
+        depth[::7, ::5] = 0
+        aligned = aligner.align(depth[:, :])
+
+        v, u = np.mgrid[0:400, 0:640]
+        z = np.where(depth > 0, depth, 1).astype(np.float64)
+        rays = np.stack([(u - 320) / 400, (v - 200) / 400, np.ones(u.shape)], axis=-1)
+        points = (rays @ np.array(rectification)) * z[..., None]
+        points = points @ np.array(extrinsics).T + [37.5, 0, 0]
+        x, y = points[..., 0] / points[..., 2], points[..., 1] / points[..., 2]
+        radial = 1 + 0.05 * (x * x + y * y)
+        px = np.floor(x * radial * 200 + 160 + 0.5).astype(int)
+        py = np.floor(y * radial * 200 + 100 + 0.5).astype(int)
+        valid = (depth > 0) & (px >= 0) & (px < 320) & (py >= 0) & (py < 200)
+        expected = np.full((200, 320), 65535, dtype=np.int64)
+        np.minimum.at(expected, (py[valid], px[valid]), np.floor(points[..., 2][valid] + 0.5).astype(np.int64))
+        expected[expected == 65535] = 0
+        self.assertLess(np.mean(np.abs(aligned.astype(np.int64) - expected) > 1), 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
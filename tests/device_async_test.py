@@ -0,0 +1,93 @@
+import asyncio
+import time
+import unittest
+
+import depthai as dai
+
+# Device.DEFAULT_SEARCH_TIME, in seconds
+SEARCH_TIME = 3
+NUM_WORKERS = 4
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def waitForAvailableDevices(count, timeout=15.0):
+    start = time.monotonic()
+    while len(dai.Device.getAllAvailableDevices()) < count:
+        if time.monotonic() - start > timeout:
+            raise TimeoutError("Device didn't become available")
+        await asyncio.sleep(0.1)
+
+
+class TestDeviceAsync(unittest.TestCase):
+    @unittest.skipIf(dai.Device.getAllAvailableDevices(), "requires no available devices")
+    def test_cancel_search(self):
+        async def cancelSearches():
+            # Occupy all workers with searches, then cancel them while pending
+            futures = [dai.Device.openAsync(dai.Pipeline()) for _ in range(NUM_WORKERS)]
+            await asyncio.sleep(0.3)
+            for future in futures:
+                self.assertFalse(future.done())
+                future.cancel()
+            for future in futures:
+                with self.assertRaises(asyncio.CancelledError):
+                    await future
+
+            # Cancelled searches release their workers, a new open isn't queued behind them
+            start = time.monotonic()
+            with self.assertRaises(RuntimeError):
+                await dai.Device.openAsync(dai.Pipeline())
+            return time.monotonic() - start
+
+        self.assertLess(run(cancelSearches()), SEARCH_TIME + 1.5)
+
+    @unittest.skipUnless(dai.Device.getAllAvailableDevices(), "requires a device")
+    def test_open_close(self):
+        async def openClose():
+            device = await dai.Device.openAsync(dai.Pipeline())
+            self.assertFalse(device.isClosed())
+            self.assertIsNone(await device.closeAsync())
+            self.assertTrue(device.isClosed())
+
+        run(openClose())
+        run(waitForAvailableDevices(1))
+
+    @unittest.skipUnless(dai.Device.getAllAvailableDevices(), "requires a device")
+    def test_cancel_boot(self):
+        async def cancelBoot():
+            future = dai.Device.openAsync(dai.Pipeline())
+            # Search finishes right away, cancelled while the device boots
+            await asyncio.sleep(0.5)
+            future.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await future
+
+            # Booted device is closed by the worker and can be opened again
+            await waitForAvailableDevices(1)
+            device = await dai.Device.openAsync(dai.Pipeline())
+            await device.closeAsync()
+
+        run(cancelBoot())
+        run(waitForAvailableDevices(1))
+
+    @unittest.skipUnless(len(dai.Device.getAllAvailableDevices()) >= 2, "requires two devices")
+    def test_concurrent_open(self):
+        async def openTwo():
+            devices = await asyncio.gather(dai.Device.openAsync(dai.Pipeline()), dai.Device.openAsync(dai.Pipeline()))
+            try:
+                self.assertNotEqual(devices[0].getMxId(), devices[1].getMxId())
+            finally:
+                await asyncio.gather(*(device.closeAsync() for device in devices))
+
+        run(openTwo())
+        run(waitForAvailableDevices(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import csv
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+WIDTH = 64
+HEIGHT = 40
+
+
+def makeFrame(i, type=dai.RawImgFrame.Type.GRAY8):
+    dtype = np.uint16 if type == dai.RawImgFrame.Type.RAW16 else np.uint8
+    rng = np.random.default_rng(i)
+    pixels = (np.arange(WIDTH * HEIGHT) % WIDTH + rng.integers(0, 4, WIDTH * HEIGHT)).astype(dtype)
+    frame = dai.ImgFrame()
+    frame.setType(type)
+    frame.setWidth(WIDTH)
+    frame.setHeight(HEIGHT)
+    frame.setSequenceNum(i)
+    frame.setTimestamp(timedelta(seconds=5, milliseconds=i))
+    frame.setData(pixels.view(np.uint8))
+    return frame, pixels
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+
+def decodePng(data):
+    # Minimal decoder of grayscale, non interlaced PNG
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    idat = b""
+    while position < len(data):
+        size, type = struct.unpack(">I4s", data[position:position + 8])
+        body = data[position + 8:position + 8 + size]
+        crc, = struct.unpack(">I", data[position + 8 + size:position + 12 + size])
+        assert zlib.crc32(type + body) == crc
+        if type == b"IHDR":
+            width, height, depth, colorType = struct.unpack(">IIBB", body[:10])
+        elif type == b"IDAT":
+            idat += body
+        position += 12 + size
+    assert colorType == 0
+
+    bpp = depth // 8
+    stride = width * bpp
+    raw = zlib.decompress(idat)
+    rows = []
+    previous = bytearray(stride)
+    for y in range(height):
+        filter = raw[y * (stride + 1)]
+        row = bytearray(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)])
+        for x in range(stride):
+            a = row[x - bpp] if x >= bpp else 0
+            b = previous[x]
+            c = previous[x - bpp] if x >= bpp else 0
+            row[x] = (row[x] + [0, a, b, (a + b) // 2, paeth(a, b, c)][filter]) & 0xFF
+        rows.append(bytes(row))
+        previous = row
+    return np.frombuffer(b"".join(rows), dtype=">u2" if depth == 16 else np.uint8)
+
+
+class TestFrameArchiver(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "archive")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def readIndex(self):
+        with open(os.path.join(self.path, "index.csv")) as f:
+            return list(csv.DictReader(f))
+
+    def test_png(self):
+        frames = [makeFrame(i, dai.RawImgFrame.Type.RAW16 if i % 2 else dai.RawImgFrame.Type.GRAY8) for i in range(12)]
+        with dai.FrameArchiver(self.path, dai.FrameArchiver.Format.PNG, 4) as archiver:
+            archiver.setBlocking(True)
+            archiver.setMaxPending(3)
+            for i, (frame, _) in enumerate(frames):
+                archiver.setCompressionLevel(i % 10)
+                self.assertTrue(archiver.add(frame))
+            self.assertTrue(archiver.wait(timedelta(seconds=5)))
+
+        stats = archiver.getStats()
+        self.assertEqual(stats.numArchived, 12)
+        self.assertEqual(stats.numFailed, 0)
+        self.assertEqual(stats.numBytesIn, 6 * WIDTH * HEIGHT * 3)
+
+        # Written in order, although compressed concurrently
+        index = self.readIndex()
+        self.assertEqual([int(line["sequenceNum"]) for line in index], list(range(12)))
+        for line, (_, pixels) in zip(index, frames):
+            # Frames added directly are named after their instance number
+            self.assertEqual(line["file"], "0_%08d.png" % int(line["sequenceNum"]))
+            with open(os.path.join(self.path, line["file"]), "rb") as f:
+                data = f.read()
+            self.assertEqual(len(data), int(line["size"]))
+            np.testing.assert_array_equal(decodePng(data), pixels)
+
+    def test_png_names(self):
+        with dai.FrameArchiver(self.path, dai.FrameArchiver.Format.PNG, 2) as archiver:
+            archiver.setBlocking(True)
+            # Two streams with the same sequence numbers, the first one restarting
+            for stream, i in [("left", 0), ("right", 0), ("left", 1), ("right", 1), ("left", 0), ("left", 1)]:
+                self.assertTrue(archiver.add(makeFrame(i)[0], stream))
+            self.assertTrue(archiver.add(makeFrame(0)[0], "camera/1"))
+
+        files = [line["file"] for line in self.readIndex()]
+        self.assertEqual(files, ["left_00000000.png", "right_00000000.png", "left_00000001.png", "right_00000001.png",
+                                 "left-1_00000000.png", "left-1_00000001.png", "camera_1_00000000.png"])
+        self.assertEqual(sorted(os.listdir(self.path)), sorted(files + ["index.csv"]))
+
+    def test_raw(self):
+        frames = [makeFrame(i, dai.RawImgFrame.Type.RAW16) for i in range(6)]
+        with dai.FrameArchiver(self.path, dai.FrameArchiver.Format.RAW, 2) as archiver:
+            archiver.setBlocking(True)
+            for i, (frame, _) in enumerate(frames):
+                archiver.setCompressionLevel(0 if i == 5 else 6)
+                archiver.add(frame)
+            # Only GRAY8, RAW8 and RAW16 frames are supported
+            self.assertFalse(archiver.add(makeFrame(6, dai.RawImgFrame.Type.NV12)[0]))
+
+        self.assertEqual(archiver.getStats().numFailed, 1)
+        with open(os.path.join(self.path, "frames.bin"), "rb") as f:
+            data = f.read()
+        for line, (_, pixels) in zip(self.readIndex(), frames):
+            record = data[int(line["offset"]):int(line["offset"]) + int(line["size"])]
+            if line["encoding"] == "zlib":
+                record = zlib.decompress(record)
+            self.assertEqual(line["type"], "RAW16")
+            self.assertEqual(record, pixels.tobytes())
+
+        with self.assertRaises(ValueError):
+            archiver.setCompressionLevel(10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+
+def makeFrame(i, type=dai.RawImgFrame.Type.BITSTREAM, width=0, height=0, data=None):
+    frame = dai.ImgFrame()
+    frame.setType(type)
+    frame.setWidth(width)
+    frame.setHeight(height)
+    frame.setSequenceNum(i)
+    frame.setInstanceNum(1)
+    frame.setTimestamp(timedelta(seconds=5, milliseconds=i))
+    if data is None:
+        data = b"\xff\xd8" + bytes([i]) * 1000 + b"\xff\xd9"
+    frame.setData(np.frombuffer(data, dtype=np.uint8))
+    return frame
+
+
+class TestFrameSaver(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.template = os.path.join(self.directory.name, "stills", "{instanceNum}", "{sequenceNum:04}_{timestamp}.{ext}")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_template(self):
+        saver = dai.FrameSaver(self.template)
+        self.assertEqual(saver.formatPath(makeFrame(7)), os.path.join(self.directory.name, "stills", "1", "0007_5007.jpeg"))
+        gray = makeFrame(7, dai.RawImgFrame.Type.GRAY8, 4, 2, bytes(8))
+        self.assertTrue(saver.formatPath(gray).endswith(".pgm"))
+        with self.assertRaises(ValueError):
+            dai.FrameSaver("{unknown}.jpeg")
+
+    def test_save(self):
+        with dai.FrameSaver(self.template, 2) as saver:
+            # Files of a batch are kept open, so batches are capped
+            saver.setSyncBatch(100000)
+            self.assertEqual(saver.getSyncBatch(), 64)
+            saver.setSyncBatch(4)
+            saver.setBlocking(True)
+            saver.setMaxPendingBytes(4096)
+            for i in range(10):
+                self.assertTrue(saver.add(makeFrame(i)))
+            # Planar BGR is written as interleaved RGB
+            saver.add(makeFrame(10, dai.RawImgFrame.Type.BGR888p, 2, 1, bytes([0, 1, 2, 3, 4, 5])))
+            self.assertTrue(saver.wait(timedelta(seconds=5)))
+
+        stats = saver.getStats()
+        self.assertEqual(stats.numSaved, 11)
+        self.assertEqual(stats.numFailed, 0)
+        self.assertEqual(stats.numPending, 0)
+        self.assertEqual(stats.pendingBytes, 0)
+        self.assertFalse(saver.add(makeFrame(11)))
+
+        directory = os.path.join(self.directory.name, "stills", "1")
+        with open(os.path.join(directory, "0003_5003.jpeg"), "rb") as f:
+            self.assertEqual(f.read(), b"\xff\xd8" + bytes([3]) * 1000 + b"\xff\xd9")
+        with open(os.path.join(directory, "0010_5010.ppm"), "rb") as f:
+            self.assertEqual(f.read(), b"P6\n2 1\n255\n" + bytes([4, 2, 0, 5, 3, 1]))
+
+    def test_drop(self):
+        saver = dai.FrameSaver(self.template, 1)
+        saver.setMaxPendingBytes(1)
+        added = sum(saver.add(makeFrame(i)) for i in range(50))
+        saver.close()
+        stats = saver.getStats()
+        self.assertEqual(stats.numSaved, added)
+        self.assertEqual(stats.numDropped, 50 - added)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import time
+import unittest
+
+import depthai as dai
+
+
+class Doubler(dai.HostNode):
+    def __init__(self):
+        dai.HostNode.__init__(self)
+        self.input = self.createInput("in", queueSize=2)
+        self.out = self.createOutput("out")
+
+    def process(self):
+        for msg in self.input.tryGetAll():
+            data = msg.getData()
+            if data[0] == 0:
+                raise RuntimeError("zero")
+            buffer = dai.Buffer()
+            buffer.setData(data * 2)
+            self.out.send(buffer)
+
+
+class Splitter(dai.HostNode):
+    def __init__(self, count):
+        dai.HostNode.__init__(self)
+        self.count = count
+        self.input = self.createInput("in", queueSize=4)
+        self.out = self.createOutput("out")
+
+    def process(self):
+        for msg in self.input.tryGetAll():
+            for i in range(self.count):
+                self.out.send(makeBuffer(msg.getData()[0] * 10 + i))
+
+
+class SlowConsumer(dai.HostNode):
+    def __init__(self):
+        dai.HostNode.__init__(self)
+        self.input = self.createInput("in", queueSize=1)
+        self.out = self.createOutput("out")
+
+    def process(self):
+        msg = self.input.tryGet()
+        if msg is not None:
+            time.sleep(0.01)
+            self.out.send(msg)
+
+
+def makeBuffer(value):
+    buffer = dai.Buffer()
+    buffer.setData([value])
+    return buffer
+
+
+class TestHostNode(unittest.TestCase):
+    def setUp(self):
+        self.source = dai.MessageQueue("source", 16)
+        self.sink = dai.MessageQueue("sink", 16)
+        self.pipeline = dai.HostPipeline()
+        self.fromDevice = dai.DeviceOutputNode(self.source)
+        self.pipeline.add(self.fromDevice)
+        self.doubler = Doubler()
+        self.pipeline.add(self.doubler)
+        self.toDevice = dai.DeviceInputNode(self.sink)
+        self.pipeline.add(self.toDevice)
+        self.fromDevice.out.link(self.doubler.input)
+        self.doubler.out.link(self.toDevice.input)
+
+    def tearDown(self):
+        self.pipeline.stop()
+
+    def test_process(self):
+        self.assertEqual([node.getId() for node in self.pipeline.getAllNodes()], [0, 1, 2])
+        with self.pipeline:
+            for value in range(1, 11):
+                self.source.send(makeBuffer(value))
+            results = [self.sink.get().getData()[0] for _ in range(10)]
+        self.assertEqual(results, [value * 2 for value in range(1, 11)])
+
+        stats = self.doubler.getStats()
+        self.assertEqual(stats.numReceived, 10)
+        self.assertEqual(stats.numSent, 10)
+        self.assertEqual(stats.numErrors, 0)
+        self.assertGreaterEqual(stats.maxLatency, stats.averageLatency)
+
+    def test_errors(self):
+        self.pipeline.start()
+        self.source.send(makeBuffer(0))
+        while self.doubler.getStats().numErrors == 0:
+            time.sleep(0.01)
+        self.source.send(makeBuffer(1))
+        self.assertEqual(self.sink.get().getData()[0], 2)
+        stats = self.doubler.getStats()
+        self.assertEqual(stats.numErrors, 1)
+        self.assertIn("zero", stats.lastError)
+
+    def test_lifecycle(self):
+        self.pipeline.start()
+        self.assertTrue(self.pipeline.isRunning())
+        with self.assertRaises(RuntimeError):
+            self.pipeline.add(Doubler())
+        self.pipeline.stop()
+        self.assertFalse(self.pipeline.isRunning())
+        with self.assertRaises(RuntimeError):
+            self.pipeline.start()
+        # Waiting for input messages gives up once the pipeline was stopped
+        with self.assertRaises(RuntimeError):
+            self.doubler.input.get()
+
+    def test_backpressure(self):
+        # A single pool thread, blocking it on the full input of the slow consumer would stall the pipeline
+        pipeline = dai.HostPipeline(1)
+        fromDevice = dai.DeviceOutputNode(self.source)
+        splitter = Splitter(4)
+        consumer = SlowConsumer()
+        toDevice = dai.DeviceInputNode(self.sink)
+        for node in (fromDevice, splitter, consumer, toDevice):
+            pipeline.add(node)
+        fromDevice.out.link(splitter.input)
+        splitter.out.link(consumer.input)
+        consumer.out.link(toDevice.input)
+
+        with pipeline:
+            for value in range(1, 4):
+                self.source.send(makeBuffer(value))
+            results = []
+            deadline = time.monotonic() + 5
+            while len(results) < 12 and time.monotonic() < deadline:
+                msg = self.sink.tryGet()
+                if msg is None:
+                    time.sleep(0.01)
+                else:
+                    results.append(msg.getData()[0])
+        self.assertEqual(results, [value * 10 + i for value in range(1, 4) for i in range(4)])
+        self.assertEqual(splitter.getStats().numSent, 12)
+        self.assertEqual(consumer.getStats().numDropped, 0)
+
+    def test_foreign_link(self):
+        other = Doubler()
+        self.doubler.out.link(other.input)
+        with self.assertRaises(RuntimeError):
+            self.pipeline.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+ELF_HEADER_SIZE = 52
+
+
+def createBlob():
+    # Blob header of version 5.0 without inputs and outputs
+    blob = bytearray(256)
+    struct.pack_into("<4I", blob, ELF_HEADER_SIZE, 9709, len(blob), 5, 0)
+    return bytes(blob)
+
+
+class TestMappedFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.bin")
+        with open(self.path, "wb") as f:
+            f.write(bytes(range(256)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_buffer(self):
+        mapped = dai.MappedFile(self.path)
+        self.assertEqual(mapped.size(), 256)
+        view = np.frombuffer(mapped, dtype=np.uint8)
+        self.assertEqual(view[255], 255)
+        self.assertFalse(view.flags.writeable)
+
+    def test_asset(self):
+        asset = dai.Asset("key")
+        asset.loadFile(self.path)
+        self.assertEqual(bytes(asset.data), bytes(range(256)))
+        asset.setData(b"abc")
+        self.assertEqual(bytes(asset.data), b"abc")
+
+    def test_blob(self):
+        blob = createBlob()
+        blobPath = os.path.join(self.directory.name, "model.blob")
+        with open(blobPath, "wb") as f:
+            f.write(blob)
+
+        pipeline = dai.Pipeline()
+        fromPath = pipeline.createNeuralNetwork()
+        fromPath.setBlobPath(blobPath)
+        fromBuffer = pipeline.createNeuralNetwork()
+        fromBuffer.setBlob(dai.MappedFile(blobPath))
+        for nn in (fromPath, fromBuffer):
+            self.assertEqual(bytes(nn.getAssets()[0].data), blob)
+        # Blob URIs of both nodes refer to their assets
+        self.assertEqual(sorted(pipeline.getBlobInfos().keys()), sorted([fromPath.id, fromBuffer.id]))
+        self.assertEqual(pipeline.resolveOpenVINOVersion(), dai.OpenVINO.VERSION_2020_3)
+
+        with self.assertRaises(RuntimeError):
+            fromPath.setBlobPath(os.path.join(self.directory.name, "missing.blob"))
+
+    def test_invalid_blob(self):
+        nn = dai.Pipeline().createNeuralNetwork()
+        with self.assertRaises(ValueError):
+            nn.setBlob(dai.MappedFile(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
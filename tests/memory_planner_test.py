@@ -0,0 +1,46 @@
+import unittest
+
+import depthai as dai
+
+
+class TestMemoryPlanner(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = dai.Pipeline()
+        xin = self.pipeline.createXLinkIn()
+        xin.setStreamName("in")
+        xin.setNumFrames(4)
+        xin.setMaxDataSize(1000)
+        self.manip = self.pipeline.createImageManip()
+        self.manip.setMaxOutputFrameSize(2000)
+        self.manip.setNumFramesPool(2)
+        xin.out.link(self.manip.inputImage)
+        xout = self.pipeline.createXLinkOut()
+        xout.setStreamName("out")
+        self.manip.out.link(xout.input)
+
+    def test_plan(self):
+        plan = self.pipeline.planMemory()
+        sizes = {pool.setting: pool.size for pool in plan.pools}
+        self.assertEqual(sizes, {"XLinkIn.setNumFrames": 4000, "ImageManip.setNumFramesPool": 4000})
+        self.assertEqual(plan.ddrEstimate, 8000)
+        self.assertTrue(plan.withinBudget)
+        self.assertFalse(self.pipeline.planMemory(ddrBudget=5000).withinBudget)
+
+    def test_suggestions(self):
+        plan = self.pipeline.planMemory(targetFps=30, targetLatency=0.1)
+        manip = [pool for pool in plan.pools if pool.nodeId == self.manip.id][0]
+        self.assertEqual(manip.suggestedNumFrames, 4)
+        self.assertTrue(any("setNumFramesPool(4)" in warning for warning in plan.warnings))
+
+    def test_compare(self):
+        plan = self.pipeline.planMemory()
+        usage = dai.MemoryInfo()
+        usage.used = 10000
+        usage.total = 20000
+        usage.remaining = 10000
+        comparison = plan.compare(usage, usage)
+        self.assertEqual(comparison.getDdrUnaccounted(), 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
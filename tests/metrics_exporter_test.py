@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from datetime import timedelta
+
+import depthai as dai
+
+
+class TestMetricsExporter(unittest.TestCase):
+    def setUp(self):
+        self.exporter = dai.MetricsExporter()
+        self.queue = dai.MessageQueue("rgb", 2, False)
+        self.exporter.addQueue(self.queue, "TESTMXID")
+
+    def tearDown(self):
+        self.exporter.stop()
+
+    def sendFrames(self, count):
+        for _ in range(count):
+            frame = dai.ImgFrame()
+            frame.setTimestamp(timedelta(seconds=time.monotonic() - 0.01))
+            self.queue.send(frame)
+
+    def fetch(self, accept=None):
+        port = self.exporter.getHttpPort()
+        request = urllib.request.Request("http://127.0.0.1:{}/metrics".format(port))
+        if accept is not None:
+            request.add_header("Accept", accept)
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.headers.get("Content-Type"), response.read().decode()
+
+    def test_http_prometheus(self):
+        self.exporter.startHttpServer(0)
+        self.assertGreater(self.exporter.getHttpPort(), 0)
+        self.sendFrames(3)
+
+        contentType, body = self.fetch()
+        self.assertTrue(contentType.startswith("text/plain"))
+        self.assertIn("# TYPE depthai_queue_messages_total counter", body)
+        self.assertIn('depthai_queue_messages_total{queue="rgb",mxid="TESTMXID"} 3', body)
+        self.assertIn('depthai_queue_dropped_messages_total{queue="rgb",mxid="TESTMXID"} 1', body)
+        self.assertIn('depthai_queue_depth{queue="rgb",mxid="TESTMXID"} 2', body)
+        self.assertIn('depthai_queue_latency_seconds_count{queue="rgb",mxid="TESTMXID"} 3', body)
+        self.assertNotIn("# EOF", body)
+
+    def test_http_openmetrics(self):
+        self.exporter.startHttpServer(0)
+        self.sendFrames(1)
+
+        contentType, body = self.fetch("application/openmetrics-text; version=1.0.0")
+        self.assertTrue(contentType.startswith("application/openmetrics-text"))
+        self.assertIn("# TYPE depthai_queue_messages counter", body)
+        self.assertIn('depthai_queue_messages_total{queue="rgb",mxid="TESTMXID"} 1', body)
+        self.assertTrue(body.endswith("# EOF\n"))
+
+    def test_http_not_found(self):
+        self.exporter.startHttpServer(0)
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen("http://127.0.0.1:{}/other".format(self.exporter.getHttpPort()), timeout=5)
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_textfile(self):
+        self.sendFrames(2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "depthai.prom")
+            self.exporter.startTextfile(path)
+            with open(path) as f:
+                body = f.read()
+            self.assertIn('depthai_queue_messages_total{queue="rgb",mxid="TESTMXID"} 2', body)
+            self.exporter.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import copy
+import unittest
+
+import depthai as dai
+
+
+def createPipeline():
+    pipeline = dai.Pipeline()
+    cam = pipeline.createColorCamera()
+    xout = pipeline.createXLinkOut()
+    xout.setStreamName("preview")
+    cam.preview.link(xout.input)
+    return pipeline
+
+
+def streamNames(pipeline):
+    return sorted(node.getStreamName() for node in pipeline.getAllNodes() if isinstance(node, dai.XLinkOut))
+
+
+class TestPipelineClone(unittest.TestCase):
+    def test_clone(self):
+        pipeline = createPipeline()
+        clone = pipeline.clone()
+        self.assertEqual(clone.getContentHash(), pipeline.getContentHash())
+        self.assertEqual(len(clone.getConnections()), 1)
+
+    def test_stream_prefix(self):
+        pipeline = createPipeline()
+        clone = pipeline.clone("dev1_")
+        self.assertEqual(streamNames(clone), ["dev1_preview"])
+        self.assertEqual(streamNames(pipeline), ["preview"])
+
+    def test_deepcopy(self):
+        pipeline = createPipeline()
+        clone = copy.deepcopy(pipeline)
+        clone.addStreamNamePrefix("x_")
+        self.assertEqual(streamNames(clone), ["x_preview"])
+        self.assertEqual(streamNames(pipeline), ["preview"])
+
+    def test_link_on_clone(self):
+        pipeline = createPipeline()
+        clone = pipeline.clone()
+        cam = next(node for node in clone.getAllNodes() if isinstance(node, dai.ColorCamera))
+        xout = clone.createXLinkOut()
+        xout.setStreamName("video")
+        cam.video.link(xout.input)
+        self.assertEqual(len(clone.getConnections()), 2)
+        self.assertEqual(len(pipeline.getConnections()), 1)
+        self.assertEqual(len(pipeline.getAllNodes()), 2)
+
+        # Unlinking on the clone leaves the original connection in place
+        cam.preview.unlink(next(node for node in clone.getAllNodes() if isinstance(node, dai.XLinkOut) and node.getStreamName() == "preview").input)
+        self.assertEqual(len(clone.getConnections()), 1)
+        self.assertEqual(len(pipeline.getConnections()), 1)
+
+    def test_assets_shared(self):
+        pipeline = createPipeline()
+        asset = dai.Asset("config")
+        asset.setData(b"original")
+        pipeline.getAssetManager().add(asset)
+        original = pipeline.getAssetManager().get("config")
+        clone = pipeline.clone()
+        # Same storage, not a copy
+        self.assertIs(clone.getAssetManager().get("config"), original)
+
+        # Setting an asset on the clone leaves the original in place
+        replacement = dai.Asset("config")
+        replacement.setData(b"modified")
+        clone.getAssetManager().set("config", replacement)
+        self.assertIs(pipeline.getAssetManager().get("config"), original)
+        self.assertEqual(bytes(original.data), b"original")
+        self.assertEqual(bytes(clone.getAssetManager().get("config").data), b"modified")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import depthai as dai
+
+
+def createPipeline():
+    pipeline = dai.Pipeline()
+    xin = pipeline.createXLinkIn()
+    xin.setStreamName("in")
+    xout = pipeline.createXLinkOut()
+    xout.setStreamName("out")
+    xout.input.setQueueSize(2)
+    xin.out.link(xout.input)
+    return pipeline
+
+
+class TestPipelineSerializer(unittest.TestCase):
+    def test_roundtrip(self):
+        pipeline = createPipeline()
+        data = pipeline.serialize()
+        restored = dai.Pipeline.deserialize(data)
+
+        self.assertEqual(restored.getContentHash(), pipeline.getContentHash())
+        self.assertEqual(restored.serialize(), data)
+        names = sorted(node.getName() for node in restored.getAllNodes())
+        self.assertEqual(names, ["XLinkIn", "XLinkOut"])
+        self.assertEqual(len(restored.getConnections()), 1)
+
+        xout = [node for node in restored.getAllNodes() if node.getName() == "XLinkOut"][0]
+        self.assertIsInstance(xout, dai.SerializedNode)
+        self.assertEqual(xout.getInput("in").getQueueSize(), 2)
+        self.assertEqual(xout.getProperties()["streamName"], "out")
+
+    def test_corrupted(self):
+        data = bytearray(createPipeline().serialize())
+        data[-1] ^= 0xFF
+        with self.assertRaises(RuntimeError):
+            dai.Pipeline.deserialize(bytes(data))
+
+    def test_load_cached(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return createPipeline()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pipeline.bin")
+            self.assertIsNone(dai.Pipeline.loadCached(path))
+
+            first = dai.Pipeline.loadCached(path, builder, key="v1")
+            second = dai.Pipeline.loadCached(path, builder, key="v1")
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(first.getContentHash(), second.getContentHash())
+
+            dai.Pipeline.loadCached(path, builder, key="v2")
+            self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
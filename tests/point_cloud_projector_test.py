@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+
+
+class TestPointCloudProjector(unittest.TestCase):
+    def setUp(self):
+        self.calibration = dai.CalibrationHandler()
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.RIGHT, INTRINSICS, 1280, 800)
+        self.calibration.setDistortionCoefficients(dai.CameraBoardSocket.RIGHT, [0.1] + [0.0] * 13)
+        self.projector = dai.PointCloudProjector(self.calibration, dai.CameraBoardSocket.RIGHT, (640, 400))
+        self.depth = np.random.default_rng(0).integers(0, 5000, (400, 640), dtype=np.uint16)
+
+    def expected(self, depth):
+        v, u = np.mgrid[0:400, 0:640]
+        z = depth.astype(np.float32)
+        return np.stack([(u - 320) / 400 * z, (v - 200) / 400 * z, z], axis=-1)
+
+    def test_organized(self):
+        points = self.projector.project(self.depth, organized=True)
+        self.assertEqual(points.shape, (400, 640, 3))
+        self.assertEqual(points.dtype, np.float32)
+        valid = self.depth > 0
+        np.testing.assert_allclose(points[valid], self.expected(self.depth)[valid], rtol=1e-5, atol=1e-3)
+        self.assertTrue(np.isnan(points[~valid]).all())
+
+        # Decimation and output reuse
+        out = np.empty((200, 320, 3), dtype=np.float32)
+        self.assertIs(self.projector.project(self.depth, organized=True, decimation=2, out=out), out)
+        np.testing.assert_array_equal(out, points[::2, ::2])
+
+    def test_unorganized(self):
+        self.projector.setDepthRange(1000, 4000)
+        self.projector.setScale(0.001)
+        points = self.projector.project(self.depth)
+        valid = (self.depth >= 1000) & (self.depth <= 4000)
+        self.assertEqual(points.shape, (valid.sum(), 3))
+        np.testing.assert_allclose(points, self.expected(self.depth)[valid] * 0.001, rtol=1e-5, atol=1e-6)
+
+        out = np.empty((400 * 640, 3), dtype=np.float32)
+        result = self.projector.project(self.depth[:, :], out=out, decimation=3)
+        self.assertEqual(len(result), ((self.depth[::3, ::3] >= 1000) & (self.depth[::3, ::3] <= 4000)).sum())
+        self.assertTrue(np.shares_memory(result, out))
+
+        # Strided depth (eg. a crop) is accepted
+        padded = np.zeros((400, 700), dtype=np.uint16)
+        padded[:, :640] = self.depth
+        np.testing.assert_array_equal(self.projector.project(padded[:, :640]), points)
+
+        with self.assertRaises(ValueError):
+            self.projector.project(self.depth.astype(np.float32))
+        with self.assertRaises(ValueError):
+            self.projector.project(self.depth[:200])
+        with self.assertRaises(ValueError):
+            self.projector.project(self.depth, out=np.empty((10, 3), dtype=np.float32))
+
+    def test_undistort(self):
+        projector = dai.PointCloudProjector(self.calibration, dai.CameraBoardSocket.RIGHT, (640, 400), undistort=True)
+        rays = projector.getRays()
+        self.assertEqual(rays.shape, (400, 640, 2))
+        # Distorting the rays gives back the pixels
+        x, y = rays[..., 0].astype(np.float64), rays[..., 1].astype(np.float64)
+        radial = 1 + 0.1 * (x * x + y * y)
+        v, u = np.mgrid[0:400, 0:640]
+        np.testing.assert_allclose(x * radial * 400 + 320, u, atol=1e-2)
+        np.testing.assert_allclose(y * radial * 400 + 200, v, atol=1e-2)
+        np.testing.assert_allclose(self.projector.getRays()[..., 0], (u - 320) / 400, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import threading
+import time
+import unittest
+from datetime import timedelta
+
+import depthai as dai
+
+
+class SimulatedTransport(dai.DeviceTransport):
+    """Transport which pretends to be a device, producing 'out' stream messages and recording 'in' stream ones"""
+
+    def __init__(self, mxId="SIMULATED", failConnects=0):
+        dai.DeviceTransport.__init__(self)
+        self.mxId = mxId
+        self.failConnects = failConnects
+        self.connects = 0
+        self.uploadedPipelines = []
+        self.received = []
+        self.callback = None
+        self.connected = False
+        self.lock = threading.Lock()
+
+    def connect(self, pipeline, mxId, callback):
+        with self.lock:
+            if mxId and mxId != self.mxId:
+                raise RuntimeError("Device with MxId '{}' not found".format(mxId))
+            if self.failConnects > 0:
+                self.failConnects -= 1
+                raise RuntimeError("Device not found")
+            self.connects += 1
+            self.uploadedPipelines.append(pipeline)
+            self.callback = callback
+            self.connected = True
+            return self.mxId
+
+    def disconnect(self):
+        with self.lock:
+            self.connected = False
+            self.callback = None
+
+    def isConnected(self):
+        with self.lock:
+            return self.connected
+
+    def send(self, streamName, msg, timeout):
+        with self.lock:
+            if not self.connected:
+                return False
+            self.received.append((streamName, msg))
+            return True
+
+    # Simulation helpers
+    def produce(self, seq):
+        with self.lock:
+            callback = self.callback
+        if callback is None:
+            return False
+        buf = dai.Buffer()
+        buf.setData([seq])
+        callback("out", buf)
+        return True
+
+    def unplug(self, failConnects=0):
+        with self.lock:
+            self.connected = False
+            self.failConnects = failConnects
+
+
+def waitFor(predicate, timeout=5.0):
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestReconnectingDevice(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = dai.Pipeline()
+        self.transport = SimulatedTransport()
+        self.device = dai.ReconnectingDevice(self.pipeline, "", self.transport)
+        self.device.setPollInterval(timedelta(milliseconds=10))
+        self.device.setRetryInterval(timedelta(milliseconds=10))
+
+    def tearDown(self):
+        self.device.close()
+
+    def test_initial_connect(self):
+        self.assertTrue(self.device.isConnected())
+        self.assertEqual(self.device.getMxId(), "SIMULATED")
+        self.assertEqual(self.transport.connects, 1)
+        self.assertEqual(self.device.getReconnectCount(), 0)
+
+    def test_reconnect_reuploads_pipeline_and_keeps_queues(self):
+        events = []
+        self.device.addReconnectCallback(lambda ev: events.append(ev))
+        qOut = self.device.getOutputQueue("out", 8, False)
+
+        self.assertTrue(self.transport.produce(1))
+        self.assertEqual(qOut.get().getData()[0], 1)
+
+        self.transport.unplug(failConnects=2)
+        self.assertTrue(waitFor(lambda: self.device.getReconnectCount() == 1))
+
+        # Pipeline was uploaded again, to the same device
+        self.assertEqual(self.transport.connects, 2)
+        self.assertEqual(len(self.transport.uploadedPipelines), 2)
+
+        # Events describe the outage
+        self.assertTrue(waitFor(lambda: len(events) == 2))
+        self.assertEqual(events[0].type, dai.ReconnectEvent.Type.DISCONNECTED)
+        self.assertEqual(events[1].type, dai.ReconnectEvent.Type.RECONNECTED)
+        self.assertEqual(events[1].mxId, "SIMULATED")
+        self.assertEqual(events[1].attempts, 3)
+        self.assertGreater(events[1].outageDuration.total_seconds(), 0)
+        self.assertEqual(self.device.getLastOutageDuration(), events[1].outageDuration)
+
+        # Same queue handle keeps receiving messages
+        self.assertIs(self.device.getOutputQueue("out", 8, False), qOut)
+        self.assertTrue(self.transport.produce(2))
+        self.assertEqual(qOut.get().getData()[0], 2)
+
+    def test_input_queue_buffers_during_outage(self):
+        qIn = self.device.getInputQueue("in")
+        self.transport.unplug(failConnects=5)
+
+        buf = dai.Buffer()
+        buf.setData([42])
+        qIn.send(buf)
+        time.sleep(0.02)
+        self.assertEqual(len(self.transport.received), 0)
+
+        self.assertTrue(waitFor(lambda: len(self.transport.received) == 1))
+        self.assertEqual(self.transport.received[0][0], "in")
+        self.assertEqual(self.transport.received[0][1].getData()[0], 42)
+
+    def test_close_closes_queues(self):
+        qOut = self.device.getOutputQueue("out")
+        self.device.close()
+        self.assertTrue(self.device.isClosed())
+        self.assertTrue(qOut.isClosed())
+        with self.assertRaises(RuntimeError):
+            qOut.tryGet()
+
+    def test_callback_outlives_device(self):
+        callback = self.transport.callback
+        self.device.close()
+        del self.device
+        self.device = dai.ReconnectingDevice(self.pipeline, "", SimulatedTransport())
+
+        # Transport kept the message callback of the destroyed device
+        buf = dai.Buffer()
+        buf.setData([1])
+        callback("out", buf)
+
+    def test_close_from_callback(self):
+        closed = threading.Event()
+
+        def onEvent(ev):
+            self.device.close()
+            closed.set()
+
+        self.device.addReconnectCallback(onEvent)
+        self.transport.unplug()
+        self.assertTrue(closed.wait(5))
+        self.assertTrue(self.device.isClosed())
+        self.assertEqual(self.transport.connects, 1)
+
+    def test_callback_error_recorded(self):
+        def onEvent(ev):
+            raise ValueError("callback failed")
+
+        self.device.addReconnectCallback(onEvent)
+        self.assertEqual(self.device.getLastCallbackError(), "")
+        self.transport.unplug()
+        self.assertTrue(waitFor(lambda: "callback failed" in self.device.getLastCallbackError()))
+        # Reconnecting continued regardless
+        self.assertTrue(waitFor(lambda: self.device.getReconnectCount() == 1))
+
+    def test_destroy_while_callback_waits_for_gil(self):
+        entered = threading.Event()
+        self.device.addReconnectCallback(lambda ev: entered.set())
+        self.transport.unplug(failConnects=1000)
+        self.assertTrue(entered.wait(5))
+
+        # Dropping the last reference joins the supervisor, which retries connecting through the Python transport
+        del self.device
+        self.device = dai.ReconnectingDevice(self.pipeline, "", SimulatedTransport())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+
+def makeFrame(i):
+    frame = dai.ImgFrame()
+    frame.setType(dai.RawImgFrame.Type.GRAY8)
+    frame.setWidth(16)
+    frame.setHeight(8)
+    frame.setSequenceNum(100 + i)
+    frame.setTimestamp(timedelta(milliseconds=33 * i))
+    frame.setData(np.full(16 * 8, i, dtype=np.uint8))
+    return frame
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.rec")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, count, close=True):
+        recorder = dai.Recorder(self.path)
+        recorder.addStream("rgb")
+        recorder.addStream("detections")
+        recorder.setChunkSize(4096)
+        recorder.setBlocking(True)
+        recorder.start()
+        for i in range(count):
+            self.assertTrue(recorder.add("rgb", makeFrame(i)))
+            detections = dai.ImgDetections()
+            detection = dai.ImgDetection()
+            detection.label = i
+            detections.detections = [detection]
+            self.assertTrue(recorder.add(1, detections))
+        if close:
+            recorder.close()
+            self.assertEqual(recorder.getStats().numRecorded, 2 * count)
+        return recorder
+
+    def test_roundtrip(self):
+        self.record(20)
+        reader = dai.RecordingReader(self.path)
+        self.assertTrue(reader.isComplete())
+        self.assertEqual(reader.getStreams(), ["rgb", "detections"])
+        self.assertEqual(len(reader), 40)
+
+        frame = reader.getNearest("rgb", timedelta(milliseconds=33 * 7 + 5))
+        self.assertEqual(frame.getSequenceNum(), 107)
+        self.assertEqual(frame.getWidth(), 16)
+        self.assertTrue((frame.getData() == 7).all())
+
+        index = reader.getIndex("rgb")
+        self.assertEqual(index[3].datatype, dai.DatatypeEnum.ImgFrame)
+        self.assertEqual((index[3].width, index[3].height), (16, 8))
+        self.assertEqual(len(reader.getRange("rgb", timedelta(0), timedelta(milliseconds=100))), 4)
+
+        detections = reader.read(reader.getIndex("detections")[5])
+        self.assertEqual(detections.detections[0].label, 5)
+
+    def test_recovery(self):
+        self.record(20)
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 4096 * 3)
+        reader = dai.RecordingReader(self.path)
+        self.assertFalse(reader.isComplete())
+        self.assertGreater(len(reader), 0)
+        self.assertLess(len(reader), 40)
+        reader[len(reader) - 1]
+
+
+if __name__ == "__main__":
+    unittest.main()
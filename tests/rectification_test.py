@@ -0,0 +1,134 @@
+import glob
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+ROTATION = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+DISTORTION = [0.1, 0.01] + [0.0] * 12
+
+
+class TestRectification(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.calibration = self.createCalibration()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def createCalibration(self):
+        calibration = dai.CalibrationHandler()
+        calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, INTRINSICS, 1280, 800)
+        calibration.setCameraIntrinsics(dai.CameraBoardSocket.RIGHT, INTRINSICS, 1280, 800)
+        calibration.setDistortionCoefficients(dai.CameraBoardSocket.LEFT, DISTORTION)
+        calibration.setDistortionCoefficients(dai.CameraBoardSocket.RIGHT, [0.0] * 14)
+        calibration.setCameraExtrinsics(dai.CameraBoardSocket.LEFT, dai.CameraBoardSocket.RIGHT, ROTATION, [-7.5, 0.0, 0.0])
+        calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, ROTATION)
+        calibration.setStereoRight(dai.CameraBoardSocket.RIGHT, ROTATION)
+        return calibration
+
+    def getMaps(self, calibration, camera, alpha=-1):
+        return calibration.getRectificationMaps(camera, (640, 400), alpha, cacheDirectory=self.directory.name)
+
+    def test_maps(self):
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.LEFT)
+        self.assertEqual((maps.width, maps.height), (640, 400))
+        self.assertEqual(maps.coordinates.shape, (400, 640, 2))
+        self.assertEqual(maps.coordinates.dtype, np.int16)
+        self.assertEqual(maps.fractions.shape, (400, 640))
+        self.assertEqual(maps.fractions.dtype, np.uint16)
+        self.assertFalse(maps.coordinates.flags.writeable)
+        np.testing.assert_allclose(maps.cameraMatrix, [[400, 0, 320], [0, 400, 200], [0, 0, 1]])
+
+        # Source coordinates follow the distortion model
+        v, u = np.mgrid[0:400, 0:640].astype(np.float64)
+        x, y = (u - 320) / 400, (v - 200) / 400
+        r2 = x * x + y * y
+        radial = 1 + DISTORTION[0] * r2 + DISTORTION[1] * r2 * r2
+        expected = np.stack([x * radial * 400 + 320, y * radial * 400 + 200], axis=-1)
+        fractions = np.stack([maps.fractions & 31, maps.fractions >> 5], axis=-1)
+        actual = maps.coordinates + fractions / 32.0
+        inside = np.all(np.abs(expected) < 30000, axis=-1)
+        np.testing.assert_allclose(actual[inside], expected[inside], atol=1 / 32 + 1e-3)
+
+        # Undistorted camera with identity rotation maps to itself
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.RIGHT)
+        np.testing.assert_array_equal(maps.coordinates, np.stack([u, v], axis=-1))
+        self.assertFalse(maps.fractions.any())
+
+        # Only valid pixels with alpha 0
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.LEFT, 0)
+        self.assertTrue((maps.coordinates >= 0).all())
+        self.assertTrue((maps.coordinates[..., 0] < 640).all() and (maps.coordinates[..., 1] < 400).all())
+
+    def test_remap(self):
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.RIGHT)
+        frame = np.random.default_rng(0).integers(0, 256, (400, 640), dtype=np.uint8)
+        np.testing.assert_array_equal(dai.remap(frame, maps), frame)
+        color = np.random.default_rng(1).integers(0, 65536, (400, 640, 3), dtype=np.uint16)
+        out = np.zeros_like(color)
+        self.assertIs(dai.remap(color, maps, out), out)
+        np.testing.assert_array_equal(out, color)
+
+        # Pixels mapped outside of the frame blend in black
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.LEFT)
+        flat = np.full((400, 640), 100, dtype=np.uint8)
+        remapped = dai.remap(flat, maps)
+        inside = (maps.coordinates[..., 0] >= 0) & (maps.coordinates[..., 0] < 639) & (maps.coordinates[..., 1] >= 0) & (maps.coordinates[..., 1] < 399)
+        self.assertTrue((remapped[inside] == 100).all())
+        self.assertTrue((remapped[~inside] <= 100).all())
+        self.assertEqual(remapped[0, 0], 0)
+
+        with self.assertRaises(ValueError):
+            dai.remap(frame.astype(np.float32), maps)
+        with self.assertRaises(ValueError):
+            dai.remap(frame, maps, np.zeros((10, 10), dtype=np.uint8))
+
+    def test_disk_cache(self):
+        maps = self.getMaps(self.calibration, dai.CameraBoardSocket.LEFT)
+        files = glob.glob(os.path.join(self.directory.name, "rectification_*.bin"))
+        self.assertEqual(len(files), 1)
+
+        # Another handler with the same calibration loads the cached tables
+        os.utime(files[0], (0, 0))
+        loaded = self.getMaps(self.createCalibration(), dai.CameraBoardSocket.LEFT)
+        np.testing.assert_array_equal(loaded.coordinates, maps.coordinates)
+        np.testing.assert_array_equal(loaded.fractions, maps.fractions)
+        self.assertEqual(os.stat(files[0]).st_mtime, 0)
+
+        # Changed calibration or arguments are cached separately, corrupted files are recomputed
+        self.calibration.setDistortionCoefficients(dai.CameraBoardSocket.LEFT, [0.2] + [0.0] * 13)
+        self.assertFalse(np.array_equal(self.getMaps(self.calibration, dai.CameraBoardSocket.LEFT).coordinates, maps.coordinates))
+        self.getMaps(self.createCalibration(), dai.CameraBoardSocket.LEFT, 0.5)
+        self.assertEqual(len(glob.glob(os.path.join(self.directory.name, "rectification_*.bin"))), 3)
+        with open(files[0], "r+b") as file:
+            file.truncate(1000)
+        loaded = self.getMaps(self.createCalibration(), dai.CameraBoardSocket.LEFT)
+        np.testing.assert_array_equal(loaded.coordinates, maps.coordinates)
+
+    def test_set_during_compute(self):
+        # Maps are computed off the GIL, a setter running meanwhile mustn't leave stale maps memoized
+        focals = [800.0, 1000.0]
+        expected = []
+        for focal in focals:
+            calibration = self.createCalibration()
+            calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, [[focal, 0.0, 640.0], [0.0, focal, 400.0], [0.0, 0.0, 1.0]], 1280, 800)
+            expected.append(calibration.getRectificationMaps(dai.CameraBoardSocket.LEFT, (1280, 800), useCache=False).coordinates)
+
+        for i in range(20):
+            focal = focals[(i + 1) % 2]
+            computing = threading.Thread(target=lambda: self.calibration.getRectificationMaps(dai.CameraBoardSocket.LEFT, (1280, 800), useCache=False))
+            computing.start()
+            self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, [[focal, 0.0, 640.0], [0.0, focal, 400.0], [0.0, 0.0, 1.0]], 1280, 800)
+            computing.join()
+            maps = self.calibration.getRectificationMaps(dai.CameraBoardSocket.LEFT, (1280, 800), useCache=False)
+            np.testing.assert_array_equal(maps.coordinates, expected[(i + 1) % 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+
+class TestReplayDevice(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.rec")
+        recorder = dai.Recorder(self.path)
+        recorder.addStream("rgb")
+        recorder.addStream("nn")
+        recorder.setBlocking(True)
+        with recorder:
+            for i in range(10):
+                frame = dai.ImgFrame()
+                frame.setSequenceNum(i)
+                frame.setTimestamp(timedelta(milliseconds=20 * i))
+                frame.setData(np.full(32, i, dtype=np.uint8))
+                recorder.add("rgb", frame)
+                buffer = dai.Buffer()
+                buffer.setData([i])
+                recorder.add("nn", buffer)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_paced(self):
+        with dai.ReplayDevice(self.path, speed=2.0) as device:
+            queue = device.getOutputQueue("rgb", maxSize=4, blocking=True)
+            device.startPipeline()
+            start = time.monotonic()
+            frames = [queue.get() for _ in range(10)]
+            elapsed = time.monotonic() - start
+        self.assertEqual([frame.getSequenceNum() for frame in frames], list(range(10)))
+        self.assertGreater(elapsed, 0.07)
+
+    def test_events_and_loop(self):
+        with dai.ReplayDevice(self.path, speed=0, loop=True) as device:
+            self.assertEqual(device.getOutputQueueNames(), ["rgb", "nn"])
+            queue = device.getOutputQueue("nn", maxSize=30, blocking=True)
+            device.startPipeline()
+            received = []
+            while len(received) < 25:
+                self.assertEqual(device.getQueueEvent("nn", timeout=timedelta(seconds=5)), "nn")
+                received.append(queue.get().getData()[0])
+            self.assertEqual(received[:12], list(range(10)) + [0, 1])
+            self.assertGreaterEqual(device.getNumLoops(), 2)
+
+    def test_zero_copy_data(self):
+        reader = dai.RecordingReader(self.path)
+        data = reader.getData(reader.getIndex("rgb")[3])
+        self.assertTrue((data == 3).all())
+        self.assertFalse(data.flags.writeable)
+
+    def test_destroy_during_playback(self):
+        # Playback thread calls into Python, destroying the device without closing must not deadlock on the GIL
+        device = dai.ReplayDevice(self.path, speed=0, loop=True)
+        received = []
+        device.getOutputQueue("rgb", maxSize=1, blocking=False).addCallback(lambda msg: received.append(msg.getSequenceNum()))
+        device.startPipeline()
+        while len(received) < 20:
+            time.sleep(0.01)
+        del device
+        self.assertGreaterEqual(len(received), 20)
+
+    def test_unknown_stream(self):
+        with dai.ReplayDevice(self.path) as device:
+            with self.assertRaises(RuntimeError):
+                device.getOutputQueue("depth")
+
+
+if __name__ == "__main__":
+    unittest.main()
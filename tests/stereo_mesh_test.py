@@ -0,0 +1,75 @@
+import glob
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+INTRINSICS = [[800.0, 0.0, 640.0], [0.0, 800.0, 400.0], [0.0, 0.0, 1.0]]
+ROTATION = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+LEFT_ROTATION = [[0.9998477, 0.0, 0.0174524], [0.0, 1.0, 0.0], [-0.0174524, 0.0, 0.9998477]]
+
+
+class TestStereoMesh(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.calibration = dai.CalibrationHandler()
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.LEFT, INTRINSICS, 1280, 800)
+        self.calibration.setCameraIntrinsics(dai.CameraBoardSocket.RIGHT, INTRINSICS, 1280, 800)
+        self.calibration.setDistortionCoefficients(dai.CameraBoardSocket.LEFT, [0.1, 0.01] + [0.0] * 12)
+        self.calibration.setDistortionCoefficients(dai.CameraBoardSocket.RIGHT, [-0.05] + [0.0] * 13)
+        self.calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, LEFT_ROTATION)
+        self.calibration.setStereoRight(dai.CameraBoardSocket.RIGHT, ROTATION)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_mesh(self):
+        mesh = dai.generateStereoMesh(self.calibration, (1280, 800), 16, useCache=False)
+        self.assertEqual((mesh.width, mesh.height, mesh.stepWidth, mesh.stepHeight), (1280, 800, 16, 16))
+        self.assertEqual(mesh.left.shape, (51, 81, 2))
+        self.assertEqual(mesh.right.dtype, np.float32)
+
+        # Mesh points are (y, x) samples of the rectification maps, edges sample the last pixel
+        for camera, points in [(dai.CameraBoardSocket.LEFT, mesh.left), (dai.CameraBoardSocket.RIGHT, mesh.right)]:
+            maps = self.calibration.getRectificationMaps(camera, (1280, 800), useCache=False)
+            rows = np.minimum(np.arange(51) * 16, 799)
+            columns = np.minimum(np.arange(81) * 16, 1279)
+            coordinates = maps.coordinates[rows][:, columns].astype(np.float64)
+            fractions = maps.fractions[rows][:, columns]
+            coordinates[..., 0] += (fractions & 31) / 32.0
+            coordinates[..., 1] += (fractions >> 5) / 32.0
+            np.testing.assert_allclose(points[..., ::-1], coordinates, atol=1 / 32 + 1e-3)
+
+        # Rows are padded when width % step is odd
+        mesh = dai.generateStereoMesh(self.calibration, (1001, 800), 16, useCache=False)
+        self.assertEqual(mesh.left.shape, (51, 64, 2))
+        self.assertFalse(mesh.left[:, -1].any())
+
+        with self.assertRaises(ValueError):
+            dai.generateStereoMesh(self.calibration, (1280, 800), 0, useCache=False)
+        with self.assertRaises(RuntimeError):
+            dai.generateStereoMesh(dai.CalibrationHandler(), (1280, 800), useCache=False)
+
+    def test_cache(self):
+        mesh = dai.generateStereoMesh(self.calibration, (1280, 800), mxId="14442C10D13EABCE00", cacheDirectory=self.directory.name)
+        files = glob.glob(os.path.join(self.directory.name, "mesh_14442C10D13EABCE00_*.bin"))
+        self.assertEqual(len(files), 1)
+
+        os.utime(files[0], (0, 0))
+        cached = dai.generateStereoMesh(self.calibration, (1280, 800), mxId="14442C10D13EABCE00", cacheDirectory=self.directory.name)
+        np.testing.assert_array_equal(cached.left, mesh.left)
+        np.testing.assert_array_equal(cached.right, mesh.right)
+        self.assertEqual(os.stat(files[0]).st_mtime, 0)
+
+        # Another step or calibration is another entry
+        dai.generateStereoMesh(self.calibration, (1280, 800), 32, mxId="14442C10D13EABCE00", cacheDirectory=self.directory.name)
+        self.calibration.setStereoLeft(dai.CameraBoardSocket.LEFT, ROTATION)
+        self.assertFalse(np.array_equal(dai.generateStereoMesh(self.calibration, (1280, 800), mxId="14442C10D13EABCE00", cacheDirectory=self.directory.name).left, mesh.left))
+        self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+import depthai as dai
+
+
+def makeInfo(i):
+    info = dai.SystemInformation()
+    info.ddrMemoryUsage.used = 1000 * i
+    info.ddrMemoryUsage.total = 1000000
+    info.leonCssCpuUsage.average = 0.01 * i
+    info.chipTemperature.average = 40.0 + i
+    return info
+
+
+class TestSystemInformationBuffer(unittest.TestCase):
+    def test_empty(self):
+        buffer = dai.SystemInformationBuffer(4)
+        self.assertIsNone(buffer.getLatest())
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.getTimestamps().shape, (0,))
+        for name, series in buffer.toNumpy().items():
+            self.assertEqual(series.shape, (0,), name)
+        with self.assertRaises(ValueError):
+            dai.SystemInformationBuffer(0)
+
+    def test_wraparound(self):
+        buffer = dai.SystemInformationBuffer(4)
+        for i in range(10):
+            buffer.add(makeInfo(i))
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.getCapacity(), 4)
+        self.assertEqual(buffer.getNumAdded(), 10)
+
+        # Oldest samples are overwritten, remaining ones stay in chronological order
+        np.testing.assert_array_equal(buffer.getSeries("ddrMemoryUsage.used"), [6000, 7000, 8000, 9000])
+        np.testing.assert_allclose(buffer.getSeries("chipTemperature.average"), [46.0, 47.0, 48.0, 49.0])
+        self.assertTrue(np.all(np.diff(buffer.getTimestamps()) >= 0))
+        self.assertEqual(buffer.getLatest().ddrMemoryUsage.used, 9000)
+        with self.assertRaises(ValueError):
+            buffer.getSeries("unknown")
+
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertIsNone(buffer.getLatest())
+
+    def test_to_numpy(self):
+        buffer = dai.SystemInformationBuffer(8)
+        for i in range(3):
+            buffer.add(makeInfo(i))
+        series = buffer.toNumpy()
+        self.assertEqual(list(series.keys()), dai.SystemInformationBuffer.getFieldNames())
+        self.assertEqual(list(series.keys())[0], "timestamp")
+        for name, values in series.items():
+            self.assertEqual(values.shape, (3,), name)
+            self.assertEqual(values.dtype, np.float64, name)
+        np.testing.assert_array_equal(series["ddrMemoryUsage.total"], [1000000] * 3)
+        np.testing.assert_allclose(series["leonCssCpuUsage.average"], [0.0, 0.01, 0.02], rtol=1e-6)
+        np.testing.assert_array_equal(series["timestamp"], buffer.getTimestamps())
+
+    def test_attach(self):
+        buffer = dai.SystemInformationBuffer(8)
+        queue = dai.MessageQueue("sysinfo", 4, False)
+        buffer.attach(queue)
+        for i in range(3):
+            queue.send(makeInfo(i))
+        queue.send(dai.Buffer())
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.getLatest().chipTemperature.average, 42.0)
+
+    @unittest.skipUnless(dai.Device.getAllAvailableDevices(), "requires a device")
+    def test_snapshot(self):
+        with dai.Device(dai.Pipeline()) as device:
+            buffer = dai.SystemInformationBuffer()
+            # Retrieved from device while buffer is empty
+            snapshot = device.getSystemSnapshot(buffer)
+            self.assertGreater(snapshot.ddrMemoryUsage.total, 0)
+            self.assertGreater(device.getSystemSnapshot().chipTemperature.average, 0)
+            buffer.add(makeInfo(5))
+            self.assertEqual(device.getSystemSnapshot(buffer).ddrMemoryUsage.used, 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import struct
+import tempfile
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+import depthai as dai
+
+# Parameter sets of a 320x240 H.264 stream
+SPS = bytes.fromhex("67f4000d919640507ec044000003000400000300f03c50a920")
+PPS = bytes.fromhex("68ebc3c44844")
+START_CODE = b"\x00\x00\x00\x01"
+
+
+def h264Frame(i, gop=10):
+    # Access unit delimiter, parameter sets with each IDR picture, then a slice (payload isn't parsed)
+    data = START_CODE + b"\x09\x10"
+    if i % gop == 0:
+        data += START_CODE + SPS + START_CODE + PPS + START_CODE + b"\x65" + bytes([i]) * 64
+    else:
+        data += START_CODE + b"\x41" + bytes([i]) * 32
+    return data
+
+
+def jpegFrame(i):
+    # SOI, baseline frame header of a 64x48 image, payload and EOI
+    header = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, 48, 64, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + header + b"\xff\xda\x00\x02" + bytes([i]) * 100 + b"\xff\xd9"
+
+
+def makeFrame(i, data):
+    frame = dai.ImgFrame()
+    frame.setType(dai.RawImgFrame.Type.BITSTREAM)
+    frame.setSequenceNum(i)
+    frame.setTimestamp(timedelta(seconds=10, milliseconds=33 * i))
+    frame.setData(np.frombuffer(data, dtype=np.uint8))
+    return frame
+
+
+class TestVideoMuxer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def mux(self, name, profile, frames, fmt=dai.VideoMuxer.Format.AUTO):
+        path = os.path.join(self.directory.name, name)
+        muxer = dai.VideoMuxer(path, profile, fmt)
+        muxer.setBlocking(True)
+        muxer.setFragmentDuration(timedelta(milliseconds=300))
+        with muxer:
+            for i, data in frames:
+                self.assertTrue(muxer.add(makeFrame(i, data)))
+        with open(path, "rb") as f:
+            return muxer, f.read()
+
+    def test_mp4(self):
+        # Stream joined mid GOP, frames before first keyframe are skipped
+        muxer, data = self.mux("video.mp4", dai.VideoEncoderProperties.Profile.H264_MAIN, [(i, h264Frame(i)) for i in range(5, 40)])
+        self.assertEqual(muxer.getFormat(), dai.VideoMuxer.Format.MP4)
+        stats = muxer.getStats()
+        self.assertEqual(stats.numSkipped, 5)
+        self.assertEqual(stats.numFrames, 30)
+        self.assertEqual(stats.numFragments, 3)
+        self.assertEqual(stats.numBytes, len(data))
+        self.assertAlmostEqual(stats.duration, 30 * 0.033, places=3)
+        self.assertEqual(data[4:8], b"ftyp")
+        self.assertIn(b"avcC", data)
+        self.assertEqual(data.count(b"moof"), 3)
+        # Index at the end of the file
+        self.assertEqual(data[-12:-8], b"mfro")
+
+    def test_mjpeg_mkv(self):
+        muxer, data = self.mux("video.avi", dai.VideoEncoderProperties.Profile.MJPEG, [(i, jpegFrame(i)) for i in range(20)])
+        self.assertEqual(muxer.getFormat(), dai.VideoMuxer.Format.MKV)
+        self.assertEqual(muxer.getStats().numFrames, 20)
+        self.assertEqual(data[:4], b"\x1a\x45\xdf\xa3")
+        self.assertIn(b"V_MJPEG", data)
+        # Cues
+        self.assertIn(b"\x1c\x53\xbb\x6b", data)
+
+    def test_mjpeg_mp4(self):
+        with self.assertRaises(ValueError):
+            dai.VideoMuxer(os.path.join(self.directory.name, "video.mp4"), dai.VideoEncoderProperties.Profile.MJPEG, dai.VideoMuxer.Format.MP4)
+
+
+if __name__ == "__main__":
+    unittest.main()